@@ -0,0 +1,269 @@
+# c:\serownia\database\cli.py
+"""
+Wiersz poleceń Serowni bez GUI (bez PyQt5 i modułów ui.*) – do zadań
+nocnych na serwerze zakładu:
+
+    python -m serownia <polecenie> [opcje]      (albo python -m database.cli)
+
+Polecenia:
+    import    import masowy .xlsx / .csv (database/import_file.py)
+    export    eksport do .xlsx (database/export_xlsx.py)
+    trace     genealogia partia <-> seria (database/trace.py)
+    report    raport z logic/report_generator.py do CSV
+    rebuild   przeliczenie tabel pochodnych (stany, podsumowania, koszty, ...)
+    maintain  statystyki planisty (ANALYZE, PRAGMA optimize), wolne strony
+              pliku (incremental_vacuum porcjami – logic/maintenance.py)
+    check     spójność pliku bazy (integrity_check, foreign_key_check)
+    backup    kopia zapasowa w trakcie pracy z rotacją (logic/backup.py)
+    generate  dane przykładowe (logic/sample_data.py)
+
+Moduły poleceń importowane są dopiero po wyborze polecenia, więc start nie
+wczytuje openpyxl / NumPy, jeśli polecenie ich nie używa. Kod wyjścia 0 = OK,
+1 = rozbieżności / odrzucone wiersze / problemy, 2 = błędne argumenty.
+"""
+
+import argparse
+import csv
+import datetime
+import importlib
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database.db_manager import DBManager
+from logic.log_config import configure_logging
+
+PROG = "python -m serownia"
+
+# Przeliczenia w kolejności zależności: rozchód z partii => koszty serii
+# => stany / zużycie / SPC => podsumowania miesięczne (z kosztami)
+REBUILD_TARGETS = ("lots", "costs", "stock", "usage", "spc", "summary")
+
+
+def _db_parser(command: str, description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=f"{PROG} {command}", description=description
+    )
+    parser.add_argument("--db", default=None, help="ścieżka do pliku bazy")
+    return parser
+
+
+def _report(argv: List[str]) -> int:
+    from logic.report_generator import REPORTS, run_report
+
+    parser = _db_parser("report", "Raport do CSV (separator ';').")
+    parser.add_argument(
+        "key", nargs="?", choices=sorted(REPORTS), help="raport (bez – lista)"
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="KLUCZ=WARTOŚĆ",
+        help="parametr raportu, np. date_from=2024-01-01",
+    )
+    parser.add_argument("--out", default=None, help="plik CSV (domyślnie stdout)")
+    args = parser.parse_args(argv)
+
+    if args.key is None:
+        for key, definition in sorted(REPORTS.items()):
+            params = ", ".join(p.key for p in definition.params)
+            print(f"{key:32} {definition.title}" + (f" [{params}]" if params else ""))
+        return 0
+    params: Dict[str, str] = {}
+    for item in args.param:
+        key, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"parametr bez '=': {item}")
+        params[key.strip()] = value.strip()
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    result = run_report(REPORTS[args.key], db.create_connection, params)
+    handle = (
+        open(args.out, "w", encoding="utf-8-sig", newline="")
+        if args.out
+        else sys.stdout
+    )
+    try:
+        writer = csv.writer(handle, delimiter=";")
+        writer.writerow(result.columns)
+        writer.writerows(result.rows)
+    finally:
+        if args.out:
+            handle.close()
+    if args.out:
+        print(f"Raport '{args.key}': {len(result.rows)} wierszy do {args.out}")
+    return 0
+
+
+def _rebuild(argv: List[str]) -> int:
+    parser = _db_parser(
+        "rebuild", "Przeliczenie tabel pochodnych od zera (z poprawieniem)."
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        metavar="cel",
+        help=f"co przeliczyć: {', '.join(REBUILD_TARGETS)} (domyślnie wszystko)",
+    )
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.targets) - set(REBUILD_TARGETS))
+    if unknown:
+        parser.error(f"nieznany cel: {', '.join(unknown)}")
+    targets = args.targets or REBUILD_TARGETS
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    # cel -> (funkcja, czy wynik to lista rozbieżności, opis)
+    rebuilds: Dict[str, Tuple[Callable[[], object], bool, str]] = {
+        "lots": (db.rebuild_lot_allocations, False, "rozchód z partii, braki"),
+        "costs": (db.rebuild_batch_costs, False, "koszty serii, protokołów"),
+        "stock": (
+            lambda: db.rebuild_additive_stock() + db.rebuild_packaging_stock(),
+            True,
+            "stany magazynowe",
+        ),
+        "usage": (db.rebuild_additive_daily_usage, True, "dzienne zużycie"),
+        "spc": (db.rebuild_spc_stats, True, "statystyki SPC"),
+        "summary": (db.rebuild_production_summary, True, "podsumowania"),
+    }
+    mismatches = 0
+    for target in REBUILD_TARGETS:
+        if target not in targets:
+            continue
+        rebuild, is_mismatch_list, label = rebuilds[target]
+        result = rebuild()
+        if is_mismatch_list:
+            mismatches += len(result)
+            print(f"{target}: {label}, rozbieżności: {len(result)}")
+        else:
+            print(f"{target}: {label}: {result}")
+    return 1 if mismatches else 0
+
+
+def _maintain(argv: List[str]) -> int:
+    from logic.maintenance import VACUUM_CHUNK_PAGES, VACUUM_SLEEP_S, run_maintenance
+
+    parser = _db_parser(
+        "maintain", "Statystyki planisty i zwolnienie wolnych stron pliku."
+    )
+    parser.add_argument(
+        "--pages", type=int, default=VACUUM_CHUNK_PAGES, help="stron/porcję"
+    )
+    parser.add_argument(
+        "--sleep", type=float, default=VACUUM_SLEEP_S, help="przerwa po porcji (s)"
+    )
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    result = run_maintenance(
+        db, analyze=True, chunk_pages=args.pages, max_chunks=None, sleep=args.sleep
+    )
+    if result.converted:
+        print("Plik przełączony na auto_vacuum=INCREMENTAL (pełne VACUUM)")
+    for label, stats in (("przed", result.before), ("po", result.after)):
+        print(
+            f"{label}: {stats['file_size']} B, {stats['page_count']} stron, "
+            f"wolnych {stats['freelist_count']}"
+        )
+    print("ANALYZE i PRAGMA optimize wykonane")
+    return 0
+
+
+def _check(argv: List[str]) -> int:
+    parser = _db_parser("check", "Spójność pliku bazy (tylko odczyt).")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    problems = db.check_integrity()
+    for problem in problems:
+        print(problem)
+    print(f"Problemy: {len(problems)}" if problems else "Spójność bazy: OK")
+    return 1 if problems else 0
+
+
+def _backup(argv: List[str]) -> int:
+    from logic.app_config import get_config
+    from logic.backup import BACKUP_PAGES, BACKUP_SLEEP_S, KEEP_BACKUPS, run_backup
+
+    parser = _db_parser("backup", "Kopia zapasowa online (backup API) z rotacją.")
+    parser.add_argument("--dir", default=None, help="katalog kopii (domyślnie z INI)")
+    parser.add_argument("--keep", type=int, default=KEEP_BACKUPS, help="ile kopii")
+    parser.add_argument("--pages", type=int, default=BACKUP_PAGES, help="stron/porcję")
+    parser.add_argument(
+        "--sleep", type=float, default=BACKUP_SLEEP_S, help="przerwa po porcji (s)"
+    )
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    backup_dir = args.dir or get_config().backup_dir
+    result = run_backup(db, backup_dir, args.keep, pages=args.pages, sleep=args.sleep)
+    if not result.ok:
+        print(f"Kopia niespójna: {'; '.join(result.problems)}")
+        return 1
+    print(f"Kopia {result.path}: {result.pages} stron, {result.seconds:.2f} s")
+    return 0
+
+
+def _generate(argv: List[str]) -> int:
+    from logic.sample_data import generate_sample_data
+
+    parser = _db_parser("generate", "Dane przykładowe (produkty, dostawy, serie).")
+    parser.add_argument("--batches", type=int, default=200, help="liczba serii")
+    parser.add_argument(
+        "--start",
+        type=datetime.date.fromisoformat,
+        default=None,
+        help="data pierwszej serii YYYY-MM-DD",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="ziarno losowania")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    counts = generate_sample_data(db, args.batches, args.start, args.seed)
+    print(f"Dodano {counts['batches']} serii i {counts['receipts']} dostaw")
+    return 0
+
+
+def _delegate(module: str) -> Callable[[List[str]], int]:
+    """Polecenie z istniejącego skryptu database/<moduł>.py (jego main(argv))."""
+
+    def run(argv: List[str]) -> int:
+        return importlib.import_module(module).main(argv)
+
+    return run
+
+
+# polecenie -> (funkcja(argv) -> kod wyjścia, opis)
+COMMANDS: Dict[str, Tuple[Callable[[List[str]], int], str]] = {
+    "import": (_delegate("database.import_file"), "import masowy .xlsx / .csv"),
+    "export": (_delegate("database.export_xlsx"), "eksport do .xlsx"),
+    "trace": (_delegate("database.trace"), "genealogia partia <-> seria"),
+    "report": (_report, "raport do CSV"),
+    "rebuild": (_rebuild, "przeliczenie tabel pochodnych"),
+    "maintain": (_maintain, "ANALYZE, PRAGMA optimize, wolne strony"),
+    "check": (_check, "spójność pliku bazy"),
+    "backup": (_backup, "kopia zapasowa z rotacją"),
+    "generate": (_generate, "dane przykładowe"),
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog=PROG,
+        description="Serownia bez GUI.",
+        epilog="\n".join(f"  {name:9} {help}" for name, (_, help) in COMMANDS.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=list(COMMANDS), metavar="polecenie")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="opcje polecenia")
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command][0](args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
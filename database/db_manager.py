@@ -1,6 +1,20 @@
+import itertools
+import logging
 import sqlite3
 import os
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple
+
+from logic.app_config import get_config
+from logic.protocol_types import (
+    ProtocolType,
+    details_table_types,
+    get_protocol_type,
+    parse_number,
+)
+from logic.utils import batch_totals, to_base_quantity, to_base_unit_price
+
+logger = logging.getLogger(__name__)
 
 
 class DBManager:
@@ -8,31 +22,78 @@ class DBManager:
     Klasa odpowiedzialna za zarządzanie bazą danych (SQLite).
     Utrzymuje ścieżkę do pliku bazy, tworzy połączenia i udostępnia metody
     CRUD dla różnych tabel (users, additives, products, packaging, etc.).
+
+    db_path: ścieżka pliku (domyślnie z logic/app_config.py), URI SQLite
+    ("file:...", otwierane z uri=True) albo MEMORY_DB – wtedy baza w pamięci
+    jest klonem (backup API) szablonu zbudowanego raz na proces przez
+    create_tables: gotowe tabele, triggery i dane startowe bez migracji.
+    Baza w pamięci żyje, dopóki żyje obiekt DBManager (połączenie _keeper);
+    współdzielona pamięć podręczna => blokady na poziomie tabel, bez
+    oczekiwania (do testów i prób, nie do pracy wielowątkowej).
     """
 
+    MEMORY_DB = ":memory:"
+
+    # Szablon bazy w pamięci (wspólny dla procesu) i numeracja klonów
+    _template: Optional[sqlite3.Connection] = None
+    _template_lock = threading.Lock()
+    _memory_ids = itertools.count(1)
+
     def __init__(self, db_path: Optional[str] = None) -> None:
         if db_path is None:
-            self.db_path = r"c:\serownia\serownia.db"
+            self.db_path = get_config().db_path
         else:
             self.db_path = db_path
+        self._keeper: Optional[sqlite3.Connection] = None
+
+        if self.db_path == self.MEMORY_DB:
+            self.db_path, self._keeper = self._open_memory_db()
+            self._memory_template().backup(self._keeper)
+            logger.debug("DBManager: baza w pamięci %s (klon szablonu)", self.db_path)
+        else:
+            abs_path = os.path.abspath(self.db_path)
+            logger.info("DBManager używa pliku: %s (%s)", self.db_path, abs_path)
+
+        # Zapytanie "otwórz protokół" budowane raz (patrz _get_protocol_bundle_sql)
+        self._protocol_bundle_sql: Optional[str] = None
+        self._protocol_bundle_tables: List[tuple] = []
+        # Zapytania INSERT/UPDATE/SELECT szczegółów protokołu: {(tabela, operacja): sql}
+        self._protocol_sql: Dict[Tuple[str, str], str] = {}
 
-        abs_path = os.path.abspath(self.db_path)
-        print(f"=== DBManager używa pliku: {self.db_path}")
-        print(f"=== Absolutna ścieżka   : {abs_path}")
+        # Inicjalizacja bazy (tworzenie tabel, wstawianie danych początkowych);
+        # klon szablonu w pamięci ma je już gotowe
+        if self._keeper is None:
+            self.setup_database()
 
-        # Inicjalizacja bazy (tworzenie tabel, wstawianie danych początkowych)
-        self.setup_database()
+    @classmethod
+    def _open_memory_db(cls) -> Tuple[str, sqlite3.Connection]:
+        """Nowa pusta baza w pamięci: (URI, połączenie, które ją utrzymuje)."""
+        uri = (
+            f"file:serownia-{os.getpid()}-{next(cls._memory_ids)}"
+            "?mode=memory&cache=shared"
+        )
+        return uri, sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    @classmethod
+    def _memory_template(cls) -> sqlite3.Connection:
+        """Szablon bazy w pamięci po create_tables – budowany raz na proces."""
+        with cls._template_lock:
+            if cls._template is None:
+                uri, keeper = cls._open_memory_db()
+                cls(db_path=uri)  # create_tables na bazie szablonu
+                cls._template = keeper
+            return cls._template
 
     def create_connection(self) -> sqlite3.Connection:
         """
         Tworzy i zwraca połączenie do bazy SQLite,
         z włączonym wsparciem kluczy obcych (PRAGMA foreign_keys=ON).
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self.db_path.startswith("file:"))
         try:
             conn.execute("PRAGMA foreign_keys = ON")
         except sqlite3.Error as e:
-            print(f"Błąd podczas włączania kluczy obcych: {e}")
+            logger.error("Błąd podczas włączania kluczy obcych: %s", e)
         return conn
 
     def setup_database(self) -> None:
@@ -47,6 +108,10 @@ class DBManager:
         with self.create_connection() as conn:
             cursor = conn.cursor()
             try:
+                # Nowy plik: wolne strony zwalniane porcjami (incremental_vacuum);
+                # istniejący plik przełącza dopiero enable_incremental_vacuum
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
                 # -------------------- Użytkownicy --------------------
                 cursor.execute(
                     """
@@ -152,10 +217,32 @@ class DBManager:
                         date TEXT,
                         quantity TEXT,
                         additive_id INTEGER,
+                        qty REAL,
+                        expiry_date TEXT,
+                        remaining REAL,
+                        price TEXT,
+                        unit_price REAL,
+                        lot_no TEXT,
                         FOREIGN KEY (additive_id) REFERENCES additives(id)
                     )
                 """
                 )
+                # qty = ilość przyjęta w jednostce bazowej (g/ml/szt.) – podstawa stanu;
+                # każdy wpis to partia dostawy: remaining = ile z niej jeszcze zostało;
+                # price = cena jak wpisana, unit_price = zł za jednostkę bazową;
+                # lot_no = numer partii dostawcy
+                lots_added = "remaining" in self._add_missing_columns(
+                    cursor,
+                    "additives_register",
+                    {
+                        "qty": "REAL",
+                        "expiry_date": "TEXT",
+                        "remaining": "REAL",
+                        "price": "TEXT",
+                        "unit_price": "REAL",
+                        "lot_no": "TEXT",
+                    },
+                )
 
                 # -------------------- Rejestr Opakowań --------------------
                 cursor.execute(
@@ -165,10 +252,66 @@ class DBManager:
                         date TEXT,
                         quantity TEXT,
                         packaging_id INTEGER,
+                        qty REAL,
+                        price TEXT,
+                        unit_price REAL,
+                        expiry_date TEXT,
+                        lot_no TEXT,
                         FOREIGN KEY (packaging_id) REFERENCES packaging(id)
                     )
                 """
                 )
+                self._add_missing_columns(
+                    cursor,
+                    "packaging_register",
+                    {
+                        "qty": "REAL",
+                        "price": "TEXT",
+                        "unit_price": "REAL",
+                        "expiry_date": "TEXT",
+                        "lot_no": "TEXT",
+                    },
+                )
+
+                # -------------------- Ceny mleka (zł / L od dnia, wg rodzaju) --------------------
+                # milk_type = '' => cena dla każdego rodzaju bez własnej ceny
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS milk_prices (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        valid_from TEXT NOT NULL,
+                        milk_type TEXT NOT NULL DEFAULT '',
+                        price_l REAL NOT NULL
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_milk_prices_type_date
+                    ON milk_prices (milk_type, valid_from)
+                """
+                )
+
+                # -------------------- Plan produkcji (serie planowane) --------------------
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS production_plan (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        date TEXT NOT NULL,
+                        product_id INTEGER NOT NULL,
+                        milk_l REAL NOT NULL,
+                        note TEXT NOT NULL DEFAULT '',
+                        FOREIGN KEY (product_id) REFERENCES products(id)
+                            ON DELETE CASCADE
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_production_plan_date
+                    ON production_plan (date)
+                """
+                )
 
                 # -------------------- Tabela production_records --------------------
                 cursor.execute(
@@ -178,41 +321,76 @@ class DBManager:
                         date TEXT NOT NULL,
                         series TEXT NOT NULL,
                         product_id INTEGER,
+                        total_weight_kg REAL,
+                        yield_pct REAL,
+                        milk_l REAL,
+                        milk_type TEXT,
+                        cost_milk REAL,
+                        cost_additives REAL,
+                        cost_packaging REAL,
                         FOREIGN KEY (product_id) REFERENCES products(id)
                     )
                 """
                 )
+                # Starsze bazy: suma wagi partii, wydajność, ilość i rodzaj mleka
+                # oraz koszty serii (zł) liczone przy zapisie protokołu
+                record_columns_added = self._add_missing_columns(
+                    cursor,
+                    "production_records",
+                    {
+                        "total_weight_kg": "REAL",
+                        "yield_pct": "REAL",
+                        "milk_l": "REAL",
+                        "milk_type": "TEXT",
+                        "cost_milk": "REAL",
+                        "cost_additives": "REAL",
+                        "cost_packaging": "REAL",
+                    },
+                )
+                milk_added = "milk_l" in record_columns_added
+                milk_type_added = "milk_type" in record_columns_added
+                costs_added = "cost_milk" in record_columns_added
 
-                # -------------------- ser_production_details --------------------
-                #
-                # Uwaga: w bazie muszą istnieć kolumny dopasowane do 9 (czy nawet 6-8)
-                # czynności, np.:
-                #   dodanie_kultur_godzina, dodanie_kultur_czas, ...
-                #   => tego tu nie widzimy – więc dodałem tylko kolumny, które
-                #   były do tej pory, plus nowo wstawione (serwatka_plus, woda_minus,
-                #   temp_poczatkowa, temp_koncowa).
-                #
+                # -------------------- Partie (ewidencja partii z serii) --------------------
                 cursor.execute(
                     """
-                    CREATE TABLE IF NOT EXISTS ser_production_details (
+                    CREATE TABLE IF NOT EXISTS production_parties (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         production_record_id INTEGER NOT NULL,
-                        milk_amount TEXT,
-                        ph TEXT,
-                        krojenie_start TEXT,
-                        krojenie_end TEXT,
-                        plukanie_start TEXT,
-                        plukanie_end TEXT,
-                        dogrzewanie_start TEXT,
-                        dogrzewanie_end TEXT,
-                        serwatka_plus TEXT,
-                        woda_minus TEXT,
-                        temp_poczatkowa TEXT,
-                        temp_koncowa TEXT,
+                        party_no INTEGER NOT NULL,
+                        party_code TEXT,
+                        weight_kg REAL,
+                        comment TEXT,
                         FOREIGN KEY (production_record_id) REFERENCES production_records(id)
                     )
                 """
                 )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_production_parties_record
+                    ON production_parties (production_record_id, party_no)
+                """
+                )
+
+                # -------------------- Opakowania zużyte w protokole --------------------
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS production_packaging (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        production_record_id INTEGER NOT NULL,
+                        packaging_id INTEGER NOT NULL,
+                        qty REAL,
+                        FOREIGN KEY (production_record_id) REFERENCES production_records(id),
+                        FOREIGN KEY (packaging_id) REFERENCES packaging(id)
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_production_packaging_record
+                    ON production_packaging (production_record_id)
+                """
+                )
 
                 # -------------------- ser_production_additives --------------------
                 #
@@ -228,10 +406,147 @@ class DBManager:
                         additive_category TEXT,
                         additive_name TEXT,
                         dose_calculated TEXT,
+                        additive_id INTEGER,
+                        qty REAL,
                         FOREIGN KEY (production_record_id) REFERENCES production_records(id)
                     )
                 """
                 )
+                # additive_id + qty (jednostka bazowa) – zużycie do stanu magazynu dodatków
+                self._add_missing_columns(
+                    cursor,
+                    "ser_production_additives",
+                    {"additive_id": "INTEGER", "qty": "REAL"},
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_ser_production_additives_record
+                    ON ser_production_additives (production_record_id)
+                """
+                )
+
+                # -------------------- Rozchód dodatków z partii dostaw (FEFO) --------------------
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS additive_lot_allocations (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        production_additive_id INTEGER NOT NULL,
+                        register_id INTEGER NOT NULL,
+                        qty REAL NOT NULL,
+                        FOREIGN KEY (production_additive_id) REFERENCES ser_production_additives(id),
+                        FOREIGN KEY (register_id) REFERENCES additives_register(id)
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_additive_lot_allocations_line
+                    ON additive_lot_allocations (production_additive_id)
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_additive_lot_allocations_lot
+                    ON additive_lot_allocations (register_id)
+                """
+                )
+                # -------------------- Genealogia: partia dostawy <-> seria --------------------
+                # Zbiorczo z additive_lot_allocations, odświeżane przy zapisie protokołu;
+                # klucz (partia, protokół) + indeks odwrotny => wycofanie w obie strony.
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master"
+                    " WHERE type = 'table' AND name = 'lot_series_links'"
+                )
+                links_new = cursor.fetchone() is None
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS lot_series_links (
+                        register_id INTEGER NOT NULL,
+                        production_record_id INTEGER NOT NULL,
+                        qty REAL NOT NULL,
+                        PRIMARY KEY (register_id, production_record_id)
+                    ) WITHOUT ROWID
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_lot_series_links_record
+                    ON lot_series_links (production_record_id, register_id)
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_production_records_series
+                    ON production_records (series)
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_production_records_date
+                    ON production_records (date)
+                """
+                )
+                if links_new:
+                    cursor.execute(self._LOT_LINKS_INSERT_SQL.format(where=""))
+
+                # Kolejka otwartych partii dodatku: najpierw najkrótsza data ważności,
+                # partie bez daty na końcu, dalej FIFO po dacie przyjęcia (_LOT_QUEUE_SQL);
+                # remaining w indeksie => filtr dat i odczyt bez sięgania do tabeli
+                cursor.execute("DROP INDEX IF EXISTS idx_additives_register_open_lots")
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_additives_register_lot_queue
+                    ON additives_register (
+                        additive_id, expiry_date IS NULL, expiry_date, date, id,
+                        remaining
+                    )
+                    WHERE remaining > 0
+                """
+                )
+                # Alerty terminów ważności: zakres po dacie ważności, tylko partie
+                # otwarte (dodatki) / z datą (opakowania) – patrz get_expiring_lots
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_additives_register_expiry
+                    ON additives_register (expiry_date)
+                    WHERE remaining > 0 AND expiry_date IS NOT NULL
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_packaging_register_expiry
+                    ON packaging_register (expiry_date)
+                    WHERE expiry_date IS NOT NULL
+                """
+                )
+
+                # -------------------- Szczegóły protokołów (z definicji typów) --------------------
+                # ser_/twarog_/fermented_/generic_production_details – patrz logic/protocol_types.py
+                self.ensure_protocol_tables(cursor)
+
+                # -------------------- Stany magazynowe (dodatki, opakowania) --------------------
+                self.ensure_stock_ledgers(cursor)
+                if lots_added:
+                    self._rebuild_lot_allocations(cursor)
+
+                # -------------------- Podsumowania miesięczne produkcji --------------------
+                if milk_added:
+                    self._backfill_milk_liters(cursor)
+                if milk_type_added:
+                    self._backfill_milk_type(cursor)
+                self.ensure_unit_price_views(cursor)
+                if costs_added:
+                    self._recompute_batch_costs(cursor)
+                self.ensure_production_summary(cursor)
+
+                # -------------------- Dzienne zużycie dodatków (prognozy) --------------------
+                self.ensure_additive_daily_usage(cursor)
+
+                # -------------------- SPC: statystyki parametrów procesu --------------------
+                self.ensure_spc_stats(cursor)
+
+                # -------------------- Wersje danych (unieważnianie cache) --------------------
+                self.ensure_table_versions(cursor)
 
                 # --- Dane startowe: kategorie dodatków (tabela categories) ---
                 initial_categories = [
@@ -282,7 +597,7 @@ class DBManager:
                 conn.commit()
 
             except sqlite3.Error as e:
-                print(f"Błąd przy tworzeniu tabel: {e}")
+                logger.error("Błąd przy tworzeniu tabel: %s", e)
                 conn.rollback()
 
     # ----------------------------------------------------------------
@@ -301,7 +616,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu użytkownika: {e}")
+            logger.error("Błąd przy dodawaniu użytkownika: %s", e)
 
     def verify_user(self, username: str, password: str) -> bool:
         try:
@@ -317,7 +632,7 @@ class DBManager:
                 row = cursor.fetchone()
                 return row is not None
         except sqlite3.Error as e:
-            print(f"Błąd przy weryfikacji użytkownika: {e}")
+            logger.error("Błąd przy weryfikacji użytkownika: %s", e)
             return False
 
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
@@ -337,7 +652,7 @@ class DBManager:
                     return {"id": row[0], "username": row[1], "password": row[2]}
                 return None
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu użytkownika: {e}")
+            logger.error("Błąd przy pobieraniu użytkownika: %s", e)
             return None
 
     def update_user_password(self, username: str, new_password: str) -> None:
@@ -354,7 +669,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji hasła użytkownika: {e}")
+            logger.error("Błąd przy aktualizacji hasła użytkownika: %s", e)
 
     # ----------------------------------------------------------------
     # ----------------- KATEGORIE DODATKÓW (CRUD) --------------------
@@ -371,7 +686,7 @@ class DBManager:
                 rows = cursor.fetchall()
                 return [{"id": row[0], "name": row[1]} for row in rows]
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu kategorii: {e}")
+            logger.error("Błąd przy pobieraniu kategorii: %s", e)
             return []
 
     def get_additive_categories(self) -> List[Dict[str, Any]]:
@@ -392,7 +707,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu kategorii: {e}")
+            logger.error("Błąd przy dodawaniu kategorii: %s", e)
 
     def update_category(self, category_id: int, new_name: str) -> None:
         try:
@@ -408,7 +723,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji kategorii: {e}")
+            logger.error("Błąd przy aktualizacji kategorii: %s", e)
 
     def delete_category(self, category_id: int) -> None:
         try:
@@ -417,7 +732,7 @@ class DBManager:
                 cursor.execute("DELETE FROM categories WHERE id=?", (category_id,))
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu kategorii: {e}")
+            logger.error("Błąd przy usuwaniu kategorii: %s", e)
 
     # ----------------------------------------------------------------
     # ---------------------- DODATKI (CRUD) --------------------------
@@ -446,7 +761,7 @@ class DBManager:
                     )
                 return result
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu dodatków: {e}")
+            logger.error("Błąd przy pobieraniu dodatków: %s", e)
             return []
 
     def add_additive(
@@ -464,7 +779,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu dodatku: {e}")
+            logger.error("Błąd przy dodawaniu dodatku: %s", e)
 
     def delete_additive(self, additive_id: int) -> None:
         try:
@@ -473,7 +788,7 @@ class DBManager:
                 cursor.execute("DELETE FROM additives WHERE id=?", (additive_id,))
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu dodatku: {e}")
+            logger.error("Błąd przy usuwaniu dodatku: %s", e)
 
     def update_additive(
         self, additive_id: int, name: str, weight: str, dosage: str, category_id: int
@@ -491,7 +806,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji dodatku: {e}")
+            logger.error("Błąd przy aktualizacji dodatku: %s", e)
 
     # ----------------------------------------------------------------
     # ------------------ KATEGORIE PRODUKTÓW (CRUD) ------------------
@@ -504,7 +819,7 @@ class DBManager:
                 rows = cursor.fetchall()
                 return [{"id": row[0], "name": row[1]} for row in rows]
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu kategorii produktów: {e}")
+            logger.error("Błąd przy pobieraniu kategorii produktów: %s", e)
             return []
 
     def add_product_category(self, name: str) -> None:
@@ -519,10 +834,10 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.IntegrityError:
-            print(f"[WARN] Próba dodania zduplikowanej kategorii produktu: '{name}'")
+            logger.warning("Próba dodania zduplikowanej kategorii produktu: '%s'", name)
             raise
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu kategorii produktu: {e}")
+            logger.error("Błąd przy dodawaniu kategorii produktu: %s", e)
 
     def update_product_category(self, category_id: int, new_name: str) -> None:
         try:
@@ -538,10 +853,12 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.IntegrityError:
-            print(f"[WARN] Próba zmiany nazwy kategorii na zduplikowaną: '{new_name}'")
+            logger.warning(
+                "Próba zmiany nazwy kategorii na zduplikowaną: '%s'", new_name
+            )
             raise
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji kategorii produktu: {e}")
+            logger.error("Błąd przy aktualizacji kategorii produktu: %s", e)
 
     def delete_product_category(self, category_id: int) -> None:
         try:
@@ -552,7 +869,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu kategorii produktu: {e}")
+            logger.error("Błąd przy usuwaniu kategorii produktu: %s", e)
 
     # ----------------------------------------------------------------
     # ----------------------- PRODUKTY (CRUD) ------------------------
@@ -581,7 +898,32 @@ class DBManager:
                     )
                 return result
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu produktów: {e}")
+            logger.error("Błąd przy pobieraniu produktów: %s", e)
+            return []
+
+    def get_products_by_category_name(self, category_name: str) -> List[Dict[str, Any]]:
+        """
+        Zwraca produkty (id, name) z kategorii o podanej nazwie (case-insensitive),
+        jednym zapytaniem z JOIN-em – bez pobierania listy kategorii dla każdego produktu.
+        """
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT p.id, p.name
+                      FROM products p
+                      JOIN product_categories pc ON p.category_id = pc.id
+                     WHERE LOWER(pc.name) = LOWER(?)
+                     ORDER BY p.id
+                """,
+                    (category_name,),
+                )
+                return [{"id": row[0], "name": row[1]} for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(
+                "Błąd przy pobieraniu produktów kategorii '%s': %s", category_name, e
+            )
             return []
 
     def add_product(
@@ -608,7 +950,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu produktu: {e}")
+            logger.error("Błąd przy dodawaniu produktu: %s", e)
 
     def update_product(
         self,
@@ -637,7 +979,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji produktu: {e}")
+            logger.error("Błąd przy aktualizacji produktu: %s", e)
 
     def delete_product(self, product_id: int) -> None:
         try:
@@ -646,7 +988,7 @@ class DBManager:
                 cursor.execute("DELETE FROM products WHERE id=?", (product_id,))
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu produktu: {e}")
+            logger.error("Błąd przy usuwaniu produktu: %s", e)
 
     # ----------------------------------------------------------------
     # --------------- product_additives (RELACJA PRODUKT-DODATEK) ----
@@ -681,7 +1023,7 @@ class DBManager:
                     )
                 return result
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu relacji product_additives: {e}")
+            logger.error("Błąd przy pobieraniu relacji product_additives: %s", e)
             return []
 
     def get_product_additives_join(self, product_id: int) -> List[Dict[str, Any]]:
@@ -717,7 +1059,46 @@ class DBManager:
                     )
                 return result
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu relacji product_additives (JOIN): {e}")
+            logger.error("Błąd przy pobieraniu relacji product_additives (JOIN): %s", e)
+            return []
+
+    def get_product_recipe_lines(self, product_id: int) -> List[Dict[str, Any]]:
+        """
+        Receptura produktu w JEDNYM zapytaniu: product_additives + additives + categories.
+        Zwraca listę słowników z kluczami:
+          additive_id, additive_name, category_name, dosage_per_100.
+        (Zastępuje pętlę get_product_additives -> get_additive_by_id -> get_categories.)
+        """
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT a.id,
+                           a.name,
+                           COALESCE(c.name, ''),
+                           pa.dosage_per_100
+                      FROM product_additives pa
+                      JOIN additives a ON pa.additive_id = a.id
+                      LEFT JOIN categories c ON a.category_id = c.id
+                     WHERE pa.product_id = ?
+                     ORDER BY pa.id
+                """,
+                    (product_id,),
+                )
+                return [
+                    {
+                        "additive_id": row[0],
+                        "additive_name": row[1],
+                        "category_name": row[2],
+                        "dosage_per_100": row[3] or "",
+                    }
+                    for row in cursor.fetchall()
+                ]
+        except sqlite3.Error as e:
+            logger.error(
+                "Błąd przy pobieraniu receptury produktu (id=%s): %s", product_id, e
+            )
             return []
 
     def add_product_additive(
@@ -735,7 +1116,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu wpisu w product_additives: {e}")
+            logger.error("Błąd przy dodawaniu wpisu w product_additives: %s", e)
 
     def update_product_additive(self, pa_id: int, new_dosage: str) -> None:
         try:
@@ -751,7 +1132,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji wpisu w product_additives: {e}")
+            logger.error("Błąd przy aktualizacji wpisu w product_additives: %s", e)
 
     def delete_product_additive(self, pa_id: int) -> None:
         try:
@@ -760,7 +1141,7 @@ class DBManager:
                 cursor.execute("DELETE FROM product_additives WHERE id=?", (pa_id,))
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu wpisu w product_additives: {e}")
+            logger.error("Błąd przy usuwaniu wpisu w product_additives: %s", e)
 
     def update_product_additive_full(
         self, pa_id: int, new_additive_id: int, new_dosage: str
@@ -778,7 +1159,9 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji product_additives (pa_id={pa_id}): {e}")
+            logger.error(
+                "Błąd przy aktualizacji product_additives (pa_id=%s): %s", pa_id, e
+            )
 
     # ----------------------------------------------------------------
     # ------------------ KATEGORIE OPAKOWAŃ (CRUD) -------------------
@@ -791,7 +1174,7 @@ class DBManager:
                 rows = cursor.fetchall()
                 return [{"id": row[0], "name": row[1]} for row in rows]
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu kategorii opakowań: {e}")
+            logger.error("Błąd przy pobieraniu kategorii opakowań: %s", e)
             return []
 
     def add_packaging_category(self, name: str) -> None:
@@ -806,7 +1189,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu kategorii opakowania: {e}")
+            logger.error("Błąd przy dodawaniu kategorii opakowania: %s", e)
 
     def update_packaging_category(self, category_id: int, new_name: str) -> None:
         try:
@@ -822,7 +1205,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji kategorii opakowania: {e}")
+            logger.error("Błąd przy aktualizacji kategorii opakowania: %s", e)
 
     def delete_packaging_category(self, category_id: int) -> None:
         try:
@@ -833,7 +1216,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu kategorii opakowania: {e}")
+            logger.error("Błąd przy usuwaniu kategorii opakowania: %s", e)
 
     # ----------------------------------------------------------------
     # ---------------------- OPAKOWANIA (CRUD) -----------------------
@@ -862,7 +1245,7 @@ class DBManager:
                     )
                 return result
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu opakowań: {e}")
+            logger.error("Błąd przy pobieraniu opakowań: %s", e)
             return []
 
     def add_packaging(
@@ -880,7 +1263,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu opakowania: {e}")
+            logger.error("Błąd przy dodawaniu opakowania: %s", e)
 
     def update_packaging(
         self, packaging_id: int, name: str, quantity: str, date: str, category_id: int
@@ -898,7 +1281,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji opakowania: {e}")
+            logger.error("Błąd przy aktualizacji opakowania: %s", e)
 
     def delete_packaging(self, packaging_id: int) -> None:
         try:
@@ -907,27 +1290,55 @@ class DBManager:
                 cursor.execute("DELETE FROM packaging WHERE id=?", (packaging_id,))
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu opakowania: {e}")
+            logger.error("Błąd przy usuwaniu opakowania: %s", e)
 
     # ----------------------------------------------------------------
     # -------------------- REJESTR OPAKOWAŃ --------------------------
     # ----------------------------------------------------------------
     def add_packaging_register(
-        self, date: str, quantity: str, packaging_id: int
+        self,
+        date: str,
+        quantity: str,
+        packaging_id: int,
+        price: Optional[str] = None,
+        expiry_date: Optional[str] = None,
+        lot_no: Optional[str] = None,
     ) -> None:
+        """
+        Przyjęcie opakowań; price – cena dostawy (np. "0,85/szt"),
+        expiry_date / lot_no – termin ważności i numer partii dostawcy.
+        """
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    INSERT INTO packaging_register (date, quantity, packaging_id)
-                    VALUES (?, ?, ?)
+                    INSERT INTO packaging_register (
+                        date, quantity, packaging_id, qty, price, unit_price,
+                        expiry_date, lot_no
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                    (date, quantity, packaging_id),
+                    (
+                        date,
+                        quantity,
+                        packaging_id,
+                        to_base_quantity(quantity),
+                        price or None,
+                        to_base_unit_price(price, quantity),
+                        expiry_date or None,
+                        lot_no or None,
+                    ),
                 )
+                if price:
+                    self._recompute_batch_costs(
+                        cursor,
+                        self._PACKAGING_COST_WHERE,
+                        (packaging_id, packaging_id),
+                    )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu do rejestru opakowań: {e}")
+            logger.error("Błąd przy dodawaniu do rejestru opakowań: %s", e)
 
     def get_all_packaging_register(self) -> List[Dict[str, Any]]:
         try:
@@ -935,7 +1346,8 @@ class DBManager:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    SELECT pr.id, pr.date, pr.quantity, pr.packaging_id, p.name
+                    SELECT pr.id, pr.date, pr.quantity, pr.packaging_id, p.name,
+                           pr.price, pr.expiry_date, pr.lot_no
                     FROM packaging_register pr
                     LEFT JOIN packaging p ON pr.packaging_id = p.id
                 """
@@ -950,61 +1362,129 @@ class DBManager:
                             "quantity": row[2],
                             "packaging_id": row[3],
                             "packaging_name": row[4],
+                            "price": row[5],
+                            "expiry_date": row[6],
+                            "lot_no": row[7],
                         }
                     )
                 return result
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu rejestru opakowań: {e}")
+            logger.error("Błąd przy pobieraniu rejestru opakowań: %s", e)
             return []
 
     def update_packaging_register(
-        self, register_id: int, date_str: str, quantity_str: str, packaging_id: int
+        self,
+        register_id: int,
+        date_str: str,
+        quantity_str: str,
+        packaging_id: int,
+        price: Optional[str] = None,
+        expiry_date: Optional[str] = None,
+        lot_no: Optional[str] = None,
     ) -> None:
+        """Edycja przyjęcia; koszty serii z tym opakowaniem liczone na nowo."""
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
+                old = cursor.execute(
+                    "SELECT packaging_id FROM packaging_register WHERE id=?",
+                    (register_id,),
+                ).fetchone()
                 cursor.execute(
                     """
                     UPDATE packaging_register
-                    SET date=?, quantity=?, packaging_id=?
+                    SET date=?, quantity=?, packaging_id=?, qty=?, price=?,
+                        unit_price=?, expiry_date=?, lot_no=?
                     WHERE id=?
                 """,
-                    (date_str, quantity_str, packaging_id, register_id),
+                    (
+                        date_str,
+                        quantity_str,
+                        packaging_id,
+                        to_base_quantity(quantity_str),
+                        price or None,
+                        to_base_unit_price(price, quantity_str),
+                        expiry_date or None,
+                        lot_no or None,
+                        register_id,
+                    ),
+                )
+                self._recompute_batch_costs(
+                    cursor,
+                    self._PACKAGING_COST_WHERE,
+                    (old[0] if old else packaging_id, packaging_id),
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji rejestru opakowań: {e}")
+            logger.error("Błąd przy aktualizacji rejestru opakowań: %s", e)
 
     def delete_packaging_register(self, register_id: int) -> None:
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
+                row = cursor.execute(
+                    "SELECT packaging_id FROM packaging_register WHERE id=?", (register_id,)
+                ).fetchone()
                 cursor.execute(
                     "DELETE FROM packaging_register WHERE id=?", (register_id,)
                 )
+                if row is not None:
+                    self._recompute_batch_costs(
+                        cursor, self._PACKAGING_COST_WHERE, (row[0], row[0])
+                    )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu z rejestru opakowań: {e}")
+            logger.error("Błąd przy usuwaniu z rejestru opakowań: %s", e)
 
     # ----------------------------------------------------------------
     # -------------------- REJESTR DODATKÓW --------------------------
     # ----------------------------------------------------------------
     def add_additive_register(
-        self, date_str: str, quantity_str: str, additive_id: int
+        self,
+        date_str: str,
+        quantity_str: str,
+        additive_id: int,
+        expiry_date: Optional[str] = None,
+        price: Optional[str] = None,
+        lot_no: Optional[str] = None,
     ) -> None:
+        """
+        Nowa partia dostawy dodatku (remaining = cała przyjęta ilość);
+        price – cena dostawy ("45 zł/kg", "45" => za jednostkę ilości),
+        lot_no – numer partii dostawcy.
+        """
+        qty = to_base_quantity(quantity_str)
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    INSERT INTO additives_register (date, quantity, additive_id)
-                    VALUES (?, ?, ?)
+                    INSERT INTO additives_register (
+                        date, quantity, additive_id, qty, expiry_date, remaining,
+                        price, unit_price, lot_no
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                    (date_str, quantity_str, additive_id),
+                    (
+                        date_str,
+                        quantity_str,
+                        additive_id,
+                        qty,
+                        expiry_date or None,
+                        qty,
+                        price or None,
+                        to_base_unit_price(price, quantity_str),
+                        lot_no or None,
+                    ),
                 )
+                if price:
+                    # średnia cena dodatku się zmienia (części bez partii)
+                    self._recompute_batch_costs(
+                        cursor, self._ADDITIVE_COST_WHERE, (additive_id, additive_id)
+                    )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu do rejestru dodatków: {e}")
+            logger.error("Błąd przy dodawaniu do rejestru dodatków: %s", e)
 
     def get_all_additives_register(self) -> List[Dict[str, Any]]:
         try:
@@ -1012,7 +1492,8 @@ class DBManager:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    SELECT ar.id, ar.date, ar.quantity, ar.additive_id, a.name
+                    SELECT ar.id, ar.date, ar.quantity, ar.additive_id, a.name,
+                           ar.expiry_date, ar.remaining, ar.price, ar.lot_no
                     FROM additives_register ar
                     LEFT JOIN additives a ON ar.additive_id = a.id
                 """
@@ -1027,64 +1508,2422 @@ class DBManager:
                             "quantity": row[2],
                             "additive_id": row[3],
                             "additive_name": row[4],
+                            "expiry_date": row[5],
+                            "remaining": row[6],
+                            "price": row[7],
+                            "lot_no": row[8],
                         }
                     )
                 return result
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu rejestru dodatków: {e}")
+            logger.error("Błąd przy pobieraniu rejestru dodatków: %s", e)
             return []
 
+    @staticmethod
+    def _lot_consumers(
+        cursor: sqlite3.Cursor, register_id: int
+    ) -> List[Tuple[str, str, float]]:
+        """(seria, data protokołu, ilość) – protokoły rozchodowane z partii."""
+        return cursor.execute(
+            """
+            SELECT pr.series, pr.date, SUM(al.qty)
+              FROM additive_lot_allocations al
+              JOIN ser_production_additives spa
+                ON spa.id = al.production_additive_id
+              JOIN production_records pr ON pr.id = spa.production_record_id
+             WHERE al.register_id = ?
+             GROUP BY pr.id
+             ORDER BY pr.series
+        """,
+            (register_id,),
+        ).fetchall()
+
+    @staticmethod
+    def _series_list(consumers: List[Tuple[str, str, float]]) -> str:
+        return ", ".join(series for series, _date, _qty in consumers)
+
     def update_additive_register(
-        self, register_id: int, new_date: str, new_quantity: str, additive_id: int
+        self,
+        register_id: int,
+        new_date: str,
+        new_quantity: str,
+        additive_id: int,
+        expiry_date: Optional[str] = None,
+        price: Optional[str] = None,
+        lot_no: Optional[str] = None,
     ) -> None:
+        """
+        Edycja partii dostawy; remaining = nowa ilość - już rozchodowane.
+        Koszty serii z tym dodatkiem liczone na nowo (cena partii / średnia).
+        Partia rozchodowana w protokołach: zmiana dodatku, ilość poniżej
+        rozchodowanej albo daty wykluczające dzień protokołu => ValueError
+        (rozchód musi zgadzać się z partią). Błąd SQL => logowany i dalej.
+        """
+        qty = to_base_quantity(new_quantity)
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
+                old = cursor.execute(
+                    "SELECT additive_id FROM additives_register WHERE id=?",
+                    (register_id,),
+                ).fetchone()
+                consumers = self._lot_consumers(cursor, register_id)
+                if consumers:
+                    used = sum(q for _series, _date, q in consumers)
+                    dates = [d for _series, d, _qty in consumers]
+                    problem = None
+                    if old is not None and additive_id != old[0]:
+                        problem = "zmiana dodatku"
+                    elif qty is None or qty < used - 1e-9:
+                        problem = f"ilość mniejsza niż rozchodowana ({used:g})"
+                    elif new_date > min(dates):
+                        problem = "data przyjęcia po dacie protokołu"
+                    elif expiry_date and expiry_date < max(dates):
+                        problem = "data ważności przed datą protokołu"
+                    if problem:
+                        series = self._series_list(consumers)
+                        raise ValueError(
+                            f"Nie można zmienić dostawy – {problem}; partia "
+                            f"rozchodowana w protokołach: {series}"
+                        )
                 cursor.execute(
                     """
                     UPDATE additives_register
-                    SET date=?, quantity=?, additive_id=?
+                    SET date=?, quantity=?, additive_id=?, qty=?, expiry_date=?,
+                        remaining = ? - COALESCE(
+                            (SELECT SUM(qty) FROM additive_lot_allocations
+                              WHERE register_id = additives_register.id), 0),
+                        price=?, unit_price=?, lot_no=?
                     WHERE id=?
                 """,
-                    (new_date, new_quantity, additive_id, register_id),
+                    (
+                        new_date,
+                        new_quantity,
+                        additive_id,
+                        qty,
+                        expiry_date or None,
+                        qty,
+                        price or None,
+                        to_base_unit_price(price, new_quantity),
+                        lot_no or None,
+                        register_id,
+                    ),
+                )
+                self._recompute_batch_costs(
+                    cursor,
+                    self._ADDITIVE_COST_WHERE,
+                    (old[0] if old else additive_id, additive_id),
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji rejestru dodatków: {e}")
+            logger.error("Błąd przy aktualizacji rejestru dodatków: %s", e)
+            raise
 
     def delete_additive_register(self, register_id: int) -> None:
+        """
+        Usuwa dostawę z rejestru. Partii rozchodowanej w protokołach
+        (additive_lot_allocations) nie usuwamy – ValueError z seriami tych
+        protokołów; najpierw trzeba poprawić albo usunąć protokoły.
+        Błąd SQL => logowany i przekazywany dalej.
+        """
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
+                consumers = self._lot_consumers(cursor, register_id)
+                if consumers:
+                    raise ValueError(
+                        "Nie można usunąć dostawy – partia rozchodowana "
+                        f"w protokołach: {self._series_list(consumers)}"
+                    )
+                row = cursor.execute(
+                    "SELECT additive_id FROM additives_register WHERE id=?", (register_id,)
+                ).fetchone()
                 cursor.execute(
                     "DELETE FROM additives_register WHERE id=?", (register_id,)
                 )
+                if row is not None:
+                    self._recompute_batch_costs(
+                        cursor, self._ADDITIVE_COST_WHERE, (row[0], row[0])
+                    )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu z rejestru dodatków: {e}")
+            logger.error("Błąd przy usuwaniu z rejestru dodatków: %s", e)
+            raise
 
     # ----------------------------------------------------------------
-    # --------------- NOWA METODA: GET_ADDITIVE_BY_ID ---------------
+    # ------- STANY MAGAZYNOWE (additive_stock, packaging_stock) -----
     # ----------------------------------------------------------------
-    def get_additive_by_id(self, additive_id: int) -> Optional[Dict[str, Any]]:
+    # Jeden wiersz na dodatek / opakowanie: received (suma przyjęć z rejestru),
+    # consumed (suma zużycia w protokołach), w jednostce bazowej (g/ml/szt. –
+    # patrz logic/utils.py). Aktualizacja przez triggery na kolumnach qty
+    # tabel źródłowych – w tej samej transakcji co zapis, więc stan to odczyt
+    # jednego wiersza po kluczu.
+    # {tabela stanu: (kolumna klucza, tabela słownika, ((źródło, kolumna stanu), ...))}
+    _STOCK_LEDGERS = {
+        "additive_stock": (
+            "additive_id",
+            "additives",
+            (
+                ("additives_register", "received"),
+                ("ser_production_additives", "consumed"),
+            ),
+        ),
+        "packaging_stock": (
+            "packaging_id",
+            "packaging",
+            (
+                ("packaging_register", "received"),
+                ("production_packaging", "consumed"),
+            ),
+        ),
+    }
+
+    @staticmethod
+    def _stock_delta_sql(
+        stock_table: str, key: str, row: str, column: str, sign: str
+    ) -> str:
+        """UPSERT zmieniający <stock_table>.<column> o ±<row>.qty (NEW/OLD)."""
+        return f"""
+            INSERT INTO {stock_table} ({key}, {column}, updated_at)
+            SELECT {row}.{key}, {sign}{row}.qty, datetime('now', 'localtime')
+             WHERE {row}.{key} IS NOT NULL AND {row}.qty IS NOT NULL
+            ON CONFLICT ({key}) DO UPDATE
+               SET {column} = {column} + excluded.{column},
+                   updated_at = excluded.updated_at;
         """
-        Zwraca słownik z informacjami o danym dodatku (id, name, weight, dosage, category_id)
-        na podstawie jego ID, albo None, jeśli nie znaleziono wpisu w bazie.
+
+    def ensure_stock_ledgers(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Tworzy tabele stanów i triggery, uzupełnia qty/additive_id w starszych
+        wierszach (parsowanie tekstu), a przy pierwszym utworzeniu tabeli stanu
+        liczy ją od zera (_rebuild_stock).
+        """
+        self._backfill_stock_quantities(cursor)
+        for stock_table, (key, owner_table, sources) in self._STOCK_LEDGERS.items():
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (stock_table,),
+            )
+            is_new = cursor.fetchone() is None
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {stock_table} (
+                    {key} INTEGER PRIMARY KEY,
+                    received REAL NOT NULL DEFAULT 0,
+                    consumed REAL NOT NULL DEFAULT 0,
+                    updated_at TEXT
+                )
+            """
+            )
+            for table, column in sources:
+                cursor.execute(
+                    f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table}_{key.split("_")[0]}
+                    ON {table} ({key})
+                """
+                )
+                add = self._stock_delta_sql(stock_table, key, "NEW", column, "")
+                remove = self._stock_delta_sql(stock_table, key, "OLD", column, "-")
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_stock_ins
+                    AFTER INSERT ON {table}
+                    BEGIN {add} END
+                """
+                )
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_stock_del
+                    AFTER DELETE ON {table}
+                    BEGIN {remove} END
+                """
+                )
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_stock_upd
+                    AFTER UPDATE OF {key}, qty ON {table}
+                    BEGIN {remove} {add} END
+                """
+                )
+            cursor.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{owner_table}_stock_del
+                AFTER DELETE ON {owner_table}
+                BEGIN
+                    DELETE FROM {stock_table} WHERE {key} = OLD.id;
+                END
+            """
+            )
+            if is_new:
+                self._rebuild_stock(cursor, stock_table)
+
+    def _backfill_stock_quantities(self, cursor: sqlite3.Cursor) -> None:
         """
+        Migracja: wiersze sprzed kolumn qty/additive_id – dopasowanie dodatku
+        po nazwie (jedno UPDATE) i przeliczenie tekstu ilości/dawki na qty.
+        """
+        cursor.execute(
+            """
+            UPDATE ser_production_additives
+               SET additive_id = (
+                   SELECT MIN(a.id) FROM additives a
+                    WHERE a.name = ser_production_additives.additive_name
+               )
+             WHERE additive_id IS NULL AND additive_name IS NOT NULL
+        """
+        )
+        for table, text_column in (
+            ("additives_register", "quantity"),
+            ("packaging_register", "quantity"),
+            ("ser_production_additives", "dose_calculated"),
+        ):
+            cursor.execute(
+                f"SELECT id, {text_column} FROM {table}"
+                f" WHERE qty IS NULL AND TRIM(COALESCE({text_column}, '')) <> ''"
+            )
+            updates = [
+                (qty, row_id)
+                for row_id, text in cursor.fetchall()
+                if (qty := to_base_quantity(text)) is not None
+            ]
+            if updates:
+                logger.info(
+                    "Migracja: %s – przeliczono qty dla %d wierszy", table, len(updates)
+                )
+                cursor.executemany(f"UPDATE {table} SET qty = ? WHERE id = ?", updates)
+
+    def _computed_stock(
+        self, cursor: sqlite3.Cursor, stock_table: str
+    ) -> Dict[int, Tuple[float, float]]:
+        """Stany policzone od zera: {id: (received, consumed)} – jedno GROUP BY."""
+        key, _owner, sources = self._STOCK_LEDGERS[stock_table]
+        parts = [
+            f"SELECT {key} AS item_id,"
+            f" {'qty' if column == 'received' else '0'} AS received,"
+            f" {'qty' if column == 'consumed' else '0'} AS consumed"
+            f" FROM {table} WHERE {key} IS NOT NULL AND qty IS NOT NULL"
+            for table, column in sources
+        ]
+        cursor.execute(
+            "SELECT item_id, SUM(received), SUM(consumed) FROM ("
+            + " UNION ALL ".join(parts)
+            + ") GROUP BY item_id"
+        )
+        return {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+    def _rebuild_stock(
+        self, cursor: sqlite3.Cursor, stock_table: str
+    ) -> List[Dict[str, Any]]:
+        key = self._STOCK_LEDGERS[stock_table][0]
+        computed = self._computed_stock(cursor, stock_table)
+        cursor.execute(f"SELECT {key}, received, consumed FROM {stock_table}")
+        stored = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+        mismatches: List[Dict[str, Any]] = []
+        for item_id in sorted(set(computed) | set(stored)):
+            old = stored.get(item_id, (0.0, 0.0))
+            new = computed.get(item_id, (0.0, 0.0))
+            if any(abs(a - b) > 1e-6 for a, b in zip(old, new)):
+                mismatches.append(
+                    {
+                        key: item_id,
+                        "stored_balance": old[0] - old[1],
+                        "rebuilt_balance": new[0] - new[1],
+                    }
+                )
+
+        cursor.execute(f"DELETE FROM {stock_table}")
+        cursor.executemany(
+            f"""
+            INSERT INTO {stock_table} ({key}, received, consumed, updated_at)
+            VALUES (?, ?, ?, datetime('now', 'localtime'))
+        """,
+            [(item_id, rec, con) for item_id, (rec, con) in computed.items()],
+        )
+        return mismatches
+
+    def _rebuild_stock_ledger(self, stock_table: str) -> List[Dict[str, Any]]:
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(
+                self._backfill_stock_quantities(cursor)
+                mismatches = self._rebuild_stock(cursor, stock_table)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy przeliczaniu %s: %s", stock_table, e)
+            raise
+        if mismatches:
+            logger.warning("%s: %d rozbieżności poprawiono", stock_table, len(mismatches))
+        return mismatches
+
+    def rebuild_additive_stock(self) -> List[Dict[str, Any]]:
+        """
+        Pełne przeliczenie additive_stock od zera (jedno zapytanie GROUP BY po
+        przyjęciach i zużyciu) – do weryfikacji stanów utrzymywanych triggerami.
+        Zwraca rozbieżności względem poprzedniego stanu:
+        [{"additive_id", "stored_balance", "rebuilt_balance"}] (pusta => zgodne).
+        """
+        return self._rebuild_stock_ledger("additive_stock")
+
+    def rebuild_packaging_stock(self) -> List[Dict[str, Any]]:
+        """Jak rebuild_additive_stock, dla packaging_stock (klucz "packaging_id")."""
+        return self._rebuild_stock_ledger("packaging_stock")
+
+    @staticmethod
+    def _stock_row_to_dict(row: tuple, key: str = "additive_id") -> Dict[str, Any]:
+        return {
+            key: row[0],
+            "received": row[1],
+            "consumed": row[2],
+            "balance": row[1] - row[2],
+            "updated_at": row[3],
+        }
+
+    def get_additive_stock(self, additive_id: int) -> Optional[Dict[str, Any]]:
+        """Stan jednego dodatku (received, consumed, balance) – odczyt po kluczu."""
+        try:
+            with self.create_connection() as conn:
+                row = conn.execute(
                     """
-                    SELECT id, name, weight, dosage, category_id
-                    FROM additives
-                    WHERE id = ?
+                    SELECT additive_id, received, consumed, updated_at
+                      FROM additive_stock
+                     WHERE additive_id = ?
                 """,
                     (additive_id,),
-                )
-                row = cursor.fetchone()
-                if row:
-                    return {
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(
+                "Błąd przy pobieraniu stanu dodatku (id=%s): %s", additive_id, e
+            )
+            return None
+        return self._stock_row_to_dict(row) if row else None
+
+    def get_packaging_stock(self, packaging_id: int) -> Optional[Dict[str, Any]]:
+        """Stan jednego opakowania (received, consumed, balance) – odczyt po kluczu."""
+        try:
+            with self.create_connection() as conn:
+                row = conn.execute(
+                    """
+                    SELECT packaging_id, received, consumed, updated_at
+                      FROM packaging_stock
+                     WHERE packaging_id = ?
+                """,
+                    (packaging_id,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(
+                "Błąd przy pobieraniu stanu opakowania (id=%s): %s", packaging_id, e
+            )
+            return None
+        return self._stock_row_to_dict(row, "packaging_id") if row else None
+
+    def get_all_additive_stock(self) -> List[Dict[str, Any]]:
+        """Stany wszystkich dodatków (także bez ruchów – zera) z nazwą dodatku."""
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT a.id, COALESCE(s.received, 0), COALESCE(s.consumed, 0),
+                           s.updated_at, a.name
+                      FROM additives a
+                      LEFT JOIN additive_stock s ON s.additive_id = a.id
+                     ORDER BY a.name
+                """
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu stanów dodatków: %s", e)
+            return []
+        result = []
+        for row in rows:
+            item = self._stock_row_to_dict(row)
+            item["additive_name"] = row[4]
+            result.append(item)
+        return result
+
+    def get_stock_levels(self) -> List[Dict[str, Any]]:
+        """
+        Bieżące stany dla ekranu Magazyn – dodatki i opakowania w JEDNYM zapytaniu
+        (złączenia po kluczu głównym tabel stanów, bez skanowania historii).
+        Wiersz: {"kind": "Dodatek"/"Opakowanie", "id", "name", "received",
+        "consumed", "balance"}.
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT 'Dodatek', a.id, a.name,
+                           COALESCE(s.received, 0), COALESCE(s.consumed, 0)
+                      FROM additives a
+                      LEFT JOIN additive_stock s ON s.additive_id = a.id
+                    UNION ALL
+                    SELECT 'Opakowanie', p.id, p.name,
+                           COALESCE(s.received, 0), COALESCE(s.consumed, 0)
+                      FROM packaging p
+                      LEFT JOIN packaging_stock s ON s.packaging_id = p.id
+                     ORDER BY 1, 3
+                """
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu stanów magazynowych: %s", e)
+            return []
+        return [
+            {
+                "kind": kind,
+                "id": item_id,
+                "name": name,
+                "received": received,
+                "consumed": consumed,
+                "balance": received - consumed,
+            }
+            for kind, item_id, name, received, consumed in rows
+        ]
+
+    @staticmethod
+    def _additive_ids_by_name(
+        cursor: sqlite3.Cursor, names: Iterable[str]
+    ) -> Dict[str, int]:
+        """{nazwa: id} dla nazw dodatków z protokołu – jedno zapytanie."""
+        names = sorted({name for name in names if name})
+        if not names:
+            return {}
+        cursor.execute(
+            f"""
+            SELECT name, MIN(id) FROM additives
+             WHERE name IN ({", ".join("?" for _ in names)})
+             GROUP BY name
+        """,
+            names,
+        )
+        return dict(cursor.fetchall())
+
+    # ----------------------------------------------------------------
+    # ----- PODSUMOWANIE MIESIĘCZNE (rok, miesiąc, produkt, kat.) -----
+    # ----------------------------------------------------------------
+    # Klucz bez NULL-i: 0 = brak produktu / kategorii
+    _SUMMARY_KEY_SQL = """
+        CAST(substr({row}.date, 1, 4) AS INTEGER),
+        CAST(substr({row}.date, 6, 2) AS INTEGER),
+        COALESCE({row}.product_id, 0),
+        COALESCE((SELECT category_id FROM products WHERE id = {row}.product_id), 0)
+    """
+
+    @classmethod
+    def _summary_delta_sql(cls, row: str, sign: str) -> str:
+        """UPSERT zmieniający wiersz podsumowania o ±1 serię (wiersz NEW/OLD)."""
+        return f"""
+            INSERT INTO production_monthly_summary (
+                year, month, product_id, category_id,
+                batches, milk_l, party_weight_kg,
+                cost_milk, cost_additives, cost_packaging
+            )
+            SELECT {cls._SUMMARY_KEY_SQL.format(row=row)},
+                   {sign}1,
+                   {sign}COALESCE({row}.milk_l, 0),
+                   {sign}COALESCE({row}.total_weight_kg, 0),
+                   {sign}COALESCE({row}.cost_milk, 0),
+                   {sign}COALESCE({row}.cost_additives, 0),
+                   {sign}COALESCE({row}.cost_packaging, 0)
+             WHERE 1
+            ON CONFLICT (year, month, product_id, category_id) DO UPDATE
+               SET batches = batches + excluded.batches,
+                   milk_l = milk_l + excluded.milk_l,
+                   party_weight_kg = party_weight_kg + excluded.party_weight_kg,
+                   cost_milk = cost_milk + excluded.cost_milk,
+                   cost_additives = cost_additives + excluded.cost_additives,
+                   cost_packaging = cost_packaging + excluded.cost_packaging;
+        """
+
+    def ensure_production_summary(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Tabela production_monthly_summary (serie, litry mleka, waga partii,
+        koszty na rok/miesiąc/produkt/kategorię) utrzymywana triggerami na
+        production_records; zmiana kategorii produktu przenosi jego wiersze.
+        Przy pierwszym utworzeniu (i po dodaniu kolumn) liczona od zera.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table'"
+            " AND name = 'production_monthly_summary'"
+        )
+        is_new = cursor.fetchone() is None
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS production_monthly_summary (
+                year INTEGER NOT NULL,
+                month INTEGER NOT NULL,
+                product_id INTEGER NOT NULL,
+                category_id INTEGER NOT NULL,
+                batches INTEGER NOT NULL DEFAULT 0,
+                milk_l REAL NOT NULL DEFAULT 0,
+                party_weight_kg REAL NOT NULL DEFAULT 0,
+                cost_milk REAL NOT NULL DEFAULT 0,
+                cost_additives REAL NOT NULL DEFAULT 0,
+                cost_packaging REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (year, month, product_id, category_id)
+            ) WITHOUT ROWID
+        """
+        )
+        if self._add_missing_columns(
+            cursor,
+            "production_monthly_summary",
+            {
+                "cost_milk": "REAL NOT NULL DEFAULT 0",
+                "cost_additives": "REAL NOT NULL DEFAULT 0",
+                "cost_packaging": "REAL NOT NULL DEFAULT 0",
+            },
+        ):
+            # triggery sprzed migracji nie znają nowych kolumn
+            for suffix in ("ins", "del", "upd"):
+                cursor.execute(
+                    f"DROP TRIGGER IF EXISTS trg_production_records_summary_{suffix}"
+                )
+            is_new = True
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_production_monthly_summary_category
+            ON production_monthly_summary (category_id, year, month)
+        """
+        )
+        add = self._summary_delta_sql("NEW", "")
+        remove = self._summary_delta_sql("OLD", "-")
+        prune = "DELETE FROM production_monthly_summary WHERE batches <= 0;"
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_production_records_summary_ins
+            AFTER INSERT ON production_records
+            BEGIN {add} END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_production_records_summary_del
+            AFTER DELETE ON production_records
+            BEGIN {remove} {prune} END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_production_records_summary_upd
+            AFTER UPDATE OF date, product_id, milk_l, total_weight_kg,
+                            cost_milk, cost_additives, cost_packaging
+            ON production_records
+            BEGIN {remove} {add} {prune} END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_products_summary_category
+            AFTER UPDATE OF category_id ON products
+            BEGIN
+                UPDATE production_monthly_summary
+                   SET category_id = COALESCE(NEW.category_id, 0)
+                 WHERE product_id = NEW.id;
+            END
+        """
+        )
+        if is_new:
+            self._rebuild_production_summary(cursor)
+
+    def _backfill_milk_liters(self, cursor: sqlite3.Cursor) -> int:
+        """
+        production_records.milk_l z pola milk_field tabeli szczegółów protokołu
+        (tekst => liczba jak przy zapisie protokołu; protokoły bez szczegółów
+        pozostają bez zmian).
+        Aktualizuje tylko wiersze, w których wartość się zmienia; zwraca
+        ich liczbę.
+        """
+        cursor.execute(
+            """
+            SELECT pr.id, pc.name, pr.milk_l
+              FROM production_records pr
+              LEFT JOIN products p ON p.id = pr.product_id
+              LEFT JOIN product_categories pc ON pc.id = p.category_id
+        """
+        )
+        records = cursor.fetchall()
+        milk_text: Dict[str, Dict[int, Any]] = {}
+        for ptype in details_table_types():
+            cursor.execute(
+                f"SELECT production_record_id, {ptype.milk_field}"
+                f" FROM {ptype.details_table}"
+            )
+            milk_text[ptype.details_table] = dict(cursor.fetchall())
+
+        updates = []
+        for record_id, category_name, stored in records:
+            # Tabela typu kategorii, a gdy tam brak wiersza (kategoria produktu
+            # zmieniona po zapisie) – dowolna tabela szczegółów z tym protokołem
+            own = get_protocol_type(category_name or "").details_table
+            tables = [own] + [t for t in milk_text if t != own]
+            found = next((t for t in tables if record_id in milk_text[t]), None)
+            if found is None:
+                continue
+            text = milk_text[found][record_id]
+            milk = parse_number(str(text)) if text is not None else None
+            if milk != stored:
+                updates.append((milk, record_id))
+        if updates:
+            logger.info("production_records: przeliczono milk_l dla %d", len(updates))
+            cursor.executemany(
+                "UPDATE production_records SET milk_l = ? WHERE id = ?", updates
+            )
+        return len(updates)
+
+    def _backfill_milk_type(self, cursor: sqlite3.Cursor) -> None:
+        """production_records.milk_type z pola milk_type tabel szczegółów."""
+        for ptype in details_table_types():
+            if ptype.field("milk_type") is None:
+                continue
+            cursor.execute(
+                f"""
+                UPDATE production_records
+                   SET milk_type = (
+                       SELECT NULLIF(d.milk_type, '')
+                         FROM {ptype.details_table} d
+                        WHERE d.production_record_id = production_records.id
+                   )
+                 WHERE milk_type IS NULL
+                   AND id IN (SELECT production_record_id FROM {ptype.details_table})
+            """
+            )
+
+    def _rebuild_production_summary(
+        self, cursor: sqlite3.Cursor
+    ) -> List[Dict[str, Any]]:
+        """
+        Liczy production_monthly_summary od zera (jedno GROUP BY) i zwraca
+        rozbieżności względem poprzedniej zawartości.
+        """
+        cursor.execute(
+            f"""
+            SELECT {self._SUMMARY_KEY_SQL.format(row="pr")},
+                   COUNT(*), SUM(COALESCE(pr.milk_l, 0)),
+                   SUM(COALESCE(pr.total_weight_kg, 0)),
+                   SUM(COALESCE(pr.cost_milk, 0)),
+                   SUM(COALESCE(pr.cost_additives, 0)),
+                   SUM(COALESCE(pr.cost_packaging, 0))
+              FROM production_records pr
+             GROUP BY 1, 2, 3, 4
+        """
+        )
+        computed = {tuple(row[:4]): tuple(row[4:]) for row in cursor.fetchall()}
+        cursor.execute(
+            """
+            SELECT year, month, product_id, category_id,
+                   batches, milk_l, party_weight_kg,
+                   cost_milk, cost_additives, cost_packaging
+              FROM production_monthly_summary
+        """
+        )
+        stored = {tuple(row[:4]): tuple(row[4:]) for row in cursor.fetchall()}
+
+        empty = (0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        mismatches: List[Dict[str, Any]] = []
+        for key in sorted(set(computed) | set(stored)):
+            old = stored.get(key, empty)
+            new = computed.get(key, empty)
+            if any(abs(a - b) > 1e-6 for a, b in zip(old, new)):
+                mismatches.append(
+                    {
+                        "year": key[0],
+                        "month": key[1],
+                        "product_id": key[2],
+                        "category_id": key[3],
+                        "stored": old,
+                        "rebuilt": new,
+                    }
+                )
+
+        cursor.execute("DELETE FROM production_monthly_summary")
+        cursor.executemany(
+            """
+            INSERT INTO production_monthly_summary (
+                year, month, product_id, category_id,
+                batches, milk_l, party_weight_kg,
+                cost_milk, cost_additives, cost_packaging
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            [key + values for key, values in computed.items()],
+        )
+        return mismatches
+
+    def rebuild_production_summary(self) -> List[Dict[str, Any]]:
+        """
+        Pełne przeliczenie podsumowań miesięcznych: najpierw milk_l z tabel
+        szczegółów, potem production_monthly_summary od zera. Zwraca rozbieżności
+        [{"year", "month", "product_id", "category_id", "stored", "rebuilt"}],
+        gdzie stored/rebuilt = (serie, mleko L, waga partii kg, koszt mleka,
+        koszt dodatków, koszt opakowań).
+        """
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                self._backfill_milk_liters(cursor)
+                mismatches = self._rebuild_production_summary(cursor)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy przeliczaniu podsumowań produkcji: %s", e)
+            raise
+        if mismatches:
+            logger.warning(
+                "production_monthly_summary: %d rozbieżności poprawiono",
+                len(mismatches),
+            )
+        return mismatches
+
+    def get_monthly_production_summary(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        category_name: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Wiersze podsumowania (opcjonalnie: rok, miesiąc, nazwa kategorii
+        produktu), np. "ile litrów mleka poszło na Ser w marcu":
+        sum(r["milk_l"] for r in get_monthly_production_summary(2024, 3, "Ser")).
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT s.year, s.month, s.product_id, p.name,
+                           s.category_id, pc.name,
+                           s.batches, s.milk_l, s.party_weight_kg,
+                           s.cost_milk, s.cost_additives, s.cost_packaging
+                      FROM production_monthly_summary s
+                      LEFT JOIN products p ON p.id = s.product_id
+                      LEFT JOIN product_categories pc ON pc.id = s.category_id
+                     WHERE (:year IS NULL OR s.year = :year)
+                       AND (:month IS NULL OR s.month = :month)
+                       AND (:category IS NULL OR LOWER(pc.name) = LOWER(:category))
+                     ORDER BY s.year, s.month, p.name
+                """,
+                    {"year": year, "month": month, "category": category_name},
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu podsumowań produkcji: %s", e)
+            return []
+        return [
+            {
+                "year": row[0],
+                "month": row[1],
+                "product_id": row[2] or None,
+                "product_name": row[3],
+                "category_id": row[4] or None,
+                "category_name": row[5],
+                "batches": row[6],
+                "milk_l": row[7],
+                "party_weight_kg": row[8],
+                "cost_milk": row[9],
+                "cost_additives": row[10],
+                "cost_packaging": row[11],
+            }
+            for row in rows
+        ]
+
+    # ----------------------------------------------------------------
+    # ------------- KOSZTY SERII: mleko, dodatki, opakowania ---------
+    # ----------------------------------------------------------------
+    # Liczone przy zapisie protokołu (jeden UPDATE w tej samej transakcji)
+    # do production_records.cost_*; triggery przenoszą je do
+    # production_monthly_summary. Ceny:
+    #   - dodatki: cena partii dostawy, z której rozchodowano (FEFO), a dla
+    #     części bez partii / partii bez ceny – średnia ważona cen dostaw,
+    #   - opakowania: średnia ważona cen dostaw,
+    #   - mleko: milk_prices – najnowsza cena z valid_from <= data protokołu,
+    #     najpierw dla rodzaju mleka serii, potem ogólna (milk_type = '').
+    # Brak ceny => składnik liczony jako 0 (mleko: NULL).
+    _BATCH_COST_SQL = """
+        UPDATE production_records
+           SET cost_additives = COALESCE((
+                   SELECT SUM(
+                       COALESCE((
+                           SELECT SUM(al.qty * COALESCE(ar.unit_price, ap.unit_price))
+                             FROM additive_lot_allocations al
+                             JOIN additives_register ar ON ar.id = al.register_id
+                            WHERE al.production_additive_id = spa.id
+                       ), 0)
+                       + COALESCE((spa.qty - COALESCE((
+                           SELECT SUM(al.qty) FROM additive_lot_allocations al
+                            WHERE al.production_additive_id = spa.id
+                       ), 0)) * ap.unit_price, 0)
+                   )
+                     FROM ser_production_additives spa
+                     LEFT JOIN additive_unit_prices ap
+                       ON ap.additive_id = spa.additive_id
+                    WHERE spa.production_record_id = production_records.id
+                      AND spa.qty > 0
+               ), 0),
+               cost_packaging = COALESCE((
+                   SELECT SUM(pp.qty * pu.unit_price)
+                     FROM production_packaging pp
+                     JOIN packaging_unit_prices pu
+                       ON pu.packaging_id = pp.packaging_id
+                    WHERE pp.production_record_id = production_records.id
+               ), 0),
+               cost_milk = milk_l * (
+                   SELECT mp.price_l
+                     FROM milk_prices mp
+                    WHERE mp.milk_type IN ('', COALESCE(production_records.milk_type, ''))
+                      AND mp.valid_from <= production_records.date
+                    ORDER BY mp.milk_type = '', mp.valid_from DESC, mp.id DESC
+                    LIMIT 1
+               )
+         WHERE {where}
+    """
+
+    def ensure_unit_price_views(self, cursor: sqlite3.Cursor) -> None:
+        """Widoki średnich ważonych cen (zł / jednostka bazowa) z dostaw z ceną."""
+        for view, key, register in (
+            ("additive_unit_prices", "additive_id", "additives_register"),
+            ("packaging_unit_prices", "packaging_id", "packaging_register"),
+        ):
+            cursor.execute(
+                f"""
+                CREATE VIEW IF NOT EXISTS {view} AS
+                SELECT {key}, SUM(qty * unit_price) / SUM(qty) AS unit_price
+                  FROM {register}
+                 WHERE unit_price IS NOT NULL AND qty > 0
+                 GROUP BY {key}
+            """
+            )
+
+    # Protokoły, których koszt zależy od cen dodatku / opakowania (stare, nowe id)
+    _ADDITIVE_COST_WHERE = """
+        id IN (SELECT production_record_id FROM ser_production_additives
+                WHERE additive_id IN (?, ?))
+    """
+    _PACKAGING_COST_WHERE = """
+        id IN (SELECT production_record_id FROM production_packaging
+                WHERE packaging_id IN (?, ?))
+    """
+
+    def _recompute_batch_costs(
+        self, cursor: sqlite3.Cursor, where: str = "1", params: tuple = ()
+    ) -> int:
+        """Przelicza koszty protokołów spełniających 'where' (jednym UPDATE)."""
+        cursor.execute(self._BATCH_COST_SQL.format(where=where), params)
+        return cursor.rowcount
+
+    def rebuild_batch_costs(self) -> int:
+        """Przelicza koszty wszystkich protokołów; zwraca ich liczbę."""
+        try:
+            with self.create_connection() as conn:
+                count = self._recompute_batch_costs(conn.cursor())
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy przeliczaniu kosztów serii: %s", e)
+            raise
+        logger.info("Przeliczono koszty %d protokołów", count)
+        return count
+
+    def get_batch_cost(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Koszty serii (zł): cost_milk, cost_additives, cost_packaging, total."""
+        try:
+            with self.create_connection() as conn:
+                row = conn.execute(
+                    """
+                    SELECT cost_milk, cost_additives, cost_packaging
+                      FROM production_records WHERE id = ?
+                """,
+                    (record_id,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu kosztów serii (id=%s): %s", record_id, e)
+            return None
+        if row is None:
+            return None
+        return {
+            "cost_milk": row[0],
+            "cost_additives": row[1],
+            "cost_packaging": row[2],
+            "total": sum(v or 0 for v in row),
+        }
+
+    def add_milk_price(
+        self, valid_from: str, price_l: float, milk_type: str = ""
+    ) -> None:
+        """Nowa cena mleka (zł / L) od dnia; przelicza koszty serii od tej daty."""
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT INTO milk_prices (valid_from, milk_type, price_l)"
+                    " VALUES (?, ?, ?)",
+                    (valid_from, milk_type or "", price_l),
+                )
+                self._recompute_batch_costs(cursor, "date >= ?", (valid_from,))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy dodawaniu ceny mleka: %s", e)
+            raise
+
+    def get_milk_prices(self) -> List[Dict[str, Any]]:
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, valid_from, milk_type, price_l
+                      FROM milk_prices
+                     ORDER BY valid_from DESC, milk_type
+                """
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu cen mleka: %s", e)
+            return []
+        return [
+            {"id": r[0], "valid_from": r[1], "milk_type": r[2], "price_l": r[3]}
+            for r in rows
+        ]
+
+    def delete_milk_price(self, price_id: int) -> None:
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                row = cursor.execute(
+                    "SELECT valid_from FROM milk_prices WHERE id = ?", (price_id,)
+                ).fetchone()
+                if row is None:
+                    return
+                cursor.execute("DELETE FROM milk_prices WHERE id = ?", (price_id,))
+                self._recompute_batch_costs(cursor, "date >= ?", (row[0],))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy usuwaniu ceny mleka: %s", e)
+            raise
+
+    # ----------------------------------------------------------------
+    # ----- SPC: średnia i wariancja parametrów (Welford, per produkt) -----
+    # ----------------------------------------------------------------
+    # spc_values – liczbowe wartości pól SPC protokołu (pH, temperatury),
+    # spc_stats  – akumulatory Welforda (n, mean, m2) na (produkt, parametr),
+    #              aktualizowane triggerami na spc_values w O(1):
+    #   dodanie x:  d = x − mean;  mean += d / (n+1);  m2 += d² · n / (n+1)
+    #   usunięcie:  d = x − mean;  mean −= d / (n−1);  m2 −= d² · n / (n−1)
+    # (w UPDATE ... SET wszystkie wyrażenia widzą stare n / mean).
+    _SPC_ADD_SQL = """
+        INSERT INTO spc_stats (product_id, parameter, n, mean, m2)
+        VALUES (NEW.product_id, NEW.parameter, 1, NEW.value, 0)
+        ON CONFLICT (product_id, parameter) DO UPDATE
+           SET n = n + 1,
+               mean = mean + (excluded.mean - mean) / (n + 1),
+               m2 = m2 + (excluded.mean - mean) * (excluded.mean - mean) * n / (n + 1);
+    """
+    _SPC_REMOVE_SQL = """
+        UPDATE spc_stats
+           SET n = n - 1,
+               mean = CASE WHEN n > 1
+                           THEN mean - (OLD.value - mean) / (n - 1) ELSE 0 END,
+               m2 = CASE WHEN n > 1
+                         THEN MAX(m2 - (OLD.value - mean) * (OLD.value - mean)
+                                       * n / (n - 1), 0)
+                         ELSE 0 END
+         WHERE product_id = OLD.product_id AND parameter = OLD.parameter;
+        DELETE FROM spc_stats
+         WHERE product_id = OLD.product_id AND parameter = OLD.parameter
+           AND n <= 0;
+    """
+
+    def ensure_spc_stats(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Tabele spc_values / spc_stats i triggery akumulatorów; zmiana produktu
+        protokołu przenosi jego wartości (a z nimi statystyki). Przy pierwszym
+        utworzeniu wartości czytane są z tabel szczegółów wszystkich typów.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'spc_values'"
+        )
+        is_new = cursor.fetchone() is None
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spc_values (
+                production_record_id INTEGER NOT NULL,
+                parameter TEXT NOT NULL,
+                product_id INTEGER NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (production_record_id, parameter)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spc_stats (
+                product_id INTEGER NOT NULL,
+                parameter TEXT NOT NULL,
+                n INTEGER NOT NULL DEFAULT 0,
+                mean REAL NOT NULL DEFAULT 0,
+                m2 REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (product_id, parameter)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_spc_values_ins
+            AFTER INSERT ON spc_values
+            BEGIN {self._SPC_ADD_SQL} END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_spc_values_del
+            AFTER DELETE ON spc_values
+            BEGIN {self._SPC_REMOVE_SQL} END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_spc_values_upd
+            AFTER UPDATE ON spc_values
+            BEGIN {self._SPC_REMOVE_SQL} {self._SPC_ADD_SQL} END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_production_records_spc_product
+            AFTER UPDATE OF product_id ON production_records
+            WHEN NEW.product_id IS NOT OLD.product_id
+            BEGIN
+                DELETE FROM spc_values
+                 WHERE production_record_id = NEW.id AND NEW.product_id IS NULL;
+                UPDATE spc_values SET product_id = NEW.product_id
+                 WHERE production_record_id = NEW.id;
+            END
+        """
+        )
+        if is_new:
+            count = self._backfill_spc_values(cursor)
+            if count:
+                logger.info("spc_values: wczytano %d wartości z protokołów", count)
+
+    def _backfill_spc_values(self, cursor: sqlite3.Cursor) -> int:
+        """Wartości pól SPC z tabel szczegółów (tekst => liczba jak przy zapisie)."""
+        rows: List[Tuple[int, str, int, float]] = []
+        for ptype in details_table_types():
+            keys = [f.key for f in ptype.spc_fields]
+            if not keys:
+                continue
+            cursor.execute(
+                f"""
+                SELECT pr.id, pr.product_id, {", ".join(f"d.{k}" for k in keys)}
+                  FROM {ptype.details_table} d
+                  JOIN production_records pr ON pr.id = d.production_record_id
+                 WHERE pr.product_id IS NOT NULL
+            """
+            )
+            for record_id, product_id, *texts in cursor.fetchall():
+                details = {k: t for k, t in zip(keys, texts) if t is not None}
+                rows.extend(
+                    (record_id, key, product_id, value)
+                    for key, value in ptype.spc_values(details)
+                )
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO spc_values (
+                production_record_id, parameter, product_id, value
+            )
+            VALUES (?, ?, ?, ?)
+        """,
+            rows,
+        )
+        return len(rows)
+
+    @staticmethod
+    def _store_spc_values(
+        cursor: sqlite3.Cursor,
+        record_id: int,
+        product_id: Optional[int],
+        values: Iterable[Tuple[str, float]],
+    ) -> None:
+        """Wartości SPC protokołu: stare out, nowe in (triggery => spc_stats)."""
+        cursor.execute(
+            "DELETE FROM spc_values WHERE production_record_id = ?", (record_id,)
+        )
+        if product_id is None:
+            return
+        cursor.executemany(
+            """
+            INSERT INTO spc_values (production_record_id, parameter, product_id, value)
+            VALUES (?, ?, ?, ?)
+        """,
+            [(record_id, key, product_id, value) for key, value in values],
+        )
+
+    def rebuild_spc_stats(self) -> List[Dict[str, Any]]:
+        """
+        Liczy spc_stats od zera z spc_values (dwa przebiegi: średnia, potem
+        suma kwadratów odchyleń) i zwraca rozbieżności
+        [{"product_id", "parameter", "stored", "rebuilt"}], (n, mean, m2).
+        """
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    WITH g AS (
+                        SELECT product_id, parameter, COUNT(*) AS n, AVG(value) AS mean
+                          FROM spc_values
+                         GROUP BY product_id, parameter
+                    )
+                    SELECT g.product_id, g.parameter, g.n, g.mean,
+                           SUM((v.value - g.mean) * (v.value - g.mean))
+                      FROM g
+                      JOIN spc_values v
+                        ON v.product_id = g.product_id AND v.parameter = g.parameter
+                     GROUP BY g.product_id, g.parameter
+                """
+                )
+                computed = {tuple(r[:2]): tuple(r[2:]) for r in cursor.fetchall()}
+                cursor.execute("SELECT product_id, parameter, n, mean, m2 FROM spc_stats")
+                stored = {tuple(r[:2]): tuple(r[2:]) for r in cursor.fetchall()}
+
+                empty = (0, 0.0, 0.0)
+                mismatches: List[Dict[str, Any]] = []
+                for key in sorted(set(computed) | set(stored)):
+                    old = stored.get(key, empty)
+                    new = computed.get(key, empty)
+                    if any(abs(a - b) > 1e-6 * max(1.0, abs(b)) for a, b in zip(old, new)):
+                        mismatches.append(
+                            {
+                                "product_id": key[0],
+                                "parameter": key[1],
+                                "stored": old,
+                                "rebuilt": new,
+                            }
+                        )
+                cursor.execute("DELETE FROM spc_stats")
+                cursor.executemany(
+                    "INSERT INTO spc_stats (product_id, parameter, n, mean, m2)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [key + values for key, values in computed.items()],
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy przeliczaniu statystyk SPC: %s", e)
+            raise
+        if mismatches:
+            logger.warning("spc_stats: %d rozbieżności poprawiono", len(mismatches))
+        return mismatches
+
+    def get_spc_stats(self, product_id: int) -> Dict[str, Dict[str, Any]]:
+        """{parametr: {"n", "mean", "m2"}} produktu – odczyt po kluczu głównym."""
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    "SELECT parameter, n, mean, m2 FROM spc_stats WHERE product_id = ?",
+                    (product_id,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu statystyk SPC (id=%s): %s", product_id, e)
+            return {}
+        return {row[0]: {"n": row[1], "mean": row[2], "m2": row[3]} for row in rows}
+
+    # ----------------------------------------------------------------
+    # ---------- WERSJE DANYCH: licznik zmian każdej tabeli ----------
+    # ----------------------------------------------------------------
+    # Tabele, których zmiany unieważniają cache (pulpit, analizy);
+    # do tego tabele szczegółów wszystkich typów protokołów
+    _VERSIONED_TABLES = (
+        "production_records",
+        "production_parties",
+        "ser_production_additives",
+        "production_packaging",
+        "additives_register",
+        "packaging_register",
+        "additives",
+        "packaging",
+        "products",
+    )
+
+    def versioned_tables(self) -> Tuple[str, ...]:
+        return self._VERSIONED_TABLES + tuple(
+            ptype.details_table for ptype in details_table_types()
+        )
+
+    def ensure_table_versions(self, cursor: sqlite3.Cursor) -> None:
+        """
+        table_versions: {tabela: licznik} podbijany triggerami przy każdym
+        INSERT / UPDATE / DELETE – cache porównuje liczniki zamiast danych.
+        """
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS table_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """
+        )
+        for table in self.versioned_tables():
+            bump = f"""
+                INSERT INTO table_versions (table_name, version)
+                VALUES ('{table}', 1)
+                ON CONFLICT (table_name) DO UPDATE SET version = version + 1;
+            """
+            for suffix, event in (
+                ("ins", "INSERT"),
+                ("upd", "UPDATE"),
+                ("del", "DELETE"),
+            ):
+                cursor.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{suffix}
+                    AFTER {event} ON {table}
+                    BEGIN {bump} END
+                """
+                )
+
+    def get_table_versions(
+        self, tables: Optional[Iterable[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Liczniki zmian {tabela: wersja} (0 = bez zmian od utworzenia licznika).
+        Jedno zapytanie po kluczu głównym – tanie, można je wołać przy każdym
+        odczycie cache.
+        """
+        names = list(tables) if tables is not None else list(self.versioned_tables())
+        versions = {name: 0 for name in names}
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    "SELECT table_name, version FROM table_versions"
+                    f" WHERE table_name IN ({', '.join('?' for _ in names)})",
+                    names,
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu wersji tabel: %s", e)
+            return versions
+        versions.update(dict(rows))
+        return versions
+
+    # ----------------------------------------------------------------
+    # ------------- PULPIT: wskaźniki ekranu startowego --------------
+    # ----------------------------------------------------------------
+    def get_production_between(self, date_from: str, date_to: str) -> Dict[str, Any]:
+        """
+        {"batches", "milk_l"} dla protokołów z datą w [date_from, date_to]
+        (zakres po indeksie daty, mleko z production_records.milk_l).
+        """
+        try:
+            with self.create_connection() as conn:
+                row = conn.execute(
+                    """
+                    SELECT COUNT(*), COALESCE(SUM(milk_l), 0)
+                      FROM production_records
+                     WHERE date BETWEEN ? AND ?
+                """,
+                    (date_from, date_to),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy zliczaniu produkcji: %s", e)
+            return {"batches": 0, "milk_l": 0.0}
+        return {"batches": row[0], "milk_l": row[1]}
+
+    def get_low_stock_additives(self, used_since: str) -> List[Dict[str, Any]]:
+        """
+        Dodatki ze stanem <= 0 albo mniejszym niż zużycie od daty used_since
+        (czyli zapas na krócej niż ten okres). Stan z additive_stock.
+        Wiersz: {"additive_id", "additive_name", "balance", "used"}.
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    WITH recent AS (
+                        SELECT spa.additive_id, SUM(spa.qty) AS used
+                          FROM production_records pr
+                          JOIN ser_production_additives spa
+                            ON spa.production_record_id = pr.id
+                         WHERE pr.date >= ? AND spa.additive_id IS NOT NULL
+                         GROUP BY spa.additive_id
+                    )
+                    SELECT s.additive_id, a.name,
+                           s.received - s.consumed AS balance,
+                           COALESCE(r.used, 0)
+                      FROM additive_stock s
+                      JOIN additives a ON a.id = s.additive_id
+                      LEFT JOIN recent r ON r.additive_id = s.additive_id
+                     WHERE s.received - s.consumed <= 0
+                        OR s.received - s.consumed < COALESCE(r.used, 0)
+                     ORDER BY balance, a.name
+                """,
+                    (used_since,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy wyszukiwaniu niskich stanów: %s", e)
+            return []
+        return [
+            {
+                "additive_id": row[0],
+                "additive_name": row[1],
+                "balance": row[2],
+                "used": row[3],
+            }
+            for row in rows
+        ]
+
+    def get_incomplete_protocols(
+        self, since: str, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """
+        Protokoły od daty since bez produktu, ilości mleka albo wagi partii
+        (kolumny liczone przy zapisie – bez czytania tabel szczegółów).
+        Wiersz: {"id", "date", "series", "missing": [opisy braków]}.
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, date, series, product_id IS NULL,
+                           milk_l IS NULL, total_weight_kg IS NULL
+                      FROM production_records
+                     WHERE date >= ?
+                       AND (product_id IS NULL OR milk_l IS NULL
+                            OR total_weight_kg IS NULL)
+                     ORDER BY date DESC, id DESC
+                     LIMIT ?
+                """,
+                    (since, limit),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy wyszukiwaniu niekompletnych protokołów: %s", e)
+            return []
+        labels = ("produkt", "ilość mleka", "waga partii")
+        return [
+            {
+                "id": row[0],
+                "date": row[1],
+                "series": row[2],
+                "missing": [label for label, flag in zip(labels, row[3:]) if flag],
+            }
+            for row in rows
+        ]
+
+    # ----------------------------------------------------------------
+    # ------------- PLAN PRODUKCJI: serie planowane ------------------
+    # ----------------------------------------------------------------
+    # Zapotrzebowanie liczy logic/planner.py: receptury (product_additives)
+    # i normy zużycia opakowań z historii – po jednym zapytaniu dla wszystkich
+    # planowanych produktów, skalowanie macierzowo w NumPy.
+    def add_planned_batch(
+        self, date_str: str, product_id: int, milk_l: float, note: str = ""
+    ) -> int:
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO production_plan (date, product_id, milk_l, note)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    (date_str, product_id, milk_l, note or ""),
+                )
+                conn.commit()
+                return cursor.lastrowid
+        except sqlite3.Error as e:
+            logger.error("Błąd przy dodawaniu serii do planu: %s", e)
+            raise
+
+    def delete_planned_batch(self, plan_id: int) -> None:
+        try:
+            with self.create_connection() as conn:
+                conn.execute("DELETE FROM production_plan WHERE id = ?", (plan_id,))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy usuwaniu serii z planu (id=%s): %s", plan_id, e)
+            raise
+
+    def get_planned_batches(self, date_from: str, date_to: str) -> List[Dict[str, Any]]:
+        """Serie planowane w zakresie dat (włącznie), po dacie; z nazwą produktu."""
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT pl.id, pl.date, pl.product_id, p.name, pl.milk_l, pl.note
+                      FROM production_plan pl
+                      JOIN products p ON p.id = pl.product_id
+                     WHERE pl.date BETWEEN ? AND ?
+                     ORDER BY pl.date, pl.id
+                """,
+                    (date_from, date_to),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu planu produkcji: %s", e)
+            return []
+        return [
+            {
+                "id": row[0],
+                "date": row[1],
+                "product_id": row[2],
+                "product_name": row[3],
+                "milk_l": row[4],
+                "note": row[5],
+            }
+            for row in rows
+        ]
+
+    def get_recipes_for_products(
+        self, product_ids: Iterable[int]
+    ) -> List[Tuple[int, int, str]]:
+        """(product_id, additive_id, dosage_per_100) receptur podanych produktów."""
+        ids = sorted(set(product_ids))
+        if not ids:
+            return []
+        marks = ", ".join("?" * len(ids))
+        try:
+            with self.create_connection() as conn:
+                return conn.execute(
+                    f"""
+                    SELECT product_id, additive_id, dosage_per_100
+                      FROM product_additives
+                     WHERE product_id IN ({marks})
+                """,
+                    ids,
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu receptur: %s", e)
+            return []
+
+    def get_packaging_norms(
+        self, product_ids: Iterable[int]
+    ) -> List[Tuple[int, int, float]]:
+        """
+        (product_id, packaging_id, szt. na litr mleka) – norma zużycia opakowań
+        z historii: suma zużycia / suma mleka wszystkich serii produktu.
+        """
+        ids = sorted(set(product_ids))
+        if not ids:
+            return []
+        marks = ", ".join("?" * len(ids))
+        try:
+            with self.create_connection() as conn:
+                return conn.execute(
+                    f"""
+                    WITH milk AS (
+                        SELECT product_id, SUM(milk_l) AS milk_l
+                          FROM production_records
+                         WHERE product_id IN ({marks}) AND milk_l > 0
+                         GROUP BY product_id
+                    )
+                    SELECT pr.product_id, pp.packaging_id,
+                           SUM(pp.qty) / milk.milk_l
+                      FROM production_packaging pp
+                      JOIN production_records pr ON pr.id = pp.production_record_id
+                      JOIN milk ON milk.product_id = pr.product_id
+                     WHERE pr.milk_l > 0
+                     GROUP BY pr.product_id, pp.packaging_id
+                """,
+                    ids,
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy liczeniu norm zużycia opakowań: %s", e)
+            return []
+
+    # ----------------------------------------------------------------
+    # ------ ZUŻYCIE DZIENNE DODATKÓW (wyciąg dla prognoz) -----------
+    # ----------------------------------------------------------------
+    # additive_daily_usage: (dodatek, dzień) -> suma qty z protokołów,
+    # w jednostce bazowej. Utrzymywana triggerami na ser_production_additives
+    # i na zmianie daty protokołu, więc logic/forecast.py czyta gotowe sumy
+    # dzienne zamiast tekstowych linii dodatków.
+    _USAGE_PRUNE_SQL = """
+        DELETE FROM additive_daily_usage
+         WHERE additive_id = {row}.additive_id AND qty < 1e-6;
+    """
+
+    @staticmethod
+    def _usage_delta_sql(row: str, sign: str) -> str:
+        """UPSERT zmieniający zużycie dnia protokołu o ±<row>.qty (NEW/OLD)."""
+        return f"""
+            INSERT INTO additive_daily_usage (additive_id, date, qty)
+            SELECT {row}.additive_id, pr.date, {sign}{row}.qty
+              FROM production_records pr
+             WHERE pr.id = {row}.production_record_id AND pr.date IS NOT NULL
+               AND {row}.additive_id IS NOT NULL AND {row}.qty IS NOT NULL
+            ON CONFLICT (additive_id, date) DO UPDATE
+               SET qty = qty + excluded.qty;
+        """
+
+    @staticmethod
+    def _usage_move_sql(date: str, sign: str) -> str:
+        """Zużycie wszystkich linii protokołu NEW.id ±przeniesione na dzień date."""
+        return f"""
+            INSERT INTO additive_daily_usage (additive_id, date, qty)
+            SELECT additive_id, {date}, {sign}SUM(qty)
+              FROM ser_production_additives
+             WHERE production_record_id = NEW.id AND {date} IS NOT NULL
+               AND additive_id IS NOT NULL AND qty IS NOT NULL
+             GROUP BY additive_id
+            ON CONFLICT (additive_id, date) DO UPDATE
+               SET qty = qty + excluded.qty;
+        """
+
+    def ensure_additive_daily_usage(self, cursor: sqlite3.Cursor) -> None:
+        """Tabela dziennego zużycia + triggery; przy utworzeniu liczona od zera."""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table'"
+            " AND name = 'additive_daily_usage'"
+        )
+        is_new = cursor.fetchone() is None
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS additive_daily_usage (
+                additive_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                qty REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (additive_id, date)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_additive_daily_usage_date
+            ON additive_daily_usage (date)
+        """
+        )
+        add = self._usage_delta_sql("NEW", "")
+        remove = self._usage_delta_sql("OLD", "-")
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_ser_production_additives_usage_ins
+            AFTER INSERT ON ser_production_additives
+            BEGIN {add} END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_ser_production_additives_usage_del
+            AFTER DELETE ON ser_production_additives
+            BEGIN {remove} {self._USAGE_PRUNE_SQL.format(row="OLD")} END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_ser_production_additives_usage_upd
+            AFTER UPDATE OF additive_id, qty, production_record_id
+            ON ser_production_additives
+            BEGIN {remove} {add} {self._USAGE_PRUNE_SQL.format(row="OLD")} END
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_production_records_usage_date
+            AFTER UPDATE OF date ON production_records
+            WHEN OLD.date IS NOT NEW.date
+            BEGIN
+                {self._usage_move_sql("OLD.date", "-")}
+                {self._usage_move_sql("NEW.date", "")}
+                DELETE FROM additive_daily_usage
+                 WHERE qty < 1e-6
+                   AND additive_id IN (SELECT additive_id FROM ser_production_additives
+                                        WHERE production_record_id = NEW.id);
+            END
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_additives_usage_del
+            AFTER DELETE ON additives
+            BEGIN
+                DELETE FROM additive_daily_usage WHERE additive_id = OLD.id;
+            END
+        """
+        )
+        if is_new:
+            self._rebuild_additive_daily_usage(cursor)
+
+    def _rebuild_additive_daily_usage(
+        self, cursor: sqlite3.Cursor
+    ) -> List[Dict[str, Any]]:
+        """Liczy additive_daily_usage od zera; zwraca rozbieżności."""
+        cursor.execute(
+            """
+            SELECT spa.additive_id, pr.date, SUM(spa.qty)
+              FROM ser_production_additives spa
+              JOIN production_records pr ON pr.id = spa.production_record_id
+             WHERE spa.additive_id IS NOT NULL AND spa.qty IS NOT NULL
+               AND pr.date IS NOT NULL
+             GROUP BY spa.additive_id, pr.date
+            HAVING SUM(spa.qty) >= 1e-6
+        """
+        )
+        computed = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+        cursor.execute("SELECT additive_id, date, qty FROM additive_daily_usage")
+        stored = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+        mismatches = [
+            {
+                "additive_id": key[0],
+                "date": key[1],
+                "stored": stored.get(key, 0.0),
+                "rebuilt": computed.get(key, 0.0),
+            }
+            for key in sorted(set(computed) | set(stored))
+            if abs(stored.get(key, 0.0) - computed.get(key, 0.0)) > 1e-6
+        ]
+        cursor.execute("DELETE FROM additive_daily_usage")
+        cursor.executemany(
+            "INSERT INTO additive_daily_usage (additive_id, date, qty)"
+            " VALUES (?, ?, ?)",
+            [key + (qty,) for key, qty in computed.items()],
+        )
+        return mismatches
+
+    def rebuild_additive_daily_usage(self) -> List[Dict[str, Any]]:
+        """
+        Pełne przeliczenie dziennego zużycia; zwraca rozbieżności
+        [{"additive_id", "date", "stored", "rebuilt"}].
+        """
+        try:
+            with self.create_connection() as conn:
+                mismatches = self._rebuild_additive_daily_usage(conn.cursor())
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy przeliczaniu dziennego zużycia dodatków: %s", e)
+            raise
+        if mismatches:
+            logger.warning(
+                "additive_daily_usage: %d rozbieżności poprawiono", len(mismatches)
+            )
+        return mismatches
+
+    def get_additive_daily_usage(self, since: str) -> List[Tuple[int, str, float]]:
+        """(additive_id, date, qty) od dnia since – zakres po indeksie daty."""
+        try:
+            with self.create_connection() as conn:
+                return conn.execute(
+                    """
+                    SELECT additive_id, date, qty
+                      FROM additive_daily_usage
+                     WHERE date >= ?
+                """,
+                    (since,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu dziennego zużycia dodatków: %s", e)
+            return []
+
+    def get_additive_receipt_dates(self, since: str) -> List[Tuple[int, str]]:
+        """(additive_id, date) dni dostaw dodatków od dnia since (bez powtórzeń)."""
+        try:
+            with self.create_connection() as conn:
+                return conn.execute(
+                    """
+                    SELECT DISTINCT additive_id, date
+                      FROM additives_register
+                     WHERE date >= ? AND additive_id IS NOT NULL
+                """,
+                    (since,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu dat dostaw dodatków: %s", e)
+            return []
+
+    # ----------------------------------------------------------------
+    # -------- PARTIE DOSTAW DODATKÓW: rozchód FEFO / FIFO -----------
+    # ----------------------------------------------------------------
+    # Wpis w additives_register = partia dostawy (qty, remaining, expiry_date).
+    # Zużycie linii protokołu schodzi z otwartych partii dodatku dostępnych
+    # w dniu produkcji (przyjętych najpóźniej tego dnia, ważnych co najmniej do
+    # niego) w kolejności: najkrótsza data ważności, partie bez daty na końcu,
+    # potem data przyjęcia. Kolejność = kolumny indeksu częściowego
+    # idx_additives_register_lot_queue (WHERE remaining > 0), a daty i remaining
+    # też są w indeksie, więc SQLite czyta i filtruje partie wprost z indeksu
+    # – bez sortowania i bez skanu rejestru – i kończy po pokryciu ilości.
+    _LOT_QUEUE_SQL = """
+        SELECT id, remaining
+          FROM additives_register
+         WHERE additive_id = ? AND remaining > 0
+           AND date <= ? AND (expiry_date IS NULL OR expiry_date >= ?)
+         ORDER BY expiry_date IS NULL, expiry_date, date, id
+    """
+
+    # Genealogia (lot_series_links) z rozchodu; {where}: "" (całość) / filtr protokołu
+    _LOT_LINKS_INSERT_SQL = """
+        INSERT INTO lot_series_links (register_id, production_record_id, qty)
+        SELECT al.register_id, spa.production_record_id, SUM(al.qty)
+          FROM additive_lot_allocations al
+          JOIN ser_production_additives spa ON spa.id = al.production_additive_id
+         {where}
+         GROUP BY al.register_id, spa.production_record_id
+    """
+
+    def _allocate_lots(
+        self,
+        cursor: sqlite3.Cursor,
+        production_additive_id: int,
+        additive_id: int,
+        qty: float,
+        on_date: str,
+    ) -> float:
+        """
+        Rozchoduje qty (jednostka bazowa) z partii dodatku dostępnych w dniu
+        on_date (data protokołu). Zwraca brak (ilość niepokrytą partiami;
+        0.0 => całość rozchodowana) – widoczny potem w get_lot_shortages.
+        """
+        need = qty
+        allocations = []
+        for lot_id, remaining in cursor.connection.execute(
+            self._LOT_QUEUE_SQL, (additive_id, on_date, on_date)
+        ):
+            take = min(need, remaining)
+            allocations.append((production_additive_id, lot_id, take))
+            need -= take
+            if need <= 1e-9:
+                need = 0.0
+                break
+        cursor.executemany(
+            """
+            INSERT INTO additive_lot_allocations (
+                production_additive_id, register_id, qty
+            )
+            VALUES (?, ?, ?)
+        """,
+            allocations,
+        )
+        cursor.executemany(
+            "UPDATE additives_register SET remaining = ROUND(remaining - ?, 6)"
+            " WHERE id = ?",
+            [(take, lot_id) for _, lot_id, take in allocations],
+        )
+        if need > 0:
+            logger.warning(
+                "Brak partii dostaw dodatku id=%s na %s: niepokryte %g",
+                additive_id,
+                on_date,
+                need,
+            )
+        return need
+
+    def _release_lot_allocations(self, cursor: sqlite3.Cursor, record_id: int) -> None:
+        """Zwraca do partii wszystko, co rozchodowały linie dodatków protokołu."""
+        cursor.execute(
+            "DELETE FROM lot_series_links WHERE production_record_id = ?", (record_id,)
+        )
+        cursor.execute(
+            """
+            SELECT al.register_id, SUM(al.qty)
+              FROM additive_lot_allocations al
+              JOIN ser_production_additives spa ON spa.id = al.production_additive_id
+             WHERE spa.production_record_id = ?
+             GROUP BY al.register_id
+        """,
+            (record_id,),
+        )
+        returned = cursor.fetchall()
+        if not returned:
+            return
+        cursor.executemany(
+            "UPDATE additives_register SET remaining = ROUND(remaining + ?, 6)"
+            " WHERE id = ?",
+            [(qty, lot_id) for lot_id, qty in returned],
+        )
+        cursor.execute(
+            """
+            DELETE FROM additive_lot_allocations
+             WHERE production_additive_id IN (
+                   SELECT id FROM ser_production_additives
+                    WHERE production_record_id = ?
+             )
+        """,
+            (record_id,),
+        )
+
+    def _rebuild_lot_allocations(self, cursor: sqlite3.Cursor) -> int:
+        """
+        Rozchód od zera: remaining = qty dla wszystkich partii, potem wszystkie
+        linie dodatków protokołów w kolejności daty produkcji. Zwraca liczbę linii
+        niepokrytych w całości przez partie.
+        """
+        cursor.execute("DELETE FROM lot_series_links")
+        cursor.execute("DELETE FROM additive_lot_allocations")
+        cursor.execute("UPDATE additives_register SET remaining = qty")
+        cursor.execute(
+            """
+            SELECT spa.id, spa.additive_id, spa.qty, pr.date
+              FROM ser_production_additives spa
+              JOIN production_records pr ON pr.id = spa.production_record_id
+             WHERE spa.additive_id IS NOT NULL AND spa.qty > 0
+             ORDER BY pr.date, spa.id
+        """
+        )
+        shortages = 0
+        for line_id, additive_id, qty, on_date in cursor.fetchall():
+            if self._allocate_lots(cursor, line_id, additive_id, qty, on_date) > 0:
+                shortages += 1
+        cursor.execute(self._LOT_LINKS_INSERT_SQL.format(where=""))
+        logger.info("Przeliczono rozchód partii (braki: %d linii)", shortages)
+        return shortages
+
+    def rebuild_lot_allocations(self) -> int:
+        """Ponowny rozchód wszystkich protokołów z partii dostaw (od zera)."""
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                shortages = self._rebuild_lot_allocations(cursor)
+                conn.commit()
+                return shortages
+        except sqlite3.Error as e:
+            logger.error("Błąd przy przeliczaniu rozchodu partii: %s", e)
+            raise
+
+    def get_lot_allocations(self, record_id: int) -> List[Dict[str, Any]]:
+        """
+        Rozchód dodatków protokołu na partie dostaw: po jednym wierszu na linię
+        dodatku i partię ({"additive_name", "register_id", "lot_date",
+        "expiry_date", "qty"}).
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT spa.additive_name, al.register_id, ar.date,
+                           ar.expiry_date, al.qty
+                      FROM ser_production_additives spa
+                      JOIN additive_lot_allocations al
+                        ON al.production_additive_id = spa.id
+                      JOIN additives_register ar ON ar.id = al.register_id
+                     WHERE spa.production_record_id = ?
+                     ORDER BY spa.id, al.id
+                """,
+                    (record_id,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu rozchodu (id=%s): %s", record_id, e)
+            return []
+        return [
+            {
+                "additive_name": row[0],
+                "register_id": row[1],
+                "lot_date": row[2],
+                "expiry_date": row[3],
+                "qty": row[4],
+            }
+            for row in rows
+        ]
+
+    def get_lot_shortages(self, record_id: int) -> List[Dict[str, Any]]:
+        """
+        Linie dodatków protokołu niepokryte w całości partiami dostaw:
+        [{"additive_name", "qty", "allocated", "missing"}] (pusta => wszystko pokryte).
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT spa.additive_name, spa.qty, COALESCE(SUM(al.qty), 0)
+                      FROM ser_production_additives spa
+                      LEFT JOIN additive_lot_allocations al
+                        ON al.production_additive_id = spa.id
+                     WHERE spa.production_record_id = ?
+                       AND spa.additive_id IS NOT NULL AND spa.qty > 0
+                     GROUP BY spa.id
+                    HAVING spa.qty - COALESCE(SUM(al.qty), 0) > 1e-9
+                     ORDER BY spa.id
+                """,
+                    (record_id,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy sprawdzaniu braków (id=%s): %s", record_id, e)
+            return []
+        return [
+            {
+                "additive_name": name,
+                "qty": qty,
+                "allocated": allocated,
+                "missing": round(qty - allocated, 6),
+            }
+            for name, qty, allocated in rows
+        ]
+
+    # ----------------------------------------------------------------
+    # ------------- WYCOFANIE: partia dostawy <-> seria --------------
+    # ----------------------------------------------------------------
+    def trace_lot(self, register_id: int) -> List[Dict[str, Any]]:
+        """
+        Śledzenie w przód: serie, do których trafiła partia dostawy dodatku
+        (wpis additives_register). Odczyt po kluczu lot_series_links, bez skanu
+        protokołów.
+        Wiersz: {"production_record_id", "series", "date", "product_name", "qty"}.
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT l.production_record_id, pr.series, pr.date, p.name, l.qty
+                      FROM lot_series_links l
+                      JOIN production_records pr ON pr.id = l.production_record_id
+                      LEFT JOIN products p ON p.id = pr.product_id
+                     WHERE l.register_id = ?
+                     ORDER BY pr.date, pr.series
+                """,
+                    (register_id,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy śledzeniu partii (id=%s): %s", register_id, e)
+            return []
+        return [
+            {
+                "production_record_id": row[0],
+                "series": row[1],
+                "date": row[2],
+                "product_name": row[3],
+                "qty": row[4],
+            }
+            for row in rows
+        ]
+
+    def trace_series(self, series: str) -> List[Dict[str, Any]]:
+        """
+        Śledzenie wstecz: partie dostaw dodatków użyte w serii (po numerze serii;
+        kilka protokołów z tym samym numerem => wszystkie).
+        Wiersz: {"register_id", "additive_name", "lot_date", "expiry_date",
+        "series", "qty"}.
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT l.register_id, a.name, ar.date, ar.expiry_date,
+                           pr.series, l.qty
+                      FROM production_records pr
+                      JOIN lot_series_links l ON l.production_record_id = pr.id
+                      JOIN additives_register ar ON ar.id = l.register_id
+                      LEFT JOIN additives a ON a.id = ar.additive_id
+                     WHERE pr.series = ?
+                     ORDER BY a.name, ar.date
+                """,
+                    (series,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy śledzeniu serii '%s': %s", series, e)
+            return []
+        return [
+            {
+                "register_id": row[0],
+                "additive_name": row[1],
+                "lot_date": row[2],
+                "expiry_date": row[3],
+                "series": row[4],
+                "qty": row[5],
+            }
+            for row in rows
+        ]
+
+    # ----------------------------------------------------------------
+    # ------------- TERMINY WAŻNOŚCI: partie kończące się ------------
+    # ----------------------------------------------------------------
+    # Zakres expiry_date <= :until po indeksach częściowych
+    # idx_additives_register_expiry / idx_packaging_register_expiry – koszt
+    # zależy od liczby partii w zakresie, nie od wielkości rejestrów.
+    # Opakowania nie mają rozchodu z partii: zostało = FIFO z bieżącego stanu
+    # (stan minus późniejsze przyjęcia, nie więcej niż ilość partii).
+    _EXPIRING_LOTS_SQL = """
+        SELECT 'Dodatek', ar.id, a.name, ar.lot_no, ar.date, ar.expiry_date,
+               ar.remaining
+          FROM additives_register ar
+          JOIN additives a ON a.id = ar.additive_id
+         WHERE ar.expiry_date <= :until
+           AND ar.remaining > 0 AND ar.expiry_date IS NOT NULL
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'Opakowanie', pr.id, p.name, pr.lot_no, pr.date, pr.expiry_date,
+                   MIN(pr.qty, MAX(0,
+                       COALESCE(s.received - s.consumed, 0) - COALESCE((
+                           SELECT SUM(later.qty) FROM packaging_register later
+                            WHERE later.packaging_id = pr.packaging_id
+                              AND (later.date > pr.date
+                                   OR (later.date = pr.date AND later.id > pr.id))
+                       ), 0))) AS remaining
+              FROM packaging_register pr
+              JOIN packaging p ON p.id = pr.packaging_id
+              LEFT JOIN packaging_stock s ON s.packaging_id = pr.packaging_id
+             WHERE pr.expiry_date <= :until AND pr.expiry_date IS NOT NULL
+        )
+         WHERE remaining > 0
+         ORDER BY 6, 3
+    """
+
+    def get_expiring_lots(self, until: str) -> List[Dict[str, Any]]:
+        """
+        Partie dodatków i opakowań z zapasem i terminem ważności <= until
+        (także już przeterminowane), od najkrótszego terminu.
+        Wiersz: {"kind", "register_id", "name", "lot_no", "date",
+        "expiry_date", "remaining"}.
+        """
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    self._EXPIRING_LOTS_SQL, {"until": until}
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy wyszukiwaniu kończących się partii: %s", e)
+            return []
+        keys = (
+            "kind",
+            "register_id",
+            "name",
+            "lot_no",
+            "date",
+            "expiry_date",
+            "remaining",
+        )
+        return [dict(zip(keys, row)) for row in rows]
+
+    # ----------------------------------------------------------------
+    # ---------- KONSERWACJA: spójność pliku, statystyki -------------
+    # ----------------------------------------------------------------
+    def check_integrity(self) -> List[str]:
+        """
+        PRAGMA integrity_check + foreign_key_check (tylko odczyt); zwraca
+        opisy problemów – pusta lista = baza spójna.
+        """
+        try:
+            with self.create_connection() as conn:
+                problems = [
+                    row[0]
+                    for row in conn.execute("PRAGMA integrity_check")
+                    if row[0] != "ok"
+                ]
+                problems += [
+                    f"{table} rowid={rowid}: brak wiersza w {parent}"
+                    for table, rowid, parent, _fk in conn.execute(
+                        "PRAGMA foreign_key_check"
+                    )
+                ]
+        except sqlite3.Error as e:
+            logger.error("Błąd przy sprawdzaniu spójności bazy: %s", e)
+            raise
+        for problem in problems:
+            logger.warning("Spójność bazy: %s", problem)
+        return problems
+
+    # Wiersze próbkowane na indeks przy ANALYZE (0 = wszystkie) – po dużym
+    # imporcie statystyki przybliżone, ale ANALYZE trwa chwilę, nie minuty
+    ANALYSIS_LIMIT = 1000
+    AUTO_VACUUM_INCREMENTAL = 2
+
+    def optimize(self, analyze: bool = False) -> None:
+        """
+        Statystyki planisty zapytań: ANALYZE (gdy analyze=True, próbkowane
+        do ANALYSIS_LIMIT wierszy na indeks) i PRAGMA optimize (tylko tabele,
+        których statystyki się zestarzały – tanie, np. przy zamykaniu).
+        """
+        try:
+            with self.create_connection() as conn:
+                if analyze:
+                    conn.execute(f"PRAGMA analysis_limit = {int(self.ANALYSIS_LIMIT)}")
+                    conn.execute("ANALYZE")
+                conn.execute("PRAGMA optimize")
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy optymalizacji bazy: %s", e)
+            raise
+
+    def get_storage_stats(self) -> Dict[str, int]:
+        """
+        Zajętość pliku: page_size, page_count, freelist_count (wolne strony),
+        auto_vacuum (0 brak, 1 pełny, 2 przyrostowy) i file_size w bajtach
+        (0 dla bazy w pamięci).
+        """
+        try:
+            with self.create_connection() as conn:
+                stats = {
+                    pragma: conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+                    for pragma in (
+                        "page_size",
+                        "page_count",
+                        "freelist_count",
+                        "auto_vacuum",
+                    )
+                }
+        except sqlite3.Error as e:
+            logger.error("Błąd przy odczycie statystyk pliku bazy: %s", e)
+            raise
+        if self._keeper is None and os.path.exists(self.db_path):
+            stats["file_size"] = os.path.getsize(self.db_path)
+        else:
+            stats["file_size"] = 0
+        return stats
+
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        Przełącza istniejący plik na auto_vacuum=INCREMENTAL – wymaga pełnego
+        VACUUM (przepisanie całego pliku, jednorazowo). False, jeśli tryb był
+        już ustawiony.
+        """
+        try:
+            with self.create_connection() as conn:
+                mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+                if mode == self.AUTO_VACUUM_INCREMENTAL:
+                    return False
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+        except sqlite3.Error as e:
+            logger.error("Błąd przy włączaniu auto_vacuum=INCREMENTAL: %s", e)
+            raise
+        logger.info("Baza %s: auto_vacuum=INCREMENTAL (pełne VACUUM)", self.db_path)
+        return True
+
+    def incremental_vacuum(self, pages: int) -> int:
+        """
+        Zwalnia do pages wolnych stron z końca pliku (PRAGMA incremental_vacuum,
+        działa tylko przy auto_vacuum=INCREMENTAL); zwraca liczbę zwolnionych.
+        """
+        try:
+            with self.create_connection() as conn:
+                before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                # execute() wykonuje tylko pierwszy krok pragmy (jedna strona);
+                # executescript prowadzi ją do końca
+                conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+                after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error("Błąd przy PRAGMA incremental_vacuum: %s", e)
+            raise
+        return before - after
+
+    # ----------------------------------------------------------------
+    # ------- EKSPORT: odczyt strumieniowy (kursor, porcje) ----------
+    # ----------------------------------------------------------------
+    EXPORT_CHUNK = 1000
+
+    def iter_rows(
+        self, sql: str, params: Iterable[Any] = (), chunk_size: int = EXPORT_CHUNK
+    ) -> Iterator[tuple]:
+        """
+        Generator wierszy zapytania pobieranych porcjami (fetchmany) – w pamięci
+        jest najwyżej chunk_size wierszy. Połączenie jest otwarte, dopóki generator
+        nie zostanie wyczerpany albo zamknięty. Błąd SQL => logowany i przekazywany dalej.
+        """
+        conn = self.create_connection()
+        try:
+            cursor = conn.execute(sql, tuple(params))
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                yield from chunk
+        except sqlite3.Error as e:
+            logger.error("Błąd przy odczycie strumieniowym: %s", e)
+            raise
+        finally:
+            conn.close()
+
+    def iter_production_records(self) -> Iterator[tuple]:
+        """
+        (id, date, series, product_name, category_name, total_weight_kg, yield_pct)
+        dla wszystkich protokołów, wg daty.
+        """
+        return self.iter_rows(
+            """
+            SELECT pr.id, pr.date, pr.series, p.name, pc.name,
+                   pr.total_weight_kg, pr.yield_pct
+              FROM production_records pr
+              LEFT JOIN products p ON p.id = pr.product_id
+              LEFT JOIN product_categories pc ON pc.id = p.category_id
+             ORDER BY pr.date, pr.id
+        """
+        )
+
+    def iter_protocol_details(self, ptype: ProtocolType) -> Iterator[tuple]:
+        """
+        (record_id, date, series, product_name, *ptype.columns) – szczegóły
+        protokołów zapisanych w tabeli szczegółów danego typu.
+        """
+        columns = ", ".join(f"d.{col}" for col in ptype.columns)
+        return self.iter_rows(
+            f"""
+            SELECT pr.id, pr.date, pr.series, p.name, {columns}
+              FROM {ptype.details_table} d
+              JOIN production_records pr ON pr.id = d.production_record_id
+              LEFT JOIN products p ON p.id = pr.product_id
+             ORDER BY pr.date, pr.id
+        """
+        )
+
+    def iter_stage_minutes(self, ptype: ProtocolType) -> Iterator[tuple]:
+        """
+        (record_id, product_name, *ptype.minute_columns) – czasy etapów w minutach
+        (NULL => brak / nieczytelny tekst) do analiz (logic/stage_analytics.py).
+        """
+        columns = ", ".join(f"d.{col}" for col in ptype.minute_columns)
+        return self.iter_rows(
+            f"""
+            SELECT pr.id, COALESCE(p.name, '-'), {columns}
+              FROM {ptype.details_table} d
+              JOIN production_records pr ON pr.id = d.production_record_id
+              LEFT JOIN products p ON p.id = pr.product_id
+        """
+        )
+
+    def iter_protocol_additive_lines(self) -> Iterator[tuple]:
+        """
+        (record_id, date, series, additive_category, additive_name,
+         dose_calculated, qty) – dodatki zapisane w protokołach.
+        """
+        return self.iter_rows(
+            """
+            SELECT pr.id, pr.date, pr.series, spa.additive_category,
+                   spa.additive_name, spa.dose_calculated, spa.qty
+              FROM ser_production_additives spa
+              JOIN production_records pr ON pr.id = spa.production_record_id
+             ORDER BY pr.date, pr.id, spa.id
+        """
+        )
+
+    def iter_additives_register(self) -> Iterator[tuple]:
+        """
+        (id, date, quantity, additive_name, expiry_date, remaining, price, lot_no)
+        – partie dostaw.
+        """
+        return self.iter_rows(
+            """
+            SELECT ar.id, ar.date, ar.quantity, a.name, ar.expiry_date, ar.remaining,
+                   ar.price, ar.lot_no
+              FROM additives_register ar
+              LEFT JOIN additives a ON a.id = ar.additive_id
+             ORDER BY ar.date, ar.id
+        """
+        )
+
+    def iter_packaging_register(self) -> Iterator[tuple]:
+        """
+        (id, date, quantity, packaging_name, price, expiry_date, lot_no)
+        – przyjęcia opakowań.
+        """
+        return self.iter_rows(
+            """
+            SELECT pr.id, pr.date, pr.quantity, p.name, pr.price, pr.expiry_date,
+                   pr.lot_no
+              FROM packaging_register pr
+              LEFT JOIN packaging p ON p.id = pr.packaging_id
+             ORDER BY pr.date, pr.id
+        """
+        )
+
+    # ----------------------------------------------------------------
+    # ---------- IMPORT MASOWY: słowniki nazw + executemany ----------
+    # ----------------------------------------------------------------
+    IMPORT_BATCH = 500
+
+    # Tabele, dla których import rozwiązuje nazwy na ID
+    _NAME_LOOKUP_TABLES = ("additives", "packaging", "products", "product_categories")
+
+    # Docelowe INSERT-y importu (kolejność wartości = krotka wiersza)
+    _BULK_INSERT_SQL = {
+        # (date, quantity, additive_id, expiry_date, qty, price, unit_price,
+        #  lot_no) – remaining = qty
+        "additives_register": """
+            INSERT INTO additives_register (
+                date, quantity, additive_id, expiry_date, qty, remaining,
+                price, unit_price, lot_no
+            )
+            VALUES (?1, ?2, ?3, ?4, ?5, ?5, ?6, ?7, ?8)
+        """,
+        # (date, quantity, packaging_id, qty, price, unit_price, expiry_date, lot_no)
+        "packaging_register": """
+            INSERT INTO packaging_register (
+                date, quantity, packaging_id, qty, price, unit_price,
+                expiry_date, lot_no
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        # (name, category_id, price, stock)
+        "products": """
+            INSERT INTO products (name, category_id, price, stock)
+            VALUES (?, ?, ?, ?)
+        """,
+        # (product_id, additive_id, dosage_per_100)
+        "product_additives": """
+            INSERT INTO product_additives (product_id, additive_id, dosage_per_100)
+            VALUES (?, ?, ?)
+        """,
+    }
+
+    def get_name_lookup(self, table: str) -> Dict[str, int]:
+        """
+        Słownik {nazwa małymi literami: id} dla tabeli z _NAME_LOOKUP_TABLES –
+        jedno zapytanie na cały import (przy powtórzonej nazwie wygrywa najstarszy wpis).
+        """
+        if table not in self._NAME_LOOKUP_TABLES:
+            raise ValueError(f"Brak słownika nazw dla tabeli: {table}")
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    f"SELECT name, id FROM {table} ORDER BY id"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu nazw z %s: %s", table, e)
+            return {}
+        lookup: Dict[str, int] = {}
+        for name, row_id in rows:
+            lookup.setdefault((name or "").strip().lower(), row_id)
+        return lookup
+
+    def bulk_insert(
+        self,
+        target: str,
+        rows: Iterable[tuple],
+        batch_size: int = IMPORT_BATCH,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Wstawia wiersze do tabeli target (klucz _BULK_INSERT_SQL) porcjami:
+        executemany + commit co batch_size wierszy, na jednym połączeniu.
+        progress(n) po każdej porcji. Zwraca liczbę wstawionych wierszy.
+        Błąd SQL => wycofanie bieżącej porcji, log i wyjątek dalej
+        (porcje już zatwierdzone zostają w bazie).
+        """
+        sql = self._BULK_INSERT_SQL[target]
+        total = 0
+        conn = self.create_connection()
+        try:
+            batch: List[tuple] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    total += self._insert_batch(conn, sql, batch)
+                    batch = []
+                    if progress is not None:
+                        progress(total)
+            if batch:
+                total += self._insert_batch(conn, sql, batch)
+                if progress is not None:
+                    progress(total)
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error("Błąd importu do %s po %d wierszach: %s", target, total, e)
+            raise
+        finally:
+            conn.close()
+        logger.info("Import do %s: %d wierszy", target, total)
+        return total
+
+    @staticmethod
+    def _insert_batch(conn: sqlite3.Connection, sql: str, batch: List[tuple]) -> int:
+        with conn:  # jedna transakcja na porcję
+            conn.executemany(sql, batch)
+        return len(batch)
+
+    # ----------------------------------------------------------------
+    # --------------- NOWA METODA: GET_ADDITIVE_BY_ID ---------------
+    # ----------------------------------------------------------------
+    def get_additive_by_id(self, additive_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Zwraca słownik z informacjami o danym dodatku (id, name, weight, dosage, category_id)
+        na podstawie jego ID, albo None, jeśli nie znaleziono wpisu w bazie.
+        """
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT id, name, weight, dosage, category_id
+                    FROM additives
+                    WHERE id = ?
+                """,
+                    (additive_id,),
+                )
+                row = cursor.fetchone()
+                if row:
+                    return {
                         "id": row[0],
                         "name": row[1],
                         "weight": row[2],
@@ -1093,7 +3932,7 @@ class DBManager:
                     }
                 return None
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu dodatku (id={additive_id}): {e}")
+            logger.error("Błąd przy pobieraniu dodatku (id=%s): %s", additive_id, e)
             return None
 
     # ----------------------------------------------------------------
@@ -1114,7 +3953,7 @@ class DBManager:
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy dodawaniu rekordu w production_records: {e}")
+            logger.error("Błąd przy dodawaniu rekordu w production_records: %s", e)
             raise
 
     def add_production_record_returning_id(
@@ -1133,8 +3972,8 @@ class DBManager:
                 conn.commit()
                 return cursor.lastrowid
         except sqlite3.Error as e:
-            print(
-                f"Błąd przy dodawaniu rekordu w production_records (returning id): {e}"
+            logger.error(
+                "Błąd przy dodawaniu rekordu w production_records (returning id): %s", e
             )
             raise
 
@@ -1160,251 +3999,642 @@ class DBManager:
                 row = cursor.fetchone()
                 return row[0] if row else 0
         except sqlite3.Error as e:
-            print(f"[DBManager] Błąd przy liczeniu protokołów: {e}")
+            logger.error("Błąd przy liczeniu protokołów: %s", e)
             return 0
 
-    def update_production_record(
-        self, record_id: int, new_date: str, new_series: str, new_product_id: int
-    ) -> None:
-        try:
-            with self.create_connection() as conn:
-                cursor = conn.cursor()
+    def update_production_record(
+        self, record_id: int, new_date: str, new_series: str, new_product_id: int
+    ) -> None:
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    UPDATE production_records
+                    SET date = ?,
+                        series = ?,
+                        product_id = ?
+                    WHERE id = ?
+                """,
+                    (new_date, new_series, new_product_id, record_id),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(
+                "Błąd przy aktualizacji production_records (id=%s): %s", record_id, e
+            )
+            raise
+
+    def get_next_series_number_for_month(self, month: int, full_year: int) -> int:
+        """
+        Zwraca KOLEJNY numer (integer) na podstawie tego,
+        jaki najwyższy numer serii jest w danym (miesiącu, roku) w production_records.
+        Format np. '00712_2024' -> bierzemy pierwsze 3 cyfry jako numer kolejny.
+        """
+        month_str = f"{month:02d}"
+        year_str = str(full_year)
+
+        sql = """
+            SELECT series
+            FROM production_records
+            WHERE
+                strftime('%m', date) = ?
+                AND strftime('%Y', date) = ?
+            ORDER BY series DESC
+            LIMIT 1
+        """
+
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, (month_str, year_str))
+                row = cursor.fetchone()
+                if row:
+                    last_series = row[0]  # np. "00712_2024"
+                    last_num_str = last_series[:3]  # "007"
+                    last_num = int(last_num_str)
+                    return last_num + 1
+                else:
+                    return 1
+        except Exception as e:
+            logger.error("Błąd w get_next_series_number_for_month: %s", e)
+            return 1
+
+    def get_product_by_id(self, product_id: int) -> Optional[dict]:
+        """
+        Zwraca słownik z informacjami o produkcie (id, name, category_id),
+        albo None, jeśli nie znaleziono wiersza w bazie.
+        """
+        with self.create_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, name, category_id FROM products WHERE id = ?", (product_id,)
+            )
+            row = cursor.fetchone()
+            if row:
+                return {"id": row[0], "name": row[1], "category_id": row[2]}
+            return None
+
+    # ----------------------------------------------------------------
+    # ------- PROTOKOŁY: tabele i zapytania z definicji typów --------
+    # ----------------------------------------------------------------
+    def ensure_protocol_tables(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Tworzy tabele szczegółów wszystkich typów protokołów (logic/protocol_types.py)
+        i dokłada brakujące kolumny (ALTER TABLE ... ADD COLUMN) – migracja starszych baz,
+        w których np. ser_production_details nie miało kolumn 9 czynności.
+        Kolumn nieużywanych przez definicję nie usuwamy.
+        Pola czasu mają obok tekstu kolumnę INTEGER <klucz>_min (minuty); gdy
+        migracja ją dodaje, wartości liczone są z tekstu (_backfill_stage_minutes).
+        """
+        for ptype in details_table_types():
+            table = ptype.details_table
+            column_defs = ", ".join(
+                [f"{col} TEXT" for col in ptype.columns]
+                + [f"{col} INTEGER" for col in ptype.minute_columns]
+            )
+            cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    production_record_id INTEGER NOT NULL,
+                    {column_defs},
+                    FOREIGN KEY (production_record_id) REFERENCES production_records(id)
+                )
+            """
+            )
+            self._add_missing_columns(
+                cursor, table, {col: "TEXT" for col in ptype.columns}
+            )
+            minutes_added = self._add_missing_columns(
+                cursor, table, {col: "INTEGER" for col in ptype.minute_columns}
+            )
+            if minutes_added:
+                self._backfill_stage_minutes(cursor, ptype)
+            cursor.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_record
+                ON {table} (production_record_id)
+            """
+            )
+
+    def _backfill_stage_minutes(
+        self, cursor: sqlite3.Cursor, ptype: ProtocolType
+    ) -> int:
+        """
+        Migracja: kolumny <klucz>_min z tekstu pól czasu ("HH:MM" itd.) dla
+        wszystkich wierszy tabeli szczegółów – jeden SELECT i jedno executemany.
+        Zwraca liczbę przeliczonych wierszy.
+        """
+        keys = [f.key for f in ptype.minute_fields]
+        cursor.execute(f"SELECT id, {', '.join(keys)} FROM {ptype.details_table}")
+        updates = [
+            ptype.minute_values(dict(zip(keys, row[1:]))) + [row[0]]
+            for row in cursor.fetchall()
+        ]
+        if updates:
+            cursor.executemany(
+                f"UPDATE {ptype.details_table} SET "
+                + ", ".join(f"{col} = ?" for col in ptype.minute_columns)
+                + " WHERE id = ?",
+                updates,
+            )
+            logger.info(
+                "Migracja: %s – minuty etapów dla %d wierszy",
+                ptype.details_table,
+                len(updates),
+            )
+        return len(updates)
+
+    def _add_missing_columns(
+        self, cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]
+    ) -> List[str]:
+        """
+        Migracja: ALTER TABLE ... ADD COLUMN dla kolumn {nazwa: typ}, których brak.
+        Zwraca listę dodanych kolumn.
+        """
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        added = []
+        for col, col_type in columns.items():
+            if col not in existing:
+                logger.info("Migracja: %s + kolumna '%s'", table, col)
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col} {col_type}")
+                added.append(col)
+        return added
+
+    def _get_protocol_sql(self, ptype: ProtocolType, operation: str) -> str:
+        """
+        Zwraca (budowane raz, potem z pamięci) zapytanie dla tabeli szczegółów typu:
+        "select" / "insert" / "update". Stały tekst => sqlite3 trzyma gotowy
+        (przygotowany) statement w swoim cache na połączeniu.
+        """
+        key = (ptype.details_table, operation)
+        sql = self._protocol_sql.get(key)
+        if sql is not None:
+            return sql
+
+        table = ptype.details_table
+        # Zapis: teksty pól + minuty pól czasu (wartości: values + minute_values)
+        cols = ptype.columns + ptype.minute_columns
+        if operation == "select":
+            sql = (
+                f"SELECT {', '.join(ptype.columns)} FROM {table} "
+                "WHERE production_record_id = ? ORDER BY id LIMIT 1"
+            )
+        elif operation == "insert":
+            sql = (
+                f"INSERT INTO {table} (production_record_id, {', '.join(cols)}) "
+                f"VALUES ({', '.join('?' for _ in range(len(cols) + 1))})"
+            )
+        elif operation == "update":
+            sql = (
+                f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in cols)} "
+                "WHERE production_record_id = ?"
+            )
+        else:
+            raise ValueError(f"Nieznana operacja: {operation}")
+
+        self._protocol_sql[key] = sql
+        return sql
+
+    def get_protocol_details(
+        self, ptype: ProtocolType, production_record_id: int
+    ) -> Dict[str, Any]:
+        """Szczegóły protokołu jako {kolumna: wartość} ({} jeśli brak wiersza)."""
+        try:
+            with self.create_connection() as conn:
+                row = conn.execute(
+                    self._get_protocol_sql(ptype, "select"), (production_record_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu %s: %s", ptype.details_table, e)
+            return {}
+        return dict(zip(ptype.columns, row)) if row else {}
+
+    def save_protocol(
+        self,
+        ptype: ProtocolType,
+        record_id: Optional[int],
+        date_str: str,
+        series_str: str,
+        product_id: int,
+        details: Dict[str, Any],
+        additive_lines: Iterable[Tuple[str, str, str]],
+        parties: Iterable[Tuple[str, Optional[float], str]] = (),
+        packaging: Iterable[Tuple[int, float]] = (),
+    ) -> int:
+        """
+        Zapisuje cały protokół w JEDNEJ transakcji:
+          - production_records (nowy wiersz, gdy record_id=None, inaczej UPDATE)
+            razem z sumą wag partii, wydajnością (kg / 100 L mleka), ilością
+            i rodzajem mleka (milk_l, milk_type); triggery aktualizują
+            production_monthly_summary,
+          - wiersz szczegółów w tabeli typu (UPDATE, a gdy go brak – INSERT);
+            przy edycji usuwany jest wiersz z tabel innych typów (zmiana
+            produktu na inną kategorię),
+          - dodatki (ser_production_additives): zwrot starych rozchodów do partii,
+            usunięcie starych linii, nowe linie rozchodowane z partii dostaw (FEFO);
+            triggery przeliczają przy tym stan magazynu dodatków (additive_stock),
+          - wartości pól SPC (spc_values; triggery => spc_stats, Welford),
+          - partie (production_parties: kod, waga kg, komentarz): j.w.,
+          - zużyte opakowania (production_packaging: id opakowania, ilość szt.): j.w.;
+            triggery aktualizują packaging_stock,
+          - na końcu koszty serii (cost_milk / cost_additives / cost_packaging).
+        Zwraca ID protokołu. Błąd => rollback całości i wyjątek dalej.
+        """
+        values = [details.get(col, "") for col in ptype.columns]
+        values += ptype.minute_values(details)
+        additive_lines = list(additive_lines)
+        parties = list(parties)
+        milk_l = parse_number(str(details.get(ptype.milk_field) or ""))
+        milk_type = str(details.get("milk_type") or "").strip() or None
+        total_weight, yield_pct = batch_totals(
+            (weight for _, weight, _ in parties), milk_l
+        )
+        try:
+            with self.create_connection() as conn:
+                cursor = conn.cursor()
+                if record_id is None:
+                    cursor.execute(
+                        """
+                        INSERT INTO production_records (
+                            date, series, product_id, total_weight_kg, yield_pct,
+                            milk_l, milk_type
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                        (
+                            date_str,
+                            series_str,
+                            product_id,
+                            total_weight,
+                            yield_pct,
+                            milk_l,
+                            milk_type,
+                        ),
+                    )
+                    record_id = cursor.lastrowid
+                else:
+                    cursor.execute(
+                        """
+                        UPDATE production_records
+                        SET date = ?, series = ?, product_id = ?,
+                            total_weight_kg = ?, yield_pct = ?, milk_l = ?,
+                            milk_type = ?
+                        WHERE id = ?
+                    """,
+                        (
+                            date_str,
+                            series_str,
+                            product_id,
+                            total_weight,
+                            yield_pct,
+                            milk_l,
+                            milk_type,
+                            record_id,
+                        ),
+                    )
+                    # produkt z innej kategorii => inny typ protokołu: wiersz
+                    # szczegółów poprzedniego typu nie może zostać osierocony
+                    for other in details_table_types():
+                        if other.details_table != ptype.details_table:
+                            cursor.execute(
+                                f"DELETE FROM {other.details_table}"
+                                " WHERE production_record_id = ?",
+                                (record_id,),
+                            )
+
+                cursor.execute(
+                    self._get_protocol_sql(ptype, "update"), values + [record_id]
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute(
+                        self._get_protocol_sql(ptype, "insert"), [record_id] + values
+                    )
+                self._store_spc_values(
+                    cursor, record_id, product_id, ptype.spc_values(details)
+                )
+
+                self._release_lot_allocations(cursor, record_id)
+                cursor.execute(
+                    "DELETE FROM ser_production_additives WHERE production_record_id = ?",
+                    (record_id,),
+                )
+                # additive_id + qty => triggery aktualizują stan magazynu dodatków,
+                # a każda linia jest rozchodowana z partii dostaw (FEFO)
+                additive_ids = self._additive_ids_by_name(
+                    cursor, (name for _, name, _ in additive_lines)
+                )
+                for cat, name, dose in additive_lines:
+                    additive_id = additive_ids.get(name)
+                    qty = to_base_quantity(dose)
+                    cursor.execute(
+                        """
+                        INSERT INTO ser_production_additives (
+                            production_record_id, additive_category, additive_name,
+                            dose_calculated, additive_id, qty
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                        (record_id, cat, name, dose, additive_id, qty),
+                    )
+                    if additive_id is not None and qty:
+                        self._allocate_lots(
+                            cursor, cursor.lastrowid, additive_id, qty, date_str
+                        )
+                cursor.execute(
+                    self._LOT_LINKS_INSERT_SQL.format(
+                        where="WHERE spa.production_record_id = ?"
+                    ),
+                    (record_id,),
+                )
+
+                cursor.execute(
+                    "DELETE FROM production_parties WHERE production_record_id = ?",
+                    (record_id,),
+                )
+                cursor.executemany(
+                    """
+                    INSERT INTO production_parties (
+                        production_record_id, party_no, party_code, weight_kg, comment
+                    )
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    [
+                        (record_id, no, code, weight, comment)
+                        for no, (code, weight, comment) in enumerate(parties, start=1)
+                    ],
+                )
+
                 cursor.execute(
+                    "DELETE FROM production_packaging WHERE production_record_id = ?",
+                    (record_id,),
+                )
+                cursor.executemany(
                     """
-                    UPDATE production_records
-                    SET date = ?,
-                        series = ?,
-                        product_id = ?
-                    WHERE id = ?
+                    INSERT INTO production_packaging (production_record_id, packaging_id, qty)
+                    VALUES (?, ?, ?)
                 """,
-                    (new_date, new_series, new_product_id, record_id),
+                    [(record_id, pid, qty) for pid, qty in packaging],
                 )
+                self._recompute_batch_costs(cursor, "id = ?", (record_id,))
                 conn.commit()
+                return record_id
         except sqlite3.Error as e:
-            print(f"Błąd przy aktualizacji production_records (id={record_id}): {e}")
+            logger.error("Błąd przy zapisie protokołu (%s): %s", ptype.details_table, e)
             raise
 
-    # ----------------------------------------------------------------
-    # ------------------ ser_production_details (CRUD) --------------
-    # ----------------------------------------------------------------
-    def add_ser_production_details(
-        self,
-        production_record_id: int,
-        milk_amount: str,
-        ph: str,
-        pasteryzacja_str: int,
-        krojenie_start: str,
-        krojenie_end: str,
-        plukanie_start: str,
-        plukanie_end: str,
-        dogrzewanie_start: str,
-        dogrzewanie_end: str,
-        serwatka_plus: str,
-        woda_minus: str,
-        temp_poczatkowa: str,
-        temp_koncowa: str,
-    ) -> None:
-        """
-        Dodaje nowy wiersz do tabeli ser_production_details.
-        """
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO ser_production_details (
-                    production_record_id,
-                    milk_amount,
-                    ph,
-                    dodanie_kultur_start,
-                    dodanie_kultur_end,
-                    podpuszczka_start,
-                    podpuszczka_end,
-                    krojenie_start,
-                    krojenie_end,
-                    serwatka_start,
-                    serwatka_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    dosuszanie_start,
-                    dosuszanie_end,
-                    wstepne_prasowanie_start,
-                    wstepne_prasowanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end,
-                    pasteryzacja
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    @staticmethod
+    def _party_row_to_dict(row: tuple) -> Dict[str, Any]:
+        return {
+            "party_no": row[0],
+            "party_code": row[1],
+            "weight_kg": row[2],
+            "comment": row[3],
+        }
+
+    def get_production_parties(self, production_record_id: int) -> List[Dict[str, Any]]:
+        """Partie protokołu (party_no, party_code, weight_kg, comment) – po indeksie."""
+        try:
+            with self.create_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT party_no, party_code, weight_kg, comment
+                      FROM production_parties
+                     WHERE production_record_id = ?
+                     ORDER BY party_no
                 """,
-                (
-                    production_record_id,
-                    milk_amount,
-                    ph,
-                    dodanie_kultur_start,
-                    dodanie_kultur_end,
-                    podpuszczka_start,
-                    podpuszczka_end,
-                    krojenie_start,
-                    krojenie_end,
-                    serwatka_start,
-                    serwatka_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    dosuszanie_start,
-                    dosuszanie_end,
-                    wstepne_prasowanie_start,
-                    wstepne_prasowanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end,
-                    pasteryzacja,
-                ),
+                    (production_record_id,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(
+                "Błąd przy pobieraniu partii (id=%s): %s", production_record_id, e
             )
-            conn.commit()
+            return []
+        return [self._party_row_to_dict(row) for row in rows]
 
-    def get_ser_production_details(self, production_record_id: int) -> Dict[str, Any]:
-        """
-        Pobiera szczegółowe dane protokołu 'Ser' z tabeli ser_production_details
-        dla danego production_record_id. Zwraca słownik z polami (kolumnami).
-        Jeśli brak wiersza – zwraca pusty słownik.
-        """
+    @staticmethod
+    def _packaging_use_row_to_dict(row: tuple) -> Dict[str, Any]:
+        return {"packaging_id": row[0], "packaging_name": row[1], "qty": row[2]}
+
+    def get_production_packaging(
+        self, production_record_id: int
+    ) -> List[Dict[str, Any]]:
+        """Opakowania zużyte w protokole (packaging_id, packaging_name, qty)."""
         try:
             with self.create_connection() as conn:
-                cursor = conn.cursor()
-                # Upewnij się, że SELECT uwzględnia *wszystkie* kolumny w tabeli
-                # (poza 'id', jeśli chcesz) w tej samej kolejności, co w DB:
-                cursor.execute(
-                    """
-                    SELECT
-                        id,
-                        production_record_id,
-                        milk_amount,
-                        ph,
-                        dodanie_kultur_start,
-                        dodanie_kultur_end,
-                        podpuszczka_start,
-                        podpuszczka_end,
-                        krojenie_start,
-                        krojenie_end,
-                        serwatka_start,
-                        serwatka_end,
-                        dogrzewanie_start,
-                        dogrzewanie_end,
-                        dosuszanie_start,
-                        dosuszanie_end,
-                        wstepne_prasowanie_start,
-                        wstepne_prasowanie_end,
-                        formy_wielkosc,
-                        formy_ilosc,
-                        solenie_start,
-                        solenie_end,
-                        pasteryzacja
-                    FROM ser_production_details
-                    WHERE production_record_id = ?
+                rows = conn.execute(
+                    """
+                    SELECT pp.packaging_id, p.name, pp.qty
+                      FROM production_packaging pp
+                      LEFT JOIN packaging p ON p.id = pp.packaging_id
+                     WHERE pp.production_record_id = ?
+                     ORDER BY pp.id
                 """,
                     (production_record_id,),
-                )
-
-                row = cursor.fetchone()
-                if row:
-                    return {
-                        "id": row[0],
-                        "production_record_id": row[1],
-                        "milk_amount": row[2],
-                        "ph": row[3],
-                        "dodanie_kultur_start": row[4],
-                        "dodanie_kultur_end": row[5],
-                        "podpuszczka_start": row[6],
-                        "podpuszczka_end": row[7],
-                        "krojenie_start": row[8],
-                        "krojenie_end": row[9],
-                        "serwatka_start": row[10],
-                        "serwatka_end": row[11],
-                        "dogrzewanie_start": row[12],
-                        "dogrzewanie_end": row[13],
-                        "dosuszanie_start": row[14],
-                        "dosuszanie_end": row[15],
-                        "wstepne_prasowanie_start": row[16],
-                        "wstepne_prasowanie_end": row[17],
-                        "formy_wielkosc": row[18],
-                        "formy_ilosc": row[19],
-                        "solenie_start": row[20],
-                        "solenie_end": row[21],
-                        "pasteryzacja": row[22],
-                    }
-                else:
-                    return {}
+                ).fetchall()
         except sqlite3.Error as e:
-            print(f"Błąd przy pobieraniu ser_production_details: {e}")
-            return {}
+            logger.error(
+                "Błąd przy pobieraniu opakowań (id=%s): %s", production_record_id, e
+            )
+            return []
+        return [self._packaging_use_row_to_dict(row) for row in rows]
 
-    def delete_ser_production_details(self, production_record_id: int) -> None:
+    def delete_production_record(self, record_id: int) -> None:
+        """
+        Usuwa protokół razem z wierszami zależnymi (szczegóły wszystkich typów,
+        dodatki wraz z rozchodem z partii dostaw, partie, opakowania)
+        – w jednej transakcji, bo klucze obce nie mają ON DELETE CASCADE.
+        """
         try:
             with self.create_connection() as conn:
                 cursor = conn.cursor()
+                for ptype in details_table_types():
+                    cursor.execute(
+                        f"DELETE FROM {ptype.details_table}"
+                        " WHERE production_record_id = ?",
+                        (record_id,),
+                    )
+                self._release_lot_allocations(cursor, record_id)
+                for table in (
+                    "ser_production_additives",
+                    "production_parties",
+                    "production_packaging",
+                    "spc_values",
+                ):
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE production_record_id = ?",
+                        (record_id,),
+                    )
                 cursor.execute(
-                    """
-                    DELETE FROM ser_production_details
-                    WHERE production_record_id = ?
-                """,
-                    (production_record_id,),
+                    "DELETE FROM production_records WHERE id = ?", (record_id,)
                 )
                 conn.commit()
         except sqlite3.Error as e:
-            print(f"Błąd przy usuwaniu ser_production_details: {e}")
+            logger.error("Błąd przy usuwaniu protokołu (id=%s): %s", record_id, e)
             raise
 
-    def get_next_series_number_for_month(self, month: int, full_year: int) -> int:
+    # ----------------------------------------------------------------
+    # ---------- PROTOKÓŁ: odczyt całości w JEDNYM zapytaniu ---------
+    # ----------------------------------------------------------------
+    def _get_protocol_bundle_sql(self, conn: sqlite3.Connection) -> str:
         """
-        Zwraca KOLEJNY numer (integer) na podstawie tego,
-        jaki najwyższy numer serii jest w danym (miesiącu, roku) w production_records.
-        Format np. '00712_2024' -> bierzemy pierwsze 3 cyfry jako numer kolejny.
+        Buduje (raz, potem z pamięci) zapytanie łączące production_records z produktem,
+        kategorią, tabelami szczegółów wszystkich typów protokołów i liniami dodatków.
+        Kolumny tabel szczegółów odczytujemy z PRAGMA table_info – pomijamy tabele,
+        których w bazie nie ma, a kolumny aliasujemy jako "<tabela>.<kolumna>".
         """
-        month_str = f"{month:02d}"
-        year_str = str(full_year)
+        if self._protocol_bundle_sql is not None:
+            return self._protocol_bundle_sql
 
-        sql = """
-            SELECT series
-            FROM production_records
-            WHERE
-                strftime('%m', date) = ?
-                AND strftime('%Y', date) = ?
-            ORDER BY series DESC
-            LIMIT 1
+        select_cols = [
+            "pr.id",
+            "pr.date",
+            "pr.series",
+            "pr.product_id",
+            "p.name",
+            "p.category_id",
+            "pc.name",
+            "spa.id",
+            "spa.additive_category",
+            "spa.additive_name",
+            "spa.dose_calculated",
+            "pr.total_weight_kg",
+            "pr.yield_pct",
+        ]
+        joins = []
+        tables = []
+        for i, ptype in enumerate(details_table_types()):
+            table = ptype.details_table
+            cols = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            if not cols:
+                continue
+            alias = f"d{i}"
+            joins.append(
+                f"LEFT JOIN {table} {alias} ON {alias}.production_record_id = pr.id"
+            )
+            select_cols.extend(f"{alias}.{c}" for c in cols)
+            tables.append((table, cols))
+
+        self._protocol_bundle_tables = tables
+        self._protocol_bundle_sql = f"""
+            SELECT {", ".join(select_cols)}
+              FROM production_records pr
+              LEFT JOIN products p ON pr.product_id = p.id
+              LEFT JOIN product_categories pc ON p.category_id = pc.id
+              LEFT JOIN ser_production_additives spa ON spa.production_record_id = pr.id
+              {" ".join(joins)}
+             WHERE pr.id IN ({{placeholders}})
+             ORDER BY pr.id, spa.id
         """
+        return self._protocol_bundle_sql
 
+    def get_protocol_bundles(
+        self, record_ids: Iterable[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Zwraca {record_id: pakiet} dla podanych protokołów – jednym zapytaniem
+        (plus indeksowane zapytania o partie i opakowania, żeby nie mnożyć wierszy JOIN-em).
+        Pakiet zawiera klucze production_records (id, date, series, product_id) oraz:
+          - "product":        {"id", "name", "category_id"} albo None,
+          - "category_name":  nazwa kategorii produktu ("" jeśli brak),
+          - "details":        wiersz z tabeli szczegółów właściwej dla kategorii ({} jeśli brak),
+          - "additive_lines": zapisane dodatki (ser_production_additives),
+          - "parties":        partie (production_parties),
+          - "packaging":      zużyte opakowania (production_packaging),
+          - "total_weight_kg", "yield_pct": wartości policzone przy zapisie.
+        """
+        ids = list(dict.fromkeys(int(r) for r in record_ids))
+        if not ids:
+            return {}
         try:
             with self.create_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, (month_str, year_str))
-                row = cursor.fetchone()
-                if row:
-                    last_series = row[0]  # np. "00712_2024"
-                    last_num_str = last_series[:3]  # "007"
-                    last_num = int(last_num_str)
-                    return last_num + 1
-                else:
-                    return 1
-        except Exception as e:
-            print(f"[DBManager] Błąd w get_next_series_number_for_month: {e}")
-            return 1
+                sql = self._get_protocol_bundle_sql(conn).format(
+                    placeholders=", ".join("?" for _ in ids)
+                )
+                rows = conn.execute(sql, ids).fetchall()
+                party_rows = conn.execute(
+                    f"""
+                    SELECT production_record_id, party_no, party_code, weight_kg, comment
+                      FROM production_parties
+                     WHERE production_record_id IN ({", ".join("?" for _ in ids)})
+                     ORDER BY production_record_id, party_no
+                """,
+                    ids,
+                ).fetchall()
+                packaging_rows = conn.execute(
+                    f"""
+                    SELECT pp.production_record_id, pp.packaging_id, p.name, pp.qty
+                      FROM production_packaging pp
+                      LEFT JOIN packaging p ON p.id = pp.packaging_id
+                     WHERE pp.production_record_id IN ({", ".join("?" for _ in ids)})
+                     ORDER BY pp.production_record_id, pp.id
+                """,
+                    ids,
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Błąd przy pobieraniu protokołów (ids=%s): %s", ids, e)
+            return {}
 
-    def get_product_by_id(self, product_id: int) -> Optional[dict]:
+        bundles: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            record_id = row[0]
+            bundle = bundles.get(record_id)
+            if bundle is None:
+                category_name = row[6] or ""
+                details_table = get_protocol_type(category_name).details_table
+                details: Dict[str, Any] = {}
+                offset = 13
+                for table, cols in self._protocol_bundle_tables:
+                    values = row[offset : offset + len(cols)]
+                    offset += len(cols)
+                    if table == details_table and values[0] is not None:
+                        details = dict(zip(cols, values))
+                bundle = {
+                    "id": record_id,
+                    "date": row[1],
+                    "series": row[2],
+                    "product_id": row[3],
+                    "total_weight_kg": row[11],
+                    "yield_pct": row[12],
+                    "product": (
+                        {"id": row[3], "name": row[4], "category_id": row[5]}
+                        if row[4] is not None
+                        else None
+                    ),
+                    "category_name": category_name,
+                    "details": details,
+                    "additive_lines": [],
+                    "parties": [],
+                    "packaging": [],
+                }
+                bundles[record_id] = bundle
+            if row[7] is not None:
+                bundle["additive_lines"].append(
+                    {
+                        "id": row[7],
+                        "additive_category": row[8],
+                        "additive_name": row[9],
+                        "dose_calculated": row[10],
+                    }
+                )
+        for row in party_rows:
+            bundle = bundles.get(row[0])
+            if bundle is not None:
+                bundle["parties"].append(self._party_row_to_dict(row[1:]))
+        for row in packaging_rows:
+            bundle = bundles.get(row[0])
+            if bundle is not None:
+                bundle["packaging"].append(self._packaging_use_row_to_dict(row[1:]))
+        return bundles
+
+    def get_protocol_bundle(self, record_id: int) -> Optional[Dict[str, Any]]:
         """
-        Zwraca słownik z informacjami o produkcie (id, name, category_id),
-        albo None, jeśli nie znaleziono wiersza w bazie.
+        Nagłówek + produkt + kategoria + szczegóły + dodatki + partie + opakowania
+        (patrz get_protocol_bundles). None, jeśli protokół nie istnieje.
         """
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id, name, category_id FROM products WHERE id = ?", (product_id,)
-            )
-            row = cursor.fetchone()
-            if row:
-                return {"id": row[0], "name": row[1], "category_id": row[2]}
-            return None
+        return self.get_protocol_bundles([record_id]).get(record_id)
 
     # ----------------------------------------------------------------
     # -------------- ser_production_additives (CRUD) ----------------
@@ -1447,96 +4677,19 @@ class DBManager:
                     production_record_id,
                     additive_category,
                     additive_name,
-                    dose_calculated
+                    dose_calculated,
+                    additive_id,
+                    qty
                 )
-                VALUES (?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, (SELECT MIN(id) FROM additives WHERE name = ?), ?)
             """,
-                (production_record_id, cat_name, add_name, dose_str),
-            )
-            conn.commit()
-
-    def add_ser_production_details_extended(
-        self,
-        production_record_id: int,
-        milk_amount: str,
-        ph: str,
-        pasteryzacja: str,
-        dodanie_kultur_start: str,
-        dodanie_kultur_end: str,
-        podpuszczka_start: str,
-        podpuszczka_end: str,
-        krojenie_start: str,
-        krojenie_end: str,
-        serwatka_start: str,
-        serwatka_end: str,
-        dogrzewanie_start: str,
-        dogrzewanie_end: str,
-        dosuszanie_start: str,
-        dosuszanie_end: str,
-        wstepne_prasowanie_start: str,
-        wstepne_prasowanie_end: str,
-        formy_wielkosc: str,
-        formy_ilosc: str,
-        solenie_start: str,
-        solenie_end: str,
-    ) -> None:
-        """
-        Wstawia nowy wiersz do ser_production_details z pełnym zestawem pól,
-        w tym polem 'pasteryzacja' i 9 czynności (start/end).
-        """
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO ser_production_details (
-                    production_record_id,
-                    milk_amount,
-                    ph,
-                    dodanie_kultur_start,
-                    dodanie_kultur_end,
-                    podpuszczka_start,
-                    podpuszczka_end,
-                    krojenie_start,
-                    krojenie_end,
-                    serwatka_start,
-                    serwatka_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    dosuszanie_start,
-                    dosuszanie_end,
-                    wstepne_prasowanie_start,
-                    wstepne_prasowanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end,
-                    pasteryzacja
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
                 (
                     production_record_id,
-                    milk_amount,
-                    ph,
-                    dodanie_kultur_start,
-                    dodanie_kultur_end,
-                    podpuszczka_start,
-                    podpuszczka_end,
-                    krojenie_start,
-                    krojenie_end,
-                    serwatka_start,
-                    serwatka_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    dosuszanie_start,
-                    dosuszanie_end,
-                    wstepne_prasowanie_start,
-                    wstepne_prasowanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end,
-                    pasteryzacja,
+                    cat_name,
+                    add_name,
+                    dose_str,
+                    add_name,
+                    to_base_quantity(dose_str),
                 ),
             )
             conn.commit()
@@ -1559,466 +4712,23 @@ class DBManager:
                     production_record_id,
                     additive_category,
                     additive_name,
-                    dose_calculated
-                )
-                VALUES (?, ?, ?, ?)
-            """,
-                (production_record_id, cat_name, add_name, dose_str),
-            )
-            conn.commit()
-
-    def update_ser_production_details_extended(
-        self,
-        production_record_id: int,
-        milk_amount: str,
-        ph: str,
-        pasteryzacja: str,
-        dodanie_kultur_start: str,
-        dodanie_kultur_end: str,
-        podpuszczka_start: str,
-        podpuszczka_end: str,
-        krojenie_start: str,
-        krojenie_end: str,
-        serwatka_start: str,
-        serwatka_end: str,
-        dogrzewanie_start: str,
-        dogrzewanie_end: str,
-        dosuszanie_start: str,
-        dosuszanie_end: str,
-        wstepne_prasowanie_start: str,
-        wstepne_prasowanie_end: str,
-        formy_wielkosc: str,
-        formy_ilosc: str,
-        solenie_start: str,
-        solenie_end: str,
-    ) -> None:
-        """
-        Aktualizuje istniejący wiersz w ser_production_details (zidentyfikowany
-        przez production_record_id), uwzględniając pole 'pasteryzacja' i 9 czynności.
-        """
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE ser_production_details
-                SET
-                    milk_amount               = ?,
-                    ph                       = ?,
-                    pasteryzacja            = ?,
-                    dodanie_kultur_start    = ?,
-                    dodanie_kultur_end      = ?,
-                    podpuszczka_start       = ?,
-                    podpuszczka_end         = ?,
-                    krojenie_start          = ?,
-                    krojenie_end            = ?,
-                    serwatka_start          = ?,
-                    serwatka_end            = ?,
-                    dogrzewanie_start       = ?,
-                    dogrzewanie_end         = ?,
-                    dosuszanie_start        = ?,
-                    dosuszanie_end          = ?,
-                    wstepne_prasowanie_start= ?,
-                    wstepne_prasowanie_end  = ?,
-                    formy_wielkosc          = ?,
-                    formy_ilosc             = ?,
-                    solenie_start           = ?,
-                    solenie_end             = ?
-                WHERE production_record_id = ?
-                """,
-                (
-                    milk_amount,
-                    ph,
-                    pasteryzacja,
-                    dodanie_kultur_start,
-                    dodanie_kultur_end,
-                    podpuszczka_start,
-                    podpuszczka_end,
-                    krojenie_start,
-                    krojenie_end,
-                    serwatka_start,
-                    serwatka_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    dosuszanie_start,
-                    dosuszanie_end,
-                    wstepne_prasowanie_start,
-                    wstepne_prasowanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end,
-                    production_record_id,  # warunek w WHERE
-                ),
-            )
-            conn.commit()
-
-    def add_fermented_production_details(
-        self,
-        production_record_id: int,
-        milk_type: str,
-        amt: str,
-        ph: str,
-        pasteryzacja: str,
-        dod_kultur_godz: str,
-        dod_kultur_czas: str,
-        rozl_start: str,
-        rozl_end: str,
-        ink_temp: str,
-        ink_czas: str,
-        chl_godz: str,
-        chl_temp_end: str,
-    ) -> None:
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO fermented_production_details (
-                    production_record_id,
-                    milk_type,
-                    amt,
-                    ph,
-                    pasteryzacja,
-                    dod_kultur_godz,
-                    dod_kultur_czas,
-                    rozl_start,
-                    rozl_end,
-                    ink_temp,
-                    ink_czas,
-                    chl_godz,
-                    chl_temp_end
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    production_record_id,
-                    milk_type,
-                    amt,
-                    ph,
-                    pasteryzacja,
-                    dod_kultur_godz,
-                    dod_kultur_czas,
-                    rozl_start,
-                    rozl_end,
-                    ink_temp,
-                    ink_czas,
-                    chl_godz,
-                    chl_temp_end,
-                ),
-            )
-            conn.commit()
-
-    def update_fermented_production_details(
-        self,
-        production_record_id: int,
-        milk_type: str,
-        amt: str,
-        ph: str,
-        pasteryzacja: str,
-        dod_kultur_godz: str,
-        dod_kultur_czas: str,
-        rozl_start: str,
-        rozl_end: str,
-        ink_temp: str,
-        ink_czas: str,
-        chl_godz: str,
-        chl_temp_end: str,
-    ) -> None:
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE fermented_production_details
-                SET
-                    milk_type = ?,
-                    amt = ?,
-                    ph = ?,
-                    pasteryzacja = ?,
-                    dod_kultur_godz = ?,
-                    dod_kultur_czas = ?,
-                    rozl_start = ?,
-                    rozl_end = ?,
-                    ink_temp = ?,
-                    ink_czas = ?,
-                    chl_godz = ?,
-                    chl_temp_end = ?
-                WHERE production_record_id = ?
-            """,
-                (
-                    milk_type,
-                    amt,
-                    ph,
-                    pasteryzacja,
-                    dod_kultur_godz,
-                    dod_kultur_czas,
-                    rozl_start,
-                    rozl_end,
-                    ink_temp,
-                    ink_czas,
-                    chl_godz,
-                    chl_temp_end,
-                    production_record_id,
-                ),
-            )
-            conn.commit()
-
-    def get_fermented_production_details(
-        self, production_record_id: int
-    ) -> Dict[str, Any]:
-        """
-        Pobiera szczegóły z tabeli fermented_production_details
-        dla danego production_record_id.
-        """
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT
-                    id,
-                    production_record_id,
-                    milk_type,
-                    amt,
-                    ph,
-                    pasteryzacja,
-                    dod_kultur_godz,
-                    dod_kultur_czas,
-                    rozl_start,
-                    rozl_end,
-                    ink_temp,
-                    ink_czas,
-                    chl_godz,
-                    chl_temp_end
-                FROM fermented_production_details
-                WHERE production_record_id = ?
-            """,
-                (production_record_id,),
-            )
-
-            row = cursor.fetchone()
-            if row:
-                return {
-                    "id": row[0],
-                    "production_record_id": row[1],
-                    "milk_type": row[2],
-                    "amt": row[3],
-                    "ph": row[4],
-                    "pasteryzacja": row[5],
-                    "dod_kultur_godz": row[6],
-                    "dod_kultur_czas": row[7],
-                    "rozl_start": row[8],
-                    "rozl_end": row[9],
-                    "ink_temp": row[10],
-                    "ink_czas": row[11],
-                    "chl_godz": row[12],
-                    "chl_temp_end": row[13],
-                }
-            else:
-                return {}
-
-    # -------------- TWAROG (CRUD) --------------
-    def add_twarog_production_details(
-        self,
-        production_record_id: int,
-        milk_type: str,
-        milk_amount: str,
-        ph: str,
-        pasteryzacja: str,
-        krojenie_start: str,
-        krojenie_end: str,
-        dogrzewanie_start: str,
-        dogrzewanie_end: str,
-        formy_wielkosc: str,
-        formy_ilosc: str,
-        solenie_start: str,
-        solenie_end: str,
-    ) -> None:
-        """
-        Dodaje nowy wiersz do tabeli twarog_production_details.
-        """
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO twarog_production_details (
-                    production_record_id,
-                    milk_type,       
-                    milk_amount,
-                    ph,
-                    pasteryzacja,
-                    krojenie_start,
-                    krojenie_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    production_record_id,
-                    milk_type,
-                    milk_amount,
-                    ph,
-                    pasteryzacja,
-                    krojenie_start,
-                    krojenie_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end,
-                ),
-            )
-            conn.commit()
-
-    def get_twarog_production_details(self, production_record_id: int) -> dict:
-        """
-        Pobiera wiersz z twarog_production_details dla danego production_record_id.
-        Zwraca słownik z kluczami odpowiadającymi kolumnom w tabeli.
-        Jeśli brak — zwraca pusty słownik {}.
-        """
-        try:
-            with self.create_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    SELECT
-                        id,
-                        production_record_id,
-                        milk_type,
-                        milk_amount,
-                        ph,
-                        pasteryzacja,
-                        krojenie_start,
-                        krojenie_end,
-                        dogrzewanie_start,
-                        dogrzewanie_end,
-                        formy_wielkosc,
-                        formy_ilosc,
-                        solenie_start,
-                        solenie_end
-                    FROM twarog_production_details
-                    WHERE production_record_id = ?
-                """,
-                    (production_record_id,),
+                    dose_calculated,
+                    additive_id,
+                    qty
                 )
-                row = cursor.fetchone()
-                if row:
-                    return {
-                        "id": row[0],
-                        "production_record_id": row[1],
-                        "milk_type": row[2],
-                        "milk_amount": row[3],
-                        "ph": row[4],
-                        "pasteryzacja": row[5],
-                        "krojenie_start": row[6],
-                        "krojenie_end": row[7],
-                        "dogrzewanie_start": row[8],
-                        "dogrzewanie_end": row[9],
-                        "formy_wielkosc": row[10],
-                        "formy_ilosc": row[11],
-                        "solenie_start": row[12],
-                        "solenie_end": row[13],
-                    }
-                else:
-                    return {}
-        except Exception as e:
-            print(f"[DBManager] Błąd w get_twarog_production_details: {e}")
-            return {}
-
-    def update_twarog_production_details(
-        self,
-        production_record_id: int,
-        milk_type: str,
-        milk_amount: str,
-        ph: str,
-        pasteryzacja: str,
-        krojenie_start: str,
-        krojenie_end: str,
-        dogrzewanie_start: str,
-        dogrzewanie_end: str,
-        formy_wielkosc: str,
-        formy_ilosc: str,
-        solenie_start: str,
-        solenie_end: str,
-    ) -> None:
-        """
-        Aktualizuje istniejący wiersz w twarog_production_details
-        (identyfikowany przez production_record_id).
-        """
-        with self.create_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE twarog_production_details
-                SET
-                    milk_type        = ?,  
-                    milk_amount       = ?,
-                    ph               = ?,
-                    pasteryzacja     = ?,
-                    krojenie_start   = ?,
-                    krojenie_end     = ?,
-                    dogrzewanie_start= ?,
-                    dogrzewanie_end  = ?,
-                    formy_wielkosc   = ?,
-                    formy_ilosc      = ?,
-                    solenie_start    = ?,
-                    solenie_end      = ?
-                WHERE production_record_id = ?
+                VALUES (?, ?, ?, ?, (SELECT MIN(id) FROM additives WHERE name = ?), ?)
             """,
                 (
-                    milk_type,
-                    milk_amount,
-                    ph,
-                    pasteryzacja,
-                    krojenie_start,
-                    krojenie_end,
-                    dogrzewanie_start,
-                    dogrzewanie_end,
-                    formy_wielkosc,
-                    formy_ilosc,
-                    solenie_start,
-                    solenie_end,
                     production_record_id,
+                    cat_name,
+                    add_name,
+                    dose_str,
+                    add_name,
+                    to_base_quantity(dose_str),
                 ),
             )
             conn.commit()
 
-    def fill_additives_from_record(self, record_id: int) -> None:
-        self.clear_additives_fields()
-
-        if not self.db_manager:
-            return
-
-        # załóżmy, że w DBManager mamy:
-        #    get_ser_production_additives_for_record(record_id)
-        # zwracające listę słowników: [
-        #   { "additive_category":..., "additive_name":..., "dose_calculated":... }, …
-        # ]
-        lines = self.db_manager.get_ser_production_additives_for_record(record_id)
-        for i, row in enumerate(lines):
-            if i >= len(self.additive_lines):
-                break
-            cat_str = row.get("additive_category", "")
-            add_str = row.get("additive_name", "")
-            dose_str = row.get("dose_calculated", "")
-
-            # parse dosage:
-            base_val, unit = parse_dosage(dose_str)
-            self.additives_info[i] = (base_val, unit)
-
-            # wypełniamy pola wiersza
-            cat_edit, add_edit, dose_edit = self.additive_lines[i]
-            cat_edit.setText(cat_str)
-            add_edit.setText(add_str)
-            # Możemy wstawić:
-            dose_edit.setText(dose_str)  # np. "30.0 g"
-        # ewentualnie na końcu update_doses() – ale to znów przeliczy
-        # i może nadpisać. Więc jeśli chcemy to ZACHOWAĆ, możemy pominąć
-        # update_doses()
-
     def get_ser_production_additives_for_record(self, record_id: int) -> List[dict]:
         result = []
         with self.create_connection() as conn:
@@ -0,0 +1,41 @@
+# c:\serownia\database\export_xlsx.py
+"""
+Eksport danych do .xlsx bez GUI (logic/xlsx_export.py, tryb write-only):
+
+    python -m database.export_xlsx plik.xlsx [--only protocols ...] [--db ścieżka]
+
+Domyślnie eksportowane są wszystkie zbiory: production_records, protocols,
+additives_register, packaging_register.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from database.db_manager import DBManager
+from logic.log_config import configure_logging
+from logic.xlsx_export import EXPORT_SETS, export_xlsx
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m database.export_xlsx")
+    parser.add_argument("path", help="plik wynikowy .xlsx")
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=EXPORT_SETS,
+        default=list(EXPORT_SETS),
+        help="zbiory do eksportu (domyślnie wszystkie)",
+    )
+    parser.add_argument("--db", default=None, help="ścieżka do pliku bazy")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    total = export_xlsx(db, args.path, args.only)
+    print(f"Wyeksportowano {total} wierszy do {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
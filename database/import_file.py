@@ -0,0 +1,39 @@
+# c:\serownia\database\import_file.py
+"""
+Import masowy z .xlsx / .csv bez GUI (logic/bulk_import.py):
+
+    python -m database.import_file additives_register dostawy.xlsx [--db ścieżka]
+
+Zbiory: additives_register, packaging_register, products, recipes.
+Odrzucone wiersze trafiają do <plik>_odrzucone.csv; kod wyjścia 1,
+jeśli jakieś były.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from database.db_manager import DBManager
+from logic.bulk_import import IMPORT_SPECS, import_file
+from logic.log_config import configure_logging
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m database.import_file")
+    parser.add_argument("spec", choices=sorted(IMPORT_SPECS), help="co importujemy")
+    parser.add_argument("path", help="plik .xlsx albo .csv (1. wiersz = nagłówki)")
+    parser.add_argument("--rejects", default=None, help="plik odrzuceń (CSV)")
+    parser.add_argument("--db", default=None, help="ścieżka do pliku bazy")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+    result = import_file(db, args.spec, args.path, reject_path=args.rejects)
+    print(f"Zaimportowano {result.imported} wierszy, odrzucono {result.rejected}")
+    if result.reject_path:
+        print(f"Odrzucone wiersze: {result.reject_path}")
+    return 1 if result.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# c:\serownia\database\rebuild_stock.py
+"""
+Pełne przeliczenie stanów magazynowych (additive_stock, packaging_stock) bez GUI:
+
+    python -m database.rebuild_stock [ścieżka_do_bazy]
+
+Wypisuje rozbieżności między stanem utrzymywanym triggerami a policzonym
+od zera; kod wyjścia 1, jeśli jakieś były (zostały już poprawione).
+"""
+
+import sys
+from typing import List, Optional
+
+from database.db_manager import DBManager
+from logic.log_config import configure_logging
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    configure_logging()
+    db = DBManager(db_path=args[0] if args else None)
+
+    total = 0
+    for label, key, rebuild in (
+        ("dodatek", "additive_id", db.rebuild_additive_stock),
+        ("opakowanie", "packaging_id", db.rebuild_packaging_stock),
+    ):
+        mismatches = rebuild()
+        for item in mismatches:
+            print(
+                f"{label} id={item[key]}: "
+                f"było {item['stored_balance']:g}, jest {item['rebuilt_balance']:g}"
+            )
+        total += len(mismatches)
+    print(f"Przeliczono stany magazynowe, rozbieżności: {total}")
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+# c:\serownia\database\rebuild_summary.py
+"""
+Pełne przeliczenie podsumowań miesięcznych produkcji bez GUI:
+
+    python -m database.rebuild_summary [ścieżka_do_bazy]
+
+Przelicza production_records.milk_l z tabel szczegółów i production_monthly_summary
+od zera; wypisuje rozbieżności, kod wyjścia 1, jeśli jakieś były
+(zostały już poprawione).
+"""
+
+import sys
+from typing import List, Optional
+
+from database.db_manager import DBManager
+from logic.log_config import configure_logging
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    configure_logging()
+    db = DBManager(db_path=args[0] if args else None)
+
+    mismatches = db.rebuild_production_summary()
+    for item in mismatches:
+        print(
+            f"{item['year']:04d}-{item['month']:02d} produkt id={item['product_id']}"
+            f" kategoria id={item['category_id']}:"
+            f" było {item['stored']}, jest {item['rebuilt']}"
+        )
+    print(f"Przeliczono podsumowania produkcji, rozbieżności: {len(mismatches)}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# c:\serownia\database\trace.py
+"""
+Wycofanie z rynku – genealogia partia dostawy <-> seria, bez GUI:
+
+    python -m database.trace --lot 12 [--db ścieżka_do_bazy]
+    python -m database.trace --series 00103_2024 [--db ścieżka_do_bazy]
+
+--lot     serie, w których użyto partii dodatku (ID wpisu rejestru dodatków),
+--series  partie dostaw dodatków użyte w serii.
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from database.db_manager import DBManager
+from logic.log_config import configure_logging
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m database.trace")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--lot", type=int, help="ID partii (additives_register)")
+    target.add_argument("--series", help="numer serii, np. 00103_2024")
+    parser.add_argument("--db", default=None, help="ścieżka do pliku bazy")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db = DBManager(db_path=args.db)
+
+    if args.lot is not None:
+        rows = db.trace_lot(args.lot)
+        for row in rows:
+            print(
+                f"{row['date']}  {row['series']}  {row['product_name'] or '-'}"
+                f"  {row['qty']:g}"
+            )
+        print(f"Partia id={args.lot}: {len(rows)} serii")
+    else:
+        rows = db.trace_series(args.series)
+        for row in rows:
+            print(
+                f"partia id={row['register_id']}  {row['additive_name'] or '-'}"
+                f"  przyjęta {row['lot_date']}  ważna do {row['expiry_date'] or '-'}"
+                f"  {row['qty']:g}"
+            )
+        print(f"Seria {args.series}: {len(rows)} partii dostaw")
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# c:\serownia\logic\app_config.py
+"""
+Położenie pliku bazy, katalogu grafik (tła, ikony) i kopii zapasowych –
+zamiast ścieżek wpisanych na stałe w kodzie.
+
+Kolejność (pierwsza ustawiona wygrywa):
+  1. zmienne środowiskowe SEROWNIA_DB (plik bazy), SEROWNIA_ASSETS
+     (katalog grafik) i SEROWNIA_BACKUP_DIR (kopie zapasowe),
+  2. plik konfiguracyjny INI – SEROWNIA_CONFIG albo serownia.ini w katalogu
+     aplikacji:
+
+         [serownia]
+         db_path = D:\\dane\\serownia.db
+         assets_dir = images
+         backup_dir = E:\\kopie\\serownia
+
+     (ścieżki względne liczone od katalogu pliku INI),
+  3. domyślnie: serownia.db, images/ i backup/ w katalogu aplikacji
+     (APP_DIR – na komputerach w zakładzie c:\\serownia, jak dotąd).
+
+db_path = ":memory:" (DBManager.MEMORY_DB) => baza w pamięci sklonowana
+z gotowego szablonu (testy, próby). Konfiguracja czytana raz – get_config()
+jest zapamiętywane; get_config.cache_clear() po zmianie środowiska.
+Moduł nie zależy od PyQt5.
+"""
+
+import configparser
+import functools
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = "serownia.ini"
+CONFIG_SECTION = "serownia"
+
+ENV_CONFIG = "SEROWNIA_CONFIG"
+ENV_DB = "SEROWNIA_DB"
+ENV_ASSETS = "SEROWNIA_ASSETS"
+ENV_BACKUP_DIR = "SEROWNIA_BACKUP_DIR"
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    db_path: str
+    assets_dir: str
+    backup_dir: str
+
+    def asset(self, name: str) -> str:
+        return os.path.join(self.assets_dir, name)
+
+
+def _resolve(path: str, base: str) -> str:
+    if path == ":memory:" or path.startswith("file:"):
+        return path  # baza w pamięci / URI SQLite – bez zmian
+    return os.path.normpath(os.path.join(base, os.path.expanduser(path)))
+
+
+def load_config(path: Optional[str] = None) -> AppConfig:
+    """Konfiguracja ze środowiska, pliku INI (path / SEROWNIA_CONFIG) i domyślnych."""
+    path = path or os.environ.get(ENV_CONFIG) or os.path.join(APP_DIR, CONFIG_FILE)
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        if parser.read(path, encoding="utf-8"):
+            logger.debug("Konfiguracja z pliku %s", path)
+    except configparser.Error as e:
+        logger.error("Nieczytelny plik konfiguracji %s: %s", path, e)
+    section = parser[CONFIG_SECTION] if parser.has_section(CONFIG_SECTION) else {}
+    base = os.path.dirname(os.path.abspath(path))
+
+    def setting(env: str, key: str, default: str) -> str:
+        if os.environ.get(env):
+            return _resolve(os.environ[env], os.getcwd())
+        if section.get(key):
+            return _resolve(section[key], base)
+        return os.path.join(APP_DIR, default)
+
+    return AppConfig(
+        db_path=setting(ENV_DB, "db_path", "serownia.db"),
+        assets_dir=setting(ENV_ASSETS, "assets_dir", "images"),
+        backup_dir=setting(ENV_BACKUP_DIR, "backup_dir", "backup"),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> AppConfig:
+    return load_config()
+
+
+def asset_path(name: str) -> str:
+    """Pełna ścieżka grafiki z katalogu assets_dir, np. asset_path("cheese.jpg")."""
+    return get_config().asset(name)
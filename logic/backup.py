@@ -0,0 +1,174 @@
+# c:\serownia\logic\backup.py
+"""
+Kopia zapasowa bazy w trakcie pracy (online) – sqlite3 Connection.backup.
+
+Kopiowanie pliku .db w czasie zapisu może dać uszkodzoną kopię; backup API
+kopiuje stronami z zachowaniem spójności. Kopia idzie porcjami po
+BACKUP_PAGES stron z przerwą BACKUP_SLEEP_S między porcjami – blokada
+odczytu trzymana jest tylko na czas jednej porcji, więc zapisy w GUI czekają
+najwyżej chwilę (zmiana bazy w trakcie => SQLite zaczyna kopię od nowa).
+
+Kolejne kopie to pliki serownia-RRRRMMDD-GGMMSS.db w katalogu kopii
+(logic/app_config.py: backup_dir); każda jest sprawdzana PRAGMA quick_check
+przed nadaniem docelowej nazwy, a po udanej kopii zostaje KEEP_BACKUPS
+najnowszych. Uruchamianie: CLI (python -m serownia backup) albo timer GUI
+(main.py: backup_if_due co BACKUP_CHECK_MS). Moduł nie zależy od PyQt5.
+"""
+
+import datetime
+import glob
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PAGES = 256  # stron na porcję (przy 4 KiB = 1 MiB)
+BACKUP_SLEEP_S = 0.05  # przerwa między porcjami
+KEEP_BACKUPS = 14
+BACKUP_EVERY_HOURS = 24
+BACKUP_CHECK_MS = 30 * 60 * 1000  # co ile GUI sprawdza, czy kopia jest należna
+
+BACKUP_PREFIX = "serownia-"
+BACKUP_SUFFIX = ".db"
+_STAMP_FORMAT = "%Y%m%d-%H%M%S"
+
+
+@dataclass(frozen=True)
+class BackupResult:
+    path: str
+    pages: int
+    seconds: float
+    ok: bool
+    problems: tuple = ()
+
+
+def snapshot_path(backup_dir: str, now: datetime.datetime) -> str:
+    return os.path.join(
+        backup_dir, f"{BACKUP_PREFIX}{now.strftime(_STAMP_FORMAT)}{BACKUP_SUFFIX}"
+    )
+
+
+def list_backups(backup_dir: str) -> List[str]:
+    """Kopie w katalogu, od najstarszej (nazwa = znacznik czasu)."""
+    pattern = os.path.join(glob.escape(backup_dir), f"{BACKUP_PREFIX}*{BACKUP_SUFFIX}")
+    return sorted(glob.glob(pattern))
+
+
+def _snapshot_time(path: str) -> Optional[datetime.datetime]:
+    stamp = os.path.basename(path)[len(BACKUP_PREFIX) : -len(BACKUP_SUFFIX)]
+    try:
+        return datetime.datetime.strptime(stamp, _STAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def quick_check(path: str) -> List[str]:
+    """PRAGMA quick_check pliku kopii; pusta lista = kopia spójna."""
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("PRAGMA quick_check").fetchall()
+        return [row[0] for row in rows if row[0] != "ok"]
+    finally:
+        conn.close()
+
+
+def online_backup(
+    db: DBManager,
+    target: str,
+    pages: int = BACKUP_PAGES,
+    sleep: float = BACKUP_SLEEP_S,
+) -> BackupResult:
+    """
+    Kopia bazy db do pliku target porcjami po pages stron, sprawdzona
+    quick_check. Kopia niespójna zostaje usunięta (ok=False); błąd SQL =>
+    logowany i przekazywany dalej.
+    """
+    partial = target + ".part"
+    started = time.perf_counter()
+    total = 0
+
+    def progress(_status: int, remaining: int, count: int) -> None:
+        nonlocal total
+        total = count
+        logger.debug("Kopia %s: zostało %d z %d stron", target, remaining, count)
+
+    src = db.create_connection()
+    dst = sqlite3.connect(partial)
+    try:
+        src.backup(dst, pages=pages, progress=progress, sleep=sleep)
+    except sqlite3.Error as e:
+        logger.error("Błąd kopii zapasowej %s: %s", target, e)
+        raise
+    finally:
+        dst.close()
+        src.close()
+
+    problems = quick_check(partial)
+    seconds = time.perf_counter() - started
+    if problems:
+        os.remove(partial)
+        logger.error("Kopia %s niespójna: %s", target, "; ".join(problems))
+        return BackupResult(target, total, seconds, False, tuple(problems))
+    os.replace(partial, target)
+    logger.info(
+        "Kopia zapasowa %s: %d stron, %.2f s, %d B",
+        target,
+        total,
+        seconds,
+        os.path.getsize(target),
+    )
+    return BackupResult(target, total, seconds, True)
+
+
+def rotate_backups(backup_dir: str, keep: int = KEEP_BACKUPS) -> List[str]:
+    """Usuwa kopie ponad keep najnowszych; zwraca usunięte ścieżki."""
+    removed = list_backups(backup_dir)[:-keep] if keep > 0 else []
+    for path in removed:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning("Nie usunięto starej kopii %s: %s", path, e)
+    if removed:
+        logger.info("Usunięto %d starych kopii z %s", len(removed), backup_dir)
+    return removed
+
+
+def run_backup(
+    db: DBManager,
+    backup_dir: str,
+    keep: int = KEEP_BACKUPS,
+    now: Optional[datetime.datetime] = None,
+    pages: int = BACKUP_PAGES,
+    sleep: float = BACKUP_SLEEP_S,
+) -> BackupResult:
+    """Nowa kopia z bieżącym znacznikiem czasu; rotacja tylko po udanej kopii."""
+    os.makedirs(backup_dir, exist_ok=True)
+    target = snapshot_path(backup_dir, now or datetime.datetime.now())
+    result = online_backup(db, target, pages, sleep)
+    if result.ok:
+        rotate_backups(backup_dir, keep)
+    return result
+
+
+def backup_if_due(
+    db: DBManager,
+    backup_dir: str,
+    every_hours: float = BACKUP_EVERY_HOURS,
+    keep: int = KEEP_BACKUPS,
+    now: Optional[datetime.datetime] = None,
+) -> Optional[BackupResult]:
+    """
+    Kopia, jeśli najnowsza jest starsza niż every_hours (albo jej brak);
+    inaczej None. Timer może więc tykać często i przetrwa restarty aplikacji.
+    """
+    now = now or datetime.datetime.now()
+    times = [t for t in map(_snapshot_time, list_backups(backup_dir)) if t]
+    if times and now - max(times) < datetime.timedelta(hours=every_hours):
+        return None
+    return run_backup(db, backup_dir, keep, now)
@@ -0,0 +1,373 @@
+# c:\serownia\logic\bulk_import.py
+"""
+Import masowy z .xlsx (openpyxl, tryb read-only) albo .csv do:
+rejestru dodatków, rejestru opakowań, produktów i receptur (product_additives).
+
+Przebieg (wszystko strumieniowo – plik nie jest wczytywany w całości):
+  1. pierwszy wiersz pliku = nagłówki, dopasowywane do kolumn ImportSpec
+     (wielkość liter i końcowy ':' bez znaczenia; nadmiarowe kolumny pomijane),
+  2. każdy wiersz jest walidowany, a nazwy zamieniane na ID przez słowniki
+     pobrane z bazy RAZ na import (DBManager.get_name_lookup),
+  3. poprawne wiersze idą do DBManager.bulk_insert (executemany, transakcja
+     na porcję), błędne – do pliku odrzuceń CSV (wiersz + kolumna "Błąd").
+  4. po imporcie ANALYZE (DBManager.optimize) – statystyki planisty.
+
+Nagłówki eksportu (logic/xlsx_export.py) są akceptowane, więc plik z eksportu
+rejestru można poprawić i wczytać z powrotem. Moduł nie zależy od PyQt5.
+"""
+
+import csv
+import datetime
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from database.db_manager import DBManager
+from logic.protocol_types import parse_number
+from logic.utils import to_base_quantity, to_base_unit_price
+
+logger = logging.getLogger(__name__)
+
+REJECT_SUFFIX = "_odrzucone.csv"
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class ImportRowError(ValueError):
+    """Błąd walidacji pojedynczego wiersza (trafia do pliku odrzuceń)."""
+
+
+@dataclass(frozen=True)
+class ImportColumn:
+    key: str
+    headers: Tuple[str, ...]  # akceptowane nagłówki (pierwszy = do komunikatów)
+    required: bool = True
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    key: str
+    title: str
+    target: str  # klucz DBManager._BULK_INSERT_SQL
+    columns: Tuple[ImportColumn, ...]
+    lookups: Tuple[str, ...]  # tabele słowników nazw
+    build: Callable[[Dict[str, str], Dict[str, Dict[str, int]]], tuple]
+
+
+@dataclass
+class ImportResult:
+    imported: int
+    rejected: int
+    reject_path: Optional[str] = None
+
+
+# ----------------------------------------------------------------
+# Walidacja pól
+# ----------------------------------------------------------------
+def _text(value: Any) -> str:
+    """Komórka (xlsx: liczba / data / tekst; csv: tekst) => tekst."""
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime(DATE_FORMAT)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _date(values: Dict[str, str], key: str, label: str) -> Optional[str]:
+    text = values.get(key, "")
+    if not text:
+        return None
+    try:
+        datetime.datetime.strptime(text, DATE_FORMAT)
+    except ValueError:
+        raise ImportRowError(f"{label}: '{text}' nie jest datą YYYY-MM-DD")
+    return text
+
+
+def _quantity(
+    values: Dict[str, str], key: str = "quantity", label: str = "Ilość"
+) -> Tuple[str, float]:
+    text = values.get(key, "")
+    qty = to_base_quantity(text)
+    if qty is None or qty <= 0:
+        raise ImportRowError(f"{label}: '{text}' nie jest dodatnią liczbą")
+    return text, qty
+
+
+def _price(
+    values: Dict[str, str], quantity: str
+) -> Tuple[Optional[str], Optional[float]]:
+    """Cena dostawy (opcjonalna) => (tekst, zł / jednostka bazowa)."""
+    text = values.get("price", "")
+    if not text:
+        return None, None
+    unit_price = to_base_unit_price(text, quantity)
+    if unit_price is None:
+        raise ImportRowError(f"Cena: '{text}' nie jest ceną (np. 45 zł/kg)")
+    return text, unit_price
+
+
+def _resolve(lookup: Dict[str, int], name: str, label: str) -> int:
+    row_id = lookup.get(name.lower())
+    if row_id is None:
+        raise ImportRowError(f"{label}: nie ma w bazie '{name}'")
+    return row_id
+
+
+# ----------------------------------------------------------------
+# Budowanie wierszy INSERT (kolejność jak w DBManager._BULK_INSERT_SQL)
+# ----------------------------------------------------------------
+def _additives_register_row(
+    values: Dict[str, str], lookups: Dict[str, Dict[str, int]]
+) -> tuple:
+    date = _date(values, "date", "Data przyjęcia")
+    quantity, qty = _quantity(values)
+    additive_id = _resolve(lookups["additives"], values["additive"], "Dodatek")
+    expiry = _date(values, "expiry_date", "Data ważności")
+    return (
+        date,
+        quantity,
+        additive_id,
+        expiry,
+        qty,
+        *_price(values, quantity),
+        values.get("lot_no") or None,
+    )
+
+
+def _packaging_register_row(
+    values: Dict[str, str], lookups: Dict[str, Dict[str, int]]
+) -> tuple:
+    date = _date(values, "date", "Data przyjęcia")
+    quantity, qty = _quantity(values)
+    packaging_id = _resolve(lookups["packaging"], values["packaging"], "Opakowanie")
+    return (
+        date,
+        quantity,
+        packaging_id,
+        qty,
+        *_price(values, quantity),
+        _date(values, "expiry_date", "Data ważności"),
+        values.get("lot_no") or None,
+    )
+
+
+def _product_row(values: Dict[str, str], lookups: Dict[str, Dict[str, int]]) -> tuple:
+    name = values["name"]
+    products = lookups["products"]
+    if name.lower() in products:
+        raise ImportRowError(f"Produkt '{name}' już istnieje")
+    category_id = _resolve(
+        lookups["product_categories"], values["category"], "Kategoria"
+    )
+    for key, label in (("price", "Cena"), ("stock", "Stan")):
+        if values.get(key) and parse_number(values[key]) is None:
+            raise ImportRowError(f"{label}: '{values[key]}' nie jest liczbą")
+    products[name.lower()] = 0  # duplikat w tym samym pliku => odrzucony
+    return (name, category_id, values.get("price") or None, values.get("stock") or None)
+
+
+def _recipe_row(values: Dict[str, str], lookups: Dict[str, Dict[str, int]]) -> tuple:
+    product_id = _resolve(lookups["products"], values["product"], "Produkt")
+    additive_id = _resolve(lookups["additives"], values["additive"], "Dodatek")
+    # dawka 0 / nieczytelna => planista (plan_norms) pominąłby ją bez słowa
+    dosage, _qty = _quantity(values, "dosage", "Dawka")
+    return (product_id, additive_id, dosage)
+
+
+_DATE_COLUMN = ImportColumn("date", ("Data przyjęcia", "Data"))
+_QUANTITY_COLUMN = ImportColumn("quantity", ("Ilość",))
+_PRICE_COLUMN = ImportColumn("price", ("Cena",), required=False)
+_EXPIRY_COLUMN = ImportColumn("expiry_date", ("Data ważności",), required=False)
+_LOT_COLUMN = ImportColumn("lot_no", ("Nr partii", "Partia"), required=False)
+
+# Importy z kolumną "Cena" (po imporcie przeliczane są koszty serii)
+PRICED_SPECS = ("additives_register", "packaging_register")
+
+IMPORT_SPECS: Dict[str, ImportSpec] = {
+    spec.key: spec
+    for spec in (
+        ImportSpec(
+            key="additives_register",
+            title="Rejestr dodatków",
+            target="additives_register",
+            columns=(
+                _DATE_COLUMN,
+                _QUANTITY_COLUMN,
+                ImportColumn("additive", ("Dodatek", "Rodzaj dodatku")),
+                _EXPIRY_COLUMN,
+                _PRICE_COLUMN,
+                _LOT_COLUMN,
+            ),
+            lookups=("additives",),
+            build=_additives_register_row,
+        ),
+        ImportSpec(
+            key="packaging_register",
+            title="Rejestr opakowań",
+            target="packaging_register",
+            columns=(
+                _DATE_COLUMN,
+                _QUANTITY_COLUMN,
+                ImportColumn("packaging", ("Opakowanie",)),
+                _PRICE_COLUMN,
+                _EXPIRY_COLUMN,
+                _LOT_COLUMN,
+            ),
+            lookups=("packaging",),
+            build=_packaging_register_row,
+        ),
+        ImportSpec(
+            key="products",
+            title="Produkty",
+            target="products",
+            columns=(
+                ImportColumn("name", ("Nazwa", "Produkt", "Nazwa produktu")),
+                ImportColumn("category", ("Kategoria", "Kategoria produktu")),
+                ImportColumn("price", ("Cena",), required=False),
+                ImportColumn("stock", ("Stan",), required=False),
+            ),
+            lookups=("products", "product_categories"),
+            build=_product_row,
+        ),
+        ImportSpec(
+            key="recipes",
+            title="Receptury (skład produktów)",
+            target="product_additives",
+            columns=(
+                ImportColumn("product", ("Produkt",)),
+                ImportColumn("additive", ("Dodatek",)),
+                ImportColumn("dosage", ("Dawka/100L", "Dawka")),
+            ),
+            lookups=("products", "additives"),
+            build=_recipe_row,
+        ),
+    )
+}
+
+
+# ----------------------------------------------------------------
+# Odczyt pliku
+# ----------------------------------------------------------------
+def read_rows(path: str) -> Iterator[Sequence[Any]]:
+    """
+    Wiersze pierwszego arkusza .xlsx (load_workbook(read_only=True)) albo
+    pliku .csv (separator ';' lub ',' wykrywany z nagłówka, UTF-8 z/bez BOM).
+    """
+    if path.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(values_only=True)
+        finally:
+            workbook.close()
+        return
+
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        header = handle.readline()
+        delimiter = ";" if header.count(";") > header.count(",") else ","
+        handle.seek(0)
+        yield from csv.reader(handle, delimiter=delimiter)
+
+
+def _normalize_header(text: Any) -> str:
+    return _text(text).rstrip(":").strip().lower()
+
+
+def _column_map(spec: ImportSpec, header: Sequence[Any]) -> Dict[str, int]:
+    """{klucz kolumny: indeks w wierszu}; brak wymaganej kolumny => ValueError."""
+    positions = {_normalize_header(h): i for i, h in enumerate(header)}
+    mapping: Dict[str, int] = {}
+    missing: List[str] = []
+    for column in spec.columns:
+        for name in column.headers:
+            if name.lower() in positions:
+                mapping[column.key] = positions[name.lower()]
+                break
+        else:
+            if column.required:
+                missing.append(column.headers[0])
+    if missing:
+        raise ValueError(f"Brak kolumn w pliku: {', '.join(missing)}")
+    return mapping
+
+
+# ----------------------------------------------------------------
+# Import
+# ----------------------------------------------------------------
+def default_reject_path(path: str) -> str:
+    return os.path.splitext(path)[0] + REJECT_SUFFIX
+
+
+def import_file(
+    db: DBManager,
+    spec_key: str,
+    path: str,
+    reject_path: Optional[str] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    batch_size: int = DBManager.IMPORT_BATCH,
+) -> ImportResult:
+    """
+    Importuje plik według IMPORT_SPECS[spec_key]. Odrzucone wiersze (z opisem
+    błędu) trafiają do reject_path (domyślnie <plik>_odrzucone.csv); pliku
+    odrzuceń nie tworzymy, gdy wszystkie wiersze są poprawne.
+    Zły nagłówek / brak kolumn => ValueError, błąd SQL => sqlite3.Error.
+    """
+    spec = IMPORT_SPECS[spec_key]
+    reject_path = reject_path or default_reject_path(path)
+    lookups = {table: db.get_name_lookup(table) for table in spec.lookups}
+
+    rows = read_rows(path)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError("Plik jest pusty")
+    mapping = _column_map(spec, header)
+
+    rejects: List[List[str]] = []
+
+    def accepted() -> Iterator[tuple]:
+        for line_no, row in enumerate(rows, start=2):
+            cells = [_text(v) for v in row]
+            if not any(cells):
+                continue
+            values = {
+                key: cells[index] if index < len(cells) else ""
+                for key, index in mapping.items()
+            }
+            try:
+                for column in spec.columns:
+                    if column.required and not values.get(column.key):
+                        raise ImportRowError(f"Puste pole '{column.headers[0]}'")
+                yield spec.build(values, lookups)
+            except ImportRowError as e:
+                rejects.append([str(line_no)] + cells + [str(e)])
+
+    try:
+        imported = db.bulk_insert(spec.target, accepted(), batch_size, progress)
+    finally:
+        rows.close()
+    if imported and spec.key in PRICED_SPECS:
+        # nowe ceny dostaw zmieniają średnie ceny => koszty serii
+        db.rebuild_batch_costs()
+    if imported:
+        # duża porcja nowych wierszy => świeże statystyki planisty
+        db.optimize(analyze=True)
+
+    written_path = None
+    if rejects:
+        written_path = reject_path
+        with open(reject_path, "w", newline="", encoding="utf-8-sig") as handle:
+            writer = csv.writer(handle, delimiter=";")
+            writer.writerow(["Wiersz"] + [_text(h) for h in header] + ["Błąd"])
+            writer.writerows(rejects)
+    logger.info(
+        "Import %s z %s: %d wierszy, odrzucono %d",
+        spec.key,
+        path,
+        imported,
+        len(rejects),
+    )
+    return ImportResult(imported, len(rejects), written_path)
@@ -0,0 +1,120 @@
+# c:\serownia\logic\dashboard.py
+"""
+Wskaźniki pulpitu ekranu startowego (KPI):
+  - serie i litry mleka w bieżącym tygodniu (production_records.milk_l),
+  - serie i litry w bieżącym miesiącu (production_monthly_summary),
+  - dodatki z niskim stanem (additive_stock vs zużycie z ostatnich dni),
+  - protokoły z brakami (bez produktu / ilości mleka / wagi partii).
+
+DashboardCache trzyma ostatnie wskaźniki w pamięci razem z licznikami zmian
+tabel (DBManager.get_table_versions); przeliczenie następuje dopiero, gdy
+któraś z DASHBOARD_TABLES się zmieniła albo zmienił się dzień. refresh() jest
+blokujące – GUI woła je w wątku w tle. Moduł nie zależy od PyQt5.
+"""
+
+import datetime
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+# Zmiany tych tabel unieważniają wskaźniki
+DASHBOARD_TABLES = (
+    "production_records",
+    "ser_production_additives",
+    "additives_register",
+    "additives",
+    "products",
+)
+
+# Niski stan = zapas mniejszy niż zużycie z tylu ostatnich dni
+LOW_STOCK_WINDOW_DAYS = 30
+# Protokoły z brakami szukamy w tylu ostatnich dniach
+INCOMPLETE_WINDOW_DAYS = 90
+INCOMPLETE_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class DashboardMetrics:
+    today: datetime.date
+    week_batches: int
+    week_milk_l: float
+    month_batches: int
+    month_milk_l: float
+    low_stock: Tuple[Dict[str, Any], ...]
+    incomplete: Tuple[Dict[str, Any], ...]
+
+
+def compute_metrics(
+    db: DBManager, today: Optional[datetime.date] = None
+) -> DashboardMetrics:
+    """Liczy wszystkie wskaźniki (kilka małych zapytań po indeksach i sumach)."""
+    today = today or datetime.date.today()
+    week_start = today - datetime.timedelta(days=today.weekday())
+    week = db.get_production_between(week_start.isoformat(), today.isoformat())
+
+    month_rows = db.get_monthly_production_summary(today.year, today.month)
+    low_stock = db.get_low_stock_additives(
+        (today - datetime.timedelta(days=LOW_STOCK_WINDOW_DAYS)).isoformat()
+    )
+    incomplete = db.get_incomplete_protocols(
+        (today - datetime.timedelta(days=INCOMPLETE_WINDOW_DAYS)).isoformat(),
+        INCOMPLETE_LIMIT,
+    )
+    return DashboardMetrics(
+        today=today,
+        week_batches=week["batches"],
+        week_milk_l=week["milk_l"],
+        month_batches=sum(r["batches"] for r in month_rows),
+        month_milk_l=sum(r["milk_l"] for r in month_rows),
+        low_stock=tuple(low_stock),
+        incomplete=tuple(incomplete),
+    )
+
+
+class DashboardCache:
+    """
+    Wskaźniki w pamięci + liczniki zmian tabel z chwili ich policzenia.
+    Bezpieczne wątkowo (jedna blokada; przeliczenie najwyżej jedno naraz).
+    """
+
+    def __init__(self, db: DBManager) -> None:
+        self.db = db
+        self._lock = threading.Lock()
+        self._metrics: Optional[DashboardMetrics] = None
+        self._versions: Optional[Dict[str, int]] = None
+
+    @property
+    def metrics(self) -> Optional[DashboardMetrics]:
+        """Ostatnio policzone wskaźniki (bez dotykania bazy) albo None."""
+        return self._metrics
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._versions = None
+
+    def refresh(
+        self, today: Optional[datetime.date] = None
+    ) -> Tuple[DashboardMetrics, bool]:
+        """
+        Zwraca (wskaźniki, czy_przeliczono). Bez zmian w DASHBOARD_TABLES
+        i w tym samym dniu – wynik z pamięci po jednym zapytaniu o wersje.
+        """
+        today = today or datetime.date.today()
+        with self._lock:
+            versions = self.db.get_table_versions(DASHBOARD_TABLES)
+            metrics = self._metrics
+            if (
+                metrics is not None
+                and versions == self._versions
+                and metrics.today == today
+            ):
+                return metrics, False
+            metrics = compute_metrics(self.db, today)
+            self._metrics, self._versions = metrics, versions
+        logger.debug("Pulpit przeliczony (wersje tabel: %s)", versions)
+        return metrics, True
@@ -0,0 +1,108 @@
+# c:\serownia\logic\expiry_alerts.py
+"""
+Alerty terminów ważności partii dodatków (kultury, podpuszczka, ...) i opakowań.
+
+check_expiring() to jedno zapytanie DBManager.get_expiring_lots – zakres po
+indeksach częściowych na expiry_date, więc można je wołać co kilka minut
+(ui.start_screen: QTimer co CHECK_INTERVAL_MS, zapytanie w wątku w tle).
+ExpiryWatch pamięta partie już zgłoszone i oddziela nowe alerty od
+wcześniej widzianych. Moduł nie zależy od PyQt5.
+"""
+
+import datetime
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+# Alert dla partii z terminem w ciągu tylu dni (i przeterminowanych)
+EXPIRY_ALERT_DAYS = 14
+# Co ile GUI sprawdza terminy
+CHECK_INTERVAL_MS = 5 * 60 * 1000
+
+
+@dataclass(frozen=True)
+class ExpiryAlert:
+    kind: str  # "Dodatek" / "Opakowanie"
+    register_id: int
+    name: str
+    lot_no: Optional[str]
+    expiry_date: str
+    remaining: float
+    days_left: int  # < 0 => po terminie
+
+    @property
+    def expired(self) -> bool:
+        return self.days_left < 0
+
+    def describe(self) -> str:
+        lot = f" partia {self.lot_no}" if self.lot_no else ""
+        when = (
+            f"po terminie {-self.days_left} dni"
+            if self.expired
+            else f"ważne {self.days_left} dni"
+        )
+        return (
+            f"{self.name}{lot} ({self.expiry_date}, {when},"
+            f" zostało {self.remaining:g})"
+        )
+
+
+def check_expiring(
+    db: DBManager,
+    days: int = EXPIRY_ALERT_DAYS,
+    today: Optional[datetime.date] = None,
+) -> List[ExpiryAlert]:
+    """Partie z zapasem i terminem do today + days, od najkrótszego terminu."""
+    today = today or datetime.date.today()
+    until = (today + datetime.timedelta(days=days)).isoformat()
+    alerts: List[ExpiryAlert] = []
+    for lot in db.get_expiring_lots(until):
+        try:
+            expiry = datetime.date.fromisoformat(lot["expiry_date"])
+        except ValueError:
+            logger.warning(
+                "Nieczytelna data ważności '%s' (partia id=%s)",
+                lot["expiry_date"],
+                lot["register_id"],
+            )
+            continue
+        alerts.append(
+            ExpiryAlert(
+                kind=lot["kind"],
+                register_id=lot["register_id"],
+                name=lot["name"],
+                lot_no=lot["lot_no"],
+                expiry_date=lot["expiry_date"],
+                remaining=lot["remaining"],
+                days_left=(expiry - today).days,
+            )
+        )
+    return alerts
+
+
+class ExpiryWatch:
+    """Kolejne sprawdzenia terminów; nowe = partie jeszcze niezgłoszone."""
+
+    def __init__(self, db: DBManager, days: int = EXPIRY_ALERT_DAYS) -> None:
+        self.db = db
+        self.days = days
+        self._lock = threading.Lock()
+        self._seen: Set[Tuple[str, int, bool]] = set()
+
+    def check(
+        self, today: Optional[datetime.date] = None
+    ) -> Tuple[List[ExpiryAlert], List[ExpiryAlert]]:
+        """(wszystkie alerty, nowe alerty); przeterminowanie to nowy alert."""
+        alerts = check_expiring(self.db, self.days, today)
+        with self._lock:
+            keys = [(a.kind, a.register_id, a.expired) for a in alerts]
+            new = [a for a, key in zip(alerts, keys) if key not in self._seen]
+            self._seen = set(keys)
+        for alert in new:
+            logger.warning("Termin ważności: %s – %s", alert.kind, alert.describe())
+        return alerts, new
@@ -0,0 +1,199 @@
+# c:\serownia\logic\forecast.py
+"""
+Prognoza zużycia dodatków na potrzeby zakupów (NumPy).
+
+Źródło: additive_daily_usage (dzienne sumy zużycia z protokołów, utrzymywane
+triggerami – DBManager.ensure_additive_daily_usage) i daty dostaw z rejestru.
+Wyciąg trafia do macierzy (dodatek × dzień) z HISTORY_DAYS dni wstecz;
+wszystkie wskaźniki liczone są na całej macierzy naraz:
+  - tempo bieżące: średnia dzienna z ostatnich MA_DAYS dni,
+  - współczynnik sezonowy: zużycie w najbliższych HORIZON_DAYS dniach rok
+    (SEASON_DAYS – pełne tygodnie) temu / zużycie w MA_DAYS dniach przed tą
+    datą, przycięte do [SEASONAL_MIN, SEASONAL_MAX]; bez historii sprzed
+    roku => 1 (pojedyncza seria rok temu nie zeruje prognozy dodatku, który
+    jest teraz w użyciu),
+  - prognoza tempa = tempo bieżące × współczynnik sezonowy,
+  - dni do wyczerpania = stan / prognoza tempa,
+  - typowy odstęp dostaw = mediana dni między dostawami; zamówić teraz,
+    gdy zapas nie wystarczy do kolejnej typowej dostawy (bez historii
+    dostaw – na HORIZON_DAYS dni).
+
+ForecastCache trzyma wynik w pamięci razem z licznikami zmian tabel
+(DBManager.get_table_versions) – bez zmian w danych i w tym samym dniu
+ponowne otwarcie nie dotyka bazy. Moduł nie zależy od PyQt5.
+"""
+
+import datetime
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.db_manager import DBManager
+from logic.stage_analytics import grouped_stats
+
+logger = logging.getLogger(__name__)
+
+MA_DAYS = 28
+HORIZON_DAYS = 28
+SEASON_DAYS = 364
+HISTORY_DAYS = SEASON_DAYS + MA_DAYS
+SEASONAL_MIN = 0.5
+SEASONAL_MAX = 2.0
+
+# Zmiany tych tabel unieważniają prognozę
+FORECAST_TABLES = (
+    "production_records",
+    "ser_production_additives",
+    "additives_register",
+    "additives",
+)
+
+
+@dataclass(frozen=True)
+class AdditiveForecast:
+    additive_id: int
+    name: str
+    balance: float  # jednostka bazowa (g / ml / szt.)
+    moving_avg: float  # na dzień
+    seasonal_factor: float
+    rate: float  # prognoza na dzień
+    days_left: Optional[float]  # None => brak zużycia
+    stockout_date: Optional[str]
+    receipt_interval: Optional[float]  # mediana dni między dostawami
+    order_now: bool
+
+
+def usage_matrix(
+    additive_ids: Sequence[int],
+    rows: Sequence[Tuple[int, str, float]],
+    start: datetime.date,
+    days: int = HISTORY_DAYS,
+) -> np.ndarray:
+    """(dodatek × dzień od start) z wierszy (additive_id, date, qty)."""
+    matrix = np.zeros((len(additive_ids), days))
+    index = {aid: i for i, aid in enumerate(additive_ids)}
+    picked = [
+        (index[aid], (datetime.date.fromisoformat(date) - start).days, qty)
+        for aid, date, qty in rows
+        if aid in index
+    ]
+    picked = [p for p in picked if 0 <= p[1] < days]
+    if picked:
+        r, c, q = zip(*picked)
+        np.add.at(matrix, (np.array(r), np.array(c)), np.array(q, dtype=float))
+    return matrix
+
+
+def rates(usage: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (tempo bieżące, współczynnik sezonowy) dla macierzy (dodatek × HISTORY_DAYS),
+    której ostatnia kolumna to dzisiaj.
+    """
+    moving_avg = usage[:, -MA_DAYS:].sum(axis=1) / MA_DAYS
+    year_ago = usage.shape[1] - 1 - SEASON_DAYS  # kolumna "dziś rok temu"
+    before = usage[:, year_ago - MA_DAYS + 1 : year_ago + 1].sum(axis=1) / MA_DAYS
+    after = usage[:, year_ago + 1 : year_ago + 1 + HORIZON_DAYS].sum(axis=1)
+    after = after / HORIZON_DAYS
+    factor = np.ones(usage.shape[0])
+    seasonal = before > 0
+    factor[seasonal] = after[seasonal] / before[seasonal]
+    return moving_avg, np.clip(factor, SEASONAL_MIN, SEASONAL_MAX)
+
+
+def receipt_intervals(
+    additive_ids: Sequence[int], receipts: Sequence[Tuple[int, str]]
+) -> np.ndarray:
+    """Mediana dni między kolejnymi dostawami (NaN: mniej niż dwie dostawy)."""
+    result = np.full(len(additive_ids), np.nan)
+    index = {aid: i for i, aid in enumerate(additive_ids)}
+    picked = [
+        (index[aid], datetime.date.fromisoformat(date).toordinal())
+        for aid, date in receipts
+        if aid in index
+    ]
+    if len(picked) < 2:
+        return result
+    groups, days = (np.array(v) for v in zip(*picked))
+    order = np.lexsort((days, groups))
+    groups, days = groups[order], days[order]
+    same = groups[1:] == groups[:-1]
+    codes, stats = grouped_stats(groups[1:][same], np.diff(days)[same].astype(float))
+    result[codes] = stats[:, 5]  # mediana (QUANTILES[1])
+    return result
+
+
+def compute_forecast(db: DBManager, today: datetime.date) -> List[AdditiveForecast]:
+    """Prognoza dla wszystkich dodatków – kilka zapytań i operacje na macierzach."""
+    stock = db.get_all_additive_stock()
+    if not stock:
+        return []
+    ids = [s["additive_id"] for s in stock]
+    start = today - datetime.timedelta(days=HISTORY_DAYS - 1)
+    usage = usage_matrix(ids, db.get_additive_daily_usage(start.isoformat()), start)
+    moving_avg, factor = rates(usage)
+    rate = moving_avg * factor
+    balance = np.array([max(s["balance"], 0.0) for s in stock])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_left = np.where(rate > 0, balance / rate, np.inf)
+    intervals = receipt_intervals(
+        ids, db.get_additive_receipt_dates(start.isoformat())
+    )
+
+    result: List[AdditiveForecast] = []
+    for i, item in enumerate(stock):
+        left = float(days_left[i])
+        finite = math.isfinite(left)
+        interval = float(intervals[i])
+        result.append(
+            AdditiveForecast(
+                additive_id=item["additive_id"],
+                name=item["additive_name"],
+                balance=float(item["balance"]),
+                moving_avg=round(float(moving_avg[i]), 3),
+                seasonal_factor=round(float(factor[i]), 2),
+                rate=round(float(rate[i]), 3),
+                days_left=round(left, 1) if finite else None,
+                stockout_date=(
+                    (today + datetime.timedelta(days=int(left))).isoformat()
+                    if finite
+                    else None
+                ),
+                receipt_interval=None if math.isnan(interval) else interval,
+                order_now=finite
+                and left <= (HORIZON_DAYS if math.isnan(interval) else interval),
+            )
+        )
+    result.sort(key=lambda f: (f.days_left is None, f.days_left or 0.0, f.name))
+    return result
+
+
+class ForecastCache:
+    """Prognoza w pamięci + liczniki zmian FORECAST_TABLES z chwili jej policzenia."""
+
+    def __init__(self, db: DBManager) -> None:
+        self.db = db
+        self._lock = threading.Lock()
+        self._forecast: Optional[List[AdditiveForecast]] = None
+        self._key: Optional[Tuple[datetime.date, Dict[str, int]]] = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._key = None
+
+    def refresh(
+        self, today: Optional[datetime.date] = None
+    ) -> Tuple[List[AdditiveForecast], bool]:
+        """(prognoza, czy_przeliczono) – przeliczenie tylko po zmianie danych/dnia."""
+        today = today or datetime.date.today()
+        with self._lock:
+            key = (today, self.db.get_table_versions(FORECAST_TABLES))
+            if self._forecast is not None and key == self._key:
+                return self._forecast, False
+            forecast = compute_forecast(self.db, today)
+            self._forecast, self._key = forecast, key
+        logger.debug("Prognoza zużycia przeliczona: %d dodatków", len(forecast))
+        return forecast, True
@@ -0,0 +1,100 @@
+# c:\serownia\logic\log_config.py
+"""
+Konfiguracja logowania aplikacji (moduł `logging`).
+
+Każdy moduł ma własny logger: `logger = logging.getLogger(__name__)`
+i loguje z leniwym formatowaniem: `logger.debug("Pobrano %d wierszy", n)` –
+tekst składany jest tylko wtedy, gdy poziom DEBUG jest włączony.
+
+Poziom i wyjście wybierane w czasie działania:
+  - zmienne środowiskowe SEROWNIA_LOG_LEVEL (DEBUG/INFO/WARNING/ERROR, domyślnie INFO),
+    SEROWNIA_LOG_FILE (plik z rotacją), SEROWNIA_LOG_FORMAT ("json" albo "text"),
+  - albo argumenty configure_logging(), a później set_level().
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+from typing import Optional, Union
+
+LOGGER_ROOT = ""  # logger główny – obejmuje database.*, ui.*, logic.*, __main__
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+
+class JsonFormatter(logging.Formatter):
+    """Jeden rekord = jedna linia JSON (do wysyłki logów z komputerów w zakładzie)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+def _parse_level(level: Union[str, int, None]) -> int:
+    if level is None:
+        level = os.environ.get("SEROWNIA_LOG_LEVEL", "INFO")
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).strip().upper())
+    return value if isinstance(value, int) else logging.INFO
+
+
+def configure_logging(
+    level: Union[str, int, None] = None,
+    log_file: Optional[str] = None,
+    json_format: Optional[bool] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+) -> logging.Logger:
+    """
+    Ustawia handlery loggera głównego: konsola + opcjonalnie plik z rotacją
+    (RotatingFileHandler). Wywołanie ponowne zastępuje poprzednią konfigurację.
+    Argumenty None => wartości ze zmiennych środowiskowych.
+    """
+    if log_file is None:
+        log_file = os.environ.get("SEROWNIA_LOG_FILE") or None
+    if json_format is None:
+        json_format = os.environ.get("SEROWNIA_LOG_FORMAT", "").lower() == "json"
+
+    formatter: logging.Formatter = (
+        JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+    )
+
+    root = logging.getLogger(LOGGER_ROOT)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+    root.addHandler(console)
+
+    if log_file:
+        directory = os.path.dirname(os.path.abspath(log_file))
+        os.makedirs(directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(formatter)
+        root.addHandler(file_handler)
+
+    root.setLevel(_parse_level(level))
+    return root
+
+
+def set_level(level: Union[str, int]) -> None:
+    """Zmienia poziom logowania w czasie działania (np. z ekranu ustawień)."""
+    logging.getLogger(LOGGER_ROOT).setLevel(_parse_level(level))
@@ -0,0 +1,112 @@
+# c:\serownia\logic\maintenance.py
+"""
+Konserwacja pliku bazy: statystyki planisty i odzyskiwanie wolnych stron.
+
+Usunięte protokoły i zmiany w rejestrach zostawiają w pliku wolne strony
+(freelist), a bez statystyk (ANALYZE) planista zgaduje kolejność indeksów.
+  - ANALYZE po imporcie masowym (logic/bulk_import.py),
+  - PRAGMA optimize przy zamykaniu aplikacji (main.py: closeEvent),
+  - przy bezczynności GUI (main.py: IDLE_AFTER_MS bez klawiatury i myszy)
+    run_maintenance: wolne strony zwalniane porcjami po VACUUM_CHUNK_PAGES
+    (PRAGMA incremental_vacuum) z przerwą VACUUM_SLEEP_S – każda porcja to
+    krótka transakcja zapisu, więc nie blokuje GUI na dłużej.
+
+Wolne strony da się oddać tylko przy auto_vacuum=INCREMENTAL: nowe pliki
+mają go od create_tables, starszy plik przełącza jednorazowe pełne VACUUM
+(DBManager.enable_incremental_vacuum). Rozmiar pliku i liczby stron
+przed/po są logowane. Uruchamianie ręczne: python -m serownia maintain.
+Moduł nie zależy od PyQt5.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+VACUUM_CHUNK_PAGES = 128  # stron na porcję (przy 4 KiB = 512 KiB)
+VACUUM_MAX_CHUNKS = 32  # porcji na jedno uruchomienie przy bezczynności
+VACUUM_SLEEP_S = 0.05  # przerwa między porcjami
+MIN_FREE_PAGES = 64  # mniej wolnych stron => nie warto ruszać pliku
+
+IDLE_AFTER_MS = 5 * 60 * 1000  # bezczynność GUI, po której rusza konserwacja
+IDLE_CHECK_MS = 60 * 1000  # co ile GUI sprawdza bezczynność
+
+
+@dataclass(frozen=True)
+class MaintenanceResult:
+    before: Dict[str, int]
+    after: Dict[str, int]
+    freed_pages: int
+    converted: bool  # plik przełączony na auto_vacuum=INCREMENTAL (pełne VACUUM)
+    seconds: float
+
+
+def _describe(stats: Dict[str, int]) -> str:
+    return (
+        f"{stats['file_size']} B, {stats['page_count']} stron, "
+        f"wolnych {stats['freelist_count']}"
+    )
+
+
+def reclaim_free_pages(
+    db: DBManager,
+    chunk_pages: int = VACUUM_CHUNK_PAGES,
+    max_chunks: Optional[int] = VACUUM_MAX_CHUNKS,
+    sleep: float = VACUUM_SLEEP_S,
+) -> int:
+    """
+    Wolne strony zwalniane porcjami po chunk_pages, najwyżej max_chunks porcji
+    (None = do końca); zwraca liczbę zwolnionych stron.
+    """
+    freed = 0
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        step = db.incremental_vacuum(chunk_pages)
+        freed += step
+        chunks += 1
+        if step < chunk_pages:
+            break  # lista wolnych stron pusta
+        if sleep:
+            time.sleep(sleep)
+    return freed
+
+
+def run_maintenance(
+    db: DBManager,
+    analyze: bool = False,
+    chunk_pages: int = VACUUM_CHUNK_PAGES,
+    max_chunks: Optional[int] = VACUUM_MAX_CHUNKS,
+    sleep: float = VACUUM_SLEEP_S,
+    min_free_pages: int = MIN_FREE_PAGES,
+) -> MaintenanceResult:
+    """
+    Jedno przejście konserwacji: przełączenie pliku na auto_vacuum=INCREMENTAL
+    (jeśli trzeba), zwolnienie wolnych stron porcjami (gdy jest ich co
+    najmniej min_free_pages) i PRAGMA optimize (z ANALYZE, gdy analyze=True).
+    Błąd SQL => logowany w DBManager i przekazywany dalej.
+    """
+    started = time.perf_counter()
+    before = db.get_storage_stats()
+    logger.info("Konserwacja bazy – przed: %s", _describe(before))
+
+    converted = False
+    freed = 0
+    if before["auto_vacuum"] != DBManager.AUTO_VACUUM_INCREMENTAL:
+        converted = db.enable_incremental_vacuum()
+    elif before["freelist_count"] >= min_free_pages:
+        freed = reclaim_free_pages(db, chunk_pages, max_chunks, sleep)
+    db.optimize(analyze=analyze)
+
+    after = db.get_storage_stats()
+    seconds = time.perf_counter() - started
+    logger.info(
+        "Konserwacja bazy – po: %s (zwolniono %d stron, %.2f s)",
+        _describe(after),
+        before["page_count"] - after["page_count"],
+        seconds,
+    )
+    return MaintenanceResult(before, after, freed, converted, seconds)
@@ -0,0 +1,165 @@
+# c:\serownia\logic\planner.py
+"""
+Plan produkcji na najbliższe dni: zapotrzebowanie na dodatki i opakowania
+dla serii planowanych (production_plan: produkt + litry mleka) w porównaniu
+z bieżącymi stanami (additive_stock / packaging_stock).
+
+Normy zużycia na litr mleka:
+  - dodatki: receptura produktu (product_additives.dosage_per_100 / 100 L),
+  - opakowania: średnie zużycie z historii (DBManager.get_packaging_norms).
+Obie trafiają do jednej macierzy norm (produkt × pozycja); macierz mleka
+(dzień × produkt) z planu razy normy daje zapotrzebowanie dzienne, a suma
+narastająca po dniach – dzień, od którego zabraknie danej pozycji.
+Jedno mnożenie macierzy niezależnie od liczby serii i linii receptur.
+Moduł nie zależy od PyQt5.
+"""
+
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.db_manager import DBManager
+from logic.utils import to_base_quantity
+
+logger = logging.getLogger(__name__)
+
+PLAN_DAYS = 7
+
+KIND_ADDITIVE = "Dodatek"
+KIND_PACKAGING = "Opakowanie"
+
+
+@dataclass(frozen=True)
+class Requirement:
+    kind: str  # KIND_ADDITIVE / KIND_PACKAGING
+    item_id: int
+    name: str
+    required: float  # jednostka bazowa (g / ml / szt.)
+    in_stock: float
+    short_from: Optional[str] = None  # pierwszy dzień z brakiem (YYYY-MM-DD)
+
+    @property
+    def shortage(self) -> float:
+        return max(self.required - self.in_stock, 0.0)
+
+
+def norm_matrix(
+    products: Sequence[int],
+    items: Sequence[Tuple[str, int]],
+    norms: Sequence[Tuple[int, Tuple[str, int], float]],
+) -> np.ndarray:
+    """
+    Macierz (produkt × pozycja) norm na litr mleka z trójek
+    (product_id, (rodzaj, id pozycji), ilość na litr); powtórzenia sumowane.
+    """
+    matrix = np.zeros((len(products), len(items)))
+    if norms:
+        product_index = {pid: i for i, pid in enumerate(products)}
+        item_index = {item: j for j, item in enumerate(items)}
+        rows = np.array([product_index[n[0]] for n in norms])
+        cols = np.array([item_index[n[1]] for n in norms])
+        np.add.at(matrix, (rows, cols), np.array([n[2] for n in norms], dtype=float))
+    return matrix
+
+
+def plan_norms(
+    db: DBManager, product_ids: Sequence[int]
+) -> List[Tuple[int, Tuple[str, int], float]]:
+    """Normy na litr mleka: receptury dodatków i historyczne zużycie opakowań."""
+    norms: List[Tuple[int, Tuple[str, int], float]] = []
+    for product_id, additive_id, dosage in db.get_recipes_for_products(product_ids):
+        per_100 = to_base_quantity(dosage)
+        if per_100:
+            norms.append((product_id, (KIND_ADDITIVE, additive_id), per_100 / 100.0))
+    for product_id, packaging_id, per_liter in db.get_packaging_norms(product_ids):
+        norms.append((product_id, (KIND_PACKAGING, packaging_id), per_liter))
+    return norms
+
+
+def compute_requirements(
+    batches: Sequence[Dict],
+    norms: Sequence[Tuple[int, Tuple[str, int], float]],
+    stock: Dict[Tuple[str, int], Tuple[str, float]],
+) -> List[Requirement]:
+    """
+    batches – serie planowane (date, product_id, milk_l), stock –
+    {(rodzaj, id): (nazwa, stan)}. Zwraca pozycje z niezerowym
+    zapotrzebowaniem: najpierw braki (od najwcześniejszego dnia), potem reszta.
+    """
+    if not batches or not norms:
+        return []
+    products = sorted({b["product_id"] for b in batches})
+    days = sorted({b["date"] for b in batches})
+    items = sorted({n[1] for n in norms})
+    norms_pl = norm_matrix(products, items, norms)
+
+    product_index = {pid: i for i, pid in enumerate(products)}
+    day_index = {day: i for i, day in enumerate(days)}
+    milk = np.zeros((len(days), len(products)))
+    np.add.at(
+        milk,
+        (
+            np.array([day_index[b["date"]] for b in batches]),
+            np.array([product_index[b["product_id"]] for b in batches]),
+        ),
+        np.array([b["milk_l"] or 0.0 for b in batches], dtype=float),
+    )
+
+    cumulative = np.cumsum(milk @ norms_pl, axis=0)  # dzień × pozycja
+    in_stock = np.array([stock.get(item, ("", 0.0))[1] for item in items])
+    short = cumulative > in_stock + 1e-9
+    first_short = np.where(short.any(axis=0), short.argmax(axis=0), -1)
+
+    result: List[Requirement] = []
+    for j, item in enumerate(items):
+        required = float(cumulative[-1, j])
+        if required <= 0:
+            continue
+        result.append(
+            Requirement(
+                kind=item[0],
+                item_id=item[1],
+                name=stock.get(item, (f"id={item[1]}", 0.0))[0],
+                required=round(required, 3),
+                in_stock=float(in_stock[j]),
+                short_from=days[first_short[j]] if first_short[j] >= 0 else None,
+            )
+        )
+    result.sort(
+        key=lambda r: (r.short_from is None, r.short_from or "", r.kind, r.name)
+    )
+    return result
+
+
+def plan_requirements(
+    db: DBManager,
+    date_from: Optional[datetime.date] = None,
+    days: int = PLAN_DAYS,
+) -> Tuple[List[Dict], List[Requirement]]:
+    """(serie planowane, zapotrzebowanie) na days dni od date_from (domyślnie dziś)."""
+    date_from = date_from or datetime.date.today()
+    date_to = date_from + datetime.timedelta(days=days - 1)
+    batches = db.get_planned_batches(date_from.isoformat(), date_to.isoformat())
+    norms = plan_norms(db, [b["product_id"] for b in batches])
+    stock = {
+        (level["kind"], level["id"]): (level["name"], level["balance"])
+        for level in db.get_stock_levels()
+    }
+    requirements = compute_requirements(batches, norms, stock)
+    logger.debug(
+        "Plan %s – %s: %d serii, %d pozycji, braki: %d",
+        date_from,
+        date_to,
+        len(batches),
+        len(requirements),
+        sum(1 for r in requirements if r.short_from),
+    )
+    return batches, requirements
+
+
+def shortages(requirements: Sequence[Requirement]) -> List[Requirement]:
+    """Tylko pozycje, których zabraknie w okresie planu."""
+    return [r for r in requirements if r.short_from is not None]
@@ -0,0 +1,507 @@
+# c:\serownia\logic\protocol_types.py
+"""
+Deklaratywne definicje typów protokołów produkcji.
+
+Typ protokołu opisuje pola sekcji A (parametry), etapy sekcji C (po 2 pola),
+jednostki i walidację. Na tej podstawie:
+  - DBManager generuje tabelę szczegółów (CREATE + brakujące kolumny) i zapytania
+    INSERT / UPDATE / SELECT (budowane raz i trzymane w pamięci),
+  - ui.protocol_screen.ProtocolScreen buduje formularz i mapowanie pole <-> kolumna.
+
+Kategorie produktów bez własnej definicji (np. "Ser zwarowy", "Lody") dostają
+typ ogólny (GENERIC_PROTOCOL) – nowa kategoria nie wymaga nowego kodu.
+Moduł nie zależy od PyQt5 ani od sqlite3.
+"""
+
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+
+# Rodzaje pól (wpływają na walidację i późniejsze analizy)
+KIND_TEXT = "text"
+KIND_CHOICE = "choice"
+KIND_NUMBER = "number"
+KIND_TIME = "time"  # godzina "HH:MM"
+KIND_DURATION = "duration"  # czas trwania
+KIND_TEMPERATURE = "temperature"
+
+# Pola czasu mają dodatkową kolumnę INTEGER <klucz>_min (minuty: godzina =>
+# minuty od północy, czas trwania => minuty), wypełnianą przy zapisie
+MINUTE_KINDS = (KIND_TIME, KIND_DURATION)
+MINUTES_SUFFIX = "_min"
+
+MILK_TYPES = ("Krowie", "Owcze", "Kozie")
+PASTEURIZATION_CHOICES = ("Brak", "65°C/30min", "85°C/10min")
+
+
+@dataclass(frozen=True)
+class ProtocolField:
+    """Jedno pole protokołu = jedna kolumna TEXT w tabeli szczegółów."""
+
+    key: str  # nazwa kolumny w tabeli szczegółów
+    label: str
+    kind: str = KIND_TEXT
+    unit: str = ""
+    choices: Tuple[str, ...] = ()
+    required: bool = False
+    placeholder: str = ""
+    spc: bool = False  # parametr procesu pod kontrolą statystyczną (logic/spc.py)
+
+    @property
+    def default(self) -> str:
+        """Wartość domyślna (dla list wyboru – pierwsza pozycja)."""
+        return self.choices[0] if self.choices else ""
+
+    @property
+    def minutes_column(self) -> Optional[str]:
+        """Kolumna INTEGER z minutami dla pól czasu, inaczej None."""
+        return self.key + MINUTES_SUFFIX if self.kind in MINUTE_KINDS else None
+
+
+@dataclass(frozen=True)
+class ProtocolStage:
+    """Etap produkcji (sekcja C): nazwa czynności + dwa pola w jednym wierszu."""
+
+    name: str
+    fields: Tuple[ProtocolField, ProtocolField]
+
+
+@dataclass(frozen=True)
+class ProtocolType:
+    """
+    Definicja typu protokołu.
+
+    details_table – tabela szczegółów (1 wiersz na production_records.id),
+    milk_field    – klucz pola z ilością mleka/surowca (przeliczanie dawek dodatków),
+    params        – pola sekcji A (poza produktem, datą i numerem serii),
+    stages        – etapy sekcji C.
+    """
+
+    category: str
+    details_table: str
+    title: str
+    product_label: str
+    product_hint: str
+    milk_field: str
+    params: Tuple[ProtocolField, ...]
+    stages: Tuple[ProtocolStage, ...]
+    stages_title: str = "Etapy produkcji"
+    max_additives: int = 6
+    additives_title: str = "Dodatki (maks. 6)"
+    parties_title: str = "Ewidencja partii z tej serii"
+    packaging_title: str = "Zużyte opakowania"
+    default_product_name: str = ""
+    dose_read_only: bool = False
+
+    @property
+    def fields(self) -> Tuple[ProtocolField, ...]:
+        """Wszystkie pola (sekcja A, potem etapy) w kolejności kolumn."""
+        result = list(self.params)
+        for stage in self.stages:
+            result.extend(stage.fields)
+        return tuple(result)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(f.key for f in self.fields)
+
+    @property
+    def minute_fields(self) -> Tuple[ProtocolField, ...]:
+        return tuple(f for f in self.fields if f.minutes_column)
+
+    @property
+    def minute_columns(self) -> Tuple[str, ...]:
+        """Kolumny <klucz>_min (INTEGER) w kolejności pól."""
+        return tuple(f.minutes_column for f in self.minute_fields)
+
+    def minute_values(self, values: Dict[str, str]) -> List[Optional[int]]:
+        """Minuty dla minute_columns z tekstów pól (nieczytelne / puste => None)."""
+        return [
+            parse_minutes(str(values.get(f.key) or ""), f.kind)
+            for f in self.minute_fields
+        ]
+
+    @property
+    def spc_fields(self) -> Tuple[ProtocolField, ...]:
+        return tuple(f for f in self.fields if f.spc)
+
+    def spc_values(self, values: Dict[str, str]) -> List[Tuple[str, float]]:
+        """[(klucz, liczba)] pól SPC z tekstów pól; puste / nieczytelne pomijane."""
+        result = []
+        for f in self.spc_fields:
+            number = parse_measurement(str(values.get(f.key) or ""), f.unit)
+            if number is not None:
+                result.append((f.key, number))
+        return result
+
+    def field(self, key: str) -> Optional[ProtocolField]:
+        for f in self.fields:
+            if f.key == key:
+                return f
+        return None
+
+    def field_title(self, f: ProtocolField) -> str:
+        """Etykieta do komunikatów: 'Etap – pole' dla pól etapów."""
+        for stage in self.stages:
+            if f in stage.fields:
+                return f"{stage.name} – {f.label}"
+        return f.label.rstrip(":")
+
+    def validate(self, values: Dict[str, str]) -> List[str]:
+        """
+        Sprawdza wartości pól (słownik klucz -> tekst).
+        Zwraca listę komunikatów błędów (pusta => poprawne).
+        """
+        errors: List[str] = []
+        for f in self.fields:
+            text = (values.get(f.key) or "").strip()
+            if not text:
+                if f.required:
+                    errors.append(f"Uzupełnij pole '{f.label.rstrip(':')}'.")
+                continue
+            if f.kind == KIND_NUMBER and parse_number(text) is None:
+                errors.append(f"{f.label.rstrip(':')} musi być liczbą.")
+            elif f.kind in MINUTE_KINDS and parse_minutes(text, f.kind) is None:
+                errors.append(
+                    f"{self.field_title(f)}: niepoprawny czas '{text}' (HH:MM)."
+                )
+            elif f.choices and text not in f.choices:
+                errors.append(
+                    f"Niedozwolona wartość '{text}' pola '{f.label.rstrip(':')}'."
+                )
+        return errors
+
+
+_HOURS_MINUTES_RE = re.compile(r"(\d{1,3})\s*[:.hH]\s*(\d{1,2})?\s*(?:min)?")
+_PLAIN_NUMBER_RE = re.compile(r"(\d{1,4})\s*(?:min|m|')?")
+
+
+def parse_minutes(text: str, kind: str = KIND_DURATION) -> Optional[int]:
+    """
+    Tekst czasu z protokołu => minuty.
+    KIND_TIME (godzina):       "10:30" / "10.30" / "10h30" / "10" => 630 / 600
+                               (minuty od północy, 0..1439),
+    KIND_DURATION (czas):      "1:30" / "1h30" / "2h" => 90 / 120,
+                               "45" / "45 min" => 45 (sama liczba = minuty).
+    Pusty lub niepoprawny tekst => None.
+    """
+    text = (text or "").strip().lower()
+    if not text:
+        return None
+    match = _HOURS_MINUTES_RE.fullmatch(text)
+    if match:
+        hours, minutes = int(match.group(1)), int(match.group(2) or 0)
+    else:
+        match = _PLAIN_NUMBER_RE.fullmatch(text)
+        if not match:
+            return None
+        if kind == KIND_TIME:
+            hours, minutes = int(match.group(1)), 0
+        else:
+            hours, minutes = divmod(int(match.group(1)), 60)
+    if minutes >= 60 or (kind == KIND_TIME and hours >= 24):
+        return None
+    return hours * 60 + minutes
+
+
+def parse_number(text: str) -> Optional[float]:
+    """'6,5' / '6.5' -> 6.5; pusty lub niepoprawny tekst -> None."""
+    try:
+        return float(text.strip().replace(",", "."))
+    except (AttributeError, ValueError):
+        return None
+
+
+def parse_measurement(text: str, unit: str = "") -> Optional[float]:
+    """Liczba z opcjonalną jednostką pola ('32,5°C', '32.5 °C') -> 32.5."""
+    text = text.strip()
+    if unit and text.endswith(unit):
+        text = text[: -len(unit)]
+    return parse_number(text.rstrip("° "))
+
+
+# ----------------------------------------------------------------
+# Wspólne pola sekcji A
+# ----------------------------------------------------------------
+def _milk_type() -> ProtocolField:
+    return ProtocolField("milk_type", "Rodzaj mleka:", KIND_CHOICE, choices=MILK_TYPES)
+
+
+def _milk_amount(
+    key: str = "milk_amount",
+    label: str = "Ilość mleka (litry):",
+    placeholder: str = "np. 50.0",
+) -> ProtocolField:
+    return ProtocolField(
+        key, label, KIND_NUMBER, unit="l", required=True, placeholder=placeholder
+    )
+
+
+def _ph() -> ProtocolField:
+    return ProtocolField("ph", "pH (x,xx):", KIND_NUMBER, spc=True)
+
+
+def _temperature(key: str, label: str) -> ProtocolField:
+    return ProtocolField(key, label, KIND_TEMPERATURE, unit="°C", spc=True)
+
+
+def _pasteurization(label: str = "Pasteryzacja:") -> ProtocolField:
+    return ProtocolField(
+        "pasteryzacja", label, KIND_CHOICE, choices=PASTEURIZATION_CHOICES
+    )
+
+
+def _stage(
+    name: str,
+    key1: str,
+    label1: str,
+    kind1: str,
+    key2: str,
+    label2: str,
+    kind2: str,
+) -> ProtocolStage:
+    units = {KIND_TEMPERATURE: "°C"}
+    return ProtocolStage(
+        name,
+        (
+            ProtocolField(
+                key1,
+                label1,
+                kind1,
+                unit=units.get(kind1, ""),
+                spc=kind1 == KIND_TEMPERATURE,
+            ),
+            ProtocolField(
+                key2,
+                label2,
+                kind2,
+                unit=units.get(kind2, ""),
+                spc=kind2 == KIND_TEMPERATURE,
+            ),
+        ),
+    )
+
+
+def _timed_stage(name: str, prefix: str) -> ProtocolStage:
+    """Etap 'Godzina / Czas trwania' z kolumnami <prefix>_start / <prefix>_end."""
+    return _stage(
+        name,
+        f"{prefix}_start",
+        "Godzina",
+        KIND_TIME,
+        f"{prefix}_end",
+        "Czas trwania",
+        KIND_DURATION,
+    )
+
+
+def _span_stage(name: str, prefix: str) -> ProtocolStage:
+    """Etap 'Początek / Koniec' z kolumnami <prefix>_start / <prefix>_end."""
+    return _stage(
+        name,
+        f"{prefix}_start",
+        "Początek",
+        KIND_TIME,
+        f"{prefix}_end",
+        "Koniec",
+        KIND_TIME,
+    )
+
+
+# ----------------------------------------------------------------
+# Definicje typów
+# ----------------------------------------------------------------
+SER_PROTOCOL = ProtocolType(
+    category="Ser",
+    details_table="ser_production_details",
+    title="Protokół Produkcji (Ser)",
+    product_label="Nazwa produktu (Ser):",
+    product_hint="Ser",
+    milk_field="milk_amount",
+    params=(
+        _milk_type(),
+        _milk_amount(placeholder="np. 100.0"),
+        _ph(),
+        _pasteurization(),
+        _temperature("temp_poczatkowa", "Temp. początkowa mleka:"),
+        _temperature("temp_koncowa", "Temp. końcowa (po dogrzaniu):"),
+    ),
+    stages=(
+        _timed_stage("Dodanie kultur", "dodanie_kultur"),
+        _timed_stage("Podpuszczka", "podpuszczka"),
+        _timed_stage("Krojenie", "krojenie"),
+        _stage(
+            "Płukanie ziarna",
+            "serwatka_start",
+            "Serwatka-",
+            KIND_NUMBER,
+            "serwatka_end",
+            "Woda+",
+            KIND_NUMBER,
+        ),
+        _timed_stage("Dogrzewanie ziarna", "dogrzewanie"),
+        _timed_stage("Dosuszanie ziarna", "dosuszanie"),
+        _span_stage("Wstępne prasowanie", "wstepne_prasowanie"),
+        _stage(
+            "Formy",
+            "formy_wielkosc",
+            "Wielkość",
+            KIND_TEXT,
+            "formy_ilosc",
+            "Ilość",
+            KIND_NUMBER,
+        ),
+        _timed_stage("Solenie", "solenie"),
+    ),
+    stages_title="Etapy produkcji (9 czynności)",
+    max_additives=10,
+    additives_title="Dodatki (maks. 10) – [Kategoria | Dodatek | Dawka]",
+    dose_read_only=True,
+)
+
+TWAROG_PROTOCOL = ProtocolType(
+    category="Ser twarogowy",
+    details_table="twarog_production_details",
+    title="Protokół Produkcji (Ser Twarogowy)",
+    product_label="Nazwa produktu (Ser twarogowy):",
+    product_hint="Ser Twarogowy",
+    milk_field="milk_amount",
+    params=(_milk_type(), _milk_amount(), _ph(), _pasteurization()),
+    stages=(
+        _stage(
+            "Krojenie",
+            "krojenie_start",
+            "Godzina",
+            KIND_TIME,
+            "krojenie_end",
+            "Temperatura",
+            KIND_TEMPERATURE,
+        ),
+        _span_stage("Dogrzewanie", "dogrzewanie"),
+        _stage(
+            "Formy",
+            "formy_ilosc",
+            "Ilość",
+            KIND_NUMBER,
+            "formy_wielkosc",
+            "Wielkość",
+            KIND_TEXT,
+        ),
+        _span_stage("Solenie", "solenie"),
+    ),
+    stages_title="Etapy produkcji (Twarog)",
+    parties_title="Ewidencja partii (Ser Twarogowy)",
+    default_product_name="Ser twarogowy",
+)
+
+FERMENTED_PROTOCOL = ProtocolType(
+    category="Napoje fermentowane",
+    details_table="fermented_production_details",
+    title="Protokół Produkcji (Napoje fermentowane)",
+    product_label="Nazwa produktu (Napój ferm.):",
+    product_hint="Napoje ferm.",
+    milk_field="amt",
+    params=(
+        _milk_type(),
+        _milk_amount("amt", "Ilość surowca (litry):"),
+        _ph(),
+        _pasteurization("Obróbka wstępna (pasteryzacja):"),
+    ),
+    stages=(
+        _stage(
+            "Dodanie kultur",
+            "dod_kultur_godz",
+            "Temp. mleka",
+            KIND_TEMPERATURE,
+            "dod_kultur_czas",
+            "Godzina",
+            KIND_TIME,
+        ),
+        _timed_stage("Rozlewanie", "rozl"),
+        _stage(
+            "Inkubacja",
+            "ink_temp",
+            "Temperatura",
+            KIND_TEMPERATURE,
+            "ink_czas",
+            "Czas trwania",
+            KIND_DURATION,
+        ),
+        _stage(
+            "Chłodzenie",
+            "chl_godz",
+            "Godzina",
+            KIND_TIME,
+            "chl_temp_end",
+            "Temp. zadana",
+            KIND_TEMPERATURE,
+        ),
+    ),
+    stages_title="Etapy produkcji (Napoje fermentowane) – 4 czynności",
+)
+
+# Typ ogólny – dla kategorii bez własnej definicji (wspólna tabela szczegółów)
+GENERIC_PROTOCOL = ProtocolType(
+    category="",
+    details_table="generic_production_details",
+    title="Protokół Produkcji",
+    product_label="Nazwa produktu:",
+    product_hint="",
+    milk_field="milk_amount",
+    params=(_milk_type(), _milk_amount(), _ph(), _pasteurization()),
+    stages=(
+        _timed_stage("Dodanie kultur / składników", "dodanie_kultur"),
+        _stage(
+            "Obróbka termiczna",
+            "obrobka_temp",
+            "Temperatura",
+            KIND_TEMPERATURE,
+            "obrobka_czas",
+            "Czas trwania",
+            KIND_DURATION,
+        ),
+        _stage(
+            "Chłodzenie",
+            "chlodzenie_start",
+            "Godzina",
+            KIND_TIME,
+            "chlodzenie_temp",
+            "Temp. zadana",
+            KIND_TEMPERATURE,
+        ),
+        _span_stage("Pakowanie", "pakowanie"),
+    ),
+    stages_title="Etapy produkcji",
+    max_additives=10,
+    additives_title="Dodatki (maks. 10)",
+)
+
+PROTOCOL_TYPES: Dict[str, ProtocolType] = {
+    p.category: p for p in (SER_PROTOCOL, FERMENTED_PROTOCOL, TWAROG_PROTOCOL)
+}
+
+
+def get_protocol_type(category_name: str) -> ProtocolType:
+    """
+    Zwraca definicję protokołu dla kategorii produktu.
+    Kategorie bez własnej definicji => GENERIC_PROTOCOL z nazwą kategorii w etykietach.
+    """
+    name = (category_name or "").strip()
+    ptype = PROTOCOL_TYPES.get(name)
+    if ptype is not None:
+        return ptype
+    if not name:
+        return GENERIC_PROTOCOL
+    return replace(
+        GENERIC_PROTOCOL,
+        category=name,
+        title=f"Protokół Produkcji ({name})",
+        product_label=f"Nazwa produktu ({name}):",
+        product_hint=name,
+    )
+
+
+def details_table_types() -> List[ProtocolType]:
+    """Po jednej definicji na tabelę szczegółów (typy zarejestrowane + ogólny)."""
+    return list(PROTOCOL_TYPES.values()) + [GENERIC_PROTOCOL]
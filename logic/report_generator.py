@@ -0,0 +1,554 @@
+# c:\serownia\logic\report_generator.py
+"""
+Silnik raportów: każdy raport to parametryzowana definicja (ReportDefinition)
+z jednym zapytaniem SQL – agregacja (GROUP BY) i funkcje okna (SUM ... OVER)
+liczone w SQLite, do Pythona trafiają tylko wiersze wyniku, pobierane porcjami.
+
+Parametry wspólne: date_from / date_to ("YYYY-MM-DD", puste => bez ograniczenia),
+porównywane z production_records.date (albo datą przyjęcia w rejestrach);
+raporty z podsumowań miesięcznych (production_monthly_summary) filtrują
+całe miesiące.
+
+Wydajność (kg sera na 100 L mleka) liczona jest z kolumn typowanych
+production_records (total_weight_kg, milk_l, milk_type): miesięcznie per
+produkt i rodzaj mleka, trend (nachylenie prostej regresji z sum w SQL)
+i serie odstające (odchylenie od średniej POZOSTAŁYCH serii grupy).
+
+Marża miesięczna per produkt: przychód = waga partii × cena produktu
+(products.price, zł / kg), koszty mleka / dodatków / opakowań z
+production_monthly_summary (koszty serii – DBManager._BATCH_COST_SQL).
+
+run_report() jest blokujące i otwiera WŁASNE połączenie (connect()), więc można
+je wywołać w wątku w tle (ui.raporty_screen). ReportCache trzyma wyniki
+w pamięci razem z licznikami zmian tabel raportu (ReportDefinition.tables,
+DBManager.get_table_versions) – bez zmian w danych ponowne otwarcie raportu
+nie dotyka tabel źródłowych. Moduł nie zależy od PyQt5.
+"""
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FETCH_CHUNK = 500
+# Tyle wyników (raport + parametry) trzyma ReportCache
+CACHE_ENTRIES = 32
+# Seria odstająca: |wydajność − średnia pozostałych| > YIELD_OUTLIER_SIGMA · s
+YIELD_OUTLIER_SIGMA = 3
+# ... licząc tylko grupy z co najmniej tyloma seriami
+YIELD_OUTLIER_MIN_BATCHES = 5
+
+
+@dataclass(frozen=True)
+class ReportParam:
+    key: str  # nazwa parametru :key w SQL
+    label: str
+    placeholder: str = ""
+    default: str = ""
+
+
+@dataclass(frozen=True)
+class ReportDefinition:
+    key: str
+    title: str
+    columns: Tuple[str, ...]  # nagłówki kolumn wyniku (kolejność jak w SELECT)
+    sql: str
+    params: Tuple[ReportParam, ...] = ()
+    tables: Tuple[str, ...] = ()  # tabele źródłowe (unieważnianie ReportCache)
+
+
+@dataclass
+class ReportResult:
+    definition: ReportDefinition
+    columns: Tuple[str, ...]
+    rows: List[tuple]
+    cancelled: bool = False
+    cached: bool = False
+
+
+DATE_PARAMS = (
+    ReportParam("date_from", "Od (YYYY-MM-DD)", "2024-01-01"),
+    ReportParam("date_to", "Do (YYYY-MM-DD)", "2024-12-31"),
+)
+
+# Filtr zakresu dat dla dowolnej kolumny daty
+_DATE_FILTER = (
+    "(:date_from = '' OR {col} >= :date_from)"
+    " AND (:date_to = '' OR {col} <= :date_to)"
+)
+
+# Filtr miesiąca ("YYYY-MM") podsumowania wg zakresu dat (miesiące graniczne całe)
+_MONTH_FILTER = (
+    "(:date_from = '' OR {col} >= substr(:date_from, 1, 7))"
+    " AND (:date_to = '' OR {col} <= substr(:date_to, 1, 7))"
+)
+_SUMMARY_MONTH = "printf('%04d-%02d', s.year, s.month)"
+
+
+MILK_BY_PRODUCT_MONTH = ReportDefinition(
+    key="milk_by_product_month",
+    title="Przyjęcie mleka wg produktu i miesiąca",
+    columns=(
+        "Miesiąc",
+        "Produkt",
+        "Serie",
+        "Mleko (L)",
+        "Narastająco (L)",
+        "% miesiąca",
+    ),
+    sql=f"""
+        WITH months AS (
+            SELECT {_SUMMARY_MONTH} AS month,
+                   COALESCE(p.name, '-') AS product,
+                   SUM(s.batches) AS batches,
+                   SUM(s.milk_l) AS milk_l
+              FROM production_monthly_summary s
+              LEFT JOIN products p ON p.id = s.product_id
+             WHERE s.milk_l > 0 AND {_MONTH_FILTER.format(col=_SUMMARY_MONTH)}
+             GROUP BY month, product
+        )
+        SELECT month,
+               product,
+               batches,
+               ROUND(milk_l, 1),
+               ROUND(SUM(milk_l) OVER (PARTITION BY product ORDER BY month), 1),
+               ROUND(100.0 * milk_l / SUM(milk_l) OVER (PARTITION BY month), 1)
+          FROM months
+         ORDER BY month, product
+    """,
+    params=DATE_PARAMS,
+    tables=("production_records", "products"),
+)
+
+BATCHES_PER_CATEGORY = ReportDefinition(
+    key="batches_per_category",
+    title="Liczba serii wg kategorii produktu",
+    columns=("Kategoria", "Serie", "Udział %", "Miejsce", "Pierwsza", "Ostatnia"),
+    sql=f"""
+        SELECT COALESCE(pc.name, '-') AS category,
+               COUNT(*),
+               ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 1),
+               RANK() OVER (ORDER BY COUNT(*) DESC),
+               MIN(pr.date),
+               MAX(pr.date)
+          FROM production_records pr
+          LEFT JOIN products p ON p.id = pr.product_id
+          LEFT JOIN product_categories pc ON pc.id = p.category_id
+         WHERE {_DATE_FILTER.format(col="pr.date")}
+         GROUP BY category
+         ORDER BY COUNT(*) DESC, category
+    """,
+    params=DATE_PARAMS,
+    tables=("production_records", "products"),
+)
+
+ADDITIVES_PER_MONTH = ReportDefinition(
+    key="additives_per_month",
+    title="Zużycie dodatków wg miesiąca (g / ml / szt.)",
+    columns=("Miesiąc", "Dodatek", "Serie", "Zużycie", "Narastająco", "Zmiana m/m"),
+    sql=f"""
+        SELECT substr(pr.date, 1, 7) AS month,
+               COALESCE(a.name, spa.additive_name) AS additive,
+               COUNT(DISTINCT pr.id),
+               ROUND(SUM(spa.qty), 2),
+               ROUND(SUM(SUM(spa.qty)) OVER (
+                   PARTITION BY COALESCE(a.name, spa.additive_name)
+                   ORDER BY substr(pr.date, 1, 7)
+               ), 2),
+               ROUND(SUM(spa.qty) - LAG(SUM(spa.qty)) OVER (
+                   PARTITION BY COALESCE(a.name, spa.additive_name)
+                   ORDER BY substr(pr.date, 1, 7)
+               ), 2)
+          FROM ser_production_additives spa
+          JOIN production_records pr ON pr.id = spa.production_record_id
+          LEFT JOIN additives a ON a.id = spa.additive_id
+         WHERE spa.qty IS NOT NULL AND {_DATE_FILTER.format(col="pr.date")}
+         GROUP BY month, additive
+         ORDER BY month, additive
+    """,
+    params=DATE_PARAMS,
+    tables=("ser_production_additives", "production_records", "additives"),
+)
+
+PACKAGING_RECEIPTS_VS_USAGE = ReportDefinition(
+    key="packaging_receipts_vs_usage",
+    title="Opakowania: przyjęcia a zużycie",
+    columns=(
+        "Miesiąc",
+        "Opakowanie",
+        "Przyjęto",
+        "Zużyto",
+        "Saldo m-ca",
+        "Saldo narast.",
+    ),
+    sql=f"""
+        WITH moves AS (
+            SELECT packaging_id, substr(date, 1, 7) AS month,
+                   qty AS received, 0 AS used
+              FROM packaging_register
+             WHERE qty IS NOT NULL AND {_DATE_FILTER.format(col="date")}
+            UNION ALL
+            SELECT pp.packaging_id, substr(pr.date, 1, 7), 0, pp.qty
+              FROM production_packaging pp
+              JOIN production_records pr ON pr.id = pp.production_record_id
+             WHERE pp.qty IS NOT NULL AND {_DATE_FILTER.format(col="pr.date")}
+        )
+        SELECT m.month,
+               COALESCE(p.name, '-') AS packaging,
+               SUM(m.received),
+               SUM(m.used),
+               SUM(m.received) - SUM(m.used),
+               SUM(SUM(m.received) - SUM(m.used)) OVER (
+                   PARTITION BY m.packaging_id ORDER BY m.month
+               )
+          FROM moves m
+          LEFT JOIN packaging p ON p.id = m.packaging_id
+         GROUP BY m.month, m.packaging_id
+         ORDER BY m.month, packaging
+    """,
+    params=DATE_PARAMS,
+    tables=(
+        "packaging_register",
+        "production_packaging",
+        "production_records",
+        "packaging",
+    ),
+)
+
+# Serie z wagą partii i ilością mleka => wydajność kg / 100 L
+_YIELD_BATCHES = f"""
+    SELECT pr.id, pr.date, pr.series, pr.product_id,
+           COALESCE(pr.milk_type, '-') AS milk_type,
+           pr.milk_l, pr.total_weight_kg,
+           100.0 * pr.total_weight_kg / pr.milk_l AS yield
+      FROM production_records pr
+     WHERE pr.milk_l > 0 AND pr.total_weight_kg > 0
+       AND {_DATE_FILTER.format(col="pr.date")}
+"""
+_YIELD_TABLES = ("production_records", "products")
+
+YIELD_BY_PRODUCT_MONTH = ReportDefinition(
+    key="yield_by_product_month",
+    title="Wydajność wg produktu, rodzaju mleka i miesiąca",
+    columns=(
+        "Miesiąc",
+        "Produkt",
+        "Mleko",
+        "Serie",
+        "Mleko (L)",
+        "Ser (kg)",
+        "kg / 100 L",
+        "Zmiana m/m",
+    ),
+    sql=f"""
+        WITH b AS ({_YIELD_BATCHES}),
+        months AS (
+            SELECT substr(b.date, 1, 7) AS month,
+                   COALESCE(p.name, '-') AS product,
+                   b.milk_type,
+                   COUNT(*) AS batches,
+                   SUM(b.milk_l) AS milk_l,
+                   SUM(b.total_weight_kg) AS weight_kg
+              FROM b
+              LEFT JOIN products p ON p.id = b.product_id
+             GROUP BY month, product, b.milk_type
+        )
+        SELECT month,
+               product,
+               milk_type,
+               batches,
+               ROUND(milk_l, 1),
+               ROUND(weight_kg, 2),
+               ROUND(100.0 * weight_kg / milk_l, 2),
+               ROUND(100.0 * weight_kg / milk_l - LAG(100.0 * weight_kg / milk_l)
+                   OVER (PARTITION BY product, milk_type ORDER BY month), 2)
+          FROM months
+         ORDER BY month, product, milk_type
+    """,
+    params=DATE_PARAMS,
+    tables=_YIELD_TABLES,
+)
+
+# Trend: nachylenie prostej MNK wydajności miesięcznej (kg/100 L na miesiąc),
+# x = numer miesiąca od 2000-01; sumy Σx, Σy, Σxy, Σx² w jednym GROUP BY
+YIELD_TREND = ReportDefinition(
+    key="yield_trend",
+    title="Trend wydajności (kg / 100 L na miesiąc)",
+    columns=(
+        "Produkt",
+        "Mleko",
+        "Miesięcy",
+        "Serie",
+        "Średnio kg / 100 L",
+        "Trend / m-c",
+        "Od",
+        "Do",
+    ),
+    sql=f"""
+        WITH b AS ({_YIELD_BATCHES}),
+        months AS (
+            SELECT b.product_id,
+                   b.milk_type,
+                   substr(b.date, 1, 7) AS month,
+                   (CAST(substr(b.date, 1, 4) AS INTEGER) - 2000) * 12
+                       + CAST(substr(b.date, 6, 2) AS INTEGER) AS x,
+                   100.0 * SUM(b.total_weight_kg) / SUM(b.milk_l) AS y,
+                   COUNT(*) AS batches
+              FROM b
+             GROUP BY b.product_id, b.milk_type, month
+        )
+        SELECT COALESCE(p.name, '-') AS product,
+               m.milk_type,
+               COUNT(*),
+               SUM(m.batches),
+               ROUND(AVG(m.y), 2),
+               ROUND(
+                   (COUNT(*) * SUM(m.x * m.y) - SUM(m.x) * SUM(m.y))
+                   / NULLIF(COUNT(*) * SUM(m.x * m.x) - SUM(m.x) * SUM(m.x), 0),
+                   3
+               ),
+               MIN(m.month),
+               MAX(m.month)
+          FROM months m
+          LEFT JOIN products p ON p.id = m.product_id
+         GROUP BY m.product_id, m.milk_type
+         ORDER BY product, m.milk_type
+    """,
+    params=DATE_PARAMS,
+    tables=_YIELD_TABLES,
+)
+
+# Serie odstające: porównanie z pozostałymi seriami grupy (leave-one-out),
+# żeby pojedyncza skrajna seria nie zawyżała własnego odchylenia; warunek
+# na kwadratach (bez sqrt)
+YIELD_OUTLIERS = ReportDefinition(
+    key="yield_outliers",
+    title="Serie o odstającej wydajności",
+    columns=(
+        "Data",
+        "Seria",
+        "Produkt",
+        "Mleko",
+        "kg / 100 L",
+        "Średnia pozostałych",
+        "Różnica",
+    ),
+    sql=f"""
+        WITH b AS ({_YIELD_BATCHES}),
+        g AS (
+            SELECT b.*,
+                   COUNT(*) OVER grp AS n,
+                   SUM(b.yield) OVER grp AS sum_y,
+                   SUM(b.yield * b.yield) OVER grp AS sum_y2
+              FROM b
+            WINDOW grp AS (PARTITION BY b.product_id, b.milk_type)
+        ),
+        loo AS (
+            SELECT g.*,
+                   (sum_y - yield) / (n - 1) AS mean_other,
+                   (sum_y2 - yield * yield) / (n - 1)
+                       - ((sum_y - yield) / (n - 1)) * ((sum_y - yield) / (n - 1))
+                       AS var_other
+              FROM g
+             WHERE n >= {YIELD_OUTLIER_MIN_BATCHES}
+        )
+        SELECT loo.date,
+               loo.series,
+               COALESCE(p.name, '-'),
+               loo.milk_type,
+               ROUND(loo.yield, 2),
+               ROUND(loo.mean_other, 2),
+               ROUND(loo.yield - loo.mean_other, 2)
+          FROM loo
+          LEFT JOIN products p ON p.id = loo.product_id
+         WHERE (loo.yield - loo.mean_other) * (loo.yield - loo.mean_other)
+               > {YIELD_OUTLIER_SIGMA * YIELD_OUTLIER_SIGMA}
+                 * MAX(loo.var_other, 0) * (loo.n - 1) / (loo.n - 2)
+         ORDER BY loo.date, loo.series
+    """,
+    params=DATE_PARAMS,
+    tables=_YIELD_TABLES,
+)
+
+# products.price to tekst ("32,50") – liczba po zamianie przecinka
+_PRODUCT_PRICE = "CAST(REPLACE(p.price, ',', '.') AS REAL)"
+
+MARGIN_BY_PRODUCT_MONTH = ReportDefinition(
+    key="margin_by_product_month",
+    title="Koszty i marża wg produktu i miesiąca",
+    columns=(
+        "Miesiąc",
+        "Produkt",
+        "Serie",
+        "Ser (kg)",
+        "Mleko (zł)",
+        "Dodatki (zł)",
+        "Opakowania (zł)",
+        "Koszt / kg",
+        "Przychód (zł)",
+        "Marża (zł)",
+        "Marża %",
+    ),
+    sql=f"""
+        WITH months AS (
+            SELECT {_SUMMARY_MONTH} AS month,
+                   COALESCE(p.name, '-') AS product,
+                   SUM(s.batches) AS batches,
+                   SUM(s.party_weight_kg) AS weight_kg,
+                   SUM(s.cost_milk) AS cost_milk,
+                   SUM(s.cost_additives) AS cost_additives,
+                   SUM(s.cost_packaging) AS cost_packaging,
+                   SUM(s.party_weight_kg) * MAX({_PRODUCT_PRICE}) AS revenue
+              FROM production_monthly_summary s
+              LEFT JOIN products p ON p.id = s.product_id
+             WHERE s.batches > 0 AND {_MONTH_FILTER.format(col=_SUMMARY_MONTH)}
+             GROUP BY month, product
+        ),
+        totals AS (
+            SELECT *, cost_milk + cost_additives + cost_packaging AS cost
+              FROM months
+        )
+        SELECT month,
+               product,
+               batches,
+               ROUND(weight_kg, 2),
+               ROUND(cost_milk, 2),
+               ROUND(cost_additives, 2),
+               ROUND(cost_packaging, 2),
+               ROUND(cost / NULLIF(weight_kg, 0), 2),
+               ROUND(revenue, 2),
+               ROUND(revenue - cost, 2),
+               ROUND(100.0 * (revenue - cost) / NULLIF(revenue, 0), 1)
+          FROM totals
+         ORDER BY month, product
+    """,
+    params=DATE_PARAMS,
+    tables=("production_records", "products"),
+)
+
+REPORTS: Dict[str, ReportDefinition] = {
+    report.key: report
+    for report in (
+        MILK_BY_PRODUCT_MONTH,
+        BATCHES_PER_CATEGORY,
+        ADDITIVES_PER_MONTH,
+        PACKAGING_RECEIPTS_VS_USAGE,
+        YIELD_BY_PRODUCT_MONTH,
+        YIELD_TREND,
+        YIELD_OUTLIERS,
+        MARGIN_BY_PRODUCT_MONTH,
+    )
+}
+
+
+def run_report(
+    definition: ReportDefinition,
+    connect: Callable[[], sqlite3.Connection],
+    params: Optional[Dict[str, Any]] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    cancel: Optional[threading.Event] = None,
+    chunk_size: int = FETCH_CHUNK,
+) -> ReportResult:
+    """
+    Wykonuje raport na nowym połączeniu (connect(), np. DBManager.create_connection)
+    i zwraca wiersze wyniku. progress(n) po każdej porcji (n = liczba wierszy
+    dotąd), cancel.set() przerywa pobieranie (wynik z cancelled=True).
+    Błąd SQL => logowany i przekazywany dalej.
+    """
+    values = _param_values(definition, params)
+    rows: List[tuple] = []
+    cancelled = False
+    conn = connect()
+    try:
+        cursor = conn.execute(definition.sql, values)
+        while True:
+            if cancel is not None and cancel.is_set():
+                cancelled = True
+                break
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            rows.extend(chunk)
+            if progress is not None:
+                progress(len(rows))
+    except sqlite3.Error as e:
+        logger.error("Błąd raportu '%s': %s", definition.key, e)
+        raise
+    finally:
+        conn.close()
+
+    logger.debug("Raport '%s': %d wierszy", definition.key, len(rows))
+    return ReportResult(definition, definition.columns, rows, cancelled)
+
+
+def _param_values(
+    definition: ReportDefinition, params: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Parametry raportu: domyślne z definicji + podane (None => '')."""
+    values = {p.key: p.default for p in definition.params}
+    values.update({k: ("" if v is None else v) for k, v in (params or {}).items()})
+    return values
+
+
+class ReportCache:
+    """
+    Wyniki raportów w pamięci, kluczowane (raport, parametry) i ważne, dopóki
+    liczniki zmian tabel raportu są te same. Sprawdzenie ważności = jedno
+    zapytanie o table_versions. Bezpieczne wątkowo; najwyżej CACHE_ENTRIES
+    wyników (najstarszy wypada pierwszy).
+    """
+
+    def __init__(
+        self,
+        versions: Callable[[Iterable[str]], Dict[str, int]],
+        max_entries: int = CACHE_ENTRIES,
+    ) -> None:
+        """:param versions: np. DBManager.get_table_versions."""
+        self._versions = versions
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, Tuple[Dict[str, int], ReportResult]] = {}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def run(
+        self,
+        definition: ReportDefinition,
+        connect: Callable[[], sqlite3.Connection],
+        params: Optional[Dict[str, Any]] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> ReportResult:
+        """
+        Jak run_report(), ale wynik z pamięci, gdy tabele raportu się nie
+        zmieniły (ReportResult.cached=True). Raporty bez 'tables' i wyniki
+        przerwane nie są zapamiętywane.
+        """
+        if not definition.tables:
+            return run_report(definition, connect, params, progress, cancel)
+
+        values = _param_values(definition, params)
+        key = (definition.key, tuple(sorted(values.items())))
+        versions = self._versions(definition.tables)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == versions:
+            logger.debug("Raport '%s' z pamięci podręcznej", definition.key)
+            result = entry[1]
+            return ReportResult(
+                result.definition, result.columns, result.rows, cached=True
+            )
+
+        result = run_report(definition, connect, params, progress, cancel)
+        if not result.cancelled:
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = (versions, result)
+                while len(self._entries) > self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+        return result
@@ -0,0 +1,189 @@
+# c:\serownia\logic\sample_data.py
+"""
+Generator danych przykładowych (demo, testy obciążeniowe, szkolenia):
+produkty z recepturami, dodatki i opakowania z dostawami co RECEIPT_EVERY_DAYS
+dni (cena, termin ważności, numer partii), cena mleka i serie produkcyjne
+zapisywane zwykłym DBManager.save_protocol – triggery utrzymują stany,
+podsumowania, SPC i koszty tak samo jak przy pracy w GUI.
+
+Wynik zależy tylko od seed (random.Random), więc ten sam przebieg daje te
+same dane. Pozycje słownikowe o istniejących nazwach są używane ponownie.
+Moduł nie zależy od PyQt5 (CLI: database/cli.py generate).
+"""
+
+import datetime
+import logging
+import random
+from typing import Dict, Optional, Tuple
+
+from database.db_manager import DBManager
+from logic.protocol_types import MILK_TYPES, PASTEURIZATION_CHOICES, get_protocol_type
+
+logger = logging.getLogger(__name__)
+
+RECEIPT_EVERY_DAYS = 14
+SHELF_LIFE_DAYS = 180
+
+# (nazwa, kategoria dodatku, ilość dostawy, cena jednostkowa)
+ADDITIVES = (
+    ("Sól", "Przyprawy", "25 kg", "1,20 zł/kg"),
+    ("Kultura mezofilna", "Kultury starterowe", "1 kg", "600 zł/kg"),
+    ("Podpuszczka płynna", "Podpuszczka", "5 l", "50 zł/l"),
+)
+# (nazwa, kategoria opakowania, ilość dostawy, cena jednostkowa)
+PACKAGING = (
+    ("Słoik 0,5 L", "Słoiki", "3000 szt", "0,80 zł/szt"),
+    ("Worek próżniowy", "Worki", "3000 szt", "0,30 zł/szt"),
+)
+# (nazwa, kategoria produktu, cena, wydajność kg / L mleka,
+#  receptura [(dodatek, dawka na 100 L, jednostka)], (opakowanie, szt. / kg))
+PRODUCTS = (
+    (
+        "Gouda",
+        "Ser",
+        "45",
+        0.10,
+        (
+            ("Sól", 200.0, "g"),
+            ("Kultura mezofilna", 2.0, "g"),
+            ("Podpuszczka płynna", 25.0, "ml"),
+        ),
+        ("Worek próżniowy", 0.5),
+    ),
+    (
+        "Twaróg półtłusty",
+        "Ser twarogowy",
+        "22",
+        0.18,
+        (("Kultura mezofilna", 3.0, "g"),),
+        ("Worek próżniowy", 2.0),
+    ),
+    (
+        "Kefir",
+        "Napoje fermentowane",
+        "9",
+        0.95,
+        (("Kultura mezofilna", 4.0, "g"),),
+        ("Słoik 0,5 L", 2.0),
+    ),
+)
+MILK_PRICE_L = 2.2
+
+
+def _ids_by_name(rows, key: str = "name") -> Dict[str, int]:
+    return {row[key]: row["id"] for row in rows}
+
+
+def _ensure_catalog(
+    db: DBManager, start: datetime.date
+) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
+    """Dodatki, opakowania i produkty z recepturami (brakujące); zwraca ich ID."""
+    categories = _ids_by_name(db.get_categories())
+    additives = _ids_by_name(db.get_all_additives())
+    for name, category, _qty, _price in ADDITIVES:
+        if name not in additives:
+            db.add_additive(name, "", "", categories[category])
+    additives = _ids_by_name(db.get_all_additives())
+
+    pack_categories = _ids_by_name(db.get_packaging_categories())
+    packaging = _ids_by_name(db.get_all_packaging())
+    for name, category, _qty, _price in PACKAGING:
+        if name not in packaging:
+            db.add_packaging(name, "", start.isoformat(), pack_categories[category])
+    packaging = _ids_by_name(db.get_all_packaging())
+
+    product_categories = _ids_by_name(db.get_product_categories())
+    products = _ids_by_name(db.get_all_products())
+    for name, category, price, _yield, recipe, _pack in PRODUCTS:
+        if name in products:
+            continue
+        db.add_product(name, product_categories[category], price)
+        product_id = _ids_by_name(db.get_all_products())[name]
+        for additive, dose, unit in recipe:
+            db.add_product_additive(product_id, additives[additive], f"{dose:g} {unit}")
+    products = _ids_by_name(db.get_all_products())
+    return additives, packaging, products
+
+
+def _add_receipts(
+    db: DBManager,
+    additives: Dict[str, int],
+    packaging: Dict[str, int],
+    day: datetime.date,
+) -> int:
+    expiry = (day + datetime.timedelta(days=SHELF_LIFE_DAYS)).isoformat()
+    lot = day.strftime("%y%m%d")
+    for name, _category, qty, price in ADDITIVES:
+        db.add_additive_register(
+            day.isoformat(), qty, additives[name], expiry, price, f"D{lot}"
+        )
+    for name, _category, qty, price in PACKAGING:
+        db.add_packaging_register(
+            day.isoformat(), qty, packaging[name], price, expiry, f"O{lot}"
+        )
+    return len(ADDITIVES) + len(PACKAGING)
+
+
+def generate_sample_data(
+    db: DBManager,
+    batches: int = 200,
+    start: Optional[datetime.date] = None,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """
+    Dodaje `batches` serii (średnio dwie dziennie) od dnia start (domyślnie
+    tyle dni wstecz od dziś, by seria ostatnia wypadła dziś) wraz z dostawami.
+    Zwraca liczniki {"batches", "receipts"}.
+    """
+    rng = random.Random(seed)
+    days = max((batches + 1) // 2, 1)
+    start = start or datetime.date.today() - datetime.timedelta(days=days - 1)
+    additives, packaging, products = _ensure_catalog(db, start)
+    categories = {c["id"]: c["name"] for c in db.get_product_categories()}
+    category_of = {
+        p["id"]: categories.get(p["category_id"]) for p in db.get_all_products()
+    }
+    db.add_milk_price(start.isoformat(), MILK_PRICE_L, MILK_TYPES[0])
+
+    receipts = 0
+    last_offset = -1
+    for i in range(batches):
+        offset = i * days // batches
+        day = start + datetime.timedelta(days=offset)
+        if offset != last_offset and offset % RECEIPT_EVERY_DAYS == 0:
+            receipts += _add_receipts(db, additives, packaging, day)
+        last_offset = offset
+
+        name, _category, _price, yield_kg_l, recipe, pack = rng.choice(PRODUCTS)
+        product_id = products[name]
+        ptype = get_protocol_type(category_of[product_id])
+        milk_l = rng.randrange(200, 1050, 50)
+        weight = round(milk_l * yield_kg_l * rng.uniform(0.92, 1.08), 1)
+        details = {
+            ptype.milk_field: f"{milk_l}",
+            "milk_type": MILK_TYPES[0],
+            "ph": f"{rng.gauss(6.5, 0.08):.2f}",
+            "pasteryzacja": rng.choice(PASTEURIZATION_CHOICES[1:]),
+        }
+        lines = [
+            (
+                next(a[1] for a in ADDITIVES if a[0] == additive),
+                additive,
+                f"{dose * milk_l / 100:g} {unit}",
+            )
+            for additive, dose, unit in recipe
+        ]
+        db.save_protocol(
+            ptype,
+            None,
+            day.isoformat(),
+            f"{i + 1:05d}_{day.year}",
+            product_id,
+            details,
+            lines,
+            parties=[(f"P{i + 1}", weight, "")],
+            packaging=[(packaging[pack[0]], round(weight * pack[1]))],
+        )
+
+    logger.info("Dane demo: %d serii od %s, %d dostaw", batches, start, receipts)
+    return {"batches": batches, "receipts": receipts}
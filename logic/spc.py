@@ -0,0 +1,119 @@
+# c:\serownia\logic\spc.py
+"""
+Statystyczna kontrola procesu (SPC) parametrów protokołów: pH i temperatury
+(pola z ProtocolField.spc=True).
+
+Średnia i wariancja każdego parametru per produkt żyją w tabeli spc_stats
+jako akumulatory Welforda (n, mean, m2) – aktualizowane triggerami przy
+zapisie / usunięciu protokołu w O(1), bez przeglądania historii (patrz
+DBManager.ensure_spc_stats). RunningStats to ten sam algorytm w Pythonie.
+
+Granice kontrolne: średnia ± SIGMA_LIMIT·s (s – odchylenie z próby),
+strefa ostrzegawcza od WARNING_SIGMA·s; liczone dopiero od SPC_MIN_SAMPLES
+serii. Formularz protokołu pobiera granice RAZ przy wyborze produktu
+(load_control_limits) i ocenia wartość przy każdej zmianie pola (classify).
+Moduł nie zależy od PyQt5.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+SPC_MIN_SAMPLES = 5
+SIGMA_LIMIT = 3.0
+WARNING_SIGMA = 2.0
+
+SPC_OK = "ok"
+SPC_WARNING = "warning"
+SPC_OUT = "out"
+
+
+@dataclass
+class RunningStats:
+    """Akumulator Welforda: n, średnia, suma kwadratów odchyleń (m2)."""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x: float) -> None:
+        if self.n <= 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.n -= 1
+        delta = x - self.mean
+        self.mean -= delta / self.n
+        self.m2 = max(self.m2 - delta * (x - self.mean), 0.0)
+
+    @property
+    def std(self) -> float:
+        """Odchylenie standardowe z próby (n − 1); 0 dla n < 2."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+
+@dataclass(frozen=True)
+class ControlLimits:
+    parameter: str
+    n: int
+    mean: float
+    std: float
+
+    @property
+    def lcl(self) -> float:
+        return self.mean - SIGMA_LIMIT * self.std
+
+    @property
+    def ucl(self) -> float:
+        return self.mean + SIGMA_LIMIT * self.std
+
+    def classify(self, value: float) -> str:
+        """SPC_OK / SPC_WARNING (poza ±WARNING_SIGMA·s) / SPC_OUT (poza LCL–UCL)."""
+        deviation = abs(value - self.mean)
+        if deviation > SIGMA_LIMIT * self.std:
+            return SPC_OUT
+        if deviation > WARNING_SIGMA * self.std:
+            return SPC_WARNING
+        return SPC_OK
+
+    def describe(self) -> str:
+        return (
+            f"średnia {self.mean:.2f}, granice {self.lcl:.2f} – {self.ucl:.2f}"
+            f" (n={self.n})"
+        )
+
+
+def control_limits(
+    parameter: str, stats: RunningStats, min_samples: int = SPC_MIN_SAMPLES
+) -> Optional[ControlLimits]:
+    """Granice z akumulatora; za mało serii => None (brak oceny)."""
+    if stats.n < max(min_samples, 2):
+        return None
+    return ControlLimits(parameter, stats.n, stats.mean, stats.std)
+
+
+def load_control_limits(
+    db: DBManager, product_id: int, min_samples: int = SPC_MIN_SAMPLES
+) -> Dict[str, ControlLimits]:
+    """{parametr: granice} produktu – jedno zapytanie po kluczu spc_stats."""
+    limits: Dict[str, ControlLimits] = {}
+    for parameter, row in db.get_spc_stats(product_id).items():
+        found = control_limits(
+            parameter, RunningStats(row["n"], row["mean"], row["m2"]), min_samples
+        )
+        if found is not None:
+            limits[parameter] = found
+    logger.debug(
+        "SPC: granice dla produktu id=%s: %s", product_id, sorted(limits) or "brak"
+    )
+    return limits
@@ -0,0 +1,185 @@
+# c:\serownia\logic\stage_analytics.py
+"""
+Rozkłady czasów trwania etapów produkcji per produkt (NumPy).
+
+Źródło: kolumny <pole>_min (INTEGER, minuty) tabel szczegółów protokołów –
+DBManager.iter_stage_minutes(ptype). Czas trwania etapu:
+  - etap 'Godzina / Czas trwania' (albo dowolny z polem KIND_DURATION na
+    drugim miejscu, np. inkubacja) => minuty drugiego pola,
+  - etap 'Początek / Koniec' (dwa pola KIND_TIME) => koniec − początek
+    modulo doba (etap przechodzący przez północ),
+  - pozostałe etapy (temperatura, ilości) – pomijane.
+
+Wszystkie protokoły danego typu liczone są jednym przebiegiem: macierz
+(protokół × etap) -> grupy (produkt, etap) -> jedno sortowanie (np.lexsort)
+i sumy po grupach (np.add.reduceat); percentyle z pozycji w posortowanych
+grupach. Moduł nie zależy od PyQt5.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.db_manager import DBManager
+from logic.protocol_types import (
+    KIND_DURATION,
+    KIND_TIME,
+    ProtocolType,
+    details_table_types,
+)
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+# Percentyle w StageDurationStats (ułamki)
+QUANTILES = (0.25, 0.5, 0.75, 0.9)
+
+
+@dataclass(frozen=True)
+class StageSpan:
+    """Sposób liczenia czasu etapu z kolumn minut (indeksy w minute_columns)."""
+
+    stage: str
+    end: int
+    start: Optional[int] = None  # None => 'end' to już czas trwania
+
+
+@dataclass(frozen=True)
+class StageDurationStats:
+    category: str
+    product: str
+    stage: str
+    count: int
+    mean: float
+    std: float
+    min: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
+    max: float
+
+
+def stage_spans(ptype: ProtocolType) -> Tuple[StageSpan, ...]:
+    """Etapy typu protokołu, dla których da się policzyć czas trwania."""
+    index = {col: i for i, col in enumerate(ptype.minute_columns)}
+    spans: List[StageSpan] = []
+    for stage in ptype.stages:
+        first, second = stage.fields
+        if second.kind == KIND_DURATION:
+            spans.append(StageSpan(stage.name, index[second.minutes_column]))
+        elif first.kind == KIND_TIME and second.kind == KIND_TIME:
+            spans.append(
+                StageSpan(
+                    stage.name,
+                    index[second.minutes_column],
+                    index[first.minutes_column],
+                )
+            )
+    return tuple(spans)
+
+
+def duration_matrix(minutes: np.ndarray, spans: Sequence[StageSpan]) -> np.ndarray:
+    """
+    minutes: (protokoły × minute_columns), NaN = brak. Wynik: (protokoły × spans)
+    czasów trwania w minutach, NaN gdy brakuje któregoś pola.
+    """
+    durations = np.full((minutes.shape[0], len(spans)), np.nan)
+    for j, span in enumerate(spans):
+        if span.start is None:
+            durations[:, j] = minutes[:, span.end]
+        else:
+            durations[:, j] = np.mod(
+                minutes[:, span.end] - minutes[:, span.start], MINUTES_PER_DAY
+            )
+    return durations
+
+
+def grouped_stats(
+    groups: np.ndarray, values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Statystyki wartości w grupach (kody całkowite), NaN pomijane.
+    Zwraca (kody grup, macierz [count, mean, std, min, *QUANTILES, max]).
+    """
+    valid = ~np.isnan(values)
+    groups, values = groups[valid], values[valid]
+    if values.size == 0:
+        return groups[:0], np.empty((0, 5 + len(QUANTILES)))
+
+    order = np.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    counts = np.diff(np.r_[starts, values.size])
+
+    means = np.add.reduceat(values, starts) / counts
+    deviations = values - np.repeat(means, counts)
+    std = np.sqrt(np.add.reduceat(deviations * deviations, starts) / counts)
+
+    columns = [counts, means, std, values[starts]]
+    for q in QUANTILES:
+        # interpolacja liniowa jak np.percentile (method="linear")
+        position = starts + (counts - 1) * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        weight = position - lower
+        columns.append(values[lower] * (1 - weight) + values[upper] * weight)
+    columns.append(values[starts + counts - 1])
+    return groups[starts], np.column_stack(columns)
+
+
+def stage_duration_stats_for(
+    ptype: ProtocolType, rows: Iterable[Sequence]
+) -> List[StageDurationStats]:
+    """
+    Rozkłady dla jednego typu protokołu z wierszy
+    (record_id, product_name, *minute_columns) – jak iter_stage_minutes().
+    """
+    spans = stage_spans(ptype)
+    rows = list(rows)
+    if not spans or not rows:
+        return []
+
+    products = np.array([row[1] for row in rows], dtype=object)
+    minutes = np.array([row[2:] for row in rows], dtype=float)  # None => NaN
+    durations = duration_matrix(minutes, spans)
+
+    names, product_codes = np.unique(products, return_inverse=True)
+    stage_count = len(spans)
+    # kod grupy = produkt * liczba etapów + etap; macierz spłaszczona wierszami
+    groups = (product_codes[:, None] * stage_count + np.arange(stage_count)).ravel()
+    codes, stats = grouped_stats(groups, durations.ravel())
+
+    result: List[StageDurationStats] = []
+    for code, row in zip(codes, stats):
+        product, stage = divmod(int(code), stage_count)
+        result.append(
+            StageDurationStats(
+                ptype.category or "Inne",
+                str(names[product]),
+                spans[stage].stage,
+                int(row[0]),
+                *(round(float(v), 1) for v in row[1:]),
+            )
+        )
+    return result
+
+
+def stage_duration_stats(
+    db: DBManager, ptypes: Optional[Iterable[ProtocolType]] = None
+) -> List[StageDurationStats]:
+    """Rozkłady czasów etapów per produkt dla wszystkich (lub podanych) typów."""
+    result: List[StageDurationStats] = []
+    for ptype in ptypes or details_table_types():
+        rows = db.iter_stage_minutes(ptype)
+        try:
+            stats = stage_duration_stats_for(ptype, rows)
+        finally:
+            rows.close()
+        logger.debug(
+            "Czasy etapów %s: %d grup (produkt, etap)", ptype.details_table, len(stats)
+        )
+        result.extend(stats)
+    return result
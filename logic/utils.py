@@ -0,0 +1,86 @@
+# c:\serownia\logic\utils.py
+
+import re
+from typing import Iterable, Optional, Tuple
+
+# Przeliczniki na jednostkę bazową stanów magazynowych (g / ml / szt.).
+# Ilość bez jednostki traktujemy jak podaną w jednostce bazowej.
+UNIT_FACTORS = {
+    "": 1.0,
+    "g": 1.0,
+    "kg": 1000.0,
+    "mg": 0.001,
+    "ml": 1.0,
+    "l": 1000.0,
+    "szt": 1.0,
+    "szt.": 1.0,
+}
+
+_QUANTITY_RE = re.compile(r"^\s*([-+]?\d+(?:[.,]\d+)?)\s*(\S*)\s*$")
+_PRICE_RE = re.compile(
+    r"^\s*(\d+(?:[.,]\d+)?)\s*(?:zł|zl|pln)?\s*(?:/\s*(\S+))?\s*$", re.IGNORECASE
+)
+
+
+def parse_dosage(dosage_str: str) -> Tuple[float, str]:
+    """
+    Rozdziela tekst w stylu "30 g", "17 ml", "10" itp. na (wartość float, jednostka).
+    """
+    parts = (dosage_str or "").split()
+    if not parts:
+        return 0.0, ""
+    try:
+        val = float(parts[0].replace(",", "."))
+    except ValueError:
+        val = 0.0
+    unit = parts[1] if len(parts) >= 2 else ""
+    return val, unit
+
+
+def batch_totals(
+    weights: Iterable[Optional[float]], milk_liters: Optional[float]
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Suma wag partii (kg) i wydajność serii (kg produktu na 100 L mleka, czyli %).
+    Brak jakiejkolwiek wagi => (None, None); brak/zerowa ilość mleka => wydajność None.
+    """
+    known = [w for w in weights if w is not None]
+    if not known:
+        return None, None
+    total = round(sum(known), 3)
+    if not milk_liters or milk_liters <= 0:
+        return total, None
+    return total, round(total * 100.0 / milk_liters, 2)
+
+
+def to_base_quantity(text: Optional[str]) -> Optional[float]:
+    """
+    Tekst ilości ("2 kg", "30.0 ml", "0,5l", "10") => liczba w jednostce bazowej
+    (g / ml / szt.): 2000.0, 30.0, 500.0, 10.0. Nieznana jednostka => bez przeliczenia.
+    Tekst nieczytelny / pusty => None.
+    """
+    match = _QUANTITY_RE.match(text or "")
+    if not match:
+        return None
+    value = float(match.group(1).replace(",", "."))
+    return value * UNIT_FACTORS.get(match.group(2).lower(), 1.0)
+
+
+def to_base_unit_price(
+    price_text: Optional[str], quantity_text: Optional[str] = ""
+) -> Optional[float]:
+    """
+    Cena dostawy => zł za jednostkę bazową (g / ml / szt.).
+    Jednostka ceny po '/' ("45 zł/kg", "2,50/szt", "12/l"), a bez niej – jednostka
+    ilości dostawy ("45" przy ilości "25 kg" => 45 zł/kg => 0.045 zł/g).
+    Tekst nieczytelny / pusty => None.
+    """
+    match = _PRICE_RE.match(price_text or "")
+    if not match:
+        return None
+    unit = match.group(2)
+    if unit is None:
+        quantity = _QUANTITY_RE.match(quantity_text or "")
+        unit = quantity.group(2) if quantity else ""
+    value = float(match.group(1).replace(",", "."))
+    return value / UNIT_FACTORS.get(unit.lower(), 1.0)
@@ -0,0 +1,188 @@
+# c:\serownia\logic\xlsx_export.py
+"""
+Eksport danych do .xlsx (openpyxl w trybie write-only).
+
+Każdy arkusz to ExportSheet: tytuł, nagłówki i funkcja zwracająca iterator
+wierszy z DBManager (iter_* – kursor czytany porcjami). Wiersze trafiają
+prosto do arkusza (ws.append), więc eksport kilku lat danych zajmuje stałą
+ilość pamięci, niezależnie od liczby protokołów.
+
+Zbiory do eksportu (EXPORT_SETS): "production_records", "protocols"
+(szczegóły każdego typu + dodatki), "additives_register", "packaging_register".
+Moduł nie zależy od PyQt5; openpyxl ładowany dopiero przy eksporcie.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from database.db_manager import DBManager
+from logic.protocol_types import ProtocolType, details_table_types
+
+logger = logging.getLogger(__name__)
+
+# Co tyle wierszy wołamy progress()
+PROGRESS_EVERY = 1000
+# Limit długości nazwy arkusza w Excelu
+SHEET_TITLE_MAX = 31
+
+
+@dataclass(frozen=True)
+class ExportSheet:
+    title: str
+    headers: Tuple[str, ...]
+    rows: Callable[[DBManager], Iterator[tuple]]
+
+
+def _protocol_headers(ptype: ProtocolType) -> Tuple[str, ...]:
+    """Nagłówki arkusza szczegółów: pola sekcji A, potem 'Etap: pole'."""
+    headers = ["ID protokołu", "Data", "Seria", "Produkt"]
+    headers.extend(f.label.rstrip(":") for f in ptype.params)
+    for stage in ptype.stages:
+        headers.extend(f"{stage.name}: {f.label}" for f in stage.fields)
+    return tuple(headers)
+
+
+def _protocol_sheet(ptype: ProtocolType) -> ExportSheet:
+    name = ptype.category or "Inne"
+    return ExportSheet(
+        title=f"Protokoły {name}"[:SHEET_TITLE_MAX],
+        headers=_protocol_headers(ptype),
+        rows=lambda db: db.iter_protocol_details(ptype),
+    )
+
+
+PRODUCTION_RECORDS_SHEET = ExportSheet(
+    title="Produkcja",
+    headers=(
+        "ID",
+        "Data",
+        "Seria",
+        "Produkt",
+        "Kategoria",
+        "Waga partii (kg)",
+        "Wydajność %",
+    ),
+    rows=lambda db: db.iter_production_records(),
+)
+
+ADDITIVE_LINES_SHEET = ExportSheet(
+    title="Dodatki w protokołach",
+    headers=(
+        "ID protokołu",
+        "Data",
+        "Seria",
+        "Kategoria dodatku",
+        "Dodatek",
+        "Dawka",
+        "Ilość (g/ml/szt.)",
+    ),
+    rows=lambda db: db.iter_protocol_additive_lines(),
+)
+
+ADDITIVES_REGISTER_SHEET = ExportSheet(
+    title="Rejestr dodatków",
+    headers=(
+        "ID",
+        "Data przyjęcia",
+        "Ilość",
+        "Dodatek",
+        "Data ważności",
+        "Pozostało",
+        "Cena",
+        "Nr partii",
+    ),
+    rows=lambda db: db.iter_additives_register(),
+)
+
+PACKAGING_REGISTER_SHEET = ExportSheet(
+    title="Rejestr opakowań",
+    headers=(
+        "ID",
+        "Data przyjęcia",
+        "Ilość",
+        "Opakowanie",
+        "Cena",
+        "Data ważności",
+        "Nr partii",
+    ),
+    rows=lambda db: db.iter_packaging_register(),
+)
+
+
+def export_sets() -> Dict[str, List[ExportSheet]]:
+    """{klucz zbioru: arkusze} – arkusze protokołów z aktualnych typów."""
+    return {
+        "production_records": [PRODUCTION_RECORDS_SHEET],
+        "protocols": [_protocol_sheet(t) for t in details_table_types()]
+        + [ADDITIVE_LINES_SHEET],
+        "additives_register": [ADDITIVES_REGISTER_SHEET],
+        "packaging_register": [PACKAGING_REGISTER_SHEET],
+    }
+
+
+EXPORT_SETS: Tuple[str, ...] = (
+    "production_records",
+    "protocols",
+    "additives_register",
+    "packaging_register",
+)
+
+
+def export_xlsx(
+    db: DBManager,
+    path: str,
+    sets: Iterable[str] = EXPORT_SETS,
+    progress: Optional[Callable[[int], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> int:
+    """
+    Zapisuje wybrane zbiory do pliku .xlsx (Workbook(write_only=True)) i zwraca
+    liczbę wyeksportowanych wierszy (bez nagłówków). progress(n) co
+    PROGRESS_EVERY wierszy; cancel.set() przerywa eksport – pliku wtedy nie
+    zapisujemy (zwraca -1). Nieznany klucz zbioru => ValueError.
+    """
+    available = export_sets()
+    sheets: List[ExportSheet] = []
+    for key in sets:
+        if key not in available:
+            raise ValueError(f"Nieznany zbiór eksportu: {key}")
+        sheets.extend(available[key])
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    total = 0
+    for sheet in sheets:
+        worksheet = workbook.create_sheet(title=sheet.title)
+        worksheet.append(list(sheet.headers))
+        rows = sheet.rows(db)
+        try:
+            for row in rows:
+                worksheet.append([_cell(value) for value in row])
+                total += 1
+                if total % PROGRESS_EVERY == 0:
+                    if cancel is not None and cancel.is_set():
+                        logger.info(
+                            "Eksport %s przerwany po %d wierszach", path, total
+                        )
+                        return -1
+                    if progress is not None:
+                        progress(total)
+        finally:
+            rows.close()
+        logger.debug(
+            "Eksport: arkusz '%s' gotowy (%d wierszy łącznie)", sheet.title, total
+        )
+
+    workbook.save(path)
+    logger.info("Wyeksportowano %d wierszy do %s", total, path)
+    return total
+
+
+def _cell(value: Any) -> Any:
+    """Liczby i tekst bez zmian; pusty tekst => pusta komórka."""
+    if isinstance(value, str) and not value.strip():
+        return None
+    return value
@@ -1,4 +1,7 @@
+import logging
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, List
 
 from PyQt5.QtWidgets import (
@@ -9,10 +12,15 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QToolBar,
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt5.QtGui import QCloseEvent
 
 # Baza danych
 from database.db_manager import DBManager
+from logic.app_config import get_config
+from logic.backup import BACKUP_CHECK_MS, backup_if_due
+from logic.log_config import configure_logging
+from logic.maintenance import IDLE_AFTER_MS, IDLE_CHECK_MS, run_maintenance
 
 # Klasy bazowe i ekrany
 from ui.base_list_screen import BaseListScreen  # Zawiera apply_filter
@@ -38,12 +46,12 @@ from ui.additive_categories_crud_screen import AdditiveCategoriesCrudScreen
 
 from ui.new_production_screen import NewProductionScreen
 
-from ui.ser_production_protocol_screen import SerProductionProtocolScreen
-from ui.fermented_production_protocol_screen import FermentedProductionProtocolScreen
-from ui.twarog_production_protocol_screen import TwarogProductionProtocolScreen
+from ui.protocol_screen import ProtocolScreenPool
 
 from ui.production_list_screen import ProductionListScreen
 
+logger = logging.getLogger(__name__)
+
 
 class MainWindow(QMainWindow):
     """
@@ -54,7 +62,7 @@ class MainWindow(QMainWindow):
 
     def __init__(self, db_manager: DBManager) -> None:
         super().__init__()
-        print("=== Inicjalizacja MainWindow ===")
+        logger.debug("Inicjalizacja MainWindow")
 
         self.setWindowTitle("Serownia Manager")
         self.setGeometry(100, 100, 600, 800)
@@ -78,14 +86,16 @@ class MainWindow(QMainWindow):
         # Inicjalizacja UI
         self.setup_ui()
         self.setup_connections()
+        self.setup_backup()
+        self.setup_maintenance()
 
-        print("=== MainWindow zainicjalizowane. ===")
+        logger.debug("MainWindow zainicjalizowane.")
 
     def setup_ui(self) -> None:
         """
         Tworzy ekrany i dodaje je do QStackedWidget, konfiguruje toolbar itp.
         """
-        print("=== Tworzenie i dodawanie ekranów do QStackedWidget ===")
+        logger.debug("Tworzenie i dodawanie ekranów do QStackedWidget")
 
         # ----------------------------------------------------------
         # 1) Tworzymy instancje ekranów (koniecznie w poprawnej kolejności)
@@ -96,21 +106,23 @@ class MainWindow(QMainWindow):
         self.registration_screen = RegistrationScreen(
             parent=self, db_manager=self.db_manager
         )
-        self.start_screen = StartScreen(parent=self)
+        self.start_screen = StartScreen(parent=self, db_manager=self.db_manager)
 
         # Ekrany funkcyjne
         self.production_screen = ProductionScreen(parent=self)
         self.magazyn_screen = MagazynScreen(parent=self)
         self.settings_screen = SettingsScreen(parent=self, db_manager=self.db_manager)
         self.account_screen = AccountScreen(parent=self, db_manager=self.db_manager)
-        self.raporty_screen = RaportyScreen(parent=self)
+        self.raporty_screen = RaportyScreen(parent=self, db_manager=self.db_manager)
 
         # Najpierw ekrany list, z których jeden będzie używany przez base_list_screen:
         self.packaging_list_screen = PackagingListScreen(
             parent=self, db_manager=self.db_manager
         )
-        print(
-            f"[DEBUG] packaging_list_screen = {self.packaging_list_screen}, id={id(self.packaging_list_screen)}"
+        logger.debug(
+            "packaging_list_screen = %s, id=%s",
+            self.packaging_list_screen,
+            id(self.packaging_list_screen),
         )
         self.packaging_register_screen = PackagingRegisterScreen(
             parent=self, db_manager=self.db_manager
@@ -124,8 +136,10 @@ class MainWindow(QMainWindow):
         self.products_list_screen = ProductsListScreen(
             parent=self, db_manager=self.db_manager
         )
-        print(
-            f"[DEBUG] products_list_screen  = {self.products_list_screen}, id={id(self.products_list_screen)}"
+        logger.debug(
+            "products_list_screen  = %s, id=%s",
+            self.products_list_screen,
+            id(self.products_list_screen),
         )
 
         # Następnie klasa bazowa, jeśli chcemy z niej korzystać w interfejsie
@@ -155,17 +169,6 @@ class MainWindow(QMainWindow):
         # Nowa Produkcja (kafelki)
         self.new_production_screen = NewProductionScreen(parent=self)
 
-        # Protokoły
-        self.ser_production_protocol_screen = SerProductionProtocolScreen(
-            parent=self, db_manager=self.db_manager
-        )
-        self.fermented_production_protocol_screen = FermentedProductionProtocolScreen(
-            parent=self, db_manager=self.db_manager
-        )
-        self.twarog_production_protocol_screen = TwarogProductionProtocolScreen(
-            parent=self, db_manager=self.db_manager
-        )
-
         # Baza Produkcji (lista protokołów)
         self.production_list_screen = ProductionListScreen(
             parent=self, db_manager=self.db_manager
@@ -199,19 +202,16 @@ class MainWindow(QMainWindow):
 
         self.stacked_widget.addWidget(self.new_production_screen)
 
-        self.stacked_widget.addWidget(self.ser_production_protocol_screen)
-        self.stacked_widget.addWidget(self.fermented_production_protocol_screen)
-        self.stacked_widget.addWidget(self.twarog_production_protocol_screen)
         self.stacked_widget.addWidget(self.production_list_screen)
 
         # Na koniec ustawiamy ekran startowy (login)
         self.stacked_widget.setCurrentWidget(self.login_screen)
-        print("Aktualny ekran =", self.stacked_widget.currentWidget())
+        logger.debug("Aktualny ekran = %s", self.stacked_widget.currentWidget())
 
         # ----------------------------------------------------------
         # 3) Konfiguracja toolbaru
         # ----------------------------------------------------------
-        print("=== Konfiguracja paska narzędzi (toolbar) ===")
+        logger.debug("Konfiguracja paska narzędzi (toolbar)")
         self.toolbar.setStyleSheet("background-color: #F0F0F0;")
         self.addToolBar(Qt.TopToolBarArea, self.toolbar)
         self.toolbar.addWidget(self.user_label)
@@ -228,20 +228,111 @@ class MainWindow(QMainWindow):
         self.toolbar.addWidget(self.logout_button)
         self.toolbar.hide()
 
-        # Mapa protokołów
-        self.protocol_screens_by_name = {
-            "Ser": self.ser_production_protocol_screen,
-            "Napoje fermentowane": self.fermented_production_protocol_screen,
-            "Ser twarogowy": self.twarog_production_protocol_screen,
-        }
+        # Mapa protokołów: {kategoria produktu: ekran} – formularz danego typu
+        # tworzony przy pierwszym użyciu (logic/protocol_types.py) i używany ponownie
+        self.protocol_screens_by_name = ProtocolScreenPool(self, self.db_manager)
 
     def setup_connections(self) -> None:
         """
         Podpinamy sygnały/sloty (np. wylogowanie).
         """
-        print("=== Łączenie sygnałów/slotów ===")
+        logger.debug("Łączenie sygnałów/slotów")
         self.logout_button.clicked.connect(self.logout)
 
+    # ----------------------------------------------------------
+    # Kopia zapasowa i konserwacja bazy (w tle)
+    # ----------------------------------------------------------
+    def setup_backup(self) -> None:
+        """
+        Timer kopii zapasowej (logic/backup.py): co BACKUP_CHECK_MS i zaraz po
+        starcie sprawdza, czy kopia jest należna; kopia idzie w osobnym wątku.
+        Jeden wątek na kopię i konserwację – nigdy nie pracują na pliku naraz.
+        """
+        self._background_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="maintenance"
+        )
+        self._backup_future: Optional[Future] = None
+        self.backup_timer = QTimer(self)
+        self.backup_timer.setInterval(BACKUP_CHECK_MS)
+        self.backup_timer.timeout.connect(self.backup_if_due)
+        self.backup_timer.start()
+        QTimer.singleShot(0, self.backup_if_due)
+
+    def backup_if_due(self) -> None:
+        if self._backup_future is not None and not self._backup_future.done():
+            return
+        db_manager, backup_dir = self.db_manager, get_config().backup_dir
+
+        def job() -> None:
+            try:
+                backup_if_due(db_manager, backup_dir)
+            except Exception as e:  # wątek w tle – tylko log
+                logger.error("Kopia zapasowa nie powiodła się: %s", e)
+
+        self._backup_future = self._background_executor.submit(job)
+
+    def setup_maintenance(self) -> None:
+        """
+        Konserwacja przy bezczynności (logic/maintenance.py): filtr zdarzeń
+        aplikacji notuje ostatnie użycie klawiatury / myszy, a timer co
+        IDLE_CHECK_MS uruchamia run_maintenance po IDLE_AFTER_MS spokoju –
+        raz na okres bezczynności.
+        """
+        self._last_input = time.monotonic()
+        self._maintained_at: Optional[float] = None  # _last_input z ostatniego razu
+        self._maintenance_future: Optional[Future] = None
+        QApplication.instance().installEventFilter(self)
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(IDLE_CHECK_MS)
+        self.idle_timer.timeout.connect(self.maintain_if_idle)
+        self.idle_timer.start()
+
+    _INPUT_EVENTS = (
+        QEvent.KeyPress,
+        QEvent.MouseButtonPress,
+        QEvent.MouseMove,
+        QEvent.Wheel,
+    )
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() in self._INPUT_EVENTS:
+            self._last_input = time.monotonic()
+        return super().eventFilter(watched, event)
+
+    def maintain_if_idle(self) -> None:
+        if (time.monotonic() - self._last_input) * 1000 < IDLE_AFTER_MS:
+            return
+        if self._maintained_at == self._last_input:
+            return  # w tym okresie bezczynności już było
+        if self._maintenance_future is not None and not self._maintenance_future.done():
+            return
+        self._maintained_at = self._last_input
+        db_manager = self.db_manager
+
+        def job() -> None:
+            try:
+                run_maintenance(db_manager)
+            except Exception as e:  # wątek w tle – tylko log
+                logger.error("Konserwacja bazy nie powiodła się: %s", e)
+
+        self._maintenance_future = self._background_executor.submit(job)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """
+        Zamknięcie: porzucamy prefetch protokołów, czekamy na trwającą kopię /
+        konserwację (kolejne porzucamy) i odświeżamy statystyki planisty
+        (PRAGMA optimize).
+        """
+        self.idle_timer.stop()
+        self.backup_timer.stop()
+        self.production_list_screen.shutdown()
+        self._background_executor.shutdown(wait=True, cancel_futures=True)
+        try:
+            self.db_manager.optimize()
+        except Exception as e:
+            logger.error("PRAGMA optimize przy zamykaniu nie powiodło się: %s", e)
+        super().closeEvent(event)
+
     # ----------------------------------------------------------
     # Nawigacja
     # ----------------------------------------------------------
@@ -267,7 +358,7 @@ class MainWindow(QMainWindow):
         self.show_screen(self.start_screen)
 
     def logout(self) -> None:
-        print("=== Wylogowywanie użytkownika ===")
+        logger.debug("Wylogowywanie użytkownika")
         self.logged_in_user = None
         self.user_label.setText("")
         self.toolbar.hide()
@@ -275,21 +366,23 @@ class MainWindow(QMainWindow):
         self.show_screen(self.login_screen)
 
     def show_production_list_screen(self) -> None:
-        print(">>> show_production_list_screen()")
+        logger.debug("show_production_list_screen()")
         self.show_screen(self.production_list_screen)
 
 
 if __name__ == "__main__":
-    print("=== Start pliku main.py ===")
+    # Poziom / plik / format logów: SEROWNIA_LOG_LEVEL, SEROWNIA_LOG_FILE, SEROWNIA_LOG_FORMAT
+    configure_logging()
+    logger.debug("Start pliku main.py")
     app = QApplication(sys.argv)
-    print("=== QApplication stworzona ===")
+    logger.debug("QApplication stworzona")
 
     db_manager = DBManager()
-    print("=== DBManager zainicjalizowany ===")
+    logger.debug("DBManager zainicjalizowany")
 
     window = MainWindow(db_manager)
-    print("=== MainWindow stworzone, wywołuję show() ===")
+    logger.debug("MainWindow stworzone, wywołuję show()")
     window.show()
 
-    print("=== Wchodzę w pętlę zdarzeń (app.exec_()) ===")
+    logger.debug("Wchodzę w pętlę zdarzeń (app.exec_())")
     sys.exit(app.exec_())
@@ -0,0 +1,12 @@
+# c:\serownia\serownia.py
+"""
+Punkt wejścia wiersza poleceń (bez GUI): python -m serownia <polecenie>.
+Polecenia i opcje – database/cli.py; GUI nadal: python main.py.
+"""
+
+import sys
+
+from database.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
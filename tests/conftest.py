@@ -0,0 +1,24 @@
+import logging
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_root_logger():
+    """
+    configure_logging (test_log_config, polecenia CLI) zamyka i zastępuje
+    handlery loggera głównego – także te od pytest (caplog). Na czas testu
+    odpinamy je, a potem zamykamy handlery dodane w teście i przywracamy
+    poprzednie handlery i poziom; wynik nie zależy od kolejności testów.
+    """
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    for handler in handlers:
+        root.removeHandler(handler)
+    yield root
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
@@ -0,0 +1,36 @@
+import os
+
+from database.db_manager import DBManager
+from logic.app_config import APP_DIR, load_config
+
+
+def test_config_file_env_and_defaults(tmp_path, monkeypatch):
+    monkeypatch.delenv("SEROWNIA_DB", raising=False)
+    monkeypatch.delenv("SEROWNIA_ASSETS", raising=False)
+    ini = tmp_path / "serownia.ini"
+    ini.write_text("[serownia]\ndb_path = dane/serownia.db\n", encoding="utf-8")
+
+    config = load_config(str(ini))
+    assert config.db_path == str(tmp_path / "dane" / "serownia.db")
+    assert config.asset("cheese.jpg") == os.path.join(APP_DIR, "images", "cheese.jpg")
+
+    monkeypatch.setenv("SEROWNIA_DB", DBManager.MEMORY_DB)
+    monkeypatch.setenv("SEROWNIA_ASSETS", str(tmp_path))
+    config = load_config(str(ini))
+    assert config.db_path == DBManager.MEMORY_DB
+    assert config.assets_dir == str(tmp_path)
+
+    assert load_config(str(tmp_path / "brak.ini")).db_path == DBManager.MEMORY_DB
+
+
+def test_memory_clones_are_seeded_and_independent():
+    first = DBManager(DBManager.MEMORY_DB)
+    second = DBManager(DBManager.MEMORY_DB)
+    assert first.db_path != second.db_path
+    assert len(first.get_product_categories()) == 8
+
+    ser = first.get_product_categories()[0]["id"]
+    first.add_product("Gouda", ser)
+    assert [p["name"] for p in first.get_all_products()] == ["Gouda"]
+    assert second.get_all_products() == []
+    assert DBManager(DBManager.MEMORY_DB).get_all_products() == []
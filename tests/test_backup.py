@@ -0,0 +1,52 @@
+import datetime
+import os
+import sqlite3
+import threading
+
+from database.db_manager import DBManager
+from logic.backup import backup_if_due, list_backups, online_backup, quick_check
+
+
+def count_products(path: str) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_online_backup_in_steps_while_writing(tmp_path):
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    ser = db.get_product_categories()[0]["id"]
+    for i in range(50):
+        db.add_product(f"Ser {i}", ser)
+
+    writes = threading.Thread(
+        target=lambda: [db.add_product(f"Nowy {i}", ser) for i in range(5)]
+    )
+    writes.start()
+    target = str(tmp_path / "kopia.db")
+    result = online_backup(db, target, pages=2, sleep=0.001)
+    writes.join()
+
+    assert result.ok and result.pages > 2
+    assert quick_check(target) == []
+    assert 50 <= count_products(target) <= 55
+    assert not os.path.exists(target + ".part")
+
+
+def test_backup_rotation_and_schedule(tmp_path):
+    db = DBManager(DBManager.MEMORY_DB)
+    backup_dir = str(tmp_path / "kopie")
+    day = datetime.datetime(2024, 3, 1, 22, 0)
+    for n in range(4):
+        now = day + datetime.timedelta(days=n)
+        result = backup_if_due(db, backup_dir, keep=2, now=now)
+        assert result is not None and result.ok
+
+    names = [os.path.basename(p) for p in list_backups(backup_dir)]
+    assert names == ["serownia-20240303-220000.db", "serownia-20240304-220000.db"]
+    # najnowsza kopia młodsza niż doba => bez nowej kopii
+    later = day + datetime.timedelta(days=3, hours=5)
+    assert backup_if_due(db, backup_dir, now=later) is None
+    assert count_products(os.path.join(backup_dir, names[-1])) == 0
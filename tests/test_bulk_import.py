@@ -0,0 +1,96 @@
+import csv
+
+import pytest
+
+from database.db_manager import DBManager
+from logic.bulk_import import import_file
+
+
+def make_db() -> DBManager:
+    # klon szablonu w pamięci – świeża, zmigrowana baza bez pliku
+    return DBManager(db_path=DBManager.MEMORY_DB)
+
+
+def write_csv(path, rows, delimiter=";"):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        csv.writer(handle, delimiter=delimiter).writerows(rows)
+    return str(path)
+
+
+def test_additives_register_import_batches_and_rejects(tmp_path):
+    db = make_db()
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    path = write_csv(
+        tmp_path / "dostawy.csv",
+        [
+            ["Data przyjęcia", "Ilość", "Dodatek", "Data ważności"],
+            ["2024-01-10", "2 kg", "sól", "2024-12-31"],
+            ["2024-01-11", "500 g", "Sól", ""],
+            ["10.01.2024", "1 kg", "Sól", ""],
+            ["2024-01-12", "1 kg", "Pieprz", ""],
+            ["", "", "", ""],
+            ["2024-01-13", "abc", "Sól", ""],
+        ],
+    )
+
+    result = import_file(db, "additives_register", path, batch_size=1)
+
+    assert (result.imported, result.rejected) == (2, 3)
+    register = db.get_all_additives_register()
+    assert [(r["quantity"], r["remaining"]) for r in register] == [
+        ("2 kg", 2000.0),
+        ("500 g", 500.0),
+    ]
+    assert db.get_all_additive_stock()[0]["received"] == 2500.0
+    with open(result.reject_path, encoding="utf-8-sig") as handle:
+        rejects = list(csv.reader(handle, delimiter=";"))
+    assert [r[0] for r in rejects[1:]] == ["4", "5", "7"]
+    assert "Pieprz" in rejects[2][-1]
+
+
+def test_products_and_recipes_import(tmp_path):
+    db = make_db()
+    rennet_cat = next(
+        c["id"] for c in db.get_categories() if c["name"] == "Podpuszczka"
+    )
+    db.add_additive("Chymosin", "", "", rennet_cat)
+    products = write_csv(
+        tmp_path / "produkty.csv",
+        [
+            ["Nazwa", "Kategoria:"],
+            ["Gouda", "ser"],
+            ["Gouda", "Ser"],
+            ["Kefir", "Brak takiej"],
+        ],
+        delimiter=",",
+    )
+    result = import_file(db, "products", products)
+    assert (result.imported, result.rejected) == (1, 2)
+
+    recipes = write_csv(
+        tmp_path / "receptury.csv",
+        [
+            ["Produkt", "Dodatek", "Dawka/100L"],
+            ["Gouda", "Chymosin", "30 ml"],
+            ["Gouda", "Chymosin", "abc"],
+            ["Gouda", "Chymosin", "-5 g"],
+        ],
+    )
+    result = import_file(db, "recipes", recipes)
+    assert (result.imported, result.rejected) == (1, 2)
+    product_id = db.get_all_products()[0]["id"]
+    lines = db.get_product_recipe_lines(product_id)
+    assert [line["additive_name"] for line in lines] == ["Chymosin"]
+    with open(result.reject_path, encoding="utf-8-sig", newline="") as handle:
+        rejects = list(csv.reader(handle, delimiter=";"))
+    assert [row[-1] for row in rejects[1:]] == [
+        "Dawka: 'abc' nie jest dodatnią liczbą",
+        "Dawka: '-5 g' nie jest dodatnią liczbą",
+    ]
+
+
+def test_missing_required_column_rejected(tmp_path):
+    path = write_csv(tmp_path / "x.csv", [["Data", "Opakowanie"], ["2024-01-01", "A"]])
+    with pytest.raises(ValueError):
+        import_file(make_db(), "packaging_register", path)
@@ -0,0 +1,58 @@
+import csv
+import datetime
+import subprocess
+import sys
+from pathlib import Path
+
+from database.cli import main
+from database.db_manager import DBManager
+from logic.sample_data import generate_sample_data
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_cli_generate_rebuild_report_check(tmp_path, capsys):
+    db_path = str(tmp_path / "serownia.db")
+    argv = ["--db", db_path]
+    assert main(["generate", "--batches", "40", "--start", "2024-01-01"] + argv) == 0
+    assert main(["rebuild"] + argv) == 0  # triggery już spójne
+    assert main(["check"] + argv) == 0
+    assert main(["maintain"] + argv) == 0
+
+    out = tmp_path / "raport.csv"
+    report = ["report", "batches_per_category", "--out", str(out)]
+    assert main(report + argv) == 0
+    with open(out, encoding="utf-8-sig", newline="") as handle:
+        rows = list(csv.reader(handle, delimiter=";"))
+    assert sum(int(row[1]) for row in rows[1:]) == 40
+    assert "Spójność bazy: OK" in capsys.readouterr().out
+
+
+def test_sample_data_is_deterministic(tmp_path):
+    start = datetime.date(2024, 1, 1)
+    totals = []
+    for name in ("a.db", "b.db"):
+        db = DBManager(db_path=str(tmp_path / name))
+        assert generate_sample_data(db, 10, start, seed=7)["batches"] == 10
+        totals.append(
+            list(
+                db.iter_rows(
+                    "SELECT series, milk_l, total_weight_kg"
+                    " FROM production_records ORDER BY id"
+                )
+            )
+        )
+    assert totals[0] == totals[1] and len(totals[0]) == 10
+
+
+def test_cli_does_not_import_qt(tmp_path):
+    code = (
+        "import sys; from database.cli import main;"
+        f" main(['check', '--db', {str(tmp_path / 'serownia.db')!r}]);"
+        " bad = [m for m in sys.modules if m.startswith(('PyQt5', 'ui'))];"
+        " sys.exit(1 if bad else 0)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
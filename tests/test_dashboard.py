@@ -0,0 +1,54 @@
+import datetime
+
+from database.db_manager import DBManager
+from logic.dashboard import DashboardCache
+from logic.protocol_types import SER_PROTOCOL
+
+TODAY = datetime.date(2024, 3, 14)  # czwartek
+
+
+def make_db(tmp_path) -> DBManager:
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    category = next(
+        c["id"] for c in db.get_product_categories() if c["name"] == "Ser"
+    )
+    db.add_product("Gouda", category)
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    salt_id = db.get_all_additives()[0]["id"]
+    db.add_additive_register("2024-03-01", "100 g", salt_id)
+    return db
+
+
+def save(db, day, milk, parties=(("P1", 12.0, ""),)):
+    return db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        day,
+        f"S{day}",
+        db.get_all_products()[0]["id"],
+        {"milk_amount": milk},
+        [("Przyprawy", "Sól", "60 g")],
+        parties=parties,
+    )
+
+
+def test_dashboard_metrics_cached_until_tables_change(tmp_path):
+    db = make_db(tmp_path)
+    save(db, "2024-03-11", "100")
+    save(db, "2024-03-01", "50", parties=())
+
+    cache = DashboardCache(db)
+    metrics, changed = cache.refresh(TODAY)
+    assert changed
+    assert (metrics.week_batches, metrics.week_milk_l) == (1, 100.0)
+    assert (metrics.month_batches, metrics.month_milk_l) == (2, 150.0)
+    assert [i["additive_name"] for i in metrics.low_stock] == ["Sól"]
+    assert [(i["series"], i["missing"]) for i in metrics.incomplete] == [
+        ("S2024-03-01", ["waga partii"])
+    ]
+
+    assert cache.refresh(TODAY) == (metrics, False)
+    save(db, "2024-03-13", "20")
+    metrics, changed = cache.refresh(TODAY)
+    assert changed and metrics.week_batches == 2
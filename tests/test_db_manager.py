@@ -0,0 +1,638 @@
+import sqlite3
+
+import pytest
+
+from database.db_manager import DBManager
+from logic.protocol_types import (
+    KIND_TIME,
+    SER_PROTOCOL,
+    get_protocol_type,
+    parse_minutes,
+)
+
+
+def make_db() -> DBManager:
+    # klon szablonu w pamięci – świeża, zmigrowana baza bez pliku
+    return DBManager(db_path=DBManager.MEMORY_DB)
+
+
+def category_id(db: DBManager, name: str) -> int:
+    return next(c["id"] for c in db.get_product_categories() if c["name"] == name)
+
+
+def test_products_by_category_name():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    db.add_product("Kefir", category_id(db, "Napoje fermentowane"))
+
+    names = [p["name"] for p in db.get_products_by_category_name("ser")]
+    assert names == ["Gouda"]
+
+
+def test_product_recipe_lines_single_join():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+    rennet_cat = next(
+        c["id"] for c in db.get_categories() if c["name"] == "Podpuszczka"
+    )
+    db.add_additive("Chymosin", "", "", rennet_cat)
+    additive_id = db.get_all_additives()[0]["id"]
+    db.add_product_additive(product_id, additive_id, "30 ml")
+
+    lines = db.get_product_recipe_lines(product_id)
+    assert lines == [
+        {
+            "additive_id": additive_id,
+            "additive_name": "Chymosin",
+            "category_name": "Podpuszczka",
+            "dosage_per_100": "30 ml",
+        }
+    ]
+
+
+def test_protocol_bundle_single_query():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+    record_id = db.add_production_record_returning_id(
+        "2024-03-01", "00103_2024", product_id
+    )
+    other_id = db.add_production_record_returning_id(
+        "2024-03-02", "00203_2024", product_id
+    )
+    with db.create_connection() as conn:
+        conn.execute(
+            "INSERT INTO ser_production_details (production_record_id, milk_amount, ph)"
+            " VALUES (?, ?, ?)",
+            (record_id, "100", "6,5"),
+        )
+    db.add_ser_production_additive_3col(record_id, "Podpuszczka", "Chymosin", "30.0 ml")
+    db.add_ser_production_additive_3col(record_id, "Przyprawy", "Kozieradka", "5.0 g")
+
+    bundle = db.get_protocol_bundle(record_id)
+    assert bundle["series"] == "00103_2024"
+    assert bundle["product"]["name"] == "Gouda"
+    assert bundle["category_name"] == "Ser"
+    assert bundle["details"]["milk_amount"] == "100"
+    assert [line["additive_name"] for line in bundle["additive_lines"]] == [
+        "Chymosin",
+        "Kozieradka",
+    ]
+
+    bundles = db.get_protocol_bundles([record_id, other_id, 999])
+    assert set(bundles) == {record_id, other_id}
+    assert bundles[other_id]["details"] == {}
+    assert bundles[other_id]["additive_lines"] == []
+
+
+def test_protocol_tables_migrate_missing_columns(tmp_path):
+    path = tmp_path / "serownia.db"
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute(
+            "CREATE TABLE ser_production_details ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " production_record_id INTEGER NOT NULL,"
+            " milk_amount TEXT, ph TEXT, temp_poczatkowa TEXT)"
+        )
+    DBManager(db_path=str(path))
+
+    with sqlite3.connect(str(path)) as conn:
+        cols = {
+            row[1] for row in conn.execute("PRAGMA table_info(ser_production_details)")
+        }
+        tables = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+    assert set(SER_PROTOCOL.columns) <= cols
+    assert "temp_poczatkowa" in cols
+    assert {"twarog_production_details", "fermented_production_details"} <= tables
+
+
+def test_save_protocol_roundtrip_and_generic_category():
+    db = make_db()
+    db.add_product("Lody waniliowe", category_id(db, "Lody"))
+    product_id = db.get_all_products()[0]["id"]
+    ptype = get_protocol_type("Lody")
+    assert ptype.category == "Lody"
+
+    record_id = db.save_protocol(
+        ptype,
+        None,
+        "2024-05-01",
+        "00105_2024",
+        product_id,
+        {"milk_amount": "40", "pasteryzacja": "Brak"},
+        [("Przyprawy", "Wanilia", "2.0 g")],
+    )
+    db.save_protocol(
+        ptype,
+        record_id,
+        "2024-05-01",
+        "00105_2024",
+        product_id,
+        {"milk_amount": "50", "pasteryzacja": "Brak"},
+        [("Przyprawy", "Wanilia", "2.5 g")],
+    )
+
+    assert db.get_protocol_details(ptype, record_id)["milk_amount"] == "50"
+    bundle = db.get_protocol_bundle(record_id)
+    assert bundle["details"]["milk_amount"] == "50"
+    assert [line["dose_calculated"] for line in bundle["additive_lines"]] == ["2.5 g"]
+
+    db.delete_production_record(record_id)
+    assert db.get_protocol_bundle(record_id) is None
+    assert db.get_protocol_details(ptype, record_id) == {}
+
+
+def test_save_protocol_product_moved_to_other_type():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    db.add_product("Kefir", category_id(db, "Napoje fermentowane"))
+    gouda, kefir = (p["id"] for p in db.get_all_products())
+    fermented = get_protocol_type("Napoje fermentowane")
+
+    record_id = db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-05-02",
+        "00106_2024",
+        gouda,
+        {"milk_amount": "100"},
+        [],
+    )
+    db.save_protocol(
+        fermented, record_id, "2024-05-02", "00106_2024", kefir, {"amt": "80"}, []
+    )
+
+    # stary wiersz szczegółów (typ "Ser") usunięty w tej samej transakcji
+    assert db.get_protocol_details(SER_PROTOCOL, record_id) == {}
+    assert db.get_protocol_details(fermented, record_id)["amt"] == "80"
+
+
+def test_protocol_type_validation():
+    errors = SER_PROTOCOL.validate({"milk_amount": "abc", "ph": "6,5"})
+    assert errors == ["Ilość mleka (litry) musi być liczbą."]
+    assert SER_PROTOCOL.validate({"milk_amount": "100", "pasteryzacja": "Brak"}) == []
+
+
+def test_save_protocol_stores_parties_and_yield():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+
+    record_id = db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-03-01",
+        "00103_2024",
+        product_id,
+        {"milk_amount": "200"},
+        [],
+        [("P1", 10.5, ""), ("P2", None, "do wyważenia"), ("P3", 9.5, "")],
+    )
+
+    bundle = db.get_protocol_bundle(record_id)
+    assert bundle["total_weight_kg"] == 20.0
+    assert bundle["yield_pct"] == 10.0
+    assert [p["party_code"] for p in bundle["parties"]] == ["P1", "P2", "P3"]
+    assert db.get_production_parties(record_id)[1] == {
+        "party_no": 2,
+        "party_code": "P2",
+        "weight_kg": None,
+        "comment": "do wyważenia",
+    }
+
+    db.save_protocol(
+        SER_PROTOCOL,
+        record_id,
+        "2024-03-01",
+        "00103_2024",
+        product_id,
+        {"milk_amount": "200"},
+        [],
+        [],
+    )
+    bundle = db.get_protocol_bundle(record_id)
+    assert bundle["parties"] == []
+    assert bundle["total_weight_kg"] is None
+
+
+def test_additive_stock_ledger_follows_receipts_and_protocols():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+    rennet_cat = next(
+        c["id"] for c in db.get_categories() if c["name"] == "Podpuszczka"
+    )
+    db.add_additive("Chymosin", "", "", rennet_cat)
+    additive_id = db.get_all_additives()[0]["id"]
+
+    db.add_additive_register("2024-03-01", "1 l", additive_id)
+    db.add_additive_register("2024-03-02", "250", additive_id)
+    assert db.get_additive_stock(additive_id)["balance"] == 1250.0
+
+    record_id = db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-03-03",
+        "00103_2024",
+        product_id,
+        {"milk_amount": "100"},
+        [("Podpuszczka", "Chymosin", "30.0 ml")],
+    )
+    db.save_protocol(
+        SER_PROTOCOL,
+        record_id,
+        "2024-03-03",
+        "00103_2024",
+        product_id,
+        {"milk_amount": "200"},
+        [("Podpuszczka", "Chymosin", "60.0 ml")],
+    )
+    stock = db.get_additive_stock(additive_id)
+    assert (stock["received"], stock["consumed"], stock["balance"]) == (
+        1250.0,
+        60.0,
+        1190.0,
+    )
+
+    register_id = db.get_all_additives_register()[1]["id"]
+    db.update_additive_register(register_id, "2024-03-02", "0,5 kg", additive_id)
+    db.delete_production_record(record_id)
+    assert db.get_additive_stock(additive_id)["balance"] == 1500.0
+    assert db.rebuild_additive_stock() == []
+
+    with db.create_connection() as conn:
+        conn.execute("UPDATE additive_stock SET received = 0")
+    assert db.rebuild_additive_stock() == [
+        {"additive_id": additive_id, "stored_balance": 0.0, "rebuilt_balance": 1500.0}
+    ]
+    assert db.get_all_additive_stock()[0]["balance"] == 1500.0
+
+
+def test_packaging_consumption_updates_stock_levels():
+    db = make_db()
+    db.add_product("Kefir", category_id(db, "Napoje fermentowane"))
+    product_id = db.get_all_products()[0]["id"]
+    jars_cat = next(
+        c["id"] for c in db.get_packaging_categories() if c["name"] == "Słoiki"
+    )
+    db.add_packaging("Słoik 0,5 l", "", "", jars_cat)
+    jar_id = db.get_all_packaging()[0]["id"]
+    db.add_packaging_register("2024-03-01", "500 szt", jar_id)
+
+    ptype = get_protocol_type("Napoje fermentowane")
+    record_id = db.save_protocol(
+        ptype,
+        None,
+        "2024-03-02",
+        "00103_2024",
+        product_id,
+        {"amt": "100"},
+        [],
+        packaging=[(jar_id, 180.0)],
+    )
+    assert db.get_packaging_stock(jar_id)["balance"] == 320.0
+    assert db.get_protocol_bundle(record_id)["packaging"] == [
+        {"packaging_id": jar_id, "packaging_name": "Słoik 0,5 l", "qty": 180.0}
+    ]
+
+    levels = {(row["kind"], row["name"]): row for row in db.get_stock_levels()}
+    assert levels[("Opakowanie", "Słoik 0,5 l")]["balance"] == 320.0
+
+    db.delete_production_record(record_id)
+    assert db.get_packaging_stock(jar_id)["balance"] == 500.0
+    assert db.rebuild_packaging_stock() == []
+
+
+def test_protocol_additives_allocated_fefo_across_lots():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    salt_id = db.get_all_additives()[0]["id"]
+    db.add_additive_register("2024-01-10", "100 g", salt_id)  # bez daty ważności
+    db.add_additive_register("2024-02-01", "100 g", salt_id, "2024-06-30")
+    db.add_additive_register("2024-01-20", "100 g", salt_id, "2024-05-31")
+    lot_ids = [r["id"] for r in db.get_all_additives_register()]
+
+    def save(record_id, dose):
+        return db.save_protocol(
+            SER_PROTOCOL,
+            record_id,
+            "2024-03-01",
+            "00103_2024",
+            product_id,
+            {"milk_amount": "100"},
+            [("Przyprawy", "Sól", dose)],
+        )
+
+    record_id = save(None, "250 g")
+    allocations = db.get_lot_allocations(record_id)
+    assert [(a["register_id"], a["qty"]) for a in allocations] == [
+        (lot_ids[2], 100.0),
+        (lot_ids[1], 100.0),
+        (lot_ids[0], 50.0),
+    ]
+    assert db.get_lot_shortages(record_id) == []
+
+    save(record_id, "350 g")
+    remaining = [r["remaining"] for r in db.get_all_additives_register()]
+    assert remaining == [0.0, 0.0, 0.0]
+    assert db.get_lot_shortages(record_id) == [
+        {"additive_name": "Sól", "qty": 350.0, "allocated": 300.0, "missing": 50.0}
+    ]
+
+    # partia rozchodowana w protokole – edycja sprzeczna z rozchodem odrzucona
+    db.add_additive("Pieprz", "", "", salt_cat)
+    pepper_id = db.get_all_additives()[-1]["id"]
+    for args, message in (
+        (("2024-01-20", "10 g", salt_id, "2024-05-31"), "mniejsza"),
+        (("2024-01-20", "100 g", pepper_id, "2024-05-31"), "zmiana dodatku"),
+        (("2024-03-05", "100 g", salt_id, "2024-05-31"), "przyjęcia"),
+        (("2024-01-20", "100 g", salt_id, "2024-02-28"), "ważności"),
+    ):
+        with pytest.raises(ValueError, match=message):
+            db.update_additive_register(lot_ids[2], *args)
+    def lot():
+        return next(r for r in db.get_all_additives_register() if r["id"] == lot_ids[2])
+
+    assert (lot()["remaining"], lot()["additive_id"]) == (0.0, salt_id)
+    for quantity, remaining in (("120 g", 20.0), ("100 g", 0.0)):
+        db.update_additive_register(
+            lot_ids[2], "2024-01-20", quantity, salt_id, "2024-05-31"
+        )
+        assert lot()["remaining"] == remaining
+
+    # partia rozchodowana w protokole – usunięcie odrzucone, nic się nie zmienia
+    with pytest.raises(ValueError, match="00103_2024"):
+        db.delete_additive_register(lot_ids[2])
+    assert len(db.get_all_additives_register()) == 3
+    assert db.get_additive_stock(salt_id)["balance"] == 300.0 - 350.0
+
+    db.delete_production_record(record_id)
+    assert [r["remaining"] for r in db.get_all_additives_register()] == [100.0] * 3
+    assert db.rebuild_lot_allocations() == 0
+
+    db.delete_additive_register(lot_ids[2])
+    assert [r["id"] for r in db.get_all_additives_register()] == lot_ids[:2]
+    assert db.get_additive_stock(salt_id)["balance"] == 200.0
+
+
+def test_lots_outside_protocol_date_not_allocated():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    salt_id = db.get_all_additives()[0]["id"]
+    db.add_additive_register("2024-01-05", "100 g", salt_id, "2024-02-01")  # przeterm.
+    db.add_additive_register("2024-09-01", "100 g", salt_id)  # przyjęta po protokole
+    db.add_additive_register("2024-01-15", "100 g", salt_id, "2024-12-31")
+    expired, later, valid = (r["id"] for r in db.get_all_additives_register())
+
+    record_id = db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-03-01",
+        "00103_2024",
+        product_id,
+        {"milk_amount": "100"},
+        [("Przyprawy", "Sól", "150 g")],
+    )
+    assert [a["register_id"] for a in db.get_lot_allocations(record_id)] == [valid]
+    assert db.get_lot_shortages(record_id) == [
+        {"additive_name": "Sól", "qty": 150.0, "allocated": 100.0, "missing": 50.0}
+    ]
+
+    assert db.rebuild_lot_allocations() == 1
+    assert [a["register_id"] for a in db.get_lot_allocations(record_id)] == [valid]
+    remaining = {r["id"]: r["remaining"] for r in db.get_all_additives_register()}
+    assert remaining == {expired: 100.0, later: 100.0, valid: 0.0}
+
+
+def test_recall_trace_lot_and_series():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    salt_id = db.get_all_additives()[0]["id"]
+    db.add_additive_register("2024-01-10", "100 g", salt_id, "2024-05-31")
+    db.add_additive_register("2024-01-20", "100 g", salt_id, "2024-06-30")
+    first_lot, second_lot = [r["id"] for r in db.get_all_additives_register()]
+
+    for day, series in (("2024-03-01", "00103_2024"), ("2024-03-02", "00203_2024")):
+        db.save_protocol(
+            SER_PROTOCOL,
+            None,
+            day,
+            series,
+            product_id,
+            {"milk_amount": "100"},
+            [("Przyprawy", "Sól", "80 g")],
+        )
+
+    assert [(r["series"], r["qty"]) for r in db.trace_lot(first_lot)] == [
+        ("00103_2024", 80.0),
+        ("00203_2024", 20.0),
+    ]
+    assert [(r["register_id"], r["qty"]) for r in db.trace_series("00203_2024")] == [
+        (first_lot, 20.0),
+        (second_lot, 60.0),
+    ]
+
+    record_id = db.trace_lot(second_lot)[0]["production_record_id"]
+    db.delete_production_record(record_id)
+    assert db.trace_lot(second_lot) == []
+    assert db.rebuild_lot_allocations() == 0
+    assert [r["series"] for r in db.trace_lot(first_lot)] == ["00103_2024"]
+
+
+def test_export_iterators_stream_rows_in_chunks():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    product_id = db.get_all_products()[0]["id"]
+    for day in range(1, 6):
+        db.save_protocol(
+            SER_PROTOCOL,
+            None,
+            f"2024-03-0{day}",
+            f"00{day}03_2024",
+            product_id,
+            {"milk_amount": "100"},
+            [("Przyprawy", "Sól", "80 g")],
+        )
+
+    records = db.iter_rows(
+        "SELECT series FROM production_records ORDER BY id", chunk_size=2
+    )
+    assert [row[0] for row in records] == [f"00{d}03_2024" for d in range(1, 6)]
+
+    details = list(db.iter_protocol_details(SER_PROTOCOL))
+    assert len(details) == 5
+    assert details[0][:4] == (details[0][0], "2024-03-01", "00103_2024", "Gouda")
+    assert len(details[0]) == 4 + len(SER_PROTOCOL.columns)
+
+    lines = list(db.iter_protocol_additive_lines())
+    assert [(row[2], row[4], row[6]) for row in lines][0] == ("00103_2024", "Sól", 80.0)
+    assert next(db.iter_production_records())[2:4] == ("00103_2024", "Gouda")
+
+
+def test_monthly_summary_follows_protocol_changes():
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"))
+    db.add_product("Kefir", category_id(db, "Napoje fermentowane"))
+    gouda, kefir = [p["id"] for p in db.get_all_products()]
+
+    def save(record_id, day, product_id, milk):
+        return db.save_protocol(
+            SER_PROTOCOL,
+            record_id,
+            day,
+            f"S{day}",
+            product_id,
+            {"milk_amount": milk},
+            [],
+            parties=[("P1", 10.0, "")],
+        )
+
+    first = save(None, "2024-03-01", gouda, "100")
+    save(None, "2024-03-20", gouda, "50,5")
+    moved = save(None, "2024-04-02", gouda, "80")
+
+    def milk(year, month, category="Ser"):
+        return sum(
+            r["milk_l"]
+            for r in db.get_monthly_production_summary(year, month, category)
+        )
+
+    assert milk(2024, 3) == 150.5
+    assert db.get_monthly_production_summary(2024, 3)[0]["batches"] == 2
+
+    save(moved, "2024-03-05", gouda, "80")
+    assert (milk(2024, 3), milk(2024, 4)) == (230.5, 0)
+    db.delete_production_record(first)
+    assert milk(2024, 3) == 130.5
+    assert db.get_monthly_production_summary(2024, 4) == []
+
+    db.update_product(gouda, "Gouda", category_id(db, "Napoje fermentowane"))
+    assert milk(2024, 3) == 0
+    assert milk(2024, 3, "Napoje fermentowane") == 130.5
+    assert kefir and db.rebuild_production_summary() == []
+    assert milk(2024, 3, "Napoje fermentowane") == 130.5
+
+
+def test_parse_minutes_time_and_duration():
+    assert parse_minutes("10:30", KIND_TIME) == 630
+    assert parse_minutes("7.05", KIND_TIME) == 425
+    assert parse_minutes("25:00", KIND_TIME) is None
+    assert parse_minutes("1h 30 min") == 90
+    assert parse_minutes("45") == 45
+    assert parse_minutes("") is None
+    assert SER_PROTOCOL.validate(
+        {"milk_amount": "100", "pasteryzacja": "Brak", "krojenie_start": "ok. 10"}
+    ) == ["Krojenie – Godzina: niepoprawny czas 'ok. 10' (HH:MM)."]
+
+
+def test_stage_minutes_stored_and_backfilled(tmp_path):
+    path = tmp_path / "serownia.db"
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute(
+            "CREATE TABLE ser_production_details ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " production_record_id INTEGER NOT NULL,"
+            " krojenie_start TEXT, krojenie_end TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO ser_production_details"
+            " (production_record_id, krojenie_start, krojenie_end)"
+            " VALUES (1, '10:15', '0:40'), (2, 'rano', '')"
+        )
+    db = DBManager(db_path=str(path))
+
+    with db.create_connection() as conn:
+        rows = conn.execute(
+            "SELECT krojenie_start_min, krojenie_end_min"
+            " FROM ser_production_details ORDER BY production_record_id"
+        ).fetchall()
+    assert rows == [(615, 40), (None, None)]
+
+    db.add_product("Gouda", category_id(db, "Ser"))
+    record_id = db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-05-02",
+        "S1",
+        db.get_all_products()[0]["id"],
+        {"milk_amount": "100", "solenie_start": "23:50", "solenie_end": "2h"},
+        [],
+    )
+    row = next(r for r in db.iter_stage_minutes(SER_PROTOCOL) if r[0] == record_id)
+    minutes = dict(zip(SER_PROTOCOL.minute_columns, row[2:]))
+    assert row[1] == "Gouda"
+    assert (minutes["solenie_start_min"], minutes["solenie_end_min"]) == (1430, 120)
+
+
+def test_batch_costs_from_lot_milk_and_packaging_prices():
+    from logic.report_generator import REPORTS, run_report
+    from logic.utils import to_base_unit_price
+
+    assert to_base_unit_price("45 zł/kg") == 0.045
+    assert to_base_unit_price("45", "25 kg") == 0.045
+    assert to_base_unit_price("2,50/szt") == 2.5
+    assert to_base_unit_price("") is None
+
+    db = make_db()
+    db.add_product("Gouda", category_id(db, "Ser"), price="30,00")
+    product_id = db.get_all_products()[0]["id"]
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    salt_id = db.get_all_additives()[0]["id"]
+    db.add_additive_register("2024-02-01", "1 kg", salt_id, "2024-06-30", "8 zł/kg")
+    db.add_additive_register("2024-01-20", "1 kg", salt_id, "2024-05-31", "4 zł/kg")
+    db.add_packaging("Słoik", "", "", db.get_packaging_categories()[0]["id"])
+    jar_id = db.get_all_packaging()[0]["id"]
+    db.add_packaging_register("2024-03-01", "100 szt", jar_id, "0,50")
+
+    record_id = db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-03-10",
+        "00103_2024",
+        product_id,
+        {"milk_amount": "100", "milk_type": "Krowie"},
+        [("Przyprawy", "Sól", "1,5 kg")],
+        [("P1", 10.0, "")],
+        packaging=[(jar_id, 10)],
+    )
+    # FEFO: 1000 g × 0,004 + 500 g × 0,008; brak ceny mleka
+    assert db.get_batch_cost(record_id) == {
+        "cost_milk": None,
+        "cost_additives": 8.0,
+        "cost_packaging": 5.0,
+        "total": 13.0,
+    }
+
+    db.add_milk_price("2024-01-01", 2.0)
+    assert db.get_batch_cost(record_id)["cost_milk"] == 200.0
+    db.add_milk_price("2024-03-01", 2.5, "Krowie")
+    db.add_milk_price("2024-04-01", 9.0, "Krowie")  # później niż protokół
+    assert db.get_batch_cost(record_id)["total"] == 263.0
+
+    margin = run_report(REPORTS["margin_by_product_month"], db.create_connection)
+    assert margin.rows == [
+        ("2024-03", "Gouda", 1, 10.0, 250.0, 8.0, 5.0, 26.3, 300.0, 37.0, 12.3)
+    ]
+
+    # cena opakowania poprawiona => koszt serii i podsumowanie miesiąca
+    register_id = db.get_all_packaging_register()[0]["id"]
+    db.update_packaging_register(register_id, "2024-03-01", "100 szt", jar_id, "1")
+    assert db.get_batch_cost(record_id)["cost_packaging"] == 10.0
+    summary = db.get_monthly_production_summary(2024, 3)[0]
+    assert summary["cost_packaging"] == 10.0
+    assert db.rebuild_batch_costs() == 1
+    assert db.rebuild_production_summary() == []
@@ -0,0 +1,71 @@
+import datetime
+
+from database.db_manager import DBManager
+from logic.expiry_alerts import ExpiryWatch, check_expiring
+from logic.protocol_types import SER_PROTOCOL
+
+
+def test_expiring_lots_fefo_and_watch(tmp_path):
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    ser = next(c["id"] for c in db.get_product_categories() if c["name"] == "Ser")
+    db.add_product("Gouda", ser)
+    product_id = db.get_all_products()[0]["id"]
+    cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Kultura", "", "", cat)
+    culture_id = db.get_all_additives()[0]["id"]
+    db.add_additive_register("2024-01-01", "10 g", culture_id, "2024-02-05", None, "K1")
+    db.add_additive_register("2024-01-10", "10 g", culture_id, "2024-02-20", None, "K2")
+    db.add_additive_register("2024-01-20", "10 g", culture_id, "2024-06-30")
+    db.add_packaging("Słoik", "", "", db.get_packaging_categories()[0]["id"])
+    jar_id = db.get_all_packaging()[0]["id"]
+    db.add_packaging_register("2024-01-01", "30 szt", jar_id, None, "2024-02-10", "S1")
+    db.add_packaging_register("2024-01-15", "20 szt", jar_id, None, "2024-02-12")
+
+    today = datetime.date(2024, 2, 8)
+    alerts = check_expiring(db, 14, today)
+    assert [(a.kind, a.lot_no, a.days_left) for a in alerts] == [
+        ("Dodatek", "K1", -3),
+        ("Opakowanie", "S1", 2),
+        ("Opakowanie", None, 4),
+        ("Dodatek", "K2", 12),
+    ]
+    assert alerts[0].expired and alerts[1].remaining == 30.0
+
+    watch = ExpiryWatch(db, 14)
+    assert len(watch.check(today)[1]) == 4
+    assert watch.check(today)[1] == []
+
+    # K1 po terminie w dniu protokołu => rozchód FEFO zużywa K2;
+    # 35 słoików zdejmuje najstarsze przyjęcie
+    db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-02-08",
+        "S1",
+        product_id,
+        {"milk_amount": "100"},
+        [("Przyprawy", "Kultura", "10 g")],
+        packaging=[(jar_id, 35)],
+    )
+    alerts, new = watch.check(today)
+    assert [(a.kind, a.lot_no, a.remaining) for a in alerts] == [
+        ("Dodatek", "K1", 10.0),
+        ("Opakowanie", None, 15.0),
+    ]
+    assert new == []
+    # słoiki po terminie => ponowny alert; K2 rozchodowana – bez alertu
+    assert [a.lot_no for a in watch.check(datetime.date(2024, 2, 21))[1]] == [None]
+
+
+def test_expiring_lots_use_partial_indexes(tmp_path):
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    with db.create_connection() as conn:
+        plan = " ".join(
+            row[-1]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN " + DBManager._EXPIRING_LOTS_SQL,
+                {"until": "2024-02-22"},
+            )
+        )
+    assert "idx_additives_register_expiry" in plan
+    assert "idx_packaging_register_expiry" in plan
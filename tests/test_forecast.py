@@ -0,0 +1,81 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from database.db_manager import DBManager  # noqa: E402
+from logic.forecast import ForecastCache, receipt_intervals  # noqa: E402
+from logic.protocol_types import SER_PROTOCOL  # noqa: E402
+
+
+def test_receipt_intervals_median_per_additive():
+    receipts = [
+        (1, "2024-06-01"),
+        (2, "2024-01-01"),
+        (1, "2024-07-21"),
+        (1, "2024-07-01"),
+    ]
+    result = receipt_intervals([1, 2], receipts)
+    assert result[0] == 25.0 and np.isnan(result[1])
+
+
+def test_forecast_moving_average_season_and_cache(tmp_path):
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    ser = next(c["id"] for c in db.get_product_categories() if c["name"] == "Ser")
+    db.add_product("Gouda", ser)
+    product_id = db.get_all_products()[0]["id"]
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    salt_id = db.get_all_additives()[0]["id"]
+    for day in ("2024-06-01", "2024-07-01", "2024-07-21"):
+        db.add_additive_register(day, "4 kg", salt_id)
+
+    record_ids = []
+    for day, dose in (
+        ("2024-02-20", "1400 g"),  # rok temu, przed dzisiejszą datą
+        ("2024-03-15", "2800 g"),  # rok temu, w horyzoncie prognozy
+        ("2025-02-05", "700 g"),
+        ("2025-02-12", "700 g"),
+        ("2025-02-19", "700 g"),
+        ("2025-02-26", "700 g"),
+    ):
+        record_ids.append(
+            db.save_protocol(
+                SER_PROTOCOL,
+                None,
+                day,
+                f"S{day}",
+                product_id,
+                {"milk_amount": "100"},
+                [("Przyprawy", "Sól", dose)],
+            )
+        )
+
+    cache = ForecastCache(db)
+    today = datetime.date(2025, 3, 1)
+    (salt,), computed = cache.refresh(today)
+    assert computed
+    # 2800 g / 28 dni; rok temu: 50 g/dzień przed, 100 g/dzień po => × 2
+    assert (salt.moving_avg, salt.seasonal_factor, salt.rate) == (100.0, 2.0, 200.0)
+    assert salt.balance == 5000.0 and salt.days_left == 25.0
+    assert salt.stockout_date == "2025-03-26"
+    assert salt.receipt_interval == 25.0 and salt.order_now
+
+    assert cache.refresh(today)[1] is False
+
+    # seria sprzed roku przeniesiona poza horyzont => rok temu brak zużycia po
+    # dzisiejszej dacie; współczynnik przycięty do 0,5 – dodatek nadal w użyciu
+    db.save_protocol(
+        SER_PROTOCOL,
+        record_ids[1],
+        "2024-05-15",
+        "S2024-03-15",
+        product_id,
+        {"milk_amount": "100"},
+        [("Przyprawy", "Sól", "2800 g")],
+    )
+    (salt,), computed = cache.refresh(today)
+    assert computed and (salt.seasonal_factor, salt.rate) == (0.5, 50.0)
+    assert salt.days_left == 100.0 and salt.stockout_date == "2025-06-09"
+    assert db.rebuild_additive_daily_usage() == []
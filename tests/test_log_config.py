@@ -0,0 +1,38 @@
+import json
+import logging
+import sys
+
+from logic.log_config import JsonFormatter, configure_logging, set_level
+
+
+def test_configure_logging_json_file(tmp_path):
+    log_file = tmp_path / "logs" / "serownia.log"
+    # handlery i poziom loggera głównego przywraca fixture z conftest.py
+    root = configure_logging(level="INFO", log_file=str(log_file), json_format=True)
+    logger = logging.getLogger("database.db_manager")
+    logger.debug("niewidoczne %s", "debug")
+    logger.info("Pobrano %d wierszy", 3)
+    for handler in root.handlers:
+        handler.flush()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["message"] == "Pobrano 3 wierszy"
+    assert entry["logger"] == "database.db_manager"
+    assert entry["level"] == "INFO"
+
+    set_level("debug")
+    assert logger.isEnabledFor(logging.DEBUG)
+
+
+def test_json_formatter_includes_exception():
+    try:
+        raise ValueError("zły format")
+    except ValueError:
+        record = logging.LogRecord(
+            "x", logging.ERROR, __file__, 1, "Błąd: %s", ("a",), sys.exc_info()
+        )
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Błąd: a"
+    assert "ValueError" in entry["exc_info"]
@@ -0,0 +1,40 @@
+import sqlite3
+
+from database.db_manager import DBManager
+from logic.maintenance import run_maintenance
+
+
+def test_incremental_vacuum_reclaims_pages_in_chunks(tmp_path):
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    assert db.get_storage_stats()["auto_vacuum"] == DBManager.AUTO_VACUUM_INCREMENTAL
+    ser = db.get_product_categories()[0]["id"]
+    for i in range(300):
+        db.add_product(f"Ser {i:03d} " + "x" * 500, ser)
+    with db.create_connection() as conn:
+        conn.execute("DELETE FROM products")
+    freed = db.get_storage_stats()["freelist_count"]
+    assert freed > 20
+
+    # jedna porcja na przejście => część stron zostaje na następny raz
+    result = run_maintenance(db, chunk_pages=8, max_chunks=1, sleep=0, min_free_pages=1)
+    assert result.freed_pages == 8
+    assert result.after["freelist_count"] == freed - 8
+
+    result = run_maintenance(db, max_chunks=None, sleep=0, min_free_pages=1)
+    assert result.after["freelist_count"] == 0
+    assert result.after["file_size"] < result.before["file_size"]
+
+
+def test_old_file_switched_to_incremental_vacuum(tmp_path):
+    path = str(tmp_path / "stara.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE stara (id INTEGER PRIMARY KEY)")
+    conn.close()
+    db = DBManager(db_path=path)
+    assert db.get_storage_stats()["auto_vacuum"] == 0
+
+    result = run_maintenance(db, sleep=0)
+    assert result.converted
+    assert result.after["auto_vacuum"] == DBManager.AUTO_VACUUM_INCREMENTAL
+    assert not run_maintenance(db, sleep=0).converted
+    assert db.check_integrity() == []
@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from database.db_manager import DBManager  # noqa: E402
+from logic.planner import (  # noqa: E402
+    KIND_ADDITIVE,
+    KIND_PACKAGING,
+    norm_matrix,
+    plan_requirements,
+    shortages,
+)
+from logic.protocol_types import SER_PROTOCOL  # noqa: E402
+
+
+def test_norm_matrix_sums_repeated_lines():
+    items = [(KIND_ADDITIVE, 1), (KIND_PACKAGING, 1)]
+    norms = [(10, items[0], 0.5), (20, items[1], 2.0), (10, items[0], 0.25)]
+    assert norm_matrix([10, 20], items, norms).tolist() == [[0.75, 0.0], [0.0, 2.0]]
+
+
+def test_plan_requirements_vs_stock(tmp_path):
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    ser = next(c["id"] for c in db.get_product_categories() if c["name"] == "Ser")
+    db.add_product("Gouda", ser)
+    db.add_product("Bryndza", ser)
+    products = {p["name"]: p["id"] for p in db.get_all_products()}
+    salt_cat = next(c["id"] for c in db.get_categories() if c["name"] == "Przyprawy")
+    db.add_additive("Sól", "", "", salt_cat)
+    db.add_additive("Podpuszczka", "", "", salt_cat)
+    additives = {a["name"]: a["id"] for a in db.get_all_additives()}
+    db.add_product_additive(products["Gouda"], additives["Sól"], "100 g")
+    db.add_product_additive(products["Gouda"], additives["Podpuszczka"], "5 ml")
+    db.add_product_additive(products["Bryndza"], additives["Sól"], "0,2 kg")
+    db.add_additive_register("2024-01-01", "1 kg", additives["Sól"])
+    db.add_additive_register("2024-01-01", "1 l", additives["Podpuszczka"])
+    db.add_packaging("Słoik", "", "", db.get_packaging_categories()[0]["id"])
+    jar_id = db.get_all_packaging()[0]["id"]
+    db.add_packaging_register("2024-01-01", "30 szt", jar_id)
+    # historia: 20 słoików na 100 L Bryndzy => 0,2 szt / L
+    db.save_protocol(
+        SER_PROTOCOL,
+        None,
+        "2024-01-05",
+        "B1",
+        products["Bryndza"],
+        {"milk_amount": "100"},
+        [],
+        packaging=[(jar_id, 20)],
+    )
+
+    start = datetime.date(2024, 2, 5)
+    db.add_planned_batch("2024-02-05", products["Gouda"], 200)
+    db.add_planned_batch("2024-02-06", products["Bryndza"], 300)
+    db.add_planned_batch("2024-02-07", products["Gouda"], 200)
+    db.add_planned_batch("2024-02-20", products["Gouda"], 5000)  # poza tygodniem
+
+    batches, requirements = plan_requirements(db, start)
+    assert len(batches) == 3
+    by_name = {r.name: r for r in requirements}
+    # sól: 2×200 L × 1 g/L + 300 L × 2 g/L = 1000 g, stan 1000 g => bez braku
+    assert by_name["Sól"].required == 1000.0
+    assert by_name["Sól"].short_from is None
+    assert by_name["Podpuszczka"].required == 20.0
+    # słoiki: 300 L × 0,2 = 60 szt, na stanie 10
+    jar = by_name["Słoik"]
+    assert (jar.kind, jar.required, jar.in_stock) == (KIND_PACKAGING, 60.0, 10.0)
+    assert jar.short_from == "2024-02-06" and jar.shortage == 50.0
+    assert shortages(requirements) == [jar]
+
+    db.delete_planned_batch(batches[1]["id"])
+    _, requirements = plan_requirements(db, start)
+    assert shortages(requirements) == []
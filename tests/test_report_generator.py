@@ -0,0 +1,122 @@
+from database.db_manager import DBManager
+from logic.protocol_types import SER_PROTOCOL, get_protocol_type
+from logic.report_generator import REPORTS, ReportCache, run_report
+
+
+def make_db(tmp_path) -> DBManager:
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    categories = {c["name"]: c["id"] for c in db.get_product_categories()}
+    db.add_product("Gouda", categories["Ser"])
+    db.add_product("Kefir", categories["Napoje fermentowane"])
+    products = {p["name"]: p["id"] for p in db.get_all_products()}
+    jars_cat = db.get_packaging_categories()[0]["id"]
+    db.add_packaging("Słoik", "", "", jars_cat)
+    jar_id = db.get_all_packaging()[0]["id"]
+    db.add_packaging_register("2024-03-01", "100 szt", jar_id)
+
+    for day, milk in (
+        ("2024-03-01", "100"),
+        ("2024-03-15", "50"),
+        ("2024-04-01", "200"),
+    ):
+        db.save_protocol(
+            SER_PROTOCOL,
+            None,
+            day,
+            f"S{day}",
+            products["Gouda"],
+            {"milk_amount": milk},
+            [("Przyprawy", "Sól", "10 g")],
+        )
+    db.save_protocol(
+        get_protocol_type("Napoje fermentowane"),
+        None,
+        "2024-03-20",
+        "K1",
+        products["Kefir"],
+        {"amt": "50,5"},
+        [],
+        packaging=[(jar_id, 40)],
+    )
+    return db
+
+
+def test_milk_by_product_month(tmp_path):
+    db = make_db(tmp_path)
+    result = run_report(REPORTS["milk_by_product_month"], db.create_connection)
+    assert result.rows == [
+        ("2024-03", "Gouda", 2, 150.0, 150.0, 74.8),
+        ("2024-03", "Kefir", 1, 50.5, 50.5, 25.2),
+        ("2024-04", "Gouda", 1, 200.0, 350.0, 100.0),
+    ]
+
+    march = run_report(
+        REPORTS["milk_by_product_month"],
+        db.create_connection,
+        {"date_from": "2024-03-01", "date_to": "2024-03-31"},
+    )
+    assert [row[:2] for row in march.rows] == [
+        ("2024-03", "Gouda"),
+        ("2024-03", "Kefir"),
+    ]
+
+
+def test_batches_additives_and_packaging_reports(tmp_path):
+    db = make_db(tmp_path)
+    batches = run_report(REPORTS["batches_per_category"], db.create_connection)
+    assert batches.rows[0][:4] == ("Ser", 3, 75.0, 1)
+
+    progress = []
+    additives = run_report(
+        REPORTS["additives_per_month"], db.create_connection, progress=progress.append
+    )
+    assert additives.rows == [
+        ("2024-03", "Sól", 2, 20.0, 20.0, None),
+        ("2024-04", "Sól", 1, 10.0, 30.0, -10.0),
+    ]
+    assert progress == [2]
+
+    packaging = run_report(REPORTS["packaging_receipts_vs_usage"], db.create_connection)
+    assert packaging.rows == [("2024-03", "Słoik", 100.0, 40.0, 60.0, 60.0)]
+
+
+def test_yield_reports_and_cache(tmp_path):
+    db = make_db(tmp_path)
+    gouda = next(p["id"] for p in db.get_all_products() if p["name"] == "Gouda")
+    weights = [10.0, 10.2, 9.9, 10.1, 10.0, 14.0]
+    for day, weight in enumerate(weights, start=1):
+        db.save_protocol(
+            get_protocol_type("Ser"),
+            None,
+            f"2024-05-{day:02d}",
+            f"Y{day}",
+            gouda,
+            {"milk_amount": "100", "milk_type": "Owcze"},
+            [],
+            parties=[("P1", weight, "")],
+        )
+
+    monthly = run_report(REPORTS["yield_by_product_month"], db.create_connection)
+    assert ("2024-05", "Gouda", "Owcze", 6, 600.0, 64.2, 10.7, None) in monthly.rows
+
+    outliers = run_report(REPORTS["yield_outliers"], db.create_connection)
+    assert [row[:2] for row in outliers.rows] == [("2024-05-06", "Y6")]
+
+    cache = ReportCache(db.get_table_versions)
+    first = cache.run(REPORTS["yield_trend"], db.create_connection)
+    again = cache.run(REPORTS["yield_trend"], db.create_connection)
+    assert (first.cached, again.cached) == (False, True)
+    assert again.rows == first.rows
+
+    db.save_protocol(
+        get_protocol_type("Ser"),
+        None,
+        "2024-06-01",
+        "Y7",
+        gouda,
+        {"milk_amount": "100", "milk_type": "Owcze"},
+        [],
+        parties=[("P1", 10.0, "")],
+    )
+    changed = cache.run(REPORTS["yield_trend"], db.create_connection)
+    assert not changed.cached and changed.rows[0][2] == 2
@@ -0,0 +1,78 @@
+import statistics
+
+import pytest
+
+from database.db_manager import DBManager
+from logic.protocol_types import FERMENTED_PROTOCOL, SER_PROTOCOL
+from logic.spc import (
+    SPC_OK,
+    SPC_OUT,
+    SPC_WARNING,
+    RunningStats,
+    control_limits,
+    load_control_limits,
+)
+
+
+def make_db(tmp_path):
+    db = DBManager(db_path=str(tmp_path / "serownia.db"))
+    for name, category in (("Gouda", "Ser"), ("Kefir", "Napoje fermentowane")):
+        db.add_product(
+            name,
+            next(c["id"] for c in db.get_product_categories() if c["name"] == category),
+        )
+    return db, {p["name"]: p["id"] for p in db.get_all_products()}
+
+
+def save(db, ptype, product_id, details, record_id=None):
+    return db.save_protocol(
+        ptype, record_id, "2024-06-01", "S1", product_id, details, []
+    )
+
+
+def test_running_stats_add_remove_matches_statistics():
+    values = [6.52, 6.48, 6.61, 6.55, 6.40, 6.58]
+    stats = RunningStats()
+    for v in values + [7.9]:
+        stats.add(v)
+    stats.remove(7.9)
+    assert stats.n == len(values)
+    assert stats.mean == pytest.approx(statistics.mean(values))
+    assert stats.std == pytest.approx(statistics.stdev(values))
+
+    limits = control_limits("ph", stats)
+    assert limits.classify(stats.mean) == SPC_OK
+    assert limits.classify(stats.mean + 2.5 * stats.std) == SPC_WARNING
+    assert limits.classify(limits.ucl + 0.01) == SPC_OUT
+    assert control_limits("ph", RunningStats(2, 6.5, 0.01)) is None
+
+
+def test_spc_stats_follow_saves_edits_and_deletes(tmp_path):
+    db, products = make_db(tmp_path)
+    gouda, kefir = products["Gouda"], products["Kefir"]
+    ph = ["6,50", "6.55", "6,45", "6,60", "6,40"]
+    ids = [
+        save(db, SER_PROTOCOL, gouda, {"milk_amount": "100", "ph": v}) for v in ph
+    ]
+    save(db, FERMENTED_PROTOCOL, kefir, {"amt": "50", "ink_temp": "42°C", "ph": "4,5"})
+
+    stats = db.get_spc_stats(gouda)
+    assert set(stats) == {"ph"} and stats["ph"]["n"] == 5
+    assert stats["ph"]["mean"] == pytest.approx(6.5)
+    assert set(db.get_spc_stats(kefir)) == {"ph", "ink_temp"}
+
+    # Edycja: stara wartość out, nowa in; zmiana produktu przenosi wartości
+    save(db, SER_PROTOCOL, gouda, {"milk_amount": "100", "ph": "6,70"}, ids[0])
+    save(db, SER_PROTOCOL, kefir, {"milk_amount": "100", "ph": "6,40"}, ids[1])
+    db.delete_production_record(ids[2])
+    remaining = [6.70, 6.60, 6.40]
+    stats = db.get_spc_stats(gouda)["ph"]
+    assert stats["n"] == 3
+    assert stats["mean"] == pytest.approx(statistics.mean(remaining))
+    assert stats["m2"] == pytest.approx(statistics.pvariance(remaining) * 3)
+    assert db.get_spc_stats(kefir)["ph"]["n"] == 2
+    assert db.rebuild_spc_stats() == []
+
+    limits = load_control_limits(db, gouda, min_samples=3)
+    assert limits["ph"].classify(7.5) == SPC_OUT
+    assert load_control_limits(db, gouda) == {}
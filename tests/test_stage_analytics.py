@@ -0,0 +1,62 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from logic.protocol_types import SER_PROTOCOL, TWAROG_PROTOCOL  # noqa: E402
+from logic.stage_analytics import (  # noqa: E402
+    grouped_stats,
+    stage_duration_stats_for,
+    stage_spans,
+)
+
+
+def test_stage_spans_use_duration_or_start_end():
+    spans = {s.stage: s for s in stage_spans(TWAROG_PROTOCOL)}
+    # Krojenie: godzina + temperatura => brak czasu trwania
+    assert set(spans) == {"Dogrzewanie", "Solenie"}
+    assert all(s.start is not None for s in spans.values())
+    assert stage_spans(SER_PROTOCOL)[0].start is None
+
+
+def test_grouped_stats_match_numpy_per_group():
+    rng = np.random.default_rng(1)
+    groups = rng.integers(0, 5, 2000)
+    values = rng.normal(60, 10, 2000)
+    values[::7] = np.nan
+
+    codes, stats = grouped_stats(groups, values)
+    for code, row in zip(codes, stats):
+        sample = values[(groups == code) & ~np.isnan(values)]
+        assert row[0] == sample.size
+        assert row[1] == pytest.approx(sample.mean())
+        assert row[2] == pytest.approx(sample.std())
+        assert row[4] == pytest.approx(np.percentile(sample, 25))
+        assert row[5] == pytest.approx(np.median(sample))
+        assert (row[3], row[-1]) == (sample.min(), sample.max())
+
+
+def test_span_over_midnight_and_products():
+    columns = TWAROG_PROTOCOL.minute_columns
+    solenie = (columns.index("solenie_start_min"), columns.index("solenie_end_min"))
+
+    def row(record_id, product, start, end):
+        minutes = [None] * len(columns)
+        minutes[solenie[0]], minutes[solenie[1]] = start, end
+        return (record_id, product, *minutes)
+
+    rows = [
+        row(1, "Twaróg", 23 * 60 + 30, 30),  # przez północ => 60 min
+        row(2, "Twaróg", 600, 720),
+        row(3, "Twaróg chudy", 600, 630),
+        row(4, "Twaróg chudy", None, 630),
+    ]
+    stats = {
+        (s.product, s.stage): s
+        for s in stage_duration_stats_for(TWAROG_PROTOCOL, rows)
+    }
+    assert set(stats) == {("Twaróg", "Solenie"), ("Twaróg chudy", "Solenie")}
+    assert (stats["Twaróg", "Solenie"].count, stats["Twaróg", "Solenie"].mean) == (
+        2,
+        90.0,
+    )
+    assert stats["Twaróg chudy", "Solenie"].median == 30.0
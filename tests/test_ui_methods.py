@@ -0,0 +1,74 @@
+import ast
+import glob
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_classes():
+    """{klasa: (metody i atrybuty self.X = ..., nazwy klas bazowych, plik)}."""
+    classes = {}
+    paths = glob.glob(os.path.join(ROOT, "ui", "*.py"))
+    for path in paths + [os.path.join(ROOT, "main.py")]:
+        with open(path, encoding="utf-8") as handle:
+            tree = ast.parse(handle.read(), path)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ClassDef):
+                continue
+            names = {
+                item.name
+                for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+            }
+            names |= {
+                target.id
+                for item in node.body
+                if isinstance(item, ast.Assign)
+                for target in item.targets
+                if isinstance(target, ast.Name)
+            }
+            names |= {
+                sub.attr
+                for sub in ast.walk(node)
+                if isinstance(sub, ast.Attribute)
+                and isinstance(sub.ctx, ast.Store)
+                and isinstance(sub.value, ast.Name)
+                and sub.value.id == "self"
+            }
+            bases = [b.id for b in node.bases if isinstance(b, ast.Name)]
+            classes[node.name] = (names, bases, node, path)
+    return classes
+
+
+def known_names(classes, name, seen=()):
+    if name not in classes or name in seen:
+        return set()
+    names, bases, _node, _path = classes[name]
+    result = set(names)
+    for base in bases:
+        result |= known_names(classes, base, seen + (name,))
+    return result
+
+
+def test_ui_classes_define_called_methods():
+    """
+    self.metoda_z_podkreśleniem(...) musi być zdefiniowana w klasie albo jej
+    bazie z ui/ – metody Qt (camelCase) pomijamy. Łapie np. usunięty nagłówek
+    def, którego ciało przykleiło się do poprzedniej metody.
+    """
+    classes = parse_classes()
+    missing = []
+    for name, (_names, _bases, node, path) in classes.items():
+        known = known_names(classes, name)
+        for sub in ast.walk(node):
+            if (
+                isinstance(sub, ast.Call)
+                and isinstance(sub.func, ast.Attribute)
+                and isinstance(sub.func.value, ast.Name)
+                and sub.func.value.id == "self"
+                and "_" in sub.func.attr.strip("_")
+                and sub.func.attr not in known
+            ):
+                rel = os.path.relpath(path, ROOT)
+                missing.append(f"{rel}:{sub.lineno} {name}.{sub.func.attr}")
+    assert missing == []
@@ -0,0 +1,37 @@
+import pytest
+
+from database.db_manager import DBManager
+from logic.xlsx_export import EXPORT_SETS, export_sets, export_xlsx
+
+
+def make_db() -> DBManager:
+    # klon szablonu w pamięci – świeża, zmigrowana baza bez pliku
+    return DBManager(db_path=DBManager.MEMORY_DB)
+
+
+def test_export_sets_sheet_titles_fit_excel_limit():
+    sheets = export_sets()
+    assert set(sheets) == set(EXPORT_SETS)
+    titles = [s.title for group in sheets.values() for s in group]
+    assert len(titles) == len(set(titles))
+    assert all(len(t) <= 31 for t in titles)
+
+
+def test_unknown_set_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export_xlsx(make_db(), str(tmp_path / "out.xlsx"), ["nope"])
+
+
+def test_export_writes_registers(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    db = make_db()
+    db.add_packaging("Wiaderko 1 kg", "", "", None)
+    packaging_id = db.get_all_packaging()[0]["id"]
+    db.add_packaging_register("2024-02-01", "100", packaging_id)
+
+    path = str(tmp_path / "out.xlsx")
+    assert export_xlsx(db, path, ["packaging_register"]) == 1
+
+    sheet = openpyxl.load_workbook(path, read_only=True)["Rejestr opakowań"]
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[1][1:] == ("2024-02-01", "100", "Wiaderko 1 kg")
@@ -1,5 +1,6 @@
 # c:\serownia\ui\additive_categories_crud_screen.py
 
+import logging
 from typing import Optional, Any, List
 import sqlite3  # Możliwe, że używasz do łapania IntegrityError
 
@@ -8,6 +9,8 @@ from PyQt5.QtCore import Qt
 
 from ui.base_crud_list_screen import BaseCrudListScreen
 
+logger = logging.getLogger(__name__)
+
 
 class AdditiveCategoriesCrudScreen(BaseCrudListScreen):
     """
@@ -47,8 +50,8 @@ class AdditiveCategoriesCrudScreen(BaseCrudListScreen):
          - 2: Edytuj/Zapisz (przycisk)
          - 3: Usuń (przycisk)
         """
-        print(
-            f"[DEBUG] AdditiveCategoriesCrudScreen.load_data(filter_text='{filter_text}')"
+        logger.debug(
+            "AdditiveCategoriesCrudScreen.load_data(filter_text='%s')", filter_text
         )
 
         if not self.db_manager:
@@ -67,8 +70,8 @@ class AdditiveCategoriesCrudScreen(BaseCrudListScreen):
         if ft_lower:
             categories = [c for c in categories if ft_lower in c["name"].lower()]
 
-        print(
-            f"[DEBUG] Znaleziono {len(categories)} kategorii (po filtrze='{filter_text}')"
+        logger.debug(
+            "Znaleziono %s kategorii (po filtrze='%s')", len(categories), filter_text
         )
 
         # 3. Wstawiamy dane do tabeli
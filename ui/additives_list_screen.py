@@ -1,5 +1,6 @@
 # c:\serownia\ui\additives_list_screen.py
 
+import logging
 from typing import Optional, Any, List
 
 from PyQt5.QtWidgets import QLineEdit, QComboBox, QTableWidgetItem, QMessageBox, QDialog
@@ -10,6 +11,8 @@ from .add_additive_dialog import (
     AddAdditiveDialog,
 )  # <-- Upewnij się, że ścieżka jest poprawna
 
+logger = logging.getLogger(__name__)
+
 
 class AdditivesListScreen(BaseCrudListScreen):
     """
@@ -48,7 +51,7 @@ class AdditivesListScreen(BaseCrudListScreen):
 
         Jeśli filter_text niepuste, filtrujemy dodatki np. po polu 'name' (case-insensitive).
         """
-        print(f"[DEBUG] AdditivesListScreen.load_data(filter_text='{filter_text}')")
+        logger.debug("AdditivesListScreen.load_data(filter_text='%s')", filter_text)
 
         self.table.setRowCount(0)
         if not self.db_manager:
@@ -71,8 +74,8 @@ class AdditivesListScreen(BaseCrudListScreen):
                 ad for ad in additives if ft_lower in ad.get("name", "").lower()
             ]
 
-        print(
-            f"[DEBUG] Znaleziono {len(additives)} dodatków (po filtrze='{filter_text}')"
+        logger.debug(
+            "Znaleziono %s dodatków (po filtrze='%s')", len(additives), filter_text
         )
 
         # 3. Tworzymy mapowanie category_id -> category_name
@@ -1,5 +1,6 @@
 # c:\serownia\ui\additives_register_screen.py
 
+import logging
 from typing import Optional, Any, List
 
 from PyQt5.QtWidgets import (
@@ -20,11 +21,14 @@ from database.db_manager import (
     DBManager,
 )  # Dostosuj import, jeśli pliki są inaczej zorganizowane
 
+logger = logging.getLogger(__name__)
+
 
 class AdditivesRegisterScreen(BaseCrudListScreen):
     """
     Ekran "Rejestr Dodatków", umożliwiający:
-      - przeglądanie wpisów w tabeli (ID, Data, Ilość, Rodzaj Dodatku, Edytuj/Zapisz, Usuń),
+      - przeglądanie wpisów (partii dostaw) w tabeli (ID, Data, Ilość, Rodzaj Dodatku,
+        Data ważności, Nr partii, Cena, Pozostało, Edytuj/Zapisz, Usuń),
       - dodawanie nowego wpisu (przycisk "Nowy"),
       - edycję istniejących wpisów (kolumna "Edytuj/Zapisz"),
       - usuwanie wpisów (kolumna "Usuń").
@@ -33,6 +37,11 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
     by klasa bazowa mogła wywołać self.load_data(filter_text="...") przy filtracji.
     """
 
+    # Przycisk 'Eksport XLSX' (logic/xlsx_export.py)
+    EXPORT_SETS = ("additives_register",)
+    # Przycisk 'Importuj' (logic/bulk_import.py)
+    IMPORT_SPEC = "additives_register"
+
     def __init__(
         self,
         parent: Optional[Any] = None,  # Najczęściej QMainWindow
@@ -40,7 +49,8 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
     ) -> None:
         """
         Inicjalizuje ekran rejestru dodatków, definiując kolumny:
-          [ID, Data, Ilość, Rodzaj Dodatku, Edytuj/Zapisz, Usuń].
+          [ID, Data, Ilość, Rodzaj Dodatku, Data ważności, Nr partii, Cena,
+           Pozostało, Edytuj/Zapisz, Usuń].
 
         :param parent: Widok-rodzic, np. MainWindow.
         :param db_manager: Obiekt dostarczający metod do komunikacji z bazą danych.
@@ -54,6 +64,10 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
                 "Data przyjęcia",
                 "Ilość",
                 "Rodzaj Dodatku",
+                "Data ważności",
+                "Nr partii",
+                "Cena",
+                "Pozostało",
                 "Edytuj/Zapisz",
                 "Usuń",
             ],
@@ -70,12 +84,16 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
             "date": "2024-12-27",
             "quantity": "10",
             "additive_id": 2,
-            "additive_name": "Kozieradka"
+            "additive_name": "Kozieradka",
+            "expiry_date": "2025-06-30",
+            "lot_no": "L2412-07",
+            "remaining": 4.0,
+            "price": "45 zł/kg"
           }
 
         Jeśli filter_text niepuste, filtrujemy w Pythonie po "additive_name" (case-insensitive).
         """
-        print(f"[DEBUG] AdditivesRegisterScreen.load_data(filter_text='{filter_text}')")
+        logger.debug("AdditivesRegisterScreen.load_data(filter_text='%s')", filter_text)
 
         self.table.setRowCount(0)
         if not self.db_manager:
@@ -97,8 +115,10 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
                 if ft_lower in (rec.get("additive_name", "")).lower()
             ]
 
-        print(
-            f"[DEBUG] Znaleziono {len(rejestr_list)} wpisów w rejestrze (po filtrze='{filter_text}')"
+        logger.debug(
+            "Znaleziono %s wpisów w rejestrze (po filtrze='%s')",
+            len(rejestr_list),
+            filter_text,
         )
 
         for row_index, rec in enumerate(rejestr_list):
@@ -124,13 +144,36 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
             additive_name_edit.setEnabled(False)
             self.table.setCellWidget(row_index, 3, additive_name_edit)
 
-            # Kol 4: Edytuj/Zapisz (przycisk)
+            # Kol 4: Data ważności (rozchód FEFO – najpierw najkrótsza)
+            expiry_edit = QLineEdit(str(rec.get("expiry_date") or ""))
+            expiry_edit.setEnabled(False)
+            self.table.setCellWidget(row_index, 4, expiry_edit)
+
+            # Kol 5: Numer partii dostawcy
+            lot_edit = QLineEdit(str(rec.get("lot_no") or ""))
+            lot_edit.setEnabled(False)
+            self.table.setCellWidget(row_index, 5, lot_edit)
+
+            # Kol 6: Cena dostawy (koszty serii – DBManager._BATCH_COST_SQL)
+            price_edit = QLineEdit(str(rec.get("price") or ""))
+            price_edit.setEnabled(False)
+            self.table.setCellWidget(row_index, 6, price_edit)
+
+            # Kol 7: Pozostało w partii (tylko odczyt – rozchód przy zapisie protokołu)
+            remaining = rec.get("remaining")
+            remaining_item = QTableWidgetItem(
+                "" if remaining is None else f"{remaining:g}"
+            )
+            remaining_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
+            self.table.setItem(row_index, 7, remaining_item)
+
+            # Kol 8: Edytuj/Zapisz (przycisk)
             edit_button = self.create_edit_button(row_index)
-            self.table.setCellWidget(row_index, 4, edit_button)
+            self.table.setCellWidget(row_index, 8, edit_button)
 
-            # Kol 5: Usuń (przycisk)
+            # Kol 9: Usuń (przycisk)
             delete_button = self.create_delete_button(row_index)
-            self.table.setCellWidget(row_index, 5, delete_button)
+            self.table.setCellWidget(row_index, 9, delete_button)
 
         self.table.resizeColumnsToContents()
 
@@ -215,7 +258,8 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
         register_id = int(item_id_item.text())
 
         new_values: List[Any] = []
-        # Kolumny: 1=Data, 2=Ilość, 3=Rodzaj Dodatku
+        # Kolumny: 1=Data, 2=Ilość, 3=Rodzaj Dodatku, 4=Data ważności,
+        # 5=Nr partii, 6=Cena, 7=Pozostało
         for col in range(1, len(self.columns) - 2):
             widget = self.table.cellWidget(row, col)
             if col == 3 and isinstance(widget, QComboBox):
@@ -226,18 +270,21 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
                 text_value = widget.text().strip() if widget else ""
                 new_values.append(text_value)
 
-        # new_values -> [date_str, quantity_str, additive_id]
+        # new_values -> [date_str, quantity_str, additive_id, expiry_date, lot_no,
+        #                price, ""]
         self.update_item_in_db(register_id, new_values)
 
         QMessageBox.information(self, "Sukces", "Zaktualizowano rekord w bazie.")
 
     def update_item_in_db(self, register_id: int, new_values: List[Any]) -> None:
         """
-        Domyślnie: [date_str, quantity_str, additive_id].
-        Możesz wywołać np. db_manager.update_additive_register(register_id, date_str, quantity_str, additive_id).
+        Domyślnie: [date_str, quantity_str, additive_id, expiry_date, lot_no, price,
+        ...]. Wywołuje db_manager.update_additive_register(register_id, date_str,
+        quantity_str, additive_id, expiry_date, price, lot_no).
 
         :param register_id: ID rekordu w tabeli additives_register.
-        :param new_values: Lista [date_str, quantity_str, additive_id].
+        :param new_values: Lista [date_str, quantity_str, additive_id, expiry_date,
+            lot_no, price, ...].
         """
         if not self.db_manager:
             QMessageBox.critical(
@@ -248,10 +295,19 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
         date_str = new_values[0]
         quantity_str = new_values[1]
         additive_id = new_values[2]
+        expiry_date = new_values[3] if len(new_values) > 3 else ""
+        lot_no = new_values[4] if len(new_values) > 4 else ""
+        price = new_values[5] if len(new_values) > 5 else ""
 
         try:
             self.db_manager.update_additive_register(
-                register_id, date_str, quantity_str, additive_id
+                register_id,
+                date_str,
+                quantity_str,
+                additive_id,
+                expiry_date or None,
+                price or None,
+                lot_no or None,
             )
             # Po zapisie można odświeżyć dane (opcjonalnie)
             self.load_data()
@@ -260,8 +316,8 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
 
     def delete_item_in_db(self, item_id: int) -> None:
         """
-        Usuwanie (po kliknięciu 'Usuń').
-        Domyślnie: db_manager.delete_additive_register(item_id).
+        Usuwanie (po kliknięciu 'Usuń'): db_manager.delete_additive_register.
+        Partii rozchodowanej w protokołach baza nie usuwa (ValueError z seriami).
         """
         if not self.db_manager:
             QMessageBox.critical(
@@ -269,10 +325,15 @@ class AdditivesRegisterScreen(BaseCrudListScreen):
             )
             return
 
-        # np.:
-        # self.db_manager.delete_additive_register(item_id)
-        # self.load_data()
-        pass
+        try:
+            self.db_manager.delete_additive_register(item_id)
+        except ValueError as e:
+            QMessageBox.warning(self, "Nie usunięto", str(e))
+            return
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się usunąć wpisu: {e}")
+            return
+        self.load_data()
 
 
 class AddAdditiveRegisterDialog(QDialog):
@@ -281,6 +342,8 @@ class AddAdditiveRegisterDialog(QDialog):
       - Data przyjęcia
       - Ilość
       - Rodzaj Dodatku (QComboBox)
+      - Data ważności (opcjonalnie – kolejność rozchodu FEFO)
+      - Cena dostawy (opcjonalnie – koszty serii)
     """
 
     def __init__(
@@ -321,6 +384,24 @@ class AddAdditiveRegisterDialog(QDialog):
         # Wypełniamy listę dodatków
         self.fill_additives_combo()
 
+        # Etykieta i pole: Data ważności
+        layout.addWidget(QLabel("Data ważności (YYYY-MM-DD, opcjonalnie):"))
+        self.expiry_input = QLineEdit()
+        self.expiry_input.setPlaceholderText("2025-06-30")
+        layout.addWidget(self.expiry_input)
+
+        # Etykieta i pole: Numer partii dostawcy
+        layout.addWidget(QLabel("Nr partii (opcjonalnie):"))
+        self.lot_input = QLineEdit()
+        self.lot_input.setPlaceholderText("L2412-07")
+        layout.addWidget(self.lot_input)
+
+        # Etykieta i pole: Cena dostawy
+        layout.addWidget(QLabel("Cena (opcjonalnie, np. 45 zł/kg):"))
+        self.price_input = QLineEdit()
+        self.price_input.setPlaceholderText("45 zł/kg")
+        layout.addWidget(self.price_input)
+
         # Przycisk Zapisz
         save_button = QPushButton("Zapisz")
         save_button.clicked.connect(self.save_data)
@@ -356,13 +437,23 @@ class AddAdditiveRegisterDialog(QDialog):
         date_str = self.date_input.text().strip()
         quantity_str = self.quantity_input.text().strip()
         additive_id = self.additive_combo.itemData(self.additive_combo.currentIndex())
+        expiry_date = self.expiry_input.text().strip()
+        price = self.price_input.text().strip()
+        lot_no = self.lot_input.text().strip()
 
         if not date_str or not quantity_str:
             QMessageBox.warning(self, "Błąd", "Data i ilość są wymagane.")
             return
 
         try:
-            self.db_manager.add_additive_register(date_str, quantity_str, additive_id)
+            self.db_manager.add_additive_register(
+                date_str,
+                quantity_str,
+                additive_id,
+                expiry_date or None,
+                price or None,
+                lot_no or None,
+            )
             QMessageBox.information(
                 self,
                 "Sukces",
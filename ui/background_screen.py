@@ -13,6 +13,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap, QResizeEvent
 
+from logic.app_config import asset_path
+
 
 class BackgroundScreen(QMainWindow):
     """
@@ -24,13 +26,13 @@ class BackgroundScreen(QMainWindow):
     def __init__(
         self,
         parent: Optional[QMainWindow] = None,
-        bg_image_path: str = r"c:\serownia\images\cheese.jpg",
+        bg_image_path: Optional[str] = None,
         panel_width: int = 500,
     ) -> None:
         super().__init__(parent)
 
-        # 1. Zapamiętujemy ścieżkę do obrazu
-        self.bg_image_path = bg_image_path
+        # 1. Zapamiętujemy ścieżkę do obrazu (domyślnie tło z katalogu grafik)
+        self.bg_image_path = bg_image_path or asset_path("cheese.jpg")
 
         # 2. Główny widget (central)
         self.central_w = QWidget()
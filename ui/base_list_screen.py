@@ -1,7 +1,10 @@
 # base_list_screen.py
-from typing import Optional, List
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, List, Tuple
 
 from PyQt5.QtWidgets import (
+    QFileDialog,
     QMainWindow,
     QWidget,
     QVBoxLayout,
@@ -13,14 +16,24 @@ from PyQt5.QtWidgets import (
     QTableWidgetItem,
     QMessageBox,
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSignals(QObject):
+    """Sygnały z wątku importu/eksportu do GUI (połączenia kolejkowane przez Qt)."""
+
+    progress = pyqtSignal(int)  # liczba przetworzonych wierszy
+    finished = pyqtSignal(object)  # wynik zadania
+    failed = pyqtSignal(str)
 
 
 class BaseListScreen(QMainWindow):
     """
     Bazowy ekran wyświetlający listę danych w tabeli. Zawiera:
     - Tytuł (nagłówek),
-    - Przyciski: 'Importuj', 'Nowy',
+    - Przyciski: 'Importuj', 'Nowy' (oraz 'Eksport XLSX', gdy EXPORT_SETS niepuste),
     - Pole wyszukiwania i przyciski 'Szukaj' oraz 'Wyczyść filtr',
     - Tabelę z możliwością sortowania kolumn.
 
@@ -30,8 +43,17 @@ class BaseListScreen(QMainWindow):
     - add_new_item()  (logika przycisku 'Nowy'),
     - apply_filter()  (logika przycisku 'Szukaj'),
     - clear_filter()  (czyszczenie i ponowne wczytanie danych).
+
+    EXPORT_SETS – zbiory z logic/xlsx_export.py eksportowane przyciskiem
+    'Eksport XLSX' (w wątku w tle; wymaga self.db_manager).
+    IMPORT_SPEC – klucz logic.bulk_import.IMPORT_SPECS dla przycisku 'Importuj'
+    (import .xlsx/.csv w wątku w tle). Ekran bez IMPORT_SPEC i bez własnego
+    import_data() nie pokazuje przycisku 'Importuj'.
     """
 
+    EXPORT_SETS: Tuple[str, ...] = ()
+    IMPORT_SPEC: Optional[str] = None
+
     def __init__(
         self,
         parent: Optional[QMainWindow] = None,
@@ -76,6 +98,11 @@ class BaseListScreen(QMainWindow):
         )
         self.import_button.clicked.connect(self.import_data)
         action_layout.addWidget(self.import_button)
+        if (
+            self.IMPORT_SPEC is None
+            and type(self).import_data is BaseListScreen.import_data
+        ):
+            self.import_button.hide()
 
         self.new_button = QPushButton("Nowy")
         self.new_button.setStyleSheet(
@@ -91,6 +118,28 @@ class BaseListScreen(QMainWindow):
         self.new_button.clicked.connect(self.add_new_item)
         action_layout.addWidget(self.new_button)
 
+        if self.EXPORT_SETS:
+            self.export_button = QPushButton("Eksport XLSX")
+            self.export_button.setStyleSheet(
+                """
+                background-color: #28a745; /* zielony */
+                color: #FFFFFF;
+                font-size: 14px;
+                font-weight: bold;
+                border-radius: 8px;
+                padding: 10px 20px;
+            """
+            )
+            self.export_button.clicked.connect(self.export_data)
+            action_layout.addWidget(self.export_button)
+        self._task_executor: Optional[ThreadPoolExecutor] = None
+        self.export_signals = TaskSignals()
+        self.export_signals.finished.connect(self.on_export_finished)
+        self.export_signals.failed.connect(self.on_export_failed)
+        self.import_signals = TaskSignals()
+        self.import_signals.finished.connect(self.on_import_finished)
+        self.import_signals.failed.connect(self.on_import_failed)
+
         action_layout.addStretch()
         main_layout.addLayout(action_layout)
 
@@ -164,17 +213,132 @@ class BaseListScreen(QMainWindow):
 
         self.table.resizeColumnsToContents()
 
+    # ----------------------------------------------------------------
+    # Import .xlsx / .csv (w tle)
+    # ----------------------------------------------------------------
     def import_data(self) -> None:
-        QMessageBox.information(self, "Import", "Nie zaimplementowano jeszcze importu.")
+        """
+        Pyta o plik i importuje go według IMPORT_SPEC w wątku w tle
+        (logic.bulk_import.import_file – odczyt strumieniowy, executemany).
+        """
+        db_manager = getattr(self, "db_manager", None)
+        if self.IMPORT_SPEC is None or db_manager is None:
+            QMessageBox.warning(self, "Import", "Import niedostępny na tym ekranie.")
+            return
+
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import z pliku",
+            "",
+            "Excel / CSV (*.xlsx *.csv);;Skoroszyt Excel (*.xlsx);;CSV (*.csv)",
+        )
+        if not path:
+            return
+
+        from logic.bulk_import import import_file
+
+        self.import_button.setEnabled(False)
+        spec_key = self.IMPORT_SPEC
+        signals = self.import_signals
+        logger.debug("Import %s z %s", spec_key, path)
+
+        def job() -> None:
+            try:
+                result = import_file(
+                    db_manager, spec_key, path, progress=signals.progress.emit
+                )
+            except Exception as e:  # wynik zawsze wraca do GUI
+                signals.failed.emit(str(e))
+                return
+            signals.finished.emit(result)
+
+        self.task_executor().submit(job)
+
+    def on_import_finished(self, result: Any) -> None:
+        self.import_button.setEnabled(True)
+        self.load_data()
+        message = f"Zaimportowano wierszy: {result.imported}."
+        if result.rejected:
+            message += (
+                f"\nOdrzucono: {result.rejected} – szczegóły w pliku:"
+                f"\n{result.reject_path}"
+            )
+        QMessageBox.information(self, "Import", message)
+
+    def on_import_failed(self, message: str) -> None:
+        self.import_button.setEnabled(True)
+        self.load_data()
+        QMessageBox.warning(self, "Błąd", f"Import nie powiódł się: {message}")
 
     def add_new_item(self) -> None:
         QMessageBox.information(self, "Nowy", "Nie zaimplementowano jeszcze dodawania.")
 
+    def task_executor(self) -> ThreadPoolExecutor:
+        """Jeden wątek na ekran dla importu/eksportu (tworzony przy 1. użyciu)."""
+        if self._task_executor is None:
+            self._task_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="list-task"
+            )
+        return self._task_executor
+
+    # ----------------------------------------------------------------
+    # Eksport XLSX (w tle)
+    # ----------------------------------------------------------------
+    def export_data(self) -> None:
+        """
+        Pyta o plik i eksportuje EXPORT_SETS do .xlsx w wątku w tle
+        (logic.xlsx_export.export_xlsx – wiersze strumieniowo z kursora).
+        """
+        db_manager = getattr(self, "db_manager", None)
+        if db_manager is None:
+            QMessageBox.warning(
+                self, "Błąd", "Brak db_manager – nie można eksportować."
+            )
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Eksport do pliku Excel", "", "Skoroszyt Excel (*.xlsx)"
+        )
+        if not path:
+            return
+        if not path.lower().endswith(".xlsx"):
+            path += ".xlsx"
+
+        from logic.xlsx_export import export_xlsx
+
+        self.export_button.setEnabled(False)
+        sets = self.EXPORT_SETS
+        signals = self.export_signals
+        logger.debug("Eksport %s do %s", sets, path)
+
+        def job() -> None:
+            try:
+                total = export_xlsx(
+                    db_manager, path, sets, progress=signals.progress.emit
+                )
+            except Exception as e:  # wynik zawsze wraca do GUI
+                signals.failed.emit(str(e))
+                return
+            signals.finished.emit((path, total))
+
+        self.task_executor().submit(job)
+
+    def on_export_finished(self, result: Tuple[str, int]) -> None:
+        path, total = result
+        self.export_button.setEnabled(True)
+        QMessageBox.information(
+            self, "Eksport", f"Zapisano {total} wierszy do pliku:\n{path}"
+        )
+
+    def on_export_failed(self, message: str) -> None:
+        self.export_button.setEnabled(True)
+        QMessageBox.warning(self, "Błąd", f"Eksport nie powiódł się: {message}")
+
     # base_list_screen.py
 
     def apply_filter(self):
         text = self.filter_input.text().strip()
-        print(f"[DEBUG] base_list_screen.apply_filter: filter_text = {text}")
+        logger.debug("base_list_screen.apply_filter: filter_text = %s", text)
 
         # Zamiast self.products_list_screen, użyjemy "self", bo to SAM ekran:
         self.load_data(filter_text=text)
@@ -0,0 +1,91 @@
+# c:\serownia\ui\consumption_forecast_dialog.py
+
+import logging
+from typing import Any, Optional
+
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import (
+    QDialog,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from logic.forecast import HORIZON_DAYS, MA_DAYS, ForecastCache
+
+logger = logging.getLogger(__name__)
+
+ORDER_COLOR = QColor("#FFE599")
+
+COLUMNS = (
+    "Dodatek",
+    "Stan",
+    f"Średnio / dzień ({MA_DAYS} dni)",
+    "Sezon ×",
+    "Prognoza / dzień",
+    "Dni zapasu",
+    "Wyczerpanie",
+    "Dostawy co (dni)",
+    "Zamówić",
+)
+
+
+class ConsumptionForecastDialog(QDialog):
+    """
+    Prognoza zużycia dodatków (logic.forecast): tempo z ostatnich dni ze
+    współczynnikiem sezonowym, dni do wyczerpania zapasu i pozycje do
+    zamówienia (podświetlone). Wynik z ForecastCache ekranu Magazyn.
+    """
+
+    def __init__(self, parent: Optional[Any], cache: ForecastCache) -> None:
+        super().__init__(parent)
+        self.cache = cache
+
+        self.setWindowTitle("Prognoza zużycia dodatków")
+        self.setGeometry(250, 200, 900, 520)
+
+        layout = QVBoxLayout(self)
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(list(COLUMNS))
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        close_button = QPushButton("Zamknij")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.load_data()
+
+    def load_data(self) -> None:
+        forecast, computed = self.cache.refresh()
+        to_order = sum(1 for f in forecast if f.order_now)
+        self.info_label.setText(
+            f"Ilości w g / ml / szt.; horyzont sezonowy {HORIZON_DAYS} dni."
+            f" Do zamówienia: {to_order}"
+            + ("" if computed else " (bez zmian w danych)")
+        )
+        self.table.setRowCount(len(forecast))
+        for row, item in enumerate(forecast):
+            values = (
+                item.name,
+                f"{item.balance:g}",
+                f"{item.moving_avg:g}",
+                f"{item.seasonal_factor:g}",
+                f"{item.rate:g}",
+                "" if item.days_left is None else f"{item.days_left:g}",
+                item.stockout_date or "",
+                "" if item.receipt_interval is None else f"{item.receipt_interval:g}",
+                "TAK" if item.order_now else "",
+            )
+            for col, text in enumerate(values):
+                cell = QTableWidgetItem(text)
+                if item.order_now:
+                    cell.setBackground(ORDER_COLOR)
+                self.table.setItem(row, col, cell)
+        self.table.resizeColumnsToContents()
@@ -0,0 +1,81 @@
+# c:\serownia\ui\form_binding.py
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from PyQt5.QtWidgets import QComboBox, QLineEdit, QWidget
+
+
+@contextmanager
+def blocked_signals(*widgets: QWidget) -> Iterator[None]:
+    """
+    Blokuje sygnały podanych widgetów na czas bloku `with`,
+    a po wyjściu przywraca ich poprzedni stan (blockSignals zwraca stary stan).
+    """
+    previous = [w.blockSignals(True) for w in widgets]
+    try:
+        yield
+    finally:
+        for w, was_blocked in zip(widgets, previous):
+            w.blockSignals(was_blocked)
+
+
+class FormBinder:
+    """
+    Warstwa wiążąca słownik szczegółów protokołu (klucz = kolumna w bazie)
+    z widgetami formularza (QLineEdit / QComboBox).
+
+    Wszystkie pola ustawiane są w jednym przebiegu z zablokowanymi sygnałami,
+    więc textChanged / currentIndexChanged nie odpalają w trakcie wypełniania.
+    Pola pochodne (np. dawki) przelicza wywołujący – raz, po populate().
+    """
+
+    def __init__(
+        self,
+        bindings: Dict[str, QWidget],
+        combo_defaults: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        :param bindings: mapa {klucz_w_słowniku: widget}.
+        :param combo_defaults: domyślny tekst dla QComboBox (np. {"pasteryzacja": "Brak"}),
+                               wybierany przy braku wartości lub nieznanym tekście.
+        """
+        self.bindings = bindings
+        self.combo_defaults = combo_defaults or {}
+
+    def populate(self, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Wypełnia wszystkie powiązane widgety wartościami z 'data'.
+        Brakujące klucze (lub data=None) => pole czyszczone / wartość domyślna.
+        """
+        data = data or {}
+        with blocked_signals(*self.bindings.values()):
+            for key, widget in self.bindings.items():
+                value = data.get(key)
+                text = "" if value is None else str(value)
+                if isinstance(widget, QComboBox):
+                    self._set_combo_text(key, widget, text)
+                elif isinstance(widget, QLineEdit):
+                    widget.setText(text)
+
+    def clear(self) -> None:
+        """Czyści wszystkie pola (QComboBox => wartość domyślna)."""
+        self.populate(None)
+
+    def collect(self) -> Dict[str, str]:
+        """Zwraca słownik {klucz: tekst} z aktualnych wartości pól (po strip())."""
+        result: Dict[str, str] = {}
+        for key, widget in self.bindings.items():
+            if isinstance(widget, QComboBox):
+                result[key] = widget.currentText().strip()
+            elif isinstance(widget, QLineEdit):
+                result[key] = widget.text().strip()
+        return result
+
+    def _set_combo_text(self, key: str, combo: QComboBox, text: str) -> None:
+        idx = combo.findText(text) if text else -1
+        if idx < 0:
+            idx = combo.findText(self.combo_defaults.get(key, ""))
+        if idx < 0:
+            idx = 0 if combo.count() > 0 else -1
+        combo.setCurrentIndex(idx)
@@ -16,6 +16,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap
 
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
 
 
@@ -30,7 +31,7 @@ class LoginScreen(BackgroundScreen):
     ):
         super().__init__(
             parent=parent,
-            bg_image_path=r"c:\serownia\images\cheese.jpg",  # Tło
+            bg_image_path=asset_path("cheese.jpg"),  # Tło
             panel_width=800,  # szerokość panelu
         )
 
@@ -55,9 +56,7 @@ class LoginScreen(BackgroundScreen):
 
         # Ikonka człowieczka:
         self.user_icon_label = QLabel()
-        user_icon_path = (
-            r"c:\serownia\images\user_icon.png"  # <-- Dostaw faktyczną ścieżkę do pliku
-        )
+        user_icon_path = asset_path("user_icon.png")
         if os.path.exists(user_icon_path):
             self.user_icon_label.setPixmap(
                 QPixmap(user_icon_path).scaled(
@@ -88,7 +87,7 @@ class LoginScreen(BackgroundScreen):
 
         # Ikonka klucza:
         self.key_icon_label = QLabel()
-        key_icon_path = r"c:\serownia\images\key_icon.png"
+        key_icon_path = asset_path("key_icon.png")
         if os.path.exists(key_icon_path):
             self.key_icon_label.setPixmap(
                 QPixmap(key_icon_path).scaled(
@@ -1,14 +1,29 @@
 # c:\serownia\ui\magazyn_screen.py
 
+import logging
 from typing import Optional
-from PyQt5.QtWidgets import QGridLayout, QPushButton
+from PyQt5.QtGui import QShowEvent
+from PyQt5.QtWidgets import (
+    QGridLayout,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+)
+from logic.forecast import ForecastCache
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
+from ui.consumption_forecast_dialog import ConsumptionForecastDialog
+from ui.production_plan_dialog import ProductionPlanDialog
+
+logger = logging.getLogger(__name__)
 
 
 class MagazynScreen(BackgroundScreen):
     """
     Ekran 'Magazyn', zawierający przyciski do nawigacji między różnymi
-    widokami związanymi z magazynowaniem (Dodatki, Opakowania, Rejestry).
+    widokami związanymi z magazynowaniem (Dodatki, Opakowania, Rejestry)
+    oraz tabelę bieżących stanów (przyjęte / zużyte / stan).
     """
 
     def __init__(self, parent: Optional[BackgroundScreen] = None) -> None:
@@ -18,17 +33,20 @@ class MagazynScreen(BackgroundScreen):
           - Opakowania
           - Rejestr Dodatków
           - Rejestr Opakowań
+          - Plan produkcji (zapotrzebowanie vs stany)
+          - Prognoza zużycia (dni do wyczerpania dodatków)
           - Powrót (do ekranu startowego)
 
         :param parent: Najczęściej MainWindow (zawiera show_screen i atrybuty).
         """
         super().__init__(
             parent=parent,
-            bg_image_path=r"c:\serownia\images\cheese.jpg",
+            bg_image_path=asset_path("cheese.jpg"),
             panel_width=800,
         )
 
         self.setWindowTitle("Magazyn – Ekran główny")
+        self._forecast_cache: Optional[ForecastCache] = None
 
         # Tworzymy layout siatki
         grid_layout = QGridLayout()
@@ -39,6 +57,8 @@ class MagazynScreen(BackgroundScreen):
             {"name": "Opakowania", "action": self.show_packaging},
             {"name": "Rejestr Dodatków", "action": self.show_additives_register},
             {"name": "Rejestr Opakowań", "action": self.show_packaging_register},
+            {"name": "Plan produkcji", "action": self.show_production_plan},
+            {"name": "Prognoza zużycia", "action": self.show_consumption_forecast},
         ]
 
         for i, btn_info in enumerate(buttons):
@@ -74,6 +94,41 @@ class MagazynScreen(BackgroundScreen):
         # Zamiast self.setLayout(grid_layout), dodajemy do form_layout
         self.form_layout.addLayout(grid_layout)
 
+        # Bieżące stany (additive_stock / packaging_stock) – odświeżane przy pokazaniu
+        self.form_layout.addWidget(QLabel("Stany magazynowe (g / ml / szt.):"))
+        self.stock_table = QTableWidget(0, 5)
+        self.stock_table.setHorizontalHeaderLabels(
+            ["Rodzaj", "Nazwa", "Przyjęto", "Zużyto", "Stan"]
+        )
+        self.stock_table.horizontalHeader().setStretchLastSection(True)
+        self.stock_table.verticalHeader().setVisible(False)
+        self.stock_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.stock_table.setMinimumHeight(250)
+        self.form_layout.addWidget(self.stock_table)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        self.load_stock_levels()
+
+    def load_stock_levels(self) -> None:
+        """Wypełnia tabelę stanów jednym zapytaniem (DBManager.get_stock_levels)."""
+        db_manager = getattr(self.window(), "db_manager", None)
+        if db_manager is None:
+            return
+        levels = db_manager.get_stock_levels()
+        self.stock_table.setRowCount(len(levels))
+        for row, item in enumerate(levels):
+            values = (
+                item["kind"],
+                item["name"],
+                f"{item['received']:g}",
+                f"{item['consumed']:g}",
+                f"{item['balance']:g}",
+            )
+            for col, text in enumerate(values):
+                self.stock_table.setItem(row, col, QTableWidgetItem(text))
+        logger.debug("Magazyn: wczytano %d stanów", len(levels))
+
     # -----------
     # Metody akcji
     # -----------
@@ -82,7 +137,7 @@ class MagazynScreen(BackgroundScreen):
         """
         Przejście do widoku 'Lista Dodatków' (self.window().additives_list_screen).
         """
-        print("Wywołano show_additives()")
+        logger.debug("Wywołano show_additives()")
         mw = self.window()
         if hasattr(mw, "show_screen") and hasattr(mw, "additives_list_screen"):
             mw.show_screen(mw.additives_list_screen)
@@ -91,7 +146,7 @@ class MagazynScreen(BackgroundScreen):
         """
         Przejście do widoku 'Lista Opakowań' (self.window().packaging_list_screen).
         """
-        print("Wywołano show_packaging()")
+        logger.debug("Wywołano show_packaging()")
         mw = self.window()
         if hasattr(mw, "show_screen") and hasattr(mw, "packaging_list_screen"):
             mw.show_screen(mw.packaging_list_screen)
@@ -100,7 +155,7 @@ class MagazynScreen(BackgroundScreen):
         """
         Przejście do widoku 'Rejestr Dodatków' (self.window().additives_register_screen).
         """
-        print("Wywołano show_additives_register()")
+        logger.debug("Wywołano show_additives_register()")
         mw = self.window()
         if hasattr(mw, "show_screen") and hasattr(mw, "additives_register_screen"):
             mw.show_screen(mw.additives_register_screen)
@@ -109,16 +164,33 @@ class MagazynScreen(BackgroundScreen):
         """
         Przejście do widoku 'Rejestr Opakowań' (self.window().packaging_register_screen).
         """
-        print("Wywołano show_packaging_register()")
+        logger.debug("Wywołano show_packaging_register()")
         mw = self.window()
         if hasattr(mw, "show_screen") and hasattr(mw, "packaging_register_screen"):
             mw.show_screen(mw.packaging_register_screen)
 
+    def show_production_plan(self) -> None:
+        """Dialog planu produkcji; po zamknięciu odświeża stany."""
+        db_manager = getattr(self.window(), "db_manager", None)
+        if db_manager is None:
+            return
+        ProductionPlanDialog(self, db_manager).exec_()
+        self.load_stock_levels()
+
+    def show_consumption_forecast(self) -> None:
+        """Prognoza zużycia; wynik trzymany w ForecastCache między otwarciami."""
+        db_manager = getattr(self.window(), "db_manager", None)
+        if db_manager is None:
+            return
+        if self._forecast_cache is None:
+            self._forecast_cache = ForecastCache(db_manager)
+        ConsumptionForecastDialog(self, self._forecast_cache).exec_()
+
     def go_back_to_start(self) -> None:
         """
         Przycisk 'Powrót' – przejście do ekranu startowego.
         """
-        print("Powrót do ekranu startowego.")
+        logger.debug("Powrót do ekranu startowego.")
         mw = self.window()
         if hasattr(mw, "show_screen") and hasattr(mw, "start_screen"):
             mw.show_screen(mw.start_screen)
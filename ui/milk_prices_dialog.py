@@ -0,0 +1,125 @@
+# c:\serownia\ui\milk_prices_dialog.py
+
+import logging
+from typing import Any, Optional
+
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+from PyQt5.QtCore import Qt
+
+from database.db_manager import DBManager
+from logic.protocol_types import MILK_TYPES, parse_number
+
+logger = logging.getLogger(__name__)
+
+ALL_MILK_TYPES = "(każde)"
+
+
+class MilkPricesDialog(QDialog):
+    """
+    Cennik mleka (tabela milk_prices): cena zł / L obowiązująca od dnia,
+    dla rodzaju mleka albo ogólna. Dodanie / usunięcie ceny przelicza koszty
+    serii od daty jej obowiązywania (DBManager.add_milk_price).
+    """
+
+    def __init__(
+        self, parent: Optional[Any] = None, db_manager: Optional[DBManager] = None
+    ) -> None:
+        super().__init__(parent)
+        self.db_manager = db_manager
+
+        self.setWindowTitle("Ceny mleka")
+        self.setGeometry(300, 300, 480, 400)
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Od dnia", "Rodzaj mleka", "zł / L"])
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        form = QHBoxLayout()
+        self.date_input = QLineEdit()
+        self.date_input.setPlaceholderText("YYYY-MM-DD")
+        self.milk_type_combo = QComboBox()
+        self.milk_type_combo.addItem(ALL_MILK_TYPES, "")
+        for milk_type in MILK_TYPES:
+            self.milk_type_combo.addItem(milk_type, milk_type)
+        self.price_input = QLineEdit()
+        self.price_input.setPlaceholderText("np. 2,35")
+        form.addWidget(QLabel("Od:"))
+        form.addWidget(self.date_input)
+        form.addWidget(self.milk_type_combo)
+        form.addWidget(QLabel("zł / L:"))
+        form.addWidget(self.price_input)
+        layout.addLayout(form)
+
+        buttons = QHBoxLayout()
+        add_button = QPushButton("Dodaj cenę")
+        add_button.clicked.connect(self.add_price)
+        delete_button = QPushButton("Usuń zaznaczoną")
+        delete_button.clicked.connect(self.delete_selected)
+        close_button = QPushButton("Zamknij")
+        close_button.clicked.connect(self.accept)
+        buttons.addWidget(add_button)
+        buttons.addWidget(delete_button)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+        self.load_data()
+
+    def load_data(self) -> None:
+        if not self.db_manager:
+            return
+        prices = self.db_manager.get_milk_prices()
+        self.table.setRowCount(len(prices))
+        for row, price in enumerate(prices):
+            date_item = QTableWidgetItem(price["valid_from"])
+            date_item.setData(Qt.UserRole, price["id"])
+            self.table.setItem(row, 0, date_item)
+            self.table.setItem(
+                row, 1, QTableWidgetItem(price["milk_type"] or ALL_MILK_TYPES)
+            )
+            self.table.setItem(row, 2, QTableWidgetItem(f"{price['price_l']:.2f}"))
+        self.table.resizeColumnsToContents()
+
+    def add_price(self) -> None:
+        if not self.db_manager:
+            return
+        valid_from = self.date_input.text().strip()
+        price_l = parse_number(self.price_input.text())
+        if not valid_from or price_l is None or price_l < 0:
+            QMessageBox.warning(self, "Błąd", "Podaj datę i cenę za litr.")
+            return
+        try:
+            self.db_manager.add_milk_price(
+                valid_from, price_l, self.milk_type_combo.currentData()
+            )
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się dodać ceny: {e}")
+            return
+        self.price_input.clear()
+        self.load_data()
+
+    def delete_selected(self) -> None:
+        row = self.table.currentRow()
+        if not self.db_manager or row < 0:
+            return
+        price_id = self.table.item(row, 0).data(Qt.UserRole)
+        try:
+            self.db_manager.delete_milk_price(price_id)
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się usunąć ceny: {e}")
+            return
+        self.load_data()
@@ -1,13 +1,17 @@
 # c:\serownia\ui\new_production_screen.py
 
+import logging
 from typing import Optional, Any
 
 from PyQt5.QtGui import QShowEvent
 from PyQt5.QtWidgets import QGridLayout, QPushButton, QMessageBox
 from PyQt5.QtCore import Qt
 
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
 
+logger = logging.getLogger(__name__)
+
 
 class NewProductionScreen(BackgroundScreen):
     """
@@ -18,7 +22,7 @@ class NewProductionScreen(BackgroundScreen):
     def __init__(self, parent: Optional[Any] = None) -> None:
         super().__init__(
             parent=parent,
-            bg_image_path=r"c:\serownia\images\cheese.jpg",
+            bg_image_path=asset_path("cheese.jpg"),
             panel_width=800,  # Możesz dostosować szerokość panelu
         )
 
@@ -114,7 +118,7 @@ class NewProductionScreen(BackgroundScreen):
         Obsługa kliknięcia kategorii. Sprawdza w MainWindow słownik
         protocol_screens_by_name i przełącza na odpowiedni protokół.
         """
-        print(f"[NewProductionScreen] Kliknięto kategorię='{category_name}'.")
+        logger.debug("Kliknięto kategorię='%s'.", category_name)
 
         mw = self.window()
         if not mw or not hasattr(mw, "protocol_screens_by_name"):
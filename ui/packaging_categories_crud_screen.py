@@ -1,5 +1,6 @@
 # c:\serownia\ui\packaging_categories_crud_screen.py
 
+import logging
 from typing import Optional, Any, List
 
 from PyQt5.QtWidgets import QLineEdit, QTableWidgetItem, QMessageBox, QInputDialog
@@ -7,6 +8,8 @@ from PyQt5.QtCore import Qt
 
 from ui.base_crud_list_screen import BaseCrudListScreen
 
+logger = logging.getLogger(__name__)
+
 
 class PackagingCategoriesCrudScreen(BaseCrudListScreen):
     """
@@ -43,8 +46,8 @@ class PackagingCategoriesCrudScreen(BaseCrudListScreen):
 
         columns = [0=ID, 1=Nazwa, 2=Edytuj/Zapisz, 3=Usuń].
         """
-        print(
-            f"[DEBUG] PackagingCategoriesCrudScreen.load_data(filter_text='{filter_text}')"
+        logger.debug(
+            "PackagingCategoriesCrudScreen.load_data(filter_text='%s')", filter_text
         )
 
         if not self.db_manager:
@@ -62,8 +65,8 @@ class PackagingCategoriesCrudScreen(BaseCrudListScreen):
         if ft_lower:
             categories = [cat for cat in categories if ft_lower in cat["name"].lower()]
 
-        print(
-            f"[DEBUG] Znaleziono {len(categories)} kategorii (po filtrze='{filter_text}')"
+        logger.debug(
+            "Znaleziono %s kategorii (po filtrze='%s')", len(categories), filter_text
         )
 
         # 3. Wypełniamy tabelę
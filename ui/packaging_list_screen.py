@@ -1,5 +1,6 @@
 # c:\serownia\ui\packaging_list_screen.py
 
+import logging
 from typing import Optional, Any, List
 
 from PyQt5.QtWidgets import QLineEdit, QDialog, QMessageBox, QComboBox, QTableWidgetItem
@@ -10,6 +11,8 @@ from .add_packaging_dialog import (
     AddPackagingDialog,
 )  # <-- Upewnij się, że ścieżka jest poprawna
 
+logger = logging.getLogger(__name__)
+
 
 class PackagingListScreen(BaseCrudListScreen):
     """
@@ -52,7 +55,7 @@ class PackagingListScreen(BaseCrudListScreen):
         Jeśli 'filter_text' nie jest pusty, filtrujemy opakowania po 'name'
         (case-insensitive).
         """
-        print(f"[DEBUG] PackagingListScreen.load_data(filter_text='{filter_text}')")
+        logger.debug("PackagingListScreen.load_data(filter_text='%s')", filter_text)
 
         if not self.db_manager:
             QMessageBox.critical(
@@ -78,8 +81,10 @@ class PackagingListScreen(BaseCrudListScreen):
                 p for p in packaging_list if ft_lower in (p["name"] or "").lower()
             ]
 
-        print(
-            f"[DEBUG] Znaleziono {len(packaging_list)} opakowań (po filtrze='{filter_text}')."
+        logger.debug(
+            "Znaleziono %s opakowań (po filtrze='%s').",
+            len(packaging_list),
+            filter_text,
         )
 
         # 2. Wypełniamy tabelę
@@ -1,5 +1,6 @@
 # c:\serownia\ui\packaging_register_screen.py
 
+import logging
 from typing import Optional, List, Dict, Any
 
 from PyQt5.QtWidgets import (
@@ -20,13 +21,17 @@ from database.db_manager import (
     DBManager,
 )  # Dostosuj import, jeśli pliki są inaczej zorganizowane
 
+logger = logging.getLogger(__name__)
+
 
 class AddPackagingRegisterDialog(QDialog):
     """
     Dialog do dodania nowego wpisu w rejestrze opakowań:
       - Data przyjęcia (YYYY-MM-DD),
       - Ilość,
-      - Opakowanie (z QComboBox).
+      - Opakowanie (z QComboBox),
+      - Cena dostawy (opcjonalnie – koszty serii),
+      - Data ważności i numer partii dostawcy (opcjonalnie – alerty terminów).
     """
 
     def __init__(
@@ -36,7 +41,7 @@ class AddPackagingRegisterDialog(QDialog):
         self.db_manager = db_manager
 
         self.setWindowTitle("Dodaj wpis w Rejestrze Opakowań")
-        self.setGeometry(300, 300, 400, 200)
+        self.setGeometry(300, 300, 400, 280)
 
         layout = QVBoxLayout(self)
 
@@ -60,6 +65,23 @@ class AddPackagingRegisterDialog(QDialog):
         # Wypełnienie comboBox
         self.fill_packaging_combo()
 
+        # Pole: Cena dostawy
+        layout.addWidget(QLabel("Cena (opcjonalnie, np. 0,85 zł/szt):"))
+        self.price_input = QLineEdit()
+        self.price_input.setPlaceholderText("0,85 zł/szt")
+        layout.addWidget(self.price_input)
+
+        # Pole: Data ważności
+        layout.addWidget(QLabel("Data ważności (YYYY-MM-DD, opcjonalnie):"))
+        self.expiry_input = QLineEdit()
+        self.expiry_input.setPlaceholderText("YYYY-MM-DD")
+        layout.addWidget(self.expiry_input)
+
+        # Pole: Numer partii dostawcy
+        layout.addWidget(QLabel("Nr partii (opcjonalnie):"))
+        self.lot_input = QLineEdit()
+        layout.addWidget(self.lot_input)
+
         # Przycisk Zapisz
         save_button = QPushButton("Zapisz")
         save_button.clicked.connect(self.save_data)
@@ -94,6 +116,9 @@ class AddPackagingRegisterDialog(QDialog):
         packaging_id = self.packaging_combo.itemData(
             self.packaging_combo.currentIndex()
         )
+        price = self.price_input.text().strip()
+        expiry_date = self.expiry_input.text().strip()
+        lot_no = self.lot_input.text().strip()
 
         if not date_str or not quantity_str:
             QMessageBox.warning(self, "Błąd", "Data i ilość są wymagane.")
@@ -106,7 +131,14 @@ class AddPackagingRegisterDialog(QDialog):
             return
 
         try:
-            self.db_manager.add_packaging_register(date_str, quantity_str, packaging_id)
+            self.db_manager.add_packaging_register(
+                date_str,
+                quantity_str,
+                packaging_id,
+                price or None,
+                expiry_date or None,
+                lot_no or None,
+            )
             QMessageBox.information(
                 self,
                 "Sukces",
@@ -122,11 +154,17 @@ class AddPackagingRegisterDialog(QDialog):
 class PackagingRegisterScreen(BaseCrudListScreen):
     """
     Ekran "Rejestr Opakowań" – dziedziczy po BaseCrudListScreen.
-    Wyświetla kolumny: [ID, Data, Ilość, Nazwa opakowania, Edytuj/Zapisz, Usuń].
+    Wyświetla kolumny: [ID, Data, Ilość, Nazwa opakowania, Cena, Data ważności,
+    Nr partii, Edytuj/Zapisz, Usuń].
     Obsługuje argument filter_text w load_data(filter_text=...),
     aby klasa bazowa mogła wywoływać self.load_data(filter_text="...") podczas filtracji.
     """
 
+    # Przycisk 'Eksport XLSX' (logic/xlsx_export.py)
+    EXPORT_SETS = ("packaging_register",)
+    # Przycisk 'Importuj' (logic/bulk_import.py)
+    IMPORT_SPEC = "packaging_register"
+
     def __init__(
         self, parent: Optional[QWidget] = None, db_manager: Optional[DBManager] = None
     ) -> None:
@@ -134,7 +172,17 @@ class PackagingRegisterScreen(BaseCrudListScreen):
         super().__init__(
             parent=parent,
             title="Rejestr Opakowań",
-            columns=["ID", "Data", "Ilość", "Opakowanie", "Edytuj/Zapisz", "Usuń"],
+            columns=[
+                "ID",
+                "Data",
+                "Ilość",
+                "Opakowanie",
+                "Cena",
+                "Data ważności",
+                "Nr partii",
+                "Edytuj/Zapisz",
+                "Usuń",
+            ],
         )
 
     def load_data(self, filter_text: str = "") -> None:
@@ -148,10 +196,13 @@ class PackagingRegisterScreen(BaseCrudListScreen):
          - 1: Data
          - 2: Ilość
          - 3: Nazwa opakowania (packaging_name)
-         - 4: Edytuj/Zapisz
-         - 5: Usuń
+         - 4: Cena dostawy
+         - 5: Data ważności
+         - 6: Nr partii
+         - 7: Edytuj/Zapisz
+         - 8: Usuń
         """
-        print(f"[DEBUG] PackagingRegisterScreen.load_data(filter_text='{filter_text}')")
+        logger.debug("PackagingRegisterScreen.load_data(filter_text='%s')", filter_text)
 
         if not self.db_manager:
             QMessageBox.critical(
@@ -172,8 +223,10 @@ class PackagingRegisterScreen(BaseCrudListScreen):
                 r for r in records if ft_lower in (r["packaging_name"] or "").lower()
             ]
 
-        print(
-            f"[DEBUG] Znaleziono {len(records)} rekordów w rejestrze opakowań (po filtrze='{filter_text}')"
+        logger.debug(
+            "Znaleziono %s rekordów w rejestrze opakowań (po filtrze='%s')",
+            len(records),
+            filter_text,
         )
 
         for row_index, rec in enumerate(records):
@@ -199,13 +252,28 @@ class PackagingRegisterScreen(BaseCrudListScreen):
             pack_edit.setEnabled(False)
             self.table.setCellWidget(row_index, 3, pack_edit)
 
-            # Kol 4: Edytuj/Zapisz (przycisk)
+            # Kol 4: Cena dostawy
+            price_edit = QLineEdit(str(rec.get("price") or ""))
+            price_edit.setEnabled(False)
+            self.table.setCellWidget(row_index, 4, price_edit)
+
+            # Kol 5: Data ważności
+            expiry_edit = QLineEdit(str(rec.get("expiry_date") or ""))
+            expiry_edit.setEnabled(False)
+            self.table.setCellWidget(row_index, 5, expiry_edit)
+
+            # Kol 6: Numer partii dostawcy
+            lot_edit = QLineEdit(str(rec.get("lot_no") or ""))
+            lot_edit.setEnabled(False)
+            self.table.setCellWidget(row_index, 6, lot_edit)
+
+            # Kol 7: Edytuj/Zapisz (przycisk)
             edit_button = self.create_edit_button(row_index)
-            self.table.setCellWidget(row_index, 4, edit_button)
+            self.table.setCellWidget(row_index, 7, edit_button)
 
-            # Kol 5: Usuń (przycisk)
+            # Kol 8: Usuń (przycisk)
             delete_button = self.create_delete_button(row_index)
-            self.table.setCellWidget(row_index, 5, delete_button)
+            self.table.setCellWidget(row_index, 8, delete_button)
 
         self.table.resizeColumnsToContents()
 
@@ -285,8 +353,11 @@ class PackagingRegisterScreen(BaseCrudListScreen):
         # self.db_manager.update_packaging_register(register_id, date_str, quantity_str, packaging_id)
         # self.load_data()
 
-        print(
-            f"[DEBUG] update_item_in_db ID={register_id}, date={date_str}, qty={quantity_str}, packaging=??? (dostosuj)"
+        logger.debug(
+            "update_item_in_db ID=%s, date=%s, qty=%s, packaging=??? (dostosuj)",
+            register_id,
+            date_str,
+            quantity_str,
         )
 
     def delete_item_in_db(self, item_id: int) -> None:
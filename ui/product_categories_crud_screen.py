@@ -1,5 +1,6 @@
 # c:\serownia\ui\product_categories_crud_screen.py
 
+import logging
 from typing import Optional, Any, List
 import sqlite3  # Możliwe, że używasz do łapania IntegrityError
 
@@ -8,6 +9,8 @@ from PyQt5.QtCore import Qt
 
 from ui.base_crud_list_screen import BaseCrudListScreen
 
+logger = logging.getLogger(__name__)
+
 # Jeśli plik jest inaczej zorganizowany, dostosuj ścieżkę powyżej.
 
 
@@ -42,8 +45,8 @@ class ProductCategoriesCrudScreen(BaseCrudListScreen):
 
         columns = [0=ID, 1=Nazwa, 2=Edytuj/Zapisz, 3=Usuń]
         """
-        print(
-            f"[DEBUG] ProductCategoriesCrudScreen.load_data(filter_text='{filter_text}')"
+        logger.debug(
+            "ProductCategoriesCrudScreen.load_data(filter_text='%s')", filter_text
         )
 
         if not self.db_manager:
@@ -62,8 +65,8 @@ class ProductCategoriesCrudScreen(BaseCrudListScreen):
         if ft_lower:
             categories = [cat for cat in categories if ft_lower in cat["name"].lower()]
 
-        print(
-            f"[DEBUG] Znaleziono {len(categories)} kategorii (po filtrze='{filter_text}')"
+        logger.debug(
+            "Znaleziono %s kategorii (po filtrze='%s')", len(categories), filter_text
         )
 
         # 3. Wstawiamy do tabeli
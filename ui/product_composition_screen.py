@@ -24,6 +24,9 @@ class ProductCompositionScreen(BaseCrudListScreen):
       4) Usuń.
     """
 
+    # Przycisk 'Importuj' (logic/bulk_import.py)
+    IMPORT_SPEC = "recipes"
+
     def __init__(
         self, parent: Optional[Any] = None, db_manager: Optional[DBManager] = None
     ) -> None:
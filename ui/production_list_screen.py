@@ -1,3 +1,6 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Any, List, Dict
 from PyQt5.QtWidgets import QLineEdit, QTableWidgetItem, QMessageBox, QPushButton
 from PyQt5.QtCore import Qt, QEvent
@@ -5,6 +8,8 @@ from PyQt5.QtCore import Qt, QEvent
 from ui.base_crud_list_screen import BaseCrudListScreen
 from database.db_manager import DBManager
 
+logger = logging.getLogger(__name__)
+
 
 class ProductionListScreen(BaseCrudListScreen):
     """
@@ -14,14 +19,32 @@ class ProductionListScreen(BaseCrudListScreen):
       - Przycisk „Otwórz/Edytuj” do przejścia w protokół (z możliwością edycji),
       - Przycisk „Usuń” do kasowania protokołu,
       - Brak przycisków „Importuj” i „Nowy” (ukryte).
+
+    Otwarcie protokołu to jedno zapytanie (db_manager.get_protocol_bundle).
+    Pakiety dla wierszy wokół zaznaczenia są pobierane w tle (prefetch),
+    więc zwykle otwarcie nie dotyka bazy wcale.
     """
 
+    # Przycisk 'Eksport XLSX' (logic/xlsx_export.py)
+    EXPORT_SETS = ("production_records", "protocols")
+
+    # Ile wierszy powyżej/poniżej zaznaczenia pobieramy w tle
+    PREFETCH_RADIUS = 3
+
     def __init__(
         self, parent: Optional[Any] = None, db_manager: Optional[DBManager] = None
     ) -> None:
-        print(">>> ProductionListScreen: constructor START")
+        logger.debug("ProductionListScreen: constructor START")
         self.db_manager = db_manager
 
+        # Cache pakietów protokołów {record_id: bundle} + wątek do prefetchu
+        self._bundle_cache: Dict[int, Dict[str, Any]] = {}
+        self._bundle_lock = threading.Lock()
+        self._cache_generation = 0
+        self._prefetch_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="protocol-prefetch"
+        )
+
         super().__init__(
             parent=parent,
             title="Baza Produkcji (lista protokołów)",
@@ -35,19 +58,20 @@ class ProductionListScreen(BaseCrudListScreen):
             ],
         )
         self.hide_import_and_new_buttons()
-        print(">>> ProductionListScreen: constructor END")
+        self.table.currentCellChanged.connect(self.on_current_cell_changed)
+        logger.debug("ProductionListScreen: constructor END")
 
     def create_toolbar_buttons(self) -> None:
         """
         Nadpisujemy, aby NIE tworzyć przycisków „Importuj” i „Nowy”.
         """
-        print(
-            ">>> ProductionListScreen: create_toolbar_buttons => brak przycisków Importuj/Nowy."
+        logger.debug(
+            "ProductionListScreen: create_toolbar_buttons => brak przycisków Importuj/Nowy.",
         )
 
     def showEvent(self, event: QEvent) -> None:
         super().showEvent(event)
-        print(">>> ProductionListScreen.showEvent => load_data_with_filter('')")
+        logger.debug("ProductionListScreen.showEvent => load_data_with_filter('')")
         self.load_data_with_filter("")
 
     def apply_filter(self) -> None:
@@ -61,7 +85,7 @@ class ProductionListScreen(BaseCrudListScreen):
         # Pobieramy tekst z self.filter_input
         if hasattr(self, "filter_input") and self.filter_input is not None:
             text = self.filter_input.text().strip()
-            print(f"[DEBUG] ProductionListScreen.apply_filter: filter_text='{text}'")
+            logger.debug("ProductionListScreen.apply_filter: filter_text='%s'", text)
             self.load_data_with_filter(text)
         else:
             self.load_data_with_filter("")
@@ -70,19 +94,22 @@ class ProductionListScreen(BaseCrudListScreen):
         """
         Ładuje protokoły z uwzględnieniem filtra (numer serii).
         """
-        print(">>> ProductionListScreen.load_data_with_filter() START")
+        logger.debug("ProductionListScreen.load_data_with_filter() START")
         if not self.db_manager:
             QMessageBox.warning(
                 self, "Błąd", "Brak db_manager – nie można załadować protokołów."
             )
             return
 
+        self.invalidate_bundle_cache()
         self.table.setRowCount(0)
         ft_lower = filter_text.lower().strip()
-        print(f"    filter_text='{ft_lower}'")
+        logger.debug("filter_text='%s'", ft_lower)
 
         productions = self.get_productions_joined(ft_lower)
-        print(f"    Znaleziono {len(productions)} rekordów w production_records.")
+        logger.debug(
+            "    Znaleziono %s rekordów w production_records.", len(productions)
+        )
 
         for row_index, rec in enumerate(productions):
             self.table.insertRow(row_index)
@@ -116,7 +143,72 @@ class ProductionListScreen(BaseCrudListScreen):
             self.table.setCellWidget(row_index, 5, delete_btn)
 
         self.table.resizeColumnsToContents()
-        print(">>> ProductionListScreen.load_data_with_filter() END")
+        self.prefetch_around(0)
+        logger.debug("ProductionListScreen.load_data_with_filter() END")
+
+    # ----------------------------------------------------------------
+    # Prefetch pakietów protokołów (w tle)
+    # ----------------------------------------------------------------
+    def invalidate_bundle_cache(self, record_id: Optional[int] = None) -> None:
+        """
+        Usuwa z cache jeden pakiet (record_id) albo wszystkie (None).
+        Pełne unieważnienie zmienia "generację", więc wyniki prefetchu
+        zleconego wcześniej nie trafią już do cache.
+        """
+        with self._bundle_lock:
+            if record_id is None:
+                self._bundle_cache.clear()
+                self._cache_generation += 1
+            else:
+                self._bundle_cache.pop(record_id, None)
+
+    def on_current_cell_changed(
+        self, row: int, col: int, prev_row: int, prev_col: int
+    ) -> None:
+        if row >= 0:
+            self.prefetch_around(row)
+
+    def prefetch_around(self, row: int) -> None:
+        """
+        Zleca w tle pobranie pakietów dla wierszy [row - R, row + R],
+        których jeszcze nie ma w cache (jedno zapytanie na całe okno).
+        """
+        if not self.db_manager:
+            return
+        first = max(0, row - self.PREFETCH_RADIUS)
+        last = min(self.table.rowCount() - 1, row + self.PREFETCH_RADIUS)
+
+        wanted: List[int] = []
+        with self._bundle_lock:
+            for r in range(first, last + 1):
+                item = self.table.item(r, 0)
+                if item is None:
+                    continue
+                record_id = int(item.text())
+                if record_id not in self._bundle_cache:
+                    wanted.append(record_id)
+            generation = self._cache_generation
+        if wanted:
+            self._prefetch_executor.submit(self._prefetch_bundles, wanted, generation)
+
+    def shutdown(self) -> None:
+        """Zamknięcie aplikacji: porzuca prefetch w kolejce (MainWindow.closeEvent)."""
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prefetch_bundles(self, record_ids: List[int], generation: int) -> None:
+        """Wykonywane w wątku tła – nie dotyka widgetów, tylko cache."""
+        bundles = self.db_manager.get_protocol_bundles(record_ids)
+        with self._bundle_lock:
+            if generation == self._cache_generation:
+                self._bundle_cache.update(bundles)
+
+    def get_protocol_bundle(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Pakiet z cache (prefetch) albo – jeśli go brak – jedno zapytanie do bazy."""
+        with self._bundle_lock:
+            bundle = self._bundle_cache.pop(record_id, None)
+        if bundle is None and self.db_manager:
+            bundle = self.db_manager.get_protocol_bundle(record_id)
+        return bundle
 
     def get_productions_joined(self, filter_text: str) -> List[Dict[str, Any]]:
         """
@@ -179,16 +271,16 @@ class ProductionListScreen(BaseCrudListScreen):
         sięgamy do parent's protocol_screens_by_name[cat_name],
         tak jak w new_production_screen, zamiast if-else.
         """
-        print(f">>> open_edit_protocol(row_index={row_index})")
+        logger.debug("open_edit_protocol(row_index=%s)", row_index)
 
         id_item = self.table.item(row_index, 0)
         if not id_item:
             return
         record_id = int(id_item.text())
-        print(f"    record_id={record_id}")
+        logger.debug("record_id=%s", record_id)
 
-        # Pobierz production_record + product_id
-        record_data = self.get_production_record_by_id(record_id)
+        # Nagłówek + produkt + kategoria + szczegóły + dodatki (cache albo 1 zapytanie)
+        record_data = self.get_protocol_bundle(record_id)
         if not record_data:
             QMessageBox.warning(
                 self, "Błąd", f"Nie znaleziono protokołu o ID={record_id}."
@@ -202,8 +294,7 @@ class ProductionListScreen(BaseCrudListScreen):
             )
             return
 
-        product_info = self.db_manager.get_product_by_id(product_id)
-        if not product_info:
+        if not record_data.get("product"):
             QMessageBox.warning(
                 self,
                 "Uwaga",
@@ -211,16 +302,10 @@ class ProductionListScreen(BaseCrudListScreen):
             )
             return
 
-        # Ustal nazwę kategorii
-        cat_id = product_info.get("category_id", None)
-        cat_name = ""
-        for c in self.db_manager.get_product_categories():
-            if c["id"] == cat_id:
-                cat_name = c["name"]
-                break
-
+        # Nazwa kategorii – już dołączona w pakiecie
+        cat_name = record_data.get("category_name") or ""
         cat_name_str = cat_name.strip()
-        print(f"    product_id={product_id}, cat_name='{cat_name_str}'")
+        logger.debug("product_id=%s, cat_name='%s'", product_id, cat_name_str)
 
         # Teraz zamiast if cat_name_lower == "ser": ... => sięgamy do protocol_screens_by_name
         if not hasattr(self.parent, "protocol_screens_by_name"):
@@ -252,45 +337,20 @@ class ProductionListScreen(BaseCrudListScreen):
         protocol_screen.load_from_record(record_data)
         self.parent.show_screen(protocol_screen)
 
-    def get_production_record_by_id(self, record_id: int) -> Optional[dict]:
-        """
-        Pobiera z production_records (i ewent. zwraca dict z id, date, series, product_id).
-        """
-        if not self.db_manager:
-            return None
-        with self.db_manager.create_connection() as conn:
-            cursor = conn.cursor()
-            sql = """
-              SELECT id, date, series, product_id
-              FROM production_records
-              WHERE id = ?
-            """
-            cursor.execute(sql, (record_id,))
-            row = cursor.fetchone()
-            if row:
-                return {
-                    "id": row[0],
-                    "date": row[1],
-                    "series": row[2],
-                    "product_id": row[3],
-                }
-            return None
-
     def add_new_item(self) -> None:
         """
         Nadpisujemy, bo w ProductionListScreen jest ukryty przycisk.
         """
-        print(">>> add_new_item => nieużywane w ProductionListScreen (ukryte).")
+        logger.debug("add_new_item => nieużywane w ProductionListScreen (ukryte).")
 
     def import_items(self) -> None:
-        print(">>> import_items => nieużywane w ProductionListScreen (ukryte).")
+        logger.debug("import_items => nieużywane w ProductionListScreen (ukryte).")
 
     def delete_item_in_db(self, item_id: int) -> None:
         """
-        Usuwanie protokołu (kasuje w production_records i ewentualnie child-tabele).
-        Jeśli w bazie jest ON DELETE CASCADE, wystarczy usunąć z production_records.
+        Usuwanie protokołu (production_records + tabele szczegółów i dodatki).
         """
-        print(f">>> delete_item_in_db item_id={item_id}")
+        logger.debug("delete_item_in_db item_id=%s", item_id)
         if not self.db_manager:
             QMessageBox.warning(self, "Błąd", "Brak db_manager.")
             return
@@ -306,15 +366,10 @@ class ProductionListScreen(BaseCrudListScreen):
             return
 
         try:
-            with self.db_manager.create_connection() as conn:
-                cursor = conn.cursor()
-
-                # usuwamy protokół w production_records
-                sql = "DELETE FROM production_records WHERE id = ?"
-                cursor.execute(sql, (item_id,))
-
-                conn.commit()
+            # Protokół + szczegóły (wszystkie typy) + dodatki – jedna transakcja
+            self.db_manager.delete_production_record(item_id)
 
+            self.invalidate_bundle_cache(item_id)
             QMessageBox.information(
                 self, "Info", f"Protokół (ID={item_id}) został usunięty."
             )
@@ -327,6 +382,6 @@ class ProductionListScreen(BaseCrudListScreen):
         """
         if hasattr(self, "filter_input"):
             self.filter_input.clear()
-        print(">>> ProductionListScreen.clear_filter => load_data_with_filter('')")
+        logger.debug("ProductionListScreen.clear_filter => load_data_with_filter('')")
         # Odtąd bez filtra
         self.load_data_with_filter("")
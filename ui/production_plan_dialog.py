@@ -0,0 +1,171 @@
+# c:\serownia\ui\production_plan_dialog.py
+
+import datetime
+import logging
+from typing import Any, Optional
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from database.db_manager import DBManager
+from logic.planner import PLAN_DAYS, plan_requirements
+from logic.protocol_types import parse_number
+
+logger = logging.getLogger(__name__)
+
+SHORTAGE_COLOR = QColor("#F4CCCC")
+
+
+class ProductionPlanDialog(QDialog):
+    """
+    Plan produkcji na PLAN_DAYS dni od dziś: serie planowane (produkt + litry
+    mleka) i zapotrzebowanie na dodatki / opakowania względem stanów
+    (logic.planner). Braki podświetlone, z dniem, od którego zabraknie.
+    """
+
+    def __init__(
+        self, parent: Optional[Any] = None, db_manager: Optional[DBManager] = None
+    ) -> None:
+        super().__init__(parent)
+        self.db_manager = db_manager
+
+        self.setWindowTitle(f"Plan produkcji ({PLAN_DAYS} dni)")
+        self.setGeometry(250, 200, 760, 620)
+
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("Serie planowane:"))
+        self.plan_table = QTableWidget(0, 4)
+        self.plan_table.setHorizontalHeaderLabels(
+            ["Data", "Produkt", "Mleko (L)", "Uwagi"]
+        )
+        self.plan_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.plan_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.plan_table)
+
+        form = QHBoxLayout()
+        self.date_input = QLineEdit(datetime.date.today().isoformat())
+        self.product_combo = QComboBox()
+        self.milk_input = QLineEdit()
+        self.milk_input.setPlaceholderText("Mleko (L)")
+        self.note_input = QLineEdit()
+        self.note_input.setPlaceholderText("Uwagi")
+        add_button = QPushButton("Dodaj")
+        add_button.clicked.connect(self.add_batch)
+        delete_button = QPushButton("Usuń zaznaczoną")
+        delete_button.clicked.connect(self.delete_selected)
+        for widget in (
+            self.date_input,
+            self.product_combo,
+            self.milk_input,
+            self.note_input,
+            add_button,
+            delete_button,
+        ):
+            form.addWidget(widget)
+        layout.addLayout(form)
+
+        layout.addWidget(QLabel("Zapotrzebowanie (g / ml / szt.):"))
+        self.requirements_table = QTableWidget(0, 6)
+        self.requirements_table.setHorizontalHeaderLabels(
+            ["Rodzaj", "Nazwa", "Potrzeba", "Stan", "Brak", "Brak od"]
+        )
+        self.requirements_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.requirements_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.requirements_table)
+
+        close_button = QPushButton("Zamknij")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        self.fill_products_combo()
+        self.load_data()
+
+    def fill_products_combo(self) -> None:
+        if not self.db_manager:
+            return
+        for product in self.db_manager.get_all_products():
+            self.product_combo.addItem(product["name"], product["id"])
+
+    def load_data(self) -> None:
+        """Plan i zapotrzebowanie – kilka zapytań i jedno mnożenie macierzy."""
+        if not self.db_manager:
+            return
+        batches, requirements = plan_requirements(self.db_manager)
+
+        self.plan_table.setRowCount(len(batches))
+        for row, batch in enumerate(batches):
+            date_item = QTableWidgetItem(batch["date"])
+            date_item.setData(Qt.UserRole, batch["id"])
+            self.plan_table.setItem(row, 0, date_item)
+            self.plan_table.setItem(row, 1, QTableWidgetItem(batch["product_name"]))
+            self.plan_table.setItem(row, 2, QTableWidgetItem(f"{batch['milk_l']:g}"))
+            self.plan_table.setItem(row, 3, QTableWidgetItem(batch["note"]))
+        self.plan_table.resizeColumnsToContents()
+
+        self.requirements_table.setRowCount(len(requirements))
+        for row, req in enumerate(requirements):
+            values = (
+                req.kind,
+                req.name,
+                f"{req.required:g}",
+                f"{req.in_stock:g}",
+                f"{req.shortage:g}" if req.short_from else "",
+                req.short_from or "",
+            )
+            for col, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                if req.short_from:
+                    item.setBackground(SHORTAGE_COLOR)
+                self.requirements_table.setItem(row, col, item)
+        self.requirements_table.resizeColumnsToContents()
+
+    def add_batch(self) -> None:
+        if not self.db_manager:
+            return
+        date_str = self.date_input.text().strip()
+        product_id = self.product_combo.currentData()
+        milk_l = parse_number(self.milk_input.text())
+        try:
+            datetime.date.fromisoformat(date_str)
+        except ValueError:
+            QMessageBox.warning(self, "Błąd", "Data w formacie YYYY-MM-DD.")
+            return
+        if product_id is None or milk_l is None or milk_l <= 0:
+            QMessageBox.warning(self, "Błąd", "Wybierz produkt i podaj litry mleka.")
+            return
+        try:
+            self.db_manager.add_planned_batch(
+                date_str, product_id, milk_l, self.note_input.text().strip()
+            )
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się dodać serii: {e}")
+            return
+        self.milk_input.clear()
+        self.note_input.clear()
+        self.load_data()
+
+    def delete_selected(self) -> None:
+        row = self.plan_table.currentRow()
+        if not self.db_manager or row < 0:
+            return
+        try:
+            self.db_manager.delete_planned_batch(
+                self.plan_table.item(row, 0).data(Qt.UserRole)
+            )
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się usunąć serii: {e}")
+            return
+        self.load_data()
@@ -1,14 +1,18 @@
 # c:\serownia\ui\production_screen.py
 
+import logging
 from PyQt5.QtWidgets import QWidget, QGridLayout, QPushButton
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
 
+logger = logging.getLogger(__name__)
+
 
 class ProductionScreen(BackgroundScreen):
     def __init__(self, parent=None):
         super().__init__(
             parent=parent,
-            bg_image_path=r"c:\serownia\images\cheese.jpg",
+            bg_image_path=asset_path("cheese.jpg"),
             panel_width=800,  # Lub inna szerokość
         )
 
@@ -71,56 +75,56 @@ class ProductionScreen(BackgroundScreen):
 
     def new_production(self):
         """Kliknięcie 'Nowa Produkcja'."""
-        print("Nowa Produkcja - wywołanie funkcji")
+        logger.debug("Nowa Produkcja - wywołanie funkcji")
         main_window = self.window()  # Najpewniej <MainWindow ...>
         if hasattr(main_window, "new_production_screen"):
             main_window.show_screen(main_window.new_production_screen)
         else:
-            print("Brak atrybutu 'new_production_screen' w MainWindow.")
+            logger.warning("Brak atrybutu 'new_production_screen' w MainWindow.")
 
     def production_base(self):
         """Baza Produkcji - np. show_production_list_screen w MainWindow."""
-        print("Baza Produkcji - wywołanie funkcji")
+        logger.debug("Baza Produkcji - wywołanie funkcji")
         main_window = self.window()
         if hasattr(main_window, "show_production_list_screen"):
             main_window.show_production_list_screen()
         else:
-            print("Brak metody 'show_production_list_screen' w MainWindow.")
+            logger.warning("Brak metody 'show_production_list_screen' w MainWindow.")
 
     def products(self):
         """Kliknięcie 'Produkty'."""
-        print("Produkty - wywołanie funkcji")
+        logger.debug("Produkty - wywołanie funkcji")
         mw = self.window()
         if hasattr(mw, "products_list_screen"):
             mw.show_screen(mw.products_list_screen)
         else:
-            print("Brak 'products_list_screen' w MainWindow.")
+            logger.warning("Brak 'products_list_screen' w MainWindow.")
 
     def recipes(self):
         """Kliknięcie 'Receptury'."""
-        print("Receptury - wywołanie funkcji")
+        logger.debug("Receptury - wywołanie funkcji")
         # Jeżeli chcesz przejść do np. mw.recipes_screen, odkomentuj:
         # mw = self.window()
         # if hasattr(mw, "recipes_screen"):
         #     mw.show_screen(mw.recipes_screen)
         # else:
-        #     print("Brak 'recipes_screen' w MainWindow.")
+        #     logger.warning("Brak 'recipes_screen' w MainWindow.")
 
     def packaging(self):
         """Kliknięcie 'Pakowanie'."""
-        print("Pakowanie - wywołanie funkcji")
+        logger.debug("Pakowanie - wywołanie funkcji")
         # Podobnie, do packaging_screen:
         # mw = self.window()
         # if hasattr(mw, "packaging_screen"):
         #     mw.show_screen(mw.packaging_screen)
         # else:
-        #     print("Brak 'packaging_screen' w MainWindow.")
+        #     logger.warning("Brak 'packaging_screen' w MainWindow.")
 
     def go_back_to_start(self):
         """Przycisk 'Powrót' - wróć do ekranu startowego."""
-        print("Powrót do ekranu startowego.")
+        logger.debug("Powrót do ekranu startowego.")
         mw = self.window()
         if hasattr(mw, "start_screen"):
             mw.show_screen(mw.start_screen)
         else:
-            print("Brak atrybutu 'start_screen' w MainWindow.")
+            logger.warning("Brak atrybutu 'start_screen' w MainWindow.")
@@ -1,5 +1,6 @@
 # c:\serownia\ui\products_list_screen.py
 
+import logging
 from typing import Optional, Any, List
 
 from PyQt5.QtWidgets import (
@@ -14,6 +15,8 @@ from PyQt5.QtCore import Qt
 from .base_crud_list_screen import BaseCrudListScreen
 from database.db_manager import DBManager
 
+logger = logging.getLogger(__name__)
+
 
 class ProductsListScreen(BaseCrudListScreen):
     """
@@ -30,6 +33,9 @@ class ProductsListScreen(BaseCrudListScreen):
     aby uniknąć dublowania – zakładamy, że już istnieje w kodzie nadrzędnym.
     """
 
+    # Przycisk 'Importuj' (logic/bulk_import.py)
+    IMPORT_SPEC = "products"
+
     def __init__(
         self, parent: Optional[Any] = None, db_manager: Optional[DBManager] = None
     ) -> None:
@@ -44,7 +50,7 @@ class ProductsListScreen(BaseCrudListScreen):
 
         Nie tworzy pól wyszukiwania, bo korzystamy z paska wyszukiwania w innej części aplikacji.
         """
-        print("[DEBUG] ProductsListScreen __init__ start")
+        logger.debug("ProductsListScreen __init__ start")
         self.db_manager = db_manager
         super().__init__(
             parent=parent,
@@ -58,7 +64,7 @@ class ProductsListScreen(BaseCrudListScreen):
                 "Usuń",
             ],
         )
-        print(f"[DEBUG] ProductsListScreen __init__ done. db_manager={db_manager}")
+        logger.debug("ProductsListScreen __init__ done. db_manager=%s", db_manager)
 
         # Na start ładujemy wszystkie dane (bez filtra).
         self.load_data()
@@ -68,21 +74,21 @@ class ProductsListScreen(BaseCrudListScreen):
         Wypełnia tabelę wierszami z bazy (products).
         Jeśli filter_text nie jest pusty – filtruje listę po nazwie (case-insensitive).
         """
-        print(f"[DEBUG] load_data() wywołane z filter_text='{filter_text}'")
+        logger.debug("load_data() wywołane z filter_text='%s'", filter_text)
 
         if not self.db_manager:
-            print("[DEBUG] Brak db_manager! Nie można załadować produktów.")
+            logger.warning("Brak db_manager! Nie można załadować produktów.")
             QMessageBox.critical(
                 self, "Błąd", "Brak db_manager – nie można załadować produktów."
             )
             return
 
-        print("[DEBUG] Pobieram produkty z bazy...")
+        logger.debug("Pobieram produkty z bazy...")
         self.table.setRowCount(0)
 
         # 1. Pobierz wszystkie produkty z bazy
         products = self.db_manager.get_all_products()
-        print(f"[DEBUG] Pobrano {len(products)} produktów z bazy.")
+        logger.debug("Pobrano %s produktów z bazy.", len(products))
 
         # 2. Filtruj po nazwie, jeśli filter_text podany
         if filter_text:
@@ -90,15 +96,18 @@ class ProductsListScreen(BaseCrudListScreen):
             before_count = len(products)
             products = [p for p in products if ft_lower in p["name"].lower()]
             after_count = len(products)
-            print(
-                f"[DEBUG] Filtr '{filter_text}' – przed filtrem={before_count}, po filtrem={after_count}"
+            logger.debug(
+                "Filtr '%s' – przed filtrem=%s, po filtrem=%s",
+                filter_text,
+                before_count,
+                after_count,
             )
 
         # 3. Pobieramy listę kategorii do QComboBox
-        print("[DEBUG] Pobieram listę kategorii produktu...")
+        logger.debug("Pobieram listę kategorii produktu...")
         product_categories = self.db_manager.get_product_categories()
         cat_dict = {cat["id"]: cat["name"] for cat in product_categories}
-        print(f"[DEBUG] Kategorii: {len(cat_dict)}")
+        logger.debug("Kategorii: %s", len(cat_dict))
 
         # 4. Wypełnij tabelę
         for row_index, product in enumerate(products):
@@ -154,20 +163,16 @@ class ProductsListScreen(BaseCrudListScreen):
             delete_button = self.create_delete_button(row_index)
             self.table.setCellWidget(row_index, 5, delete_button)
 
-            print(
-                f"[DEBUG] Wstawiono produkt ID={prod_id}, name='{name_str}' do wiersza {row_index}."
-            )
-
-        print(f"[DEBUG] Wstawiono w tabeli {len(products)} wierszy.")
+        logger.debug("Wstawiono w tabeli %s wierszy.", len(products))
         self.table.resizeColumnsToContents()
 
     # --------------- Metody CRUD ---------------
 
     def add_new_item(self) -> None:
         """Obsługa przycisku 'Nowy' (BaseCrudListScreen)."""
-        print("[DEBUG] add_new_item() – dodajemy nowy produkt.")
+        logger.debug("add_new_item() – dodajemy nowy produkt.")
         if not self.db_manager:
-            print("[DEBUG] Brak db_manager w add_new_item().")
+            logger.warning("Brak db_manager w add_new_item().")
             QMessageBox.critical(self, "Błąd", "Brak db_manager.")
             return
 
@@ -177,8 +182,10 @@ class ProductsListScreen(BaseCrudListScreen):
         if ok and name.strip():
             category_id = 1  # tymczasowo
             try:
-                print(
-                    f"[DEBUG] add_new_item(): Dodaję produkt '{name.strip()}', cat_id={category_id}"
+                logger.debug(
+                    "add_new_item(): Dodaję produkt '%s', cat_id=%s",
+                    name.strip(),
+                    category_id,
                 )
                 self.db_manager.add_product(name.strip(), category_id)
                 QMessageBox.information(
@@ -186,28 +193,28 @@ class ProductsListScreen(BaseCrudListScreen):
                 )
                 self.load_data()
             except Exception as e:
-                print(f"[DEBUG] Błąd przy add_product: {e}")
+                logger.error("Błąd przy add_product: %s", e)
                 QMessageBox.warning(self, "Błąd", f"Nie udało się dodać produktu: {e}")
         else:
-            print("[DEBUG] Użytkownik anulował dodawanie nowego produktu.")
+            logger.debug("Użytkownik anulował dodawanie nowego produktu.")
 
     def show_composition(self, row_index: int) -> None:
         """Po kliknięciu przycisku 'Skład' w kolumnie 3."""
-        print(f"[DEBUG] show_composition(row_index={row_index})")
+        logger.debug("show_composition(row_index=%s)", row_index)
         item_id_item = self.table.item(row_index, 0)
         if not item_id_item:
-            print("[DEBUG] Nie znaleziono ID w wierszu.")
+            logger.debug("Nie znaleziono ID w wierszu.")
             return
 
         product_id = int(item_id_item.text())
-        print(f"[DEBUG] show_composition() product_id={product_id}")
+        logger.debug("show_composition() product_id=%s", product_id)
 
         if hasattr(self.parent, "product_composition_screen"):
-            print("[DEBUG] Przełączam widok na product_composition_screen.")
+            logger.debug("Przełączam widok na product_composition_screen.")
             self.parent.product_composition_screen.set_product_id(product_id)
             self.parent.show_screen(self.parent.product_composition_screen)
         else:
-            print("[DEBUG] Brak atrybutu product_composition_screen w parent.")
+            logger.warning("Brak atrybutu product_composition_screen w parent.")
             QMessageBox.information(
                 self,
                 "Skład",
@@ -216,9 +223,11 @@ class ProductsListScreen(BaseCrudListScreen):
 
     def update_item_in_db(self, item_id: int, new_values: List[Any]) -> None:
         """Wywoływane, gdy user kliknie 'Zapisz' w kolumnie 4."""
-        print(f"[DEBUG] update_item_in_db(item_id={item_id}, new_values={new_values})")
+        logger.debug(
+            "update_item_in_db(item_id=%s, new_values=%s)", item_id, new_values
+        )
         if not self.db_manager:
-            print("[DEBUG] Brak db_manager w update_item_in_db.")
+            logger.warning("Brak db_manager w update_item_in_db.")
             QMessageBox.critical(self, "Błąd", "Brak db_manager.")
             return
 
@@ -226,8 +235,11 @@ class ProductsListScreen(BaseCrudListScreen):
         cat_id = new_values[1]
 
         try:
-            print(
-                f"[DEBUG] update_product(item_id={item_id}, new_name='{new_name}', cat_id={cat_id})"
+            logger.debug(
+                "update_product(item_id=%s, new_name='%s', cat_id=%s)",
+                item_id,
+                new_name,
+                cat_id,
             )
             self.db_manager.update_product(item_id, new_name, cat_id)
             QMessageBox.information(
@@ -235,24 +247,24 @@ class ProductsListScreen(BaseCrudListScreen):
             )
             self.load_data()
         except Exception as e:
-            print(f"[DEBUG] Błąd przy update_product: {e}")
+            logger.error("Błąd przy update_product: %s", e)
             QMessageBox.warning(self, "Błąd", f"Nie udało się zapisać: {e}")
 
     def delete_item_in_db(self, item_id: int) -> None:
         """Usuwa produkt z bazy (po kliknięciu 'Usuń')."""
-        print(f"[DEBUG] delete_item_in_db(item_id={item_id})")
+        logger.debug("delete_item_in_db(item_id=%s)", item_id)
         if not self.db_manager:
-            print("[DEBUG] Brak db_manager w delete_item_in_db.")
+            logger.warning("Brak db_manager w delete_item_in_db.")
             QMessageBox.critical(self, "Błąd", "Brak db_manager.")
             return
 
         try:
-            print(f"[DEBUG] db_manager.delete_product({item_id})")
+            logger.debug("db_manager.delete_product(%s)", item_id)
             self.db_manager.delete_product(item_id)
             QMessageBox.information(
                 self, "Info", f"Produkt (ID={item_id}) został usunięty."
             )
             self.load_data()
         except Exception as e:
-            print(f"[DEBUG] Błąd przy delete_product: {e}")
+            logger.error("Błąd przy delete_product: %s", e)
             QMessageBox.warning(self, "Błąd", f"Nie udało się usunąć: {e}")
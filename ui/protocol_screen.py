@@ -0,0 +1,870 @@
+# c:\serownia\ui\protocol_screen.py
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date  # Do ustawiania dzisiejszej daty
+
+from PyQt5.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QGridLayout,
+    QGroupBox,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QComboBox,
+    QMessageBox,
+    QScrollArea,
+    QTableWidget,
+    QTableWidgetItem,
+)
+
+from database.db_manager import DBManager
+from logic.protocol_types import (
+    ProtocolType,
+    get_protocol_type,
+    parse_measurement,
+    parse_number,
+)
+from logic.spc import SPC_OK, SPC_OUT, SPC_WARNING, ControlLimits, load_control_limits
+from logic.utils import batch_totals, parse_dosage
+from ui.form_binding import FormBinder, blocked_signals
+
+logger = logging.getLogger(__name__)
+
+
+PROTOCOL_STYLE = """
+    QWidget {
+        background-color: #FFF9FA; /* bardzo jasny róż */
+    }
+    QGroupBox {
+        background-color: #FFEFF2;
+        border: 1px solid #FFC0CB;
+        border-radius: 5px;
+        margin-top: 10px;
+    }
+    QGroupBox:title {
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        padding: 0 4px;
+        color: #D02090;
+        font-weight: bold;
+    }
+    QLabel {
+        font-size: 14px;
+        color: #333333;
+    }
+    QLineEdit, QComboBox {
+        background-color: #FFFFFF;
+        border: 1px solid #FFB6C1;
+        border-radius: 4px;
+        padding: 2px 4px;
+    }
+    QPushButton {
+        background-color: #FFB6C1;
+        border: 1px solid #FF69B4;
+        border-radius: 8px;
+        padding: 6px 12px;
+        font-weight: bold;
+    }
+"""
+
+
+# Tło pola SPC wg oceny wartości (logic/spc.py)
+SPC_FIELD_STYLES = {
+    SPC_OK: "",
+    SPC_WARNING: "background-color: #FFF3B0;",
+    SPC_OUT: "background-color: #FF9999;",
+}
+
+
+class ProtocolScreen(QWidget):
+    """
+    Formularz protokołu produkcji budowany z definicji typu (logic/protocol_types.py):
+      - A: produkt, data, numer serii + pola 'params' definicji,
+      - B: dodatki (max_additives wierszy: Kategoria | Dodatek | Dawka),
+           dawki przeliczane wg ilości mleka (pole 'milk_field'),
+      - C: etapy produkcji (każdy etap = 2 pola),
+      - D: ewidencja partii (tabela rosnąca wg potrzeb, suma wag i wydajność),
+      - E: zużyte opakowania (Opakowanie | Ilość) – schodzą ze stanu przy zapisie.
+    Pola SPC (pH, temperatury) podświetlane w trakcie wpisywania, gdy wartość
+    wypada poza granice kontrolne produktu (pobrane raz przy wyborze produktu).
+    Odczyt i zapis szczegółów idą przez DBManager (get_protocol_details / save_protocol),
+    mapowanie pole <-> kolumna robi FormBinder.
+    """
+
+    LABEL_WIDTH = 195
+    FIELD_WIDTH = 195
+    STAGE_FIELD_WIDTH = 80
+
+    def __init__(
+        self,
+        protocol_type: ProtocolType,
+        parent: Optional[Any] = None,
+        db_manager: Optional[DBManager] = None,
+    ):
+        super().__init__(parent)
+        logger.debug("ProtocolScreen('%s') constructor START", protocol_type.category)
+        self.parent = parent
+        self.db_manager = db_manager
+        self.protocol_type = protocol_type
+
+        self.setWindowTitle(protocol_type.title)
+        self.resize(800, 600)
+        self.setStyleSheet(PROTOCOL_STYLE)
+
+        # Id protokołu (None => nowy)
+        self.current_protocol_id: Optional[int] = None
+
+        # Widgety pól definicji: {kolumna: QLineEdit / QComboBox}
+        self.field_widgets: Dict[str, QWidget] = {}
+
+        # Wartości bazowe dodatków (na 100 L) i jednostki – po jednym na wiersz sekcji B
+        self.additives_info: List[Tuple[float, str]] = [
+            (0.0, "") for _ in range(protocol_type.max_additives)
+        ]
+
+        # Opakowania do wyboru w sekcji E: [(id, nazwa)] – odświeżane przy otwarciu
+        self.packaging_choices: List[Tuple[int, str]] = []
+
+        # Granice kontrolne SPC wybranego produktu: {klucz pola: ControlLimits}
+        self.spc_limits: Dict[str, ControlLimits] = {}
+
+        # ScrollArea + główny layout
+        self.scroll_area = QScrollArea(self)
+        self.scroll_area.setWidgetResizable(True)
+        self.main_widget = QWidget()
+        self.main_layout = QVBoxLayout(self.main_widget)
+
+        self.create_section_a_params()  # A: Parametry
+        self.create_section_b_additives()  # B: Dodatki
+        self.create_section_c_stages()  # C: Etapy
+        self.create_section_d_parties()  # D: Ewidencja partii
+        self.create_section_e_packaging()  # E: Zużyte opakowania
+        self.create_bottom_buttons()  # Dolny pasek (Powrót / Zapisz)
+        self.connect_spc_fields()
+
+        self.details_binder = FormBinder(
+            self.field_widgets,
+            combo_defaults={
+                f.key: f.default for f in protocol_type.fields if f.choices
+            },
+        )
+
+        self.scroll_area.setWidget(self.main_widget)
+        outer_layout = QVBoxLayout()
+        outer_layout.addWidget(self.scroll_area)
+        self.setLayout(outer_layout)
+
+        logger.debug("ProtocolScreen('%s') constructor END", protocol_type.category)
+
+    # ----------------------------------------------------------------
+    # Budowa formularza z definicji
+    # ----------------------------------------------------------------
+    def create_field_widget(self, field, width: int) -> QWidget:
+        """QComboBox dla pól z listą wyboru, QLineEdit dla pozostałych."""
+        if field.choices:
+            widget = QComboBox()
+            widget.addItems(list(field.choices))
+        else:
+            widget = QLineEdit()
+            if field.placeholder:
+                widget.setPlaceholderText(field.placeholder)
+        widget.setFixedWidth(width)
+        self.field_widgets[field.key] = widget
+        return widget
+
+    def create_section_a_params(self):
+        group = QGroupBox("Parametry wstępne")
+        grid = QGridLayout()
+        grid.setHorizontalSpacing(40)
+
+        def add_row(row: int, text: str, widget: QWidget) -> None:
+            lbl = QLabel(text)
+            lbl.setFixedWidth(self.LABEL_WIDTH)
+            grid.addWidget(lbl, row, 0)
+            grid.addWidget(widget, row, 1)
+
+        self.product_combo = QComboBox()
+        self.product_combo.setFixedWidth(self.FIELD_WIDTH)
+        add_row(0, self.protocol_type.product_label, self.product_combo)
+
+        self.date_input = QLineEdit()
+        self.date_input.setFixedWidth(self.FIELD_WIDTH)
+        add_row(1, "Data produkcji (YYYY-MM-DD):", self.date_input)
+
+        self.series_input = QLineEdit()
+        self.series_input.setFixedWidth(self.FIELD_WIDTH)
+        add_row(2, "Numer serii (xxxyy_zz):", self.series_input)
+
+        for row, field in enumerate(self.protocol_type.params, start=3):
+            add_row(row, field.label, self.create_field_widget(field, self.FIELD_WIDTH))
+
+        # Ilość mleka => przeliczanie dawek
+        self.milk_input = self.field_widgets[self.protocol_type.milk_field]
+        self.milk_input.textChanged.connect(self.update_doses)
+        self.milk_input.textChanged.connect(self.update_party_totals)
+
+        group.setLayout(grid)
+        self.main_layout.addWidget(group)
+
+        self.fill_products()
+
+    def create_section_b_additives(self):
+        group = QGroupBox(self.protocol_type.additives_title)
+        vbox = QVBoxLayout()
+
+        header_layout = QHBoxLayout()
+        for text, width in (("Kategoria", 190), ("Dodatek", 140), ("Dawka", 80)):
+            lbl = QLabel(text)
+            lbl.setFixedWidth(width)
+            if header_layout.count():
+                header_layout.addSpacing(30)
+            header_layout.addWidget(lbl)
+        vbox.addLayout(header_layout)
+
+        self.additive_lines = []
+        for _ in range(self.protocol_type.max_additives):
+            row = QHBoxLayout()
+
+            cat_edit = QLineEdit()
+            cat_edit.setFixedWidth(190)
+            add_edit = QLineEdit()
+            add_edit.setFixedWidth(140)
+            dose_edit = QLineEdit()
+            dose_edit.setFixedWidth(80)
+            # dawka wyliczana dynamicznie (w części typów tylko do odczytu)
+            dose_edit.setReadOnly(self.protocol_type.dose_read_only)
+
+            row.addWidget(cat_edit)
+            row.addSpacing(30)
+            row.addWidget(add_edit)
+            row.addSpacing(30)
+            row.addWidget(dose_edit)
+
+            self.additive_lines.append((cat_edit, add_edit, dose_edit))
+            vbox.addLayout(row)
+
+        group.setLayout(vbox)
+        self.main_layout.addWidget(group)
+
+    def create_section_c_stages(self):
+        """
+        Każdy etap to 2 wiersze w gridzie:
+          R1: [puste] | opis pola 1 | opis pola 2
+          R2: nazwa   | QLineEdit   | QLineEdit
+        """
+        groupC = QGroupBox(self.protocol_type.stages_title)
+        gridC = QGridLayout()
+        gridC.setHorizontalSpacing(20)
+
+        for i, stage in enumerate(self.protocol_type.stages):
+            base_row = 1 + 2 * i
+
+            lbl_empty = QLabel("")
+            lbl_empty.setFixedWidth(self.LABEL_WIDTH)
+            gridC.addWidget(lbl_empty, base_row, 0)
+
+            lbl_stage = QLabel(stage.name)
+            lbl_stage.setFixedWidth(self.LABEL_WIDTH)
+            gridC.addWidget(lbl_stage, base_row + 1, 0)
+
+            for col, field in enumerate(stage.fields, start=1):
+                caption = f"{field.label} [{field.unit}]" if field.unit else field.label
+                gridC.addWidget(QLabel(caption), base_row, col)
+                gridC.addWidget(
+                    self.create_field_widget(field, self.STAGE_FIELD_WIDTH),
+                    base_row + 1,
+                    col,
+                )
+
+        groupC.setLayout(gridC)
+        self.main_layout.addWidget(groupC)
+
+    def create_section_d_parties(self):
+        """
+        Sekcja D: tabela partii (Partia | Waga (kg) | Komentarz), rośnie wg potrzeb
+        – "Dodaj partię" dokłada wiersz, "Usuń partię" usuwa zaznaczony.
+        Pod tabelą suma wag i wydajność (kg / 100 L mleka).
+        """
+        groupD = QGroupBox(self.protocol_type.parties_title)
+        vlayout = QVBoxLayout()
+
+        self.parties_table = QTableWidget(0, 3)
+        self.parties_table.setHorizontalHeaderLabels(
+            ["Partia", "Waga (kg)", "Komentarz"]
+        )
+        self.parties_table.horizontalHeader().setStretchLastSection(True)
+        self.parties_table.verticalHeader().setVisible(False)
+        self.parties_table.setMinimumHeight(150)
+        self.parties_table.itemChanged.connect(self.update_party_totals)
+        vlayout.addWidget(self.parties_table)
+
+        hbox = QHBoxLayout()
+        btn_add = QPushButton("Dodaj partię")
+        btn_add.clicked.connect(lambda: self.add_party_row())
+        hbox.addWidget(btn_add)
+        btn_remove = QPushButton("Usuń partię")
+        btn_remove.clicked.connect(self.remove_party_row)
+        hbox.addWidget(btn_remove)
+        hbox.addStretch()
+        self.party_totals_label = QLabel("")
+        hbox.addWidget(self.party_totals_label)
+        vlayout.addLayout(hbox)
+
+        groupD.setLayout(vlayout)
+        self.main_layout.addWidget(groupD)
+
+    def create_section_e_packaging(self):
+        """
+        Sekcja E: opakowania zużyte w serii (Opakowanie | Ilość (szt.)).
+        Zapis protokołu aktualizuje stan magazynu opakowań (packaging_stock).
+        """
+        groupE = QGroupBox(self.protocol_type.packaging_title)
+        vlayout = QVBoxLayout()
+
+        self.packaging_table = QTableWidget(0, 2)
+        self.packaging_table.setHorizontalHeaderLabels(["Opakowanie", "Ilość (szt.)"])
+        self.packaging_table.horizontalHeader().setStretchLastSection(True)
+        self.packaging_table.verticalHeader().setVisible(False)
+        self.packaging_table.setColumnWidth(0, 300)
+        self.packaging_table.setMinimumHeight(120)
+        vlayout.addWidget(self.packaging_table)
+
+        hbox = QHBoxLayout()
+        btn_add = QPushButton("Dodaj opakowanie")
+        btn_add.clicked.connect(lambda: self.add_packaging_row())
+        hbox.addWidget(btn_add)
+        btn_remove = QPushButton("Usuń opakowanie")
+        btn_remove.clicked.connect(self.remove_packaging_row)
+        hbox.addWidget(btn_remove)
+        hbox.addStretch()
+        vlayout.addLayout(hbox)
+
+        groupE.setLayout(vlayout)
+        self.main_layout.addWidget(groupE)
+
+    def create_bottom_buttons(self):
+        hbox = QHBoxLayout()
+
+        btn_back = QPushButton("Powrót")
+        btn_back.clicked.connect(self.go_back)
+        hbox.addWidget(btn_back)
+
+        self.btn_save = QPushButton("Zapisz protokół")
+        self.btn_save.clicked.connect(self.save_protocol)
+        hbox.addWidget(self.btn_save)
+
+        self.main_layout.addLayout(hbox)
+
+    # ----------------------------------------------------------------
+    # LOGIKA (load_from_record, save_protocol, itp.)
+    # ----------------------------------------------------------------
+    def go_back(self):
+        if hasattr(self.parent, "show_previous_screen"):
+            self.parent.show_previous_screen()
+        else:
+            self.hide()
+
+    def load_from_record(self, record_data: Optional[dict]) -> None:
+        """
+        Wypełnia formularz danymi z 'record_data' (pakiet z get_protocol_bundle
+        albo sam wiersz production_records). record_data=None => nowy, pusty protokół.
+
+        Pola ustawiane są z zablokowanymi sygnałami (combo produktu, ilość mleka),
+        dawki przeliczamy RAZ, na końcu. Z pakietem – 0 zapytań o protokół,
+        bez niego – 4 (szczegóły, dodatki, partie, opakowania); plus lista opakowań.
+        """
+        self.refresh_packaging_choices()
+        if record_data is None:
+            self.current_protocol_id = None
+
+            with blocked_signals(self.product_combo, self.milk_input):
+                self.date_input.setText(date.today().strftime("%Y-%m-%d"))
+                self.series_input.setText(self.generate_series_number())
+                self.details_binder.clear()
+                self.clear_parties_fields()
+                self.add_party_row()  # jeden pusty wiersz na start
+                self.packaging_table.setRowCount(0)
+
+                # Domyślny produkt typu (np. "Ser twarogowy"), inaczej "Wybierz..."
+                idx = -1
+                if self.protocol_type.default_product_name:
+                    idx = self.product_combo.findText(
+                        self.protocol_type.default_product_name
+                    )
+                if self.product_combo.count() > 0:
+                    self.product_combo.setCurrentIndex(max(idx, 0))
+
+            default_pid = self.product_combo.currentData()
+            if default_pid and default_pid != -1:
+                self.fill_additives_from_db(default_pid)
+            else:
+                self.clear_additives_fields()
+            self.update_doses()
+            self.refresh_spc_limits()
+
+            logger.debug(
+                "load_from_record: NOWY protokół (%s).", self.protocol_type.category
+            )
+            return
+
+        self.current_protocol_id = record_data.get("id", None)
+        date_str = record_data.get("date", "")
+        series_str = record_data.get("series", "")
+        product_id = record_data.get("product_id", None)
+
+        # Szczegóły i zapisane dodatki: z pakietu albo – gdy ich brak – z bazy
+        details = record_data.get("details")
+        lines = record_data.get("additive_lines")
+        parties = record_data.get("parties")
+        packaging = record_data.get("packaging")
+        if self.db_manager and self.current_protocol_id is not None:
+            if details is None:
+                details = self.db_manager.get_protocol_details(
+                    self.protocol_type, self.current_protocol_id
+                )
+            if lines is None:
+                lines = self.db_manager.get_ser_production_additives_for_record(
+                    self.current_protocol_id
+                )
+            if parties is None:
+                parties = self.db_manager.get_production_parties(
+                    self.current_protocol_id
+                )
+            if packaging is None:
+                packaging = self.db_manager.get_production_packaging(
+                    self.current_protocol_id
+                )
+
+        with blocked_signals(self.product_combo, self.milk_input):
+            self.date_input.setText(date_str)
+            self.series_input.setText(series_str)
+
+            found_index = (
+                self.product_combo.findData(product_id) if product_id is not None else -1
+            )
+            if found_index >= 0:
+                self.product_combo.setCurrentIndex(found_index)
+            elif self.product_combo.count() > 0:
+                self.product_combo.setCurrentIndex(0)
+
+            self.details_binder.populate(details)
+
+        self.fill_parties(parties)
+        self.fill_packaging(packaging)
+
+        if found_index < 0 and product_id is not None:
+            QMessageBox.warning(
+                self,
+                "Uwaga",
+                f"Produkt o ID={product_id} nie istnieje w bazie. Ustawiam pierwszy z listy.",
+            )
+
+        # Dodatki: zapisane w protokole, a jeśli ich brak – z receptury produktu
+        if lines:
+            self.fill_additives_from_saved_lines(lines, self.get_milk_liters())
+        elif product_id:
+            self.fill_additives_from_db(product_id)
+        else:
+            self.clear_additives_fields()
+
+        logger.debug(
+            "load_from_record: protokół ID=%s, date=%s, series=%s, product_id=%s.",
+            self.current_protocol_id,
+            date_str,
+            series_str,
+            product_id,
+        )
+        self.update_doses()
+        self.refresh_spc_limits()
+
+    def save_protocol(self) -> None:
+        """
+        Zapisuje / aktualizuje protokół (nagłówek z sumą wag i wydajnością,
+        szczegóły typu, dodatki, partie, opakowania) jedną transakcją
+        – DBManager.save_protocol.
+        """
+        if not self.db_manager:
+            QMessageBox.warning(self, "Błąd", "Brak db_manager - nie można zapisać.")
+            return
+
+        product_id = self.product_combo.currentData()
+        date_str = self.date_input.text().strip()
+        series_str = self.series_input.text().strip()
+        details = self.details_binder.collect()
+
+        milk_str = details.get(self.protocol_type.milk_field)
+        if not date_str or not series_str or not milk_str:
+            QMessageBox.warning(
+                self, "Błąd", "Uzupełnij datę, numer serii i ilość mleka."
+            )
+            return
+        if product_id is None or product_id == -1:
+            hint = self.protocol_type.product_hint
+            suffix = f" ({hint})" if hint else ""
+            QMessageBox.warning(
+                self, "Błąd", f"Nie wybrano poprawnego produktu{suffix}."
+            )
+            return
+        parties, party_errors = self.collect_parties()
+        packaging, packaging_errors = self.collect_packaging()
+        errors = (
+            self.protocol_type.validate(details) + party_errors + packaging_errors
+        )
+        if errors:
+            QMessageBox.warning(self, "Błąd", "\n".join(errors))
+            return
+
+        additive_lines = []
+        for cat_edit, add_edit, dose_edit in self.additive_lines:
+            line = (
+                cat_edit.text().strip(),
+                add_edit.text().strip(),
+                dose_edit.text().strip(),
+            )
+            if any(line):
+                additive_lines.append(line)
+
+        is_new = self.current_protocol_id is None
+        try:
+            self.current_protocol_id = self.db_manager.save_protocol(
+                self.protocol_type,
+                self.current_protocol_id,
+                date_str,
+                series_str,
+                product_id,
+                details,
+                additive_lines,
+                parties,
+                packaging,
+            )
+        except Exception as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się zapisać protokołu: {e}")
+            return
+
+        shortages = self.db_manager.get_lot_shortages(self.current_protocol_id)
+        if shortages:
+            QMessageBox.warning(
+                self,
+                "Uwaga",
+                "Za mało dodatków w partiach dostaw (rejestr dodatków):\n"
+                + "\n".join(
+                    f"{s['additive_name']}: brakuje {s['missing']:g}" for s in shortages
+                ),
+            )
+
+        if is_new:
+            QMessageBox.information(
+                self, "Sukces", f"Protokół '{series_str}' zapisany (NOWY)."
+            )
+        else:
+            QMessageBox.information(
+                self,
+                "Sukces",
+                f"Zaktualizowano protokół '{series_str}' (ID={self.current_protocol_id}).",
+            )
+
+    def generate_series_number(self) -> str:
+        """Generuje numer serii w formacie xxxyy_zz."""
+        if not self.db_manager:
+            return "00000_00"
+        today = date.today()
+        mm = today.month
+        yyyy = today.year
+        current_count = self.db_manager.get_next_series_number_for_month(mm, yyyy)
+        return f"{current_count:03d}{mm:02d}_{yyyy}"
+
+    def fill_products(self):
+        """Ładuje listę produktów kategorii typu do self.product_combo."""
+        if not self.db_manager:
+            return
+        try:
+            self.product_combo.currentIndexChanged.disconnect(self.on_product_changed)
+        except TypeError:
+            pass
+
+        self.product_combo.clear()
+        self.product_combo.addItem("Wybierz...", -1)
+        for p in self.db_manager.get_products_by_category_name(
+            self.protocol_type.category
+        ):
+            self.product_combo.addItem(p["name"], p["id"])
+
+        self.product_combo.setCurrentIndex(0)
+        self.product_combo.setEnabled(True)
+
+        self.product_combo.currentIndexChanged.connect(self.on_product_changed)
+
+    def on_product_changed(self, index: int):
+        """Gdy user wybierze inny produkt w combo, wypełniamy dodatki i przeliczamy dawki."""
+        pid = self.product_combo.currentData()
+        if pid and pid != -1:
+            self.fill_additives_from_db(pid)
+            self.update_doses()
+        else:
+            self.clear_additives_fields()
+        self.refresh_spc_limits()
+
+    # ----------------------------------------------------------------
+    # SPC: ocena pH / temperatur w trakcie wpisywania
+    # ----------------------------------------------------------------
+    def connect_spc_fields(self) -> None:
+        for field in self.protocol_type.spc_fields:
+            widget = self.field_widgets.get(field.key)
+            if isinstance(widget, QLineEdit):
+                widget.textChanged.connect(
+                    lambda _text, key=field.key: self.check_spc_field(key)
+                )
+
+    def refresh_spc_limits(self) -> None:
+        """Granice kontrolne wybranego produktu (jedno zapytanie) + ocena pól."""
+        pid = self.product_combo.currentData()
+        self.spc_limits = {}
+        if self.db_manager and pid and pid != -1:
+            self.spc_limits = load_control_limits(self.db_manager, pid)
+        for field in self.protocol_type.spc_fields:
+            self.check_spc_field(field.key)
+
+    def check_spc_field(self, key: str) -> None:
+        """Podświetla pole, gdy wartość jest poza strefą ostrzegawczą / granicami."""
+        widget = self.field_widgets.get(key)
+        field = self.protocol_type.field(key)
+        if not isinstance(widget, QLineEdit) or field is None:
+            return
+        limits = self.spc_limits.get(key)
+        value = parse_measurement(widget.text(), field.unit)
+        status = SPC_OK
+        if limits is not None and value is not None:
+            status = limits.classify(value)
+        widget.setStyleSheet(SPC_FIELD_STYLES[status])
+        widget.setToolTip(limits.describe() if limits is not None else "")
+
+    def clear_parties_fields(self) -> None:
+        with blocked_signals(self.parties_table):
+            self.parties_table.setRowCount(0)
+        self.update_party_totals()
+
+    def add_party_row(
+        self, code: str = "", weight: Optional[float] = None, comment: str = ""
+    ) -> None:
+        row = self.parties_table.rowCount()
+        self.parties_table.insertRow(row)
+        weight_text = "" if weight is None else f"{weight:g}"
+        for col, text in enumerate((code, weight_text, comment)):
+            self.parties_table.setItem(row, col, QTableWidgetItem(text))
+
+    def remove_party_row(self):
+        row = self.parties_table.currentRow()
+        if row < 0:
+            row = self.parties_table.rowCount() - 1
+        if row >= 0:
+            self.parties_table.removeRow(row)
+            self.update_party_totals()
+
+    def fill_parties(self, parties: Optional[List[dict]]) -> None:
+        """Wypełnia tabelę partii zapisanymi wierszami (production_parties)."""
+        with blocked_signals(self.parties_table):
+            self.parties_table.setRowCount(0)
+            for party in parties or []:
+                self.add_party_row(
+                    party.get("party_code") or "",
+                    party.get("weight_kg"),
+                    party.get("comment") or "",
+                )
+        self.update_party_totals()
+
+    def collect_parties(
+        self,
+    ) -> Tuple[List[Tuple[str, Optional[float], str]], List[str]]:
+        """
+        Zwraca (partie, błędy). Partia = (kod, waga kg albo None, komentarz);
+        całkiem puste wiersze pomijamy.
+        """
+        parties = []
+        errors = []
+        for row in range(self.parties_table.rowCount()):
+            code, weight_text, comment = (
+                self.party_cell_text(row, col) for col in range(3)
+            )
+            if not (code or weight_text or comment):
+                continue
+            weight = parse_number(weight_text) if weight_text else None
+            if weight_text and weight is None:
+                errors.append(f"Partia {row + 1}: waga musi być liczbą.")
+            parties.append((code, weight, comment))
+        return parties, errors
+
+    def party_cell_text(self, row: int, col: int) -> str:
+        item = self.parties_table.item(row, col)
+        return item.text().strip() if item else ""
+
+    def update_party_totals(self, *_args) -> None:
+        """Suma wag partii i wydajność – ten sam wzór co przy zapisie (batch_totals)."""
+        parties, _errors = self.collect_parties()
+        total, yield_pct = batch_totals(
+            (weight for _, weight, _ in parties), self.get_milk_liters()
+        )
+        if total is None:
+            self.party_totals_label.setText("")
+            return
+        text = f"Suma: {total:g} kg"
+        if yield_pct is not None:
+            text += f"   Wydajność: {yield_pct:.2f} kg / 100 L"
+        self.party_totals_label.setText(text)
+
+    def refresh_packaging_choices(self) -> None:
+        """Lista opakowań do combo w sekcji E (jedno zapytanie)."""
+        if not self.db_manager:
+            return
+        self.packaging_choices = [
+            (p["id"], p["name"]) for p in self.db_manager.get_all_packaging()
+        ]
+
+    def add_packaging_row(
+        self, packaging_id: Optional[int] = None, qty: Optional[float] = None
+    ) -> None:
+        row = self.packaging_table.rowCount()
+        self.packaging_table.insertRow(row)
+        combo = QComboBox()
+        combo.addItem("Wybierz...", -1)
+        for pid, name in self.packaging_choices:
+            combo.addItem(name, pid)
+        if packaging_id is not None:
+            combo.setCurrentIndex(max(combo.findData(packaging_id), 0))
+        self.packaging_table.setCellWidget(row, 0, combo)
+        qty_text = "" if qty is None else f"{qty:g}"
+        self.packaging_table.setItem(row, 1, QTableWidgetItem(qty_text))
+
+    def remove_packaging_row(self):
+        row = self.packaging_table.currentRow()
+        if row < 0:
+            row = self.packaging_table.rowCount() - 1
+        if row >= 0:
+            self.packaging_table.removeRow(row)
+
+    def fill_packaging(self, packaging: Optional[List[dict]]) -> None:
+        """Wypełnia sekcję E zapisanymi wierszami (production_packaging)."""
+        self.packaging_table.setRowCount(0)
+        for item in packaging or []:
+            self.add_packaging_row(item.get("packaging_id"), item.get("qty"))
+
+    def collect_packaging(self) -> Tuple[List[Tuple[int, float]], List[str]]:
+        """
+        Zwraca (opakowania, błędy). Opakowanie = (packaging_id, ilość > 0);
+        wiersze bez wybranego opakowania i ilości pomijamy.
+        """
+        packaging = []
+        errors = []
+        for row in range(self.packaging_table.rowCount()):
+            combo = self.packaging_table.cellWidget(row, 0)
+            pid = combo.currentData() if combo is not None else -1
+            item = self.packaging_table.item(row, 1)
+            qty_text = item.text().strip() if item else ""
+            if (pid is None or pid == -1) and not qty_text:
+                continue
+            qty = parse_number(qty_text)
+            if pid is None or pid == -1:
+                errors.append(f"Opakowanie {row + 1}: wybierz opakowanie.")
+            elif qty is None or qty <= 0:
+                errors.append(f"Opakowanie {row + 1}: ilość musi być liczbą > 0.")
+            else:
+                packaging.append((pid, qty))
+        return packaging, errors
+
+    def clear_additives_fields(self):
+        for i, (cat_edit, add_edit, dose_edit) in enumerate(self.additive_lines):
+            cat_edit.clear()
+            add_edit.clear()
+            dose_edit.clear()
+            self.additives_info[i] = (0.0, "")
+
+    def fill_additives_from_db(self, product_id: int):
+        """Wypełnia sekcję B na podstawie receptury produktu (jedno zapytanie)."""
+        self.clear_additives_fields()
+        if not self.db_manager:
+            return
+        recipe = self.db_manager.get_product_recipe_lines(product_id)
+        for i, line in enumerate(recipe[: len(self.additive_lines)]):
+            cat_edit, add_edit, dose_edit = self.additive_lines[i]
+            cat_edit.setText(line["category_name"])
+            add_edit.setText(line["additive_name"])
+            dose_edit.clear()
+            self.additives_info[i] = parse_dosage(line["dosage_per_100"])
+
+    def fill_additives_from_saved_lines(
+        self, lines: List[dict], milk_liters: float
+    ) -> None:
+        """
+        Wypełnia sekcję B zapisanymi liniami (ser_production_additives).
+        Wartość bazową (na 100 L) odtwarzamy jako dawka * 100 / ilość_mleka,
+        więc update_doses() pokaże zapisaną dawkę.
+        """
+        self.clear_additives_fields()
+        for i, row in enumerate(lines[: len(self.additive_lines)]):
+            dose_str = row.get("dose_calculated") or ""
+            dose_val, unit = parse_dosage(dose_str)
+            if milk_liters > 0:
+                self.additives_info[i] = (dose_val * 100.0 / milk_liters, unit)
+
+            cat_edit, add_edit, dose_edit = self.additive_lines[i]
+            cat_edit.setText(row.get("additive_category") or "")
+            add_edit.setText(row.get("additive_name") or "")
+            dose_edit.setText(dose_str)
+
+    def get_milk_liters(self) -> float:
+        """Ilość mleka z formularza jako float (0.0, jeśli pole puste / niepoprawne)."""
+        value = parse_number(self.milk_input.text())
+        return value if value is not None else 0.0
+
+    def update_doses(self):
+        """Przelicza dawki w sekcji B: wartość bazowa (na 100 L) * ilość mleka / 100."""
+        milk_liters = self.get_milk_liters()
+        if milk_liters <= 0:
+            self.clear_doses()
+            return
+
+        factor = milk_liters / 100.0
+        for i, (cat_edit, add_edit, dose_edit) in enumerate(self.additive_lines):
+            base_val, unit = self.additives_info[i]
+            if base_val > 0:
+                dose_edit.setText(f"{base_val * factor:.1f} {unit}")
+            else:
+                dose_edit.clear()
+
+    def clear_doses(self):
+        for cat_edit, add_edit, dose_edit in self.additive_lines:
+            dose_edit.clear()
+
+
+class ProtocolScreenPool:
+    """
+    Ekrany protokołów tworzone leniwie – JEDEN formularz na typ protokołu,
+    używany ponownie przy każdym otwarciu (nowy / edycja).
+    Zachowuje się jak słownik {nazwa_kategorii: ekran} (MainWindow.protocol_screens_by_name):
+    każda kategoria produktu ma protokół (własny typ albo ogólny), więc 'in' => True.
+    """
+
+    def __init__(self, main_window: Any, db_manager: Optional[DBManager]) -> None:
+        self.main_window = main_window
+        self.db_manager = db_manager
+        self._screens: Dict[str, ProtocolScreen] = {}
+
+    def __contains__(self, category_name: object) -> bool:
+        return isinstance(category_name, str) and bool(category_name.strip())
+
+    def __getitem__(self, category_name: str) -> ProtocolScreen:
+        ptype = get_protocol_type(category_name)
+        screen = self._screens.get(ptype.category)
+        if screen is None:
+            screen = ProtocolScreen(
+                ptype, parent=self.main_window, db_manager=self.db_manager
+            )
+            self.main_window.stacked_widget.addWidget(screen)
+            self._screens[ptype.category] = screen
+        return screen
+
+    def screens(self) -> List[ProtocolScreen]:
+        """Już utworzone ekrany."""
+        return list(self._screens.values())
@@ -1,33 +1,111 @@
 # c:\serownia\ui\raporty_screen.py
 
-from typing import Optional
-from PyQt5.QtWidgets import QVBoxLayout, QLabel, QPushButton
-from PyQt5.QtCore import Qt
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from database.db_manager import DBManager
+from logic.report_generator import REPORTS, ReportCache, ReportResult
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
 
+logger = logging.getLogger(__name__)
+
+
+class ReportSignals(QObject):
+    """Sygnały z wątku raportu do GUI (połączenia kolejkowane przez Qt)."""
+
+    progress = pyqtSignal(int)  # liczba pobranych wierszy
+    finished = pyqtSignal(object)  # ReportResult
+    failed = pyqtSignal(str)
+
 
 class RaportyScreen(BackgroundScreen):
     """
-    Ekran 'Raporty', zawierający placeholder „Tutaj będą raporty”
-    oraz przycisk „Powrót” do ekranu startowego.
+    Ekran 'Raporty': wybór raportu (logic/report_generator.py), zakres dat,
+    przycisk 'Generuj'. Zapytanie wykonuje się w wątku w tle (własne połączenie
+    SQLite), postęp i wynik wracają sygnałami; GUI nie czeka na bazę.
+    Wyniki trzymane są w ReportCache – bez zmian w danych raport wraca od razu.
     """
 
-    def __init__(self, parent: Optional[BackgroundScreen] = None) -> None:
+    def __init__(
+        self,
+        parent: Optional[BackgroundScreen] = None,
+        db_manager: Optional[DBManager] = None,
+    ) -> None:
         super().__init__(
             parent=parent,
-            bg_image_path=r"c:\serownia\images\cheese.jpg",  # Tło
+            bg_image_path=asset_path("cheese.jpg"),  # Tło
             panel_width=800,
         )
         self.setWindowTitle("Raporty")
+        self.db_manager = db_manager
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="report"
+        )
+        self._cancel: Optional[threading.Event] = None
+        self._cache: Optional[ReportCache] = None
+        self.signals = ReportSignals()
+        self.signals.progress.connect(self.on_report_progress)
+        self.signals.finished.connect(self.on_report_finished)
+        self.signals.failed.connect(self.on_report_failed)
 
         # Tworzymy layout pionowy na zawartość
         layout = QVBoxLayout()
 
-        # Placeholder
-        label = QLabel("Tutaj będą raporty.")
-        label.setStyleSheet("font-size: 16px; padding: 20px;")
-        layout.addWidget(label)
+        # Wybór raportu + parametry
+        self.report_combo = QComboBox()
+        for report in REPORTS.values():
+            self.report_combo.addItem(report.title, report.key)
+        layout.addWidget(self.report_combo)
+
+        params_box = QHBoxLayout()
+        self.param_inputs: Dict[str, QLineEdit] = {}
+        for param in next(iter(REPORTS.values())).params:
+            params_box.addWidget(QLabel(param.label))
+            edit = QLineEdit(param.default)
+            edit.setPlaceholderText(param.placeholder)
+            params_box.addWidget(edit)
+            self.param_inputs[param.key] = edit
+        layout.addLayout(params_box)
+
+        buttons_box = QHBoxLayout()
+        self.run_button = QPushButton("Generuj")
+        self.run_button.clicked.connect(self.run_selected_report)
+        buttons_box.addWidget(self.run_button)
+        self.cancel_button = QPushButton("Przerwij")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_report)
+        buttons_box.addWidget(self.cancel_button)
+        layout.addLayout(buttons_box)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setTextVisible(True)
+        layout.addWidget(self.progress_bar)
+
+        self.result_table = QTableWidget(0, 0)
+        self.result_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.result_table.verticalHeader().setVisible(False)
+        self.result_table.setMinimumHeight(350)
+        layout.addWidget(self.result_table)
 
         # Przycisk „Powrót”
         back_button = QPushButton("Powrót")
@@ -47,6 +125,98 @@ class RaportyScreen(BackgroundScreen):
         # Zamiast setCentralWidget(...) – dodajemy layout do form_layout
         self.form_layout.addLayout(layout)
 
+    # ----------------------------------------------------------------
+    # Raporty w tle
+    # ----------------------------------------------------------------
+    def get_db_manager(self) -> Optional[DBManager]:
+        return self.db_manager or getattr(self.window(), "db_manager", None)
+
+    def run_selected_report(self) -> None:
+        """Uruchamia wybrany raport w wątku w tle ('Generuj' wyłączone do końca)."""
+        db_manager = self.get_db_manager()
+        if db_manager is None:
+            QMessageBox.warning(
+                self, "Błąd", "Brak db_manager – nie można liczyć raportu."
+            )
+            return
+
+        definition = REPORTS[self.report_combo.currentData()]
+        params: Dict[str, Any] = {
+            key: edit.text().strip() for key, edit in self.param_inputs.items()
+        }
+
+        self._cancel = threading.Event()
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setRange(0, 0)  # zapytanie trwa – pasek "zajętości"
+        self.progress_bar.setFormat("Liczenie...")
+        logger.debug("Raport '%s' start, parametry=%s", definition.key, params)
+
+        if self._cache is None:
+            self._cache = ReportCache(db_manager.get_table_versions)
+        cache = self._cache
+        cancel = self._cancel
+        signals = self.signals
+
+        def job() -> None:
+            try:
+                result = cache.run(
+                    definition,
+                    db_manager.create_connection,
+                    params,
+                    progress=signals.progress.emit,
+                    cancel=cancel,
+                )
+            except Exception as e:  # wynik zawsze wraca do GUI
+                signals.failed.emit(str(e))
+                return
+            signals.finished.emit(result)
+
+        self._executor.submit(job)
+
+    def cancel_report(self) -> None:
+        if self._cancel is not None:
+            self._cancel.set()
+
+    def on_report_progress(self, rows: int) -> None:
+        self.progress_bar.setFormat(f"Pobrano {rows} wierszy...")
+
+    def on_report_finished(self, result: ReportResult) -> None:
+        self.result_table.setColumnCount(len(result.columns))
+        self.result_table.setHorizontalHeaderLabels(list(result.columns))
+        self.result_table.setRowCount(len(result.rows))
+        for row_index, row in enumerate(result.rows):
+            for col, value in enumerate(row):
+                if value is None:
+                    text = ""
+                elif isinstance(value, float):
+                    text = f"{value:g}"
+                else:
+                    text = str(value)
+                self.result_table.setItem(row_index, col, QTableWidgetItem(text))
+        self.result_table.resizeColumnsToContents()
+
+        suffix = " (przerwano)" if result.cancelled else ""
+        if result.cached:
+            suffix = " (bez zmian w danych)"
+        self.finish_progress(
+            f"{result.definition.title}: {len(result.rows)} wierszy{suffix}"
+        )
+
+    def on_report_failed(self, message: str) -> None:
+        self.finish_progress("Błąd raportu")
+        QMessageBox.warning(
+            self, "Błąd", f"Nie udało się wygenerować raportu: {message}"
+        )
+
+    def finish_progress(self, text: str) -> None:
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(1)
+        self.progress_bar.setFormat(text)
+        self.run_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self._cancel = None
+
     def go_back_to_start(self) -> None:
         """
         Przycisk „Powrót” – wraca do ekranu startowego (start_screen) z MainWindow.
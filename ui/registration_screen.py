@@ -3,13 +3,14 @@ from typing import Optional
 from PyQt5.QtWidgets import QLabel, QLineEdit, QPushButton, QMessageBox
 from PyQt5.QtCore import Qt
 from database.db_manager import DBManager
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
 
 
 class RegistrationScreen(BackgroundScreen):
     def __init__(self, parent=None, db_manager: Optional[DBManager] = None):
         super().__init__(
-            parent, bg_image_path=r"c:\serownia\images\cheese.jpg", panel_width=500
+            parent, bg_image_path=asset_path("cheese.jpg"), panel_width=500
         )
 
         self.db_manager = db_manager
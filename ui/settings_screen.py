@@ -1,13 +1,19 @@
 # c:\serownia\ui\settings_screen.py
 
+import logging
 from typing import Optional, Any
 
-from PyQt5.QtWidgets import QGridLayout, QPushButton
+from PyQt5.QtWidgets import QComboBox, QGridLayout, QHBoxLayout, QLabel, QPushButton
 from PyQt5.QtCore import Qt
 
 # Zależnie od Twojej struktury
 from database.db_manager import DBManager
+from logic.log_config import set_level
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
+from ui.milk_prices_dialog import MilkPricesDialog
+
+logger = logging.getLogger(__name__)
 
 
 class SettingsScreen(BackgroundScreen):
@@ -19,6 +25,7 @@ class SettingsScreen(BackgroundScreen):
       - kategoriami opakowań (CRUD),
       - (opcjonalnie) „Produkty”,
       - przycisk "Użytkownicy",
+      - przycisk "Ceny mleka" (koszty serii),
       - przycisk "Powrót" (do ekranu startowego).
     """
 
@@ -34,7 +41,7 @@ class SettingsScreen(BackgroundScreen):
         """
         super().__init__(
             parent=parent,
-            bg_image_path=r"c:\serownia\images\cheese.jpg",
+            bg_image_path=asset_path("cheese.jpg"),
             panel_width=800,
         )
 
@@ -91,6 +98,26 @@ class SettingsScreen(BackgroundScreen):
         row_for_users = (len(buttons) // 2) + 1
         grid_layout.addWidget(users_button, row_for_users, 0)
 
+        # Przycisk "Ceny mleka"
+        milk_prices_button = QPushButton("Ceny mleka")
+        milk_prices_button.setStyleSheet(users_button.styleSheet())
+        milk_prices_button.clicked.connect(self.manage_milk_prices)
+        grid_layout.addWidget(milk_prices_button, row_for_users + 1, 0)
+
+        # Poziom logowania (zmiana w czasie działania)
+        log_layout = QHBoxLayout()
+        log_label = QLabel("Poziom logów:")
+        log_label.setStyleSheet("font-size: 18px;")
+        self.log_level_combo = QComboBox()
+        self.log_level_combo.addItems(["DEBUG", "INFO", "WARNING", "ERROR"])
+        self.log_level_combo.setCurrentText(
+            logging.getLevelName(logging.getLogger().getEffectiveLevel())
+        )
+        self.log_level_combo.currentTextChanged.connect(self.change_log_level)
+        log_layout.addWidget(log_label)
+        log_layout.addWidget(self.log_level_combo)
+        grid_layout.addLayout(log_layout, row_for_users, 1)
+
         # Przycisk "Powrót"
         back_button = QPushButton("Powrót")
         back_button.setStyleSheet(
@@ -104,11 +131,16 @@ class SettingsScreen(BackgroundScreen):
         """
         )
         back_button.clicked.connect(lambda: self._navigate_to_screen("start_screen"))
-        grid_layout.addWidget(back_button, row_for_users + 1, 0, 1, 2)
+        grid_layout.addWidget(back_button, row_for_users + 2, 0, 1, 2)
 
         # Zamiast self.setLayout(grid_layout), dodajemy do form_layout
         self.form_layout.addLayout(grid_layout)
 
+    def change_log_level(self, level_name: str) -> None:
+        """Ustawia poziom logowania całej aplikacji (logic.log_config.set_level)."""
+        set_level(level_name)
+        logger.info("Zmieniono poziom logowania na %s", level_name)
+
     def _navigate_to_screen(self, screen_attr_name: str) -> None:
         """
         Pomocnicza metoda, która wyszukuje w obiekcie MainWindow (self.window())
@@ -117,18 +149,22 @@ class SettingsScreen(BackgroundScreen):
         """
         mw = self.window()
         if not mw or not hasattr(mw, "show_screen"):
-            print("Brak głównego okna lub metody show_screen.")
+            logger.warning("Brak głównego okna lub metody show_screen.")
             return
 
         screen = getattr(mw, screen_attr_name, None)
         if screen is not None:
             mw.show_screen(screen)
         else:
-            print(f"Nie znaleziono ekranu '{screen_attr_name}' w MainWindow.")
+            logger.warning("Nie znaleziono ekranu '%s' w MainWindow.", screen_attr_name)
+
+    def manage_milk_prices(self) -> None:
+        """Cennik mleka (milk_prices) – podstawa kosztu mleka w seriach."""
+        MilkPricesDialog(self, self.db_manager).exec_()
 
     def manage_users(self) -> None:
         """
         Metoda wywoływana po kliknięciu przycisku 'Użytkownicy'.
         Na razie tylko print, w przyszłości można przejść do ekranu zarządzania użytkownikami.
         """
-        print("Zarządzanie użytkownikami (w fazie planowania).")
+        logger.debug("Zarządzanie użytkownikami (w fazie planowania).")
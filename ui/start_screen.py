@@ -1,26 +1,97 @@
 # c:\serownia\ui\start_screen.py
 
-from PyQt5.QtWidgets import QPushButton, QGridLayout
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from PyQt5.QtWidgets import QPushButton, QGridLayout, QGroupBox, QLabel, QVBoxLayout
+from PyQt5.QtCore import QEvent, QObject, QTimer, pyqtSignal
+
+from database.db_manager import DBManager
+from logic.dashboard import DashboardCache, DashboardMetrics
+from logic.expiry_alerts import CHECK_INTERVAL_MS, ExpiryAlert, ExpiryWatch
+from logic.app_config import asset_path
 from ui.background_screen import BackgroundScreen
 
+logger = logging.getLogger(__name__)
+
+# Ile pozycji list (niskie stany, braki) pokazujemy na pulpicie
+DASHBOARD_LIST_ITEMS = 5
+
+
+class DashboardSignals(QObject):
+    """Sygnały z wątku pulpitu do GUI (połączenia kolejkowane przez Qt)."""
+
+    finished = pyqtSignal(object)  # DashboardMetrics
+    failed = pyqtSignal(str)
+    expiry = pyqtSignal(object)  # List[ExpiryAlert]
+    expiry_failed = pyqtSignal(str)
+
 
 class StartScreen(BackgroundScreen):
     """
-    Ekran startowy aplikacji, zawiera główne przyciski nawigacyjne
-    (Produkcja, Magazyn, Raporty, Ustawienia).
+    Ekran startowy aplikacji: pulpit wskaźników (KPI) i główne przyciski
+    nawigacyjne (Produkcja, Magazyn, Raporty, Ustawienia).
+
+    Wskaźniki (logic/dashboard.py) są trzymane w pamięci i przeliczane
+    w wątku w tle tylko po zmianie danych – pokazanie ekranu nie wykonuje
+    zapytań w wątku GUI. Terminy ważności partii (logic/expiry_alerts.py)
+    sprawdzane są w tym samym wątku co CHECK_INTERVAL_MS.
     """
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_manager: Optional[DBManager] = None):
         """
-        Inicjalizuje ekran startowy i ustawia layout z przyciskami.
+        Inicjalizuje ekran startowy i ustawia layout z pulpitem i przyciskami.
         :param parent: Okno nadrzędne, zazwyczaj instancja MainWindow.
+        :param db_manager: Dostęp do bazy (bez niego pulpit jest ukryty).
         """
         super().__init__(
             parent=parent,
-            bg_image_path=r"c:\serownia\images\cheese.jpg",
+            bg_image_path=asset_path("cheese.jpg"),
             panel_width=800,  # Możesz dostosować szerokość panelu
         )
         self.setWindowTitle("Ekran startowy")
+        self.db_manager = db_manager
+        self.dashboard_cache = DashboardCache(db_manager) if db_manager else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="dashboard"
+        )
+        self._refreshing = False
+        self.dashboard_signals = DashboardSignals()
+        self.dashboard_signals.finished.connect(self.show_metrics)
+        self.dashboard_signals.failed.connect(self.on_dashboard_failed)
+        self.dashboard_signals.expiry.connect(self.show_expiry)
+        self.dashboard_signals.expiry_failed.connect(self.on_expiry_failed)
+        self.expiry_watch = ExpiryWatch(db_manager) if db_manager else None
+        self._checking_expiry = False
+
+        # Pulpit: wskaźniki
+        self.dashboard_box = QGroupBox("Pulpit")
+        dashboard_layout = QVBoxLayout(self.dashboard_box)
+        self.week_label = QLabel("Ten tydzień: ...")
+        self.month_label = QLabel("Ten miesiąc: ...")
+        self.low_stock_label = QLabel("Niskie stany dodatków: ...")
+        self.incomplete_label = QLabel("Protokoły z brakami: ...")
+        self.expiry_label = QLabel("Terminy ważności: ...")
+        for label in (
+            self.week_label,
+            self.month_label,
+            self.low_stock_label,
+            self.incomplete_label,
+            self.expiry_label,
+        ):
+            label.setWordWrap(True)
+            label.setStyleSheet("font-size: 14px;")
+            dashboard_layout.addWidget(label)
+        self.dashboard_box.setVisible(self.dashboard_cache is not None)
+        self.form_layout.addWidget(self.dashboard_box)
+
+        # Terminy ważności: sprawdzenie co CHECK_INTERVAL_MS (zapytanie w tle)
+        self.expiry_timer = QTimer(self)
+        self.expiry_timer.setInterval(CHECK_INTERVAL_MS)
+        self.expiry_timer.timeout.connect(self.check_expiry)
+        if self.expiry_watch is not None:
+            self.expiry_timer.start()
 
         # Zamiast QVBoxLayout czy QHBoxLayout używamy QGridLayout
         layout = QGridLayout()
@@ -69,6 +140,108 @@ class StartScreen(BackgroundScreen):
         # Dodaj layout do panelu form_layout z klasy bazowej
         self.form_layout.addLayout(layout)
 
+    # ----------------------------------------------------------------
+    # Pulpit (odświeżanie w tle)
+    # ----------------------------------------------------------------
+    def showEvent(self, event: QEvent) -> None:
+        super().showEvent(event)
+        self.refresh_dashboard()
+        self.check_expiry()
+
+    def refresh_dashboard(self) -> None:
+        """
+        Pokazuje wskaźniki z pamięci (jeśli są) i zleca w tle sprawdzenie
+        wersji danych – przeliczenie tylko wtedy, gdy coś się zmieniło.
+        """
+        cache = self.dashboard_cache
+        if cache is None or self._refreshing:
+            return
+        if cache.metrics is not None:
+            self.show_metrics(cache.metrics)
+
+        self._refreshing = True
+        signals = self.dashboard_signals
+
+        def job() -> None:
+            try:
+                metrics, changed = cache.refresh()
+            except Exception as e:  # wynik zawsze wraca do GUI
+                signals.failed.emit(str(e))
+                return
+            if changed:
+                signals.finished.emit(metrics)
+            else:
+                signals.finished.emit(None)
+
+        self._executor.submit(job)
+
+    def show_metrics(self, metrics: Optional[DashboardMetrics]) -> None:
+        self._refreshing = False
+        if metrics is None:  # bez zmian – etykiety są aktualne
+            return
+        self.week_label.setText(
+            f"Ten tydzień: {metrics.week_batches} serii,"
+            f" {metrics.week_milk_l:g} L mleka"
+        )
+        self.month_label.setText(
+            f"Ten miesiąc: {metrics.month_batches} serii,"
+            f" {metrics.month_milk_l:g} L mleka"
+        )
+        low = [
+            f"{item['additive_name']} ({item['balance']:g})"
+            for item in metrics.low_stock[:DASHBOARD_LIST_ITEMS]
+        ]
+        self.low_stock_label.setText(
+            f"Niskie stany dodatków: {len(metrics.low_stock)}"
+            + (f" – {', '.join(low)}" if low else "")
+        )
+        incomplete = [
+            f"{item['series']} (brak: {', '.join(item['missing'])})"
+            for item in metrics.incomplete[:DASHBOARD_LIST_ITEMS]
+        ]
+        self.incomplete_label.setText(
+            f"Protokoły z brakami: {len(metrics.incomplete)}"
+            + (f" – {'; '.join(incomplete)}" if incomplete else "")
+        )
+
+    def on_dashboard_failed(self, message: str) -> None:
+        self._refreshing = False
+        logger.warning("Nie udało się odświeżyć pulpitu: %s", message)
+
+    def check_expiry(self) -> None:
+        """Zleca w tle sprawdzenie terminów ważności (timer i pokazanie ekranu)."""
+        watch = self.expiry_watch
+        if watch is None or self._checking_expiry:
+            return
+        self._checking_expiry = True
+        signals = self.dashboard_signals
+
+        def job() -> None:
+            try:
+                alerts, _new = watch.check()
+            except Exception as e:
+                signals.expiry_failed.emit(str(e))
+                return
+            signals.expiry.emit(alerts)
+
+        self._executor.submit(job)
+
+    def on_expiry_failed(self, message: str) -> None:
+        self._checking_expiry = False
+        logger.warning("Nie udało się sprawdzić terminów ważności: %s", message)
+
+    def show_expiry(self, alerts: List[ExpiryAlert]) -> None:
+        self._checking_expiry = False
+        expired = sum(1 for a in alerts if a.expired)
+        items = [a.describe() for a in alerts[:DASHBOARD_LIST_ITEMS]]
+        self.expiry_label.setText(
+            f"Terminy ważności: {len(alerts)} partii (po terminie: {expired})"
+            + (f" – {'; '.join(items)}" if items else "")
+        )
+        self.expiry_label.setStyleSheet(
+            "font-size: 14px;" + (" color: #B00000;" if alerts else "")
+        )
+
     def _navigate_to_screen(self, screen_attribute_name: str) -> None:
         """
         Pomocnicza metoda nawigująca do określonego ekranu w MainWindow.